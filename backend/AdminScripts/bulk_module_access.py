@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Bulk Module Access Script
+
+Grants or revokes modules for many users at once in a single transaction,
+e.g. when onboarding a sailing club. Uses the same code path as
+POST /api/admin/modules/bulk.
+
+Usage:
+  python bulk_module_access.py --users alice bob carol --modules boats trips
+  python bulk_module_access.py --users-file club.txt --all-modules
+  python bulk_module_access.py --all-users --modules events
+  python bulk_module_access.py --revoke --users-file leavers.txt --all-modules
+  python bulk_module_access.py --users alice --modules events --reenable
+
+--users-file takes one username or email per line (blank lines and # comments ignored).
+Existing grants are left as they are, including modules users switched off
+themselves; --reenable switches those back on.
+"""
+
+import argparse
+import sys
+import os
+import time
+# Add parent directory to path to import from backend root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from factory import create_app
+from models import db, User, SystemModule
+from module_access import _IN_CHUNK, _chunks, bulk_set_module_access
+
+def read_identifiers(path):
+    """Read usernames/emails from a file, one per line"""
+    with open(path) as handle:
+        lines = (line.split('#', 1)[0].strip() for line in handle)
+        return [line for line in lines if line]
+
+def resolve_users(identifiers):
+    """Map usernames or emails to user ids; returns (ids, unknown identifiers)"""
+    by_identifier = {}
+    # Each identifier is bound twice, so half a chunk keeps under SQLite's parameter limit
+    for chunk in _chunks(dict.fromkeys(identifiers), _IN_CHUNK // 2):
+        rows = db.session.execute(
+            db.select(User.id, User.username, User.email).where(
+                db.or_(User.username.in_(chunk), User.email.in_(chunk))
+            )
+        )
+        for user_id, username, email in rows:
+            by_identifier[username] = user_id
+            by_identifier[email] = user_id
+    unknown = [identifier for identifier in identifiers if identifier not in by_identifier]
+    return list(dict.fromkeys(by_identifier[i] for i in identifiers if i in by_identifier)), unknown
+
+def bulk_module_access(args):
+    """Apply the user x module matrix and print a summary"""
+    app = create_app(api=False)
+
+    with app.app_context():
+        if args.all_users:
+            user_ids = [user_id for (user_id,) in db.session.execute(
+                db.select(User.id).where(User.is_active.is_(True)))]
+        else:
+            identifiers = args.users or read_identifiers(args.users_file)
+            user_ids, unknown = resolve_users(identifiers)
+            for identifier in unknown:
+                print(f"⚠️  User not found: {identifier}")
+
+        if args.all_modules:
+            modules = SystemModule.query.filter_by(is_active=True).all()
+        else:
+            modules = SystemModule.query.filter(SystemModule.name.in_(args.modules)).all()
+            for name in sorted(set(args.modules) - {module.name for module in modules}):
+                print(f"⚠️  Module not found: {name}")
+
+        if not user_ids or not modules:
+            print("❌ Nothing to do: no matching users or modules")
+            return False
+
+        action = 'revoke' if args.revoke else 'grant'
+        print(f"🔄 {action.title()} {len(modules)} module(s) for {len(user_ids)} user(s)")
+
+        started = time.perf_counter()
+        try:
+            results = bulk_set_module_access(user_ids, [module.id for module in modules], action=action,
+                                             reenable=args.reenable)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            print(f"❌ Error saving changes: {e}")
+            return False
+        elapsed = time.perf_counter() - started
+
+        summary = {}
+        for result in results:
+            summary[result['outcome']] = summary.get(result['outcome'], 0) + 1
+
+        print(f"\n🎉 Done in {elapsed:.2f}s ({len(results)} pairs)")
+        for outcome, count in sorted(summary.items()):
+            print(f"   - {outcome}: {count}")
+        return True
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Grant or revoke modules for many users at once')
+    users = parser.add_mutually_exclusive_group(required=True)
+    users.add_argument('--users', nargs='+', metavar='USER', help='Usernames or emails')
+    users.add_argument('--users-file', help='File with one username or email per line')
+    users.add_argument('--all-users', action='store_true', help='Every active user')
+    modules = parser.add_mutually_exclusive_group(required=True)
+    modules.add_argument('--modules', nargs='+', metavar='MODULE', help='Module names')
+    modules.add_argument('--all-modules', action='store_true', help='Every active module')
+    parser.add_argument('--revoke', action='store_true', help='Revoke instead of grant')
+    parser.add_argument('--reenable', action='store_true',
+                        help='Also switch on grants users have disabled (grant only)')
+
+    success = bulk_module_access(parser.parse_args())
+    sys.exit(0 if success else 1)
@@ -15,24 +15,9 @@ import os
 # Add parent directory to path to import from backend root
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from flask import Flask
-from config import Config
+from factory import create_app
 from models import db, User, SystemModule, UserModulePermission
 
-def create_app_for_command():
-    """Create Flask app configured for database access"""
-    app = Flask(__name__)
-    
-    # Use development config for SQLite by default
-    app.config.from_object(Config)
-    
-    # Override with production database if specified
-    if 'DATABASE_URL' in os.environ:
-        app.config['SQLALCHEMY_DATABASE_URI'] = os.environ['DATABASE_URL']
-    
-    db.init_app(app)
-    return app
-
 def find_user(identifier):
     """Find user by username or email"""
     user = User.query.filter_by(username=identifier).first()
@@ -42,7 +27,7 @@ def find_user(identifier):
 
 def grant_all_modules(username_or_email, make_admin=False):
     """Grant all module permissions to a user"""
-    app = create_app_for_command()
+    app = create_app(api=False)
     
     with app.app_context():
         print(f"🔍 Looking for user: {username_or_email}")
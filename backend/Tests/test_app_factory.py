@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Test script for the application factory and module blueprints
+"""
+
+import json as stdlib_json
+import os
+import subprocess
+import sys
+import tempfile
+from app import app
+from factory import create_app
+from models import db, User, SystemModule
+from flask import json
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def test_app_factory():
+    """Test blueprint selection, active-module loading and the script app"""
+
+    print("=== Application Factory Tests ===\n")
+
+    def route_prefixes(flask_app):
+        return {rule.rule.split('/')[2] for rule in flask_app.url_map.iter_rules() if rule.rule.startswith('/api/')}
+
+    # Test 1: Core blueprints are always there, module blueprints only when asked for
+    print("1. Testing blueprint selection...")
+    core_app = create_app(modules=[])
+    assert set(core_app.blueprints) == {'core', 'users', 'dashboard', 'admin'}
+    assert route_prefixes(core_app) == {'health', 'auth', 'user', 'dashboard', 'admin'}
+    boats_app = create_app(modules=['boats', 'navigation'])
+    assert set(boats_app.blueprints) == {'core', 'users', 'dashboard', 'admin', 'boats'}
+    with boats_app.test_client() as client:
+        assert client.get('/api/health').status_code == 200
+        assert client.get('/api/trips').status_code == 404
+    assert {'boats', 'trips', 'equipment', 'maintenance', 'events', 'jobs'} <= route_prefixes(app)
+    core_routes, all_routes = len(list(core_app.url_map.iter_rules())), len(list(app.url_map.iter_rules()))
+    print(f"   ✓ {core_routes} core routes, {all_routes} with every module")
+
+    # Test 2: Unused module code is never imported
+    print("\n2. Testing lazy blueprint imports...")
+    probe = ("import sys, json; from factory import create_app; create_app(modules=['boats']); "
+             "print(json.dumps(['blueprints.trips' in sys.modules, 'numpy' in sys.modules]))")
+    result = subprocess.run([sys.executable, '-c', probe], cwd=BACKEND_DIR, capture_output=True, text=True, check=True)
+    assert stdlib_json.loads(result.stdout.splitlines()[-1]) == [False, False], result.stdout
+    print("   ✓ Trips blueprint and numpy not imported without the trips module")
+
+    # Test 3: Script app has the database only
+    print("\n3. Testing create_app(api=False)...")
+    script_app = create_app(api=False)
+    assert not script_app.blueprints and 'flask-jwt-extended' not in script_app.extensions
+    assert 'migrate' not in script_app.extensions
+    assert 'migrate' in create_app(api=False, migrations=True).extensions
+    with script_app.app_context():
+        assert db.session.query(User).count() >= 0
+    print("   ✓ Database-only app, migrations on request")
+
+    # Test 4: A fresh database with no modules seeded still serves every module
+    print("\n4. Testing a fresh database...")
+    with tempfile.TemporaryDirectory() as directory:
+        fresh_uri = f"sqlite:///{os.path.join(directory, 'fresh.db')}"
+        fresh_script_app = create_app(api=False, SQLALCHEMY_DATABASE_URI=fresh_uri)
+        with fresh_script_app.app_context():
+            db.create_all()
+            assert SystemModule.query.count() == 0
+            db.session.remove()
+        fresh_app = create_app(SQLALCHEMY_DATABASE_URI=fresh_uri)
+        assert {'boats', 'trips', 'equipment', 'maintenance', 'events'} <= set(fresh_app.blueprints)
+        with fresh_script_app.app_context():
+            db.engine.dispose()
+        with fresh_app.app_context():
+            db.engine.dispose()
+    print("   ✓ Every module blueprint loaded from an empty system_modules table")
+
+    with app.test_client() as client:
+        with app.app_context():
+            db.create_all()
+
+            admin = User.query.filter_by(username='factory_admin').first()
+            if not admin:
+                admin = User(username='factory_admin', email='factory_admin@test.com', is_admin=True)
+                admin.set_password('factory123')
+                db.session.add(admin)
+                db.session.commit()
+            events = SystemModule.query.filter_by(name='events').first()
+            was_active = events.is_active
+
+            login = client.post('/api/auth/login',
+                                data=json.dumps({'username': 'factory_admin', 'password': 'factory123'}),
+                                content_type='application/json')
+            headers = {'Authorization': f"Bearer {json.loads(login.data)['access_token']}"}
+
+            try:
+                # Test 5: Deactivated modules are left out of the next app
+                print("\n5. Testing active module loading...")
+                response = client.put(f'/api/admin/modules/{events.id}', headers=headers,
+                                      data=json.dumps({'is_active': False}), content_type='application/json')
+                assert json.loads(response.data)['restart_required'] is True
+                response = client.put(f'/api/admin/modules/{events.id}', headers=headers,
+                                      data=json.dumps({'sort_order': events.sort_order}),
+                                      content_type='application/json')
+                assert json.loads(response.data)['restart_required'] is False
+
+                restarted = create_app()
+                assert 'events' not in restarted.blueprints and 'boats' in restarted.blueprints
+                assert 'events' in create_app(API_MODULES='all').blueprints
+                print("   ✓ Inactive events module not loaded; API_MODULES=all overrides")
+            finally:
+                # Clean up
+                SystemModule.query.filter_by(name='events').update({'is_active': was_active})
+                db.session.commit()
+
+    print("\n=== All Application Factory Tests Passed! ===")
+
+if __name__ == "__main__":
+    test_app_factory()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Test script for bulk module grant/revoke
+
+A 200 user x 50 module matrix (10k pairs) must be applied in one request
+with per-pair outcomes.
+"""
+
+import sqlite3
+import time
+from app import app
+from models import db, User, SystemModule, UserModulePermission
+from flask import json
+from AdminScripts.bulk_module_access import resolve_users
+
+USERS = 200
+MODULES = 50
+
+def test_bulk_module_access():
+    """Test the bulk permission endpoint"""
+
+    print("=== Bulk Module Access Tests ===\n")
+
+    with app.test_client() as client:
+        with app.app_context():
+            db.create_all()
+
+            admin = User.query.filter_by(username='bulk_access_admin').first()
+            if not admin:
+                admin = User(username='bulk_access_admin', email='bulk_access_admin@test.com', is_admin=True)
+                admin.set_password('bulk123')
+                db.session.add(admin)
+                db.session.commit()
+
+            # Plain inserts: hashing 200 passwords would dominate the test
+            db.session.execute(User.__table__.insert(), [
+                {'username': f'bulk_member_{i}', 'email': f'bulk_member_{i}@test.com', 'password_hash': 'x'}
+                for i in range(USERS)])
+            db.session.execute(SystemModule.__table__.insert(), [
+                {'name': f'bulk_module_{i}', 'display_name': f'Bulk Module {i}', 'sort_order': 500 + i}
+                for i in range(MODULES)])
+            db.session.commit()
+            user_ids = [row[0] for row in db.session.execute(
+                db.select(User.id).where(User.username.like('bulk_member_%')).order_by(User.id))]
+            module_ids = [row[0] for row in db.session.execute(
+                db.select(SystemModule.id).where(SystemModule.name.like('bulk_module_%')).order_by(SystemModule.id))]
+            dashboard = SystemModule.query.filter_by(name='dashboard').first()
+
+            response = client.post('/api/auth/login',
+                                   data=json.dumps({'username': 'bulk_access_admin', 'password': 'bulk123'}),
+                                   content_type='application/json')
+            headers = {'Authorization': f"Bearer {json.loads(response.data)['access_token']}"}
+
+            def bulk(action, users, modules):
+                response = client.post('/api/admin/modules/bulk', headers=headers, content_type='application/json',
+                                       data=json.dumps({'action': action, 'user_ids': users, 'module_ids': modules}))
+                return response.status_code, json.loads(response.data)
+
+            try:
+                # Pre-existing grants: one enabled, one disabled
+                db.session.add_all([
+                    UserModulePermission(user_id=user_ids[0], module_id=module_ids[0], is_enabled=True),
+                    UserModulePermission(user_id=user_ids[0], module_id=module_ids[1], is_enabled=False),
+                ])
+                db.session.commit()
+
+                # Test 1: 10k grants in one request
+                print(f"1. Testing {USERS * MODULES} grants...")
+                started = time.perf_counter()
+                status, data = bulk('grant', user_ids, module_ids)
+                elapsed = time.perf_counter() - started
+                assert status == 200, data
+                assert data['summary'] == {'granted': USERS * MODULES - 2, 'exists': 2}
+                assert len(data['results']) == USERS * MODULES
+                assert data['results'][1] == {'user_id': user_ids[0], 'module_id': module_ids[1], 'outcome': 'exists'}
+                stored = UserModulePermission.query.filter(
+                    UserModulePermission.module_id.in_(module_ids), UserModulePermission.is_enabled.is_(True)).count()
+                # The grant the user switched off stays off
+                assert stored == USERS * MODULES - 1
+                assert elapsed < 3, f'{elapsed:.2f}s'
+                print(f"   ✓ {data['summary']} in {elapsed:.2f}s")
+
+                # Disabled grants are only switched back on when asked to
+                response = client.post('/api/admin/modules/bulk', headers=headers, content_type='application/json',
+                                       data=json.dumps({'action': 'grant', 'user_ids': [user_ids[0]],
+                                                        'module_ids': module_ids[:2], 'reenable': True}))
+                data = json.loads(response.data)
+                assert [r['outcome'] for r in data['results']] == ['exists', 'enabled']
+                print("   ✓ reenable switches the disabled grant back on")
+
+                # Test 2: Unknown ids and protected modules are reported per pair
+                print("\n2. Testing per-pair outcomes...")
+                status, data = bulk('grant', [user_ids[0], 999999], [module_ids[0], 999999])
+                assert [r['outcome'] for r in data['results']] == [
+                    'exists', 'module_not_found', 'user_not_found', 'user_not_found']
+                if dashboard:
+                    bulk('grant', [user_ids[0]], [dashboard.id])
+                    status, data = bulk('revoke', [user_ids[0]], [dashboard.id, module_ids[0]])
+                    assert [r['outcome'] for r in data['results']] == ['protected', 'revoked']
+                print("   ✓ Missing users/modules and core modules reported")
+
+                # Test 3: Bulk revoke
+                print("\n3. Testing revoke...")
+                status, data = bulk('revoke', user_ids, module_ids)
+                assert data['summary'].get('revoked') == USERS * MODULES - (1 if dashboard else 0)
+                assert UserModulePermission.query.filter(UserModulePermission.module_id.in_(module_ids)).count() == 0
+                print(f"   ✓ {data['summary']}")
+
+                # Test 4: Validation
+                print("\n4. Testing validation...")
+                for body in ({'action': 'delete', 'user_ids': [1], 'module_ids': [1]},
+                             {'user_ids': [], 'module_ids': [1]},
+                             {'user_ids': ['1'], 'module_ids': [1]}):
+                    response = client.post('/api/admin/modules/bulk', headers=headers,
+                                           data=json.dumps(body), content_type='application/json')
+                    assert response.status_code == 400, body
+                print("   ✓ Bad requests return 400")
+
+                # Test 5: The CLI resolves a users file larger than SQLite's bound-parameter limit
+                print("\n5. Testing bulk_module_access.py user lookup...")
+                identifiers = [f'bulk_member_{i}@test.com' for i in range(USERS)]
+                identifiers += [f'bulk_missing_{i}' for i in range(2000)] + ['bulk_member_0']
+                if db.engine.dialect.name == 'sqlite':
+                    # Builds differ (999 to 250000), so hold this connection to the historical default
+                    connection = db.session.connection().connection.driver_connection
+                    limit = connection.getlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER)
+                    connection.setlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER, 999)
+                try:
+                    resolved, unknown = resolve_users(identifiers)
+                finally:
+                    if db.engine.dialect.name == 'sqlite':
+                        connection.setlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER, limit)
+                assert resolved == user_ids and len(unknown) == 2000
+                print(f"   ✓ {len(identifiers)} identifiers: {len(resolved)} users, {len(unknown)} unknown")
+            finally:
+                # Clean up
+                db.session.rollback()
+                UserModulePermission.query.filter(UserModulePermission.user_id.in_(user_ids)).delete()
+                SystemModule.query.filter(SystemModule.id.in_(module_ids)).delete()
+                User.query.filter(User.id.in_(user_ids)).delete()
+                db.session.commit()
+
+    print("\n=== All Bulk Module Access Tests Passed! ===")
+
+if __name__ == "__main__":
+    test_bulk_module_access()
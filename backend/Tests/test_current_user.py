@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Test script for current-user resolution and token claims
+
+The authenticated user must be loaded at most once per request, not at all
+when the TTL cache or trusted token claims can answer.
+"""
+
+import re
+from app import app
+from auth import user_cache
+from models import db, User
+from flask import json
+from flask_jwt_extended import decode_token
+from test_query_counts import count_statements
+
+USER_SELECT = re.compile(r'FROM "?user"?(\s|$)')
+
+def get_user(username, is_admin=False):
+    user = User.query.filter_by(username=username).first()
+    if not user:
+        user = User(username=username, email=f'{username}@test.com')
+        user.set_password('current123')
+        db.session.add(user)
+    user.is_admin = is_admin
+    db.session.commit()
+    return user
+
+def test_current_user():
+    """Test per-request user loading, the TTL cache and authorization claims"""
+
+    print("=== Current User Tests ===\n")
+
+    with app.test_client() as client:
+        with app.app_context():
+            db.create_all()
+
+            admin_id = get_user('current_user_admin', is_admin=True).id
+            member_id = get_user('current_user_member').id
+
+            def login(username):
+                response = client.post('/api/auth/login',
+                                       data=json.dumps({'username': username, 'password': 'current123'}),
+                                       content_type='application/json')
+                return json.loads(response.data)['access_token']
+
+            def measure(method, url, token):
+                db.session.expunge_all()
+                with count_statements() as statements:
+                    response = client.open(url, method=method, headers={'Authorization': f'Bearer {token}'})
+                user_selects = [sql for sql in statements if sql.startswith('SELECT') and USER_SELECT.search(sql)]
+                return response.status_code, len(user_selects), len(statements)
+
+            try:
+                admin_token = login('current_user_admin')
+                member_token = login('current_user_member')
+
+                # Test 1: Tokens carry the admin flag
+                print("1. Testing token claims...")
+                claims = decode_token(member_token)
+                assert claims['is_admin'] is False and 'modules' not in claims
+                assert decode_token(admin_token)['is_admin'] is True
+                print("   ✓ Member token: is_admin=False")
+
+                # Test 2: Decorator and endpoint share one user lookup
+                print("\n2. Testing one user lookup per request...")
+                status, user_selects, _ = measure('GET', f'/api/admin/users/{admin_id}/modules', admin_token)
+                assert status == 200 and user_selects == 1, user_selects
+                status, user_selects, _ = measure('GET', '/api/admin/modules', member_token)
+                assert status == 403 and user_selects == 1
+                print("   ✓ Admin endpoint loads the user once")
+
+                # Test 3: Trusted claims skip the database entirely for admin checks
+                print("\n3. Testing trusted claims...")
+                app.config['AUTHZ_TRUST_TOKEN_CLAIMS'] = True
+                status, _, statements = measure('GET', '/api/admin/modules', member_token)
+                assert status == 403 and statements == 0
+                status, user_selects, _ = measure('GET', '/api/admin/modules', admin_token)
+                assert status == 200 and user_selects == 0
+                app.config['AUTHZ_TRUST_TOKEN_CLAIMS'] = False
+                print("   ✓ No user lookup with trusted claims")
+
+                # Test 4: TTL cache serves repeat requests and drops updated users
+                print("\n4. Testing user cache...")
+                app.config['USER_CACHE_TTL_SECONDS'] = 60
+                user_cache.clear()
+                assert measure('GET', '/api/user/preferences', member_token)[:2] == (200, 1)
+                assert measure('GET', '/api/user/preferences', member_token)[:2] == (200, 0)
+
+                db.session.get(User, member_id).first_name = 'Cached'
+                db.session.commit()
+                assert measure('GET', '/api/user/preferences', member_token)[:2] == (200, 1)
+                response = client.get('/api/auth/me', headers={'Authorization': f'Bearer {member_token}'})
+                assert json.loads(response.data)['user']['first_name'] == 'Cached'
+                print("   ✓ Cached user reused, evicted on update")
+            finally:
+                app.config['AUTHZ_TRUST_TOKEN_CLAIMS'] = False
+                app.config['USER_CACHE_TTL_SECONDS'] = 0
+                user_cache.clear()
+
+    print("\n=== All Current User Tests Passed! ===")
+
+if __name__ == "__main__":
+    test_current_user()
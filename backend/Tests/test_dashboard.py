@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Test script for the dashboard summary endpoint
+
+/api/dashboard/summary must count and list the user's data with a fixed
+number of aggregate statements, serve repeat calls from the per-user cache
+and drop the cached summary when the user's data changes.
+"""
+
+import time
+from datetime import date, datetime, timedelta
+import dashboard
+from app import app
+from models import db, User, Boat, Equipment, MaintenanceRecord, Event, Trip
+from flask import json
+from test_query_counts import count_statements
+
+def test_dashboard_summary():
+    """Test summary contents, statement count, caching and invalidation"""
+
+    print("=== Dashboard Summary Tests ===\n")
+
+    today = date.today()
+    now = datetime.now()
+    rows = []
+    with app.test_client() as client:
+        with app.app_context():
+            db.create_all()
+
+            user = User.query.filter_by(username='dashboard_tester').first()
+            if not user:
+                user = User(username='dashboard_tester', email='dashboard@test.com')
+                user.set_password('dashboard123')
+                db.session.add(user)
+                db.session.commit()
+            user_id = user.id
+
+            login = client.post('/api/auth/login',
+                                data=json.dumps({'username': 'dashboard_tester', 'password': 'dashboard123'}),
+                                content_type='application/json')
+            headers = {'Authorization': f"Bearer {json.loads(login.data)['access_token']}"}
+
+            def summary():
+                db.session.expunge_all()
+                with count_statements() as statements:
+                    response = client.get('/api/dashboard/summary', headers=headers)
+                assert response.status_code == 200, response.data
+                return json.loads(response.data), len(statements)
+
+            try:
+                boats = [Boat(name=f'Dashboard Boat {i}', owner_id=user_id) for i in range(2)]
+                db.session.add_all(boats)
+                db.session.flush()
+                winch = Equipment(name='Dashboard Winch', owner_id=user_id, boat_id=boats[0].id)
+                db.session.add(winch)
+                db.session.flush()
+                rows += [*boats, winch]
+                rows += [
+                    MaintenanceRecord(boat_id=boats[0].id, equipment_id=winch.id, maintenance_type='Routine',
+                                      title='Overdue service', description='Grease',
+                                      date_performed=today - timedelta(days=100),
+                                      next_maintenance_due=today - timedelta(days=10), cost=120.5, created_by=user_id),
+                    MaintenanceRecord(boat_id=boats[1].id, maintenance_type='Inspection', title='Due soon',
+                                      description='Check', date_performed=today - timedelta(days=1),
+                                      next_maintenance_due=today + timedelta(days=5), cost=30, created_by=user_id),
+                    MaintenanceRecord(boat_id=boats[1].id, maintenance_type='Routine', title='Later',
+                                      description='Check', date_performed=today,
+                                      next_maintenance_due=today + timedelta(days=300), created_by=user_id),
+                    Event(name='Dashboard Race', event_type='Race', start_date=now + timedelta(days=3),
+                          created_by=user_id, is_public=False),
+                    Event(name='Dashboard Past Race', event_type='Race', start_date=now - timedelta(days=3),
+                          created_by=user_id, is_public=False),
+                    Trip(name='Dashboard Trip 1', boat_id=boats[0].id, captain_id=user_id,
+                         start_date=now - timedelta(hours=5), distance_miles=12.5, actual_duration_hours=3),
+                    Trip(name='Dashboard Trip 2', boat_id=boats[1].id, captain_id=user_id,
+                         start_date=now - timedelta(hours=2), distance_miles=4, actual_duration_hours=1.5),
+                ]
+                db.session.add_all(rows[3:])
+                db.session.commit()
+                rows = [(type(row), row.id) for row in rows]
+                dashboard.invalidate()
+
+                # Test 1: Counts, lists and season totals
+                print("1. Testing summary contents...")
+                data, statements = summary()
+                assert data['counts'] == {'boats': 2, 'trips': 2, 'equipment': 1, 'maintenance_records': 3,
+                                          'upcoming_events': data['counts']['upcoming_events']}, data['counts']
+                assert data['counts']['upcoming_events'] >= 1
+                maintenance = data['maintenance']
+                assert (maintenance['overdue_count'], maintenance['due_soon_count']) == (1, 1)
+                assert maintenance['overdue'][0]['title'] == 'Overdue service'
+                assert maintenance['overdue'][0]['days_until_due'] == -10
+                assert maintenance['overdue'][0]['equipment_name'] == 'Dashboard Winch'
+                assert maintenance['due_soon'][0]['boat_name'] == 'Dashboard Boat 1'
+                assert 'Dashboard Race' in [item['name'] for item in data['next_events']]
+                assert 'Dashboard Past Race' not in [item['name'] for item in data['next_events']]
+                assert [trip['name'] for trip in data['recent_trips']] == ['Dashboard Trip 2', 'Dashboard Trip 1']
+                season = data['season']
+                assert (season['trips'], season['distance_miles'], season['hours']) == (2, 16.5, 4.5), season
+                season_begins = dashboard.season_start(today, app.config['DASHBOARD_SEASON_START_MONTH'])
+                assert season['maintenance_cost'] == (150.5 if today - timedelta(days=100) >= season_begins else 30)
+                assert season['by_boat'][0]['boat_name'] == 'Dashboard Boat 0'
+                print(f"   ✓ {data['counts']}, season {season['distance_miles']} miles")
+
+                # Test 2: A handful of statements, however much data
+                print("\n2. Testing statement count...")
+                assert statements <= 10, statements
+                print(f"   ✓ {statements} statements including the user lookup")
+
+                # Test 3: Repeat calls come from the cache
+                print("\n3. Testing cache...")
+                cached, cached_statements = summary()
+                assert cached == data and cached_statements <= 2, cached_statements
+                print(f"   ✓ {cached_statements} statements when cached")
+
+                # Test 4: Writes through the API drop the cached summary
+                print("\n4. Testing invalidation...")
+                response = client.post('/api/boats', headers=headers, data=json.dumps({'name': 'Dashboard Boat 2'}),
+                                       content_type='application/json')
+                assert response.status_code == 201
+                rows.append((Boat, json.loads(response.data)['boat']['id']))
+                data, statements = summary()
+                assert data['counts']['boats'] == 3 and statements > cached_statements
+                record = db.session.get(MaintenanceRecord, rows[3][1])
+                record.next_maintenance_due = today + timedelta(days=2)
+                db.session.commit()
+                data, _ = summary()
+                assert data['maintenance']['overdue_count'] == 0 and data['maintenance']['due_soon_count'] == 2
+                print("   ✓ New boat and rescheduled maintenance show up at once")
+
+                # Test 5: A boat or trip handed to another user leaves the previous owner's summary
+                print("\n5. Testing reassignment...")
+                other = User.query.filter_by(username='dashboard_other').first()
+                if not other:
+                    other = User(username='dashboard_other', email='dashboard_other@test.com')
+                    other.set_password('dashboard123')
+                    db.session.add(other)
+                    db.session.commit()
+                other_id = other.id
+                summary()
+                db.session.get(Boat, rows[-1][1]).owner_id = other_id
+                trip_id = next(row_id for model, row_id in rows if model is Trip)
+                db.session.get(Trip, trip_id).captain_id = other_id
+                db.session.commit()
+                data, _ = summary()
+                assert (data['counts']['boats'], data['counts']['trips']) == (2, 1), data['counts']
+                print("   ✓ Moved boat and trip dropped from the previous owner's cached summary")
+
+                # Test 6: A summary cached between flush and commit is dropped on commit
+                print("\n6. Testing invalidation on commit...")
+                stale, _ = summary()
+                db.session.get(Boat, rows[0][1]).name = 'Dashboard Boat Renamed'
+                db.session.flush()
+                assert user_id not in dashboard._cache
+                # Another request reads the pre-commit rows meanwhile
+                dashboard._cache[user_id] = (time.monotonic(), today, stale)
+                db.session.commit()
+                assert user_id not in dashboard._cache
+                dashboard._cache[user_id] = (time.monotonic(), today, stale)
+                db.session.get(Boat, rows[0][1]).name = 'Dashboard Boat 0'
+                db.session.flush()
+                db.session.rollback()
+                dashboard._cache[user_id] = (time.monotonic(), today, stale)
+                db.session.commit()
+                assert user_id in dashboard._cache
+                print("   ✓ Entry dropped again on commit, rolled back flushes forgotten")
+            finally:
+                db.session.rollback()
+                db.session.expunge_all()
+                for model, row_id in reversed([row for row in rows if isinstance(row, tuple)]):
+                    model.query.filter_by(id=row_id).delete()
+                db.session.commit()
+                dashboard.invalidate()
+
+    print("\n=== All Dashboard Summary Tests Passed! ===")
+
+if __name__ == "__main__":
+    test_dashboard_summary()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Test script for database engine profiles and pool metrics
+"""
+
+import os
+import tempfile
+from app import app
+from config import Config
+from factory import create_app
+from models import db, User
+from db_engine import engine_options, pool_stats
+from flask import json
+
+def test_db_engine():
+    """Test engine profiles, SQLite pragmas, pool counters and pool timeouts"""
+
+    print("=== Database Engine Tests ===\n")
+
+    config = {key: getattr(Config, key) for key in dir(Config) if key.isupper()}
+
+    # Test 1: PostgreSQL profile is bounded per process and sets server timeouts
+    print("1. Testing PostgreSQL profile...")
+    options = engine_options({**config, 'SQLALCHEMY_DATABASE_URI': 'postgresql+psycopg2://u:p@localhost/db',
+                              'DB_POOL_SIZE': 0, 'SERVE_THREADS': 6, 'DB_MAX_OVERFLOW': 1})
+    assert options['pool_size'] == 6 and options['max_overflow'] == 1
+    assert options['pool_pre_ping'] is True and options['pool_recycle'] == config['DB_POOL_RECYCLE_SECONDS']
+    assert f"statement_timeout={config['DB_STATEMENT_TIMEOUT_MS']}" in options['connect_args']['options']
+    assert 'prepare_threshold' not in options['connect_args']
+    options = engine_options({**config, 'SQLALCHEMY_DATABASE_URI': 'postgresql+psycopg://u:p@localhost/db'})
+    assert options['connect_args']['prepare_threshold'] == config['DB_PREPARE_THRESHOLD']
+    memory = engine_options({**config, 'SQLALCHEMY_DATABASE_URI': 'sqlite://'})
+    assert 'pool_size' not in memory
+    print("   ✓ Pool of 6+1 with pre-ping, statement_timeout; psycopg 3 prepares statements")
+
+    # Test 2: SQLite connections get WAL and the other pragmas
+    print("\n2. Testing SQLite pragmas...")
+    with app.app_context():
+        pragmas = {name: db.session.execute(db.text(f'PRAGMA {name}')).scalar()
+                   for name in ('journal_mode', 'synchronous', 'busy_timeout', 'temp_store')}
+        db.session.remove()
+    assert pragmas == {'journal_mode': 'wal', 'synchronous': 1, 'busy_timeout': config['SQLITE_BUSY_TIMEOUT_MS'],
+                       'temp_store': 2}, pragmas
+    memory_app = create_app(api=False, SQLALCHEMY_DATABASE_URI='sqlite://')
+    with memory_app.app_context():
+        assert db.session.execute(db.text('PRAGMA journal_mode')).scalar() == 'memory'
+    print(f"   ✓ {pragmas}")
+
+    # Test 3: Pool counters and the admin endpoint
+    print("\n3. Testing pool metrics...")
+    with app.test_client() as client:
+        with app.app_context():
+            admin = User.query.filter_by(username='pool_admin').first()
+            if not admin:
+                admin = User(username='pool_admin', email='pool_admin@test.com', is_admin=True)
+                admin.set_password('pool123')
+                db.session.add(admin)
+                db.session.commit()
+            before = pool_stats()['checkouts']
+            login = client.post('/api/auth/login', data=json.dumps({'username': 'pool_admin', 'password': 'pool123'}),
+                                content_type='application/json')
+            headers = {'Authorization': f"Bearer {json.loads(login.data)['access_token']}"}
+            stats = json.loads(client.get('/api/admin/db/pool', headers=headers).data)['pool']
+            assert stats['checkouts'] > before and stats['pid'] == os.getpid()
+            assert stats['capacity'] == stats['size'] + config['DB_MAX_OVERFLOW']
+            assert client.get('/api/admin/db/pool').status_code == 401
+    print(f"   ✓ {stats['checkouts']} checkouts, capacity {stats['capacity']}")
+
+    # Test 4: An exhausted pool answers 503 instead of hanging or 500
+    print("\n4. Testing pool timeout...")
+    scratch = tempfile.NamedTemporaryFile(suffix='.db', delete=False)
+    scratch.close()
+    try:
+        small_app = create_app(modules=[], SQLALCHEMY_DATABASE_URI=f'sqlite:///{scratch.name}',
+                               DB_POOL_SIZE=1, DB_MAX_OVERFLOW=0, DB_POOL_TIMEOUT_SECONDS=0.1)
+        with small_app.app_context():
+            db.create_all()
+            user = User(username='pool_user', email='pool_user@test.com')
+            user.set_password('pool123')
+            db.session.add(user)
+            db.session.commit()
+            db.session.remove()
+        with small_app.test_client() as client:
+            login = client.post('/api/auth/login', data=json.dumps({'username': 'pool_user', 'password': 'pool123'}),
+                                content_type='application/json')
+            headers = {'Authorization': f"Bearer {json.loads(login.data)['access_token']}"}
+            with small_app.app_context():
+                engine = db.engine
+            held = engine.connect()
+            try:
+                response = client.get('/api/auth/me', headers=headers)
+            finally:
+                held.close()
+            assert response.status_code == 503 and response.headers['Retry-After'] == '1'
+            with small_app.app_context():
+                stats = pool_stats(small_app)
+            assert stats['timeouts'] == 1 and stats['full_checkouts'] >= 1
+            assert client.get('/api/auth/me', headers=headers).status_code == 200
+        engine.dispose()
+    finally:
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(scratch.name + suffix):
+                os.unlink(scratch.name + suffix)
+    print("   ✓ 503 with Retry-After, then recovers")
+
+    print("\n=== All Database Engine Tests Passed! ===")
+
+if __name__ == "__main__":
+    test_db_engine()
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Test script for the event calendar
+
+GET /api/events?from=&to= must return the occurrences overlapping the
+window, expanding recurring events only there, from two indexed range
+scans; /api/events/calendar.ics must export the same events.
+"""
+
+from datetime import datetime, timedelta
+from sqlalchemy import text
+import event_calendar
+from app import app
+from models import db, User, Event, EventRecurrence
+from flask import json
+from test_query_counts import count_statements
+
+def expand_from_start(start, end, rule, window_start, window_end):
+    """Occurrences found by walking every period from the first one"""
+    found = []
+    for occurrence, finish in event_calendar.expand(start, end, rule, start, window_end):
+        if (finish or occurrence) > window_start or occurrence >= window_start:
+            found.append((occurrence, finish))
+    return found
+
+def test_event_calendar():
+    """Test recurrence rules, the calendar window, updates and the iCalendar export"""
+
+    print("=== Event Calendar Tests ===\n")
+
+    event_ids = []
+    with app.test_client() as client:
+        with app.app_context():
+            db.create_all()
+
+            users = {}
+            for name in ('calendar_owner', 'calendar_other'):
+                user = User.query.filter_by(username=name).first()
+                if not user:
+                    user = User(username=name, email=f'{name}@test.com')
+                    user.set_password('calendar123')
+                    db.session.add(user)
+                    db.session.commit()
+                login = client.post('/api/auth/login', data=json.dumps({'username': name, 'password': 'calendar123'}),
+                                    content_type='application/json')
+                users[name] = (user.id, {'Authorization': f"Bearer {json.loads(login.data)['access_token']}"})
+            owner_id, headers = users['calendar_owner']
+            other_id, other_headers = users['calendar_other']
+
+            def create(**payload):
+                response = client.post('/api/events', data=json.dumps(payload), content_type='application/json',
+                                       headers=headers)
+                assert response.status_code == 201, response.data
+                event = json.loads(response.data)['event']
+                event_ids.append(event['id'])
+                return event
+
+            def window(start, end, request_headers=headers):
+                response = client.get(f'/api/events?from={start}&to={end}', headers=request_headers)
+                assert response.status_code == 200, response.data
+                return [(item['name'], item['start_date']) for item in json.loads(response.data)['events']
+                        if item['name'].startswith('Calendar')]
+
+            try:
+                # Test 1: Rules expand from the window's period, the same as walking from the start
+                print("1. Testing recurrence rules...")
+                rule = event_calendar.parse_rule('RRULE:FREQ=WEEKLY;BYDAY=TU,TH;COUNT=40')
+                start, end = datetime(2024, 1, 4, 18), datetime(2024, 1, 4, 21)
+                for window_start in (datetime(2024, 1, 1), datetime(2024, 5, 7, 20), datetime(2024, 6, 1)):
+                    window_end = window_start + timedelta(days=31)
+                    assert list(event_calendar.expand(start, end, rule, window_start, window_end)) == \
+                        expand_from_start(start, end, rule, window_start, window_end)
+                assert event_calendar.series_end(start, end, rule) == datetime(2024, 5, 21, 21)
+                monthly = event_calendar.parse_rule('FREQ=MONTHLY;UNTIL=20240630')
+                assert [occurrence.month for occurrence, _ in event_calendar.expand(
+                    datetime(2024, 1, 31), None, monthly, datetime(2024, 1, 1))] == [1, 3, 5]
+                for bad in ('FREQ=HOURLY', 'FREQ=DAILY;BYDAY=MO', 'FREQ=WEEKLY;BYSETPOS=1', 'FREQ=WEEKLY;COUNT=0'):
+                    try:
+                        event_calendar.parse_rule(bad)
+                        assert False, bad
+                    except ValueError:
+                        pass
+                print("   ✓ Weekly, monthly and unsupported rules")
+
+                # Test 2: The window holds single events overlapping it and occurrences of live series
+                print("\n2. Testing the calendar window...")
+                create(name='Calendar Regatta', start_date='2025-07-12T10:00:00', end_date='2025-07-13T17:00:00')
+                create(name='Calendar Rally', start_date='2025-06-20T09:00:00', end_date='2025-07-02T18:00:00')
+                create(name='Calendar Earlier', start_date='2025-06-10T09:00:00', end_date='2025-06-10T18:00:00')
+                create(name='Calendar Private', start_date='2025-07-20T09:00:00', is_public=False)
+                races = create(name='Calendar Club Race', start_date='2025-04-02T18:30:00',
+                               end_date='2025-04-02T21:00:00',
+                               recurrence={'rule': 'FREQ=WEEKLY;BYDAY=WE', 'exdates': ['2025-07-16T18:30:00']})
+                create(name='Calendar Old Series', start_date='2024-04-03T18:00:00',
+                       recurrence={'rule': 'FREQ=WEEKLY;COUNT=10'})
+                assert races['recurrence']['ends_at'] is None
+                assert window('2025-07-01', '2025-07-31') == [
+                    ('Calendar Rally', '2025-06-20T09:00:00'),
+                    ('Calendar Club Race', '2025-07-02T18:30:00'),
+                    ('Calendar Club Race', '2025-07-09T18:30:00'),
+                    ('Calendar Regatta', '2025-07-12T10:00:00'),
+                    ('Calendar Private', '2025-07-20T09:00:00'),
+                    ('Calendar Club Race', '2025-07-23T18:30:00'),
+                    ('Calendar Club Race', '2025-07-30T18:30:00'),
+                ]
+                assert ('Calendar Private', '2025-07-20T09:00:00') not in window('2025-07-01', '2025-07-31',
+                                                                                 other_headers)
+                print("   ✓ Spanning, private, recurring and skipped occurrences placed correctly")
+
+                # Test 3: Moving a series or ending it updates the window
+                print("\n3. Testing updates...")
+                response = client.put(f"/api/events/{races['id']}", headers=headers, content_type='application/json',
+                                      data=json.dumps({'start_date': '2025-04-03T18:30:00',
+                                                       'end_date': '2025-04-03T21:00:00',
+                                                       'recurrence': {'rule': 'FREQ=WEEKLY;UNTIL=20250715'}}))
+                assert response.status_code == 200, response.data
+                assert json.loads(response.data)['event']['recurrence']['ends_at'] == '2025-07-16T02:29:59'
+                assert [start for name, start in window('2025-07-01', '2025-07-31')
+                        if name == 'Calendar Club Race'] == ['2025-07-03T18:30:00', '2025-07-10T18:30:00']
+                response = client.put(f"/api/events/{races['id']}", headers=headers, content_type='application/json',
+                                      data=json.dumps({'recurrence': {'rule': 'FREQ=SECONDLY'}}))
+                assert response.status_code == 400
+                client.put(f"/api/events/{races['id']}", headers=headers, content_type='application/json',
+                           data=json.dumps({'recurrence': None}))
+                assert EventRecurrence.query.filter_by(event_id=races['id']).count() == 0
+                print("   ✓ Moved, bounded and removed recurrence")
+
+                # Test 4: Bad windows are rejected
+                print("\n4. Testing window validation...")
+                for query in ('from=2025-07-01', 'from=July&to=2025-07-31', 'from=2025-07-31&to=2025-07-01',
+                              'from=2020-01-01&to=2025-01-01'):
+                    assert client.get(f'/api/events?{query}', headers=headers).status_code == 400, query
+                assert event_calendar.parse_window('2025-07-01T02:00:00+02:00', '2025-07-01T12:00:00Z', 400) == \
+                    (datetime(2025, 7, 1), datetime(2025, 7, 1, 12))
+                print("   ✓ Missing, malformed, reversed and oversized windows return 400; offsets become UTC")
+
+                # Test 5: Two statements, each a range scan on the window indexes
+                print("\n5. Testing statements and query plans...")
+                window_start, window_end = datetime(2025, 7, 1), datetime(2025, 8, 1)
+                with count_statements() as statements:
+                    event_calendar.calendar(owner_id, window_start, window_end)
+                assert len(statements) == 2
+                if db.engine.dialect.name == 'sqlite':
+                    # create_all() doesn't add indexes to an existing events table
+                    db.session.commit()
+                    for index in Event.__table__.indexes:
+                        index.create(db.engine, checkfirst=True)
+                    query = event_calendar.single_events(owner_id, window_start, window_end)
+                    sql = str(query.compile(db.engine, compile_kwargs={'literal_binds': True}))
+                    plan = ' '.join(row[-1] for row in db.session.execute(text(f'EXPLAIN QUERY PLAN {sql}')))
+                    assert 'ix_events_start_date_end_date' in plan and 'ix_events_end_date' in plan, plan
+                print("   ✓ 2 statements, window served by the start and end date indexes")
+
+                # Test 6: The iCalendar export carries series as RRULEs
+                print("\n6. Testing /api/events/calendar.ics...")
+                client.put(f"/api/events/{races['id']}", headers=headers, content_type='application/json',
+                           data=json.dumps({'description': 'Start line off the harbour; bring a VHF, ' * 3,
+                                            'recurrence': {'rule': 'FREQ=WEEKLY',
+                                                           'exdates': ['2025-07-17T18:30:00']}}))
+                response = client.get('/api/events/calendar.ics?from=2025-07-01&to=2025-07-31', headers=headers)
+                assert response.status_code == 200 and response.mimetype == 'text/calendar'
+                feed = response.get_data(as_text=True)
+                assert feed.startswith('BEGIN:VCALENDAR\r\n') and feed.endswith('END:VCALENDAR\r\n')
+                assert all(len(line.encode()) <= 75 for line in feed.split('\r\n'))
+                unfolded = feed.replace('\r\n ', '')
+                assert f"UID:event-{races['id']}@" in unfolded
+                assert 'RRULE:FREQ=WEEKLY\r\nEXDATE:20250717T183000Z' in unfolded
+                assert 'Start line off the harbour\\; bring a VHF\\,' in unfolded
+                assert 'SUMMARY:Calendar Earlier' not in unfolded
+                assert client.get('/api/events/calendar.ics?from=soon', headers=headers).status_code == 400
+                print(f"   ✓ {unfolded.count('BEGIN:VEVENT')} events exported")
+            finally:
+                db.session.rollback()
+                EventRecurrence.query.filter(EventRecurrence.event_id.in_(event_ids)).delete()
+                Event.query.filter(Event.id.in_(event_ids)).delete()
+                db.session.commit()
+
+    print("\n=== All Event Calendar Tests Passed! ===")
+
+if __name__ == "__main__":
+    test_event_calendar()
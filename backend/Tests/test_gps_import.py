@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Test script for streaming GPS track import
+"""
+
+import io
+import os
+import tempfile
+from datetime import datetime, timedelta
+from app import app
+from models import db, User, Boat, Trip, GPSRoutePoint
+from gps_import import iter_gpx_points, iter_kml_points, iter_nmea_points, detect_track_format
+from jobs import run_job
+from flask import json
+
+def build_gpx(point_count):
+    """Build a GPX track with one fix per second"""
+    start = datetime(2025, 6, 21, 8, 0, 0)
+    lines = [
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        '<gpx version="1.1" creator="test" xmlns="http://www.topografix.com/GPX/1/1">',
+        '<trk><name>Race</name><trkseg>'
+    ]
+    for i in range(point_count):
+        timestamp = (start + timedelta(seconds=i)).strftime('%Y-%m-%dT%H:%M:%SZ')
+        lines.append(
+            f'<trkpt lat="{37.8 + i * 0.0001:.6f}" lon="{-122.4 + i * 0.0001:.6f}">'
+            f'<ele>1.5</ele><time>{timestamp}</time><sat>9</sat><hdop>0.9</hdop></trkpt>'
+        )
+    lines.append('</trkseg></trk></gpx>')
+    return '\n'.join(lines).encode('utf-8')
+
+KML_SAMPLE = b"""<?xml version="1.0" encoding="UTF-8"?>
+<kml xmlns="http://www.opengis.net/kml/2.2" xmlns:gx="http://www.google.com/kml/ext/2.2">
+<Document>
+  <Placemark><name>Start Mark</name><Point><coordinates>-122.40,37.80,0</coordinates></Point></Placemark>
+  <Placemark><name>Track</name>
+    <gx:Track>
+      <when>2025-06-21T08:00:00Z</when>
+      <when>2025-06-21T08:00:10Z</when>
+      <gx:coord>-122.40 37.80 0</gx:coord>
+      <gx:coord>-122.41 37.81 0</gx:coord>
+    </gx:Track>
+  </Placemark>
+</Document>
+</kml>"""
+
+NMEA_SAMPLE = b"""$GPGGA,080000.00,3748.0000,N,12224.0000,W,1,09,0.9,1.5,M,-25.0,M,,*57
+$GPRMC,080000.00,A,3748.0000,N,12224.0000,W,6.5,045.0,210625,,,A*4B
+$SDDPT,12.4,0.5*65
+$GPGGA,080001.00,3748.0010,N,12223.9990,W,1,09,0.9,1.5,M,-25.0,M,,*59
+$GPRMC,080001.00,A,3748.0010,N,12223.9990,W,6.6,045.5,210625,,,A*43
+$GPRMC,080002.00,V,,,,,,,210625,,,N*75
+"""
+
+def test_gps_import():
+    """Test track parsers and the track upload endpoint"""
+
+    print("=== GPS Track Import Tests ===\n")
+
+    # Test 1: Format detection
+    print("1. Testing format detection...")
+    assert detect_track_format('race.GPX') == 'gpx'
+    assert detect_track_format('race.kml') == 'kml'
+    assert detect_track_format('log.nmea') == 'nmea'
+    assert detect_track_format('log.bin', 'NMEA') == 'nmea'
+    assert detect_track_format('track.csv') is None
+    print("   ✓ Formats detected from extension and explicit override")
+
+    # Test 2: GPX parser
+    print("\n2. Testing GPX parser...")
+    points = list(iter_gpx_points(io.BytesIO(build_gpx(3))))
+    assert len(points) == 3
+    assert points[0]['timestamp'] == datetime(2025, 6, 21, 8, 0, 0)
+    assert points[0]['satellites_used'] == 9
+    print(f"   ✓ Parsed {len(points)} GPX points")
+
+    # Test 3: KML parser
+    print("\n3. Testing KML parser...")
+    points = list(iter_kml_points(io.BytesIO(KML_SAMPLE)))
+    assert len(points) == 3
+    assert points[0]['point_type'] == 'waypoint' and points[0]['point_name'] == 'Start Mark'
+    assert points[2]['timestamp'] == datetime(2025, 6, 21, 8, 0, 10)
+    print(f"   ✓ Parsed {len(points)} KML points (waypoint + gx:Track)")
+
+    # Test 4: NMEA parser merges GGA/RMC epochs and skips void fixes
+    print("\n4. Testing NMEA parser...")
+    points = list(iter_nmea_points(io.BytesIO(NMEA_SAMPLE)))
+    assert len(points) == 2
+    assert abs(points[0]['latitude'] - 37.8) < 1e-9
+    assert abs(points[0]['longitude'] + 122.4) < 1e-9
+    assert points[0]['water_depth'] == 12.9
+    assert points[0]['hdop'] == 0.9 and points[0]['speed_knots'] == 6.5
+    assert points[1]['timestamp'] == datetime(2025, 6, 21, 8, 0, 1)
+    print(f"   ✓ Parsed {len(points)} NMEA fixes")
+
+    with app.test_client() as client:
+        with app.app_context():
+            db.create_all()
+
+            # Create test captain, boat and trip
+            user = User.query.filter_by(username='gps_import_tester').first()
+            if not user:
+                user = User(username='gps_import_tester', email='gps_import@test.com')
+                user.set_password('track123')
+                db.session.add(user)
+                db.session.commit()
+
+            boat = Boat(name='Track Tester', owner_id=user.id)
+            db.session.add(boat)
+            db.session.commit()
+
+            trip = Trip(name='24h Race', boat_id=boat.id, captain_id=user.id,
+                        start_date=datetime(2025, 6, 21, 8, 0, 0))
+            db.session.add(trip)
+            db.session.commit()
+
+            login = client.post('/api/auth/login',
+                                data=json.dumps({'username': 'gps_import_tester', 'password': 'track123'}),
+                                content_type='application/json')
+            headers = {'Authorization': f"Bearer {json.loads(login.data)['access_token']}"}
+
+            # Test 5: Upload a GPX track spanning several batches
+            print("\n5. Testing track upload endpoint...")
+            app.config['GPS_IMPORT_BATCH_SIZE'] = 500
+            app.config['GPS_UPLOAD_FOLDER'] = tempfile.mkdtemp()
+            gpx_data = build_gpx(1234)
+            response = client.post(f'/api/trips/{trip.id}/track',
+                                   data={'file': (io.BytesIO(gpx_data), 'race.gpx')},
+                                   headers=headers, content_type='multipart/form-data')
+            assert response.status_code == 202, response.data
+            result = json.loads(response.data)
+            assert result['job']['status'] == 'Queued'
+            assert result['trip']['gps_file_type'] == 'gpx'
+            assert result['trip']['gps_file_size'] == len(gpx_data)
+            assert result['trip']['route_processed'] is False
+            print(f"   ✓ Upload stored and job {result['job']['id']} queued")
+
+            # Test 6: Running the queued job imports the points in batches
+            print("\n6. Testing queued import job...")
+            job = run_job(result['job']['id'])
+            assert job.status == 'Completed', job.error
+            assert job.get_result()['points_imported'] == 1234
+            db.session.refresh(trip)
+            assert trip.total_route_points == 1234 and trip.route_processed
+            assert GPSRoutePoint.query.filter_by(trip_id=trip.id).count() == 1234
+            last_point = GPSRoutePoint.query.filter_by(trip_id=trip.id).order_by(GPSRoutePoint.timestamp.desc()).first()
+            assert last_point.elapsed_time_seconds == 1233
+            response = client.get(f"/api/jobs/{job.id}", headers=headers)
+            assert json.loads(response.data)['job']['status'] == 'Completed'
+            print(f"   ✓ Imported {job.get_result()['points_imported']} points in batches of 500")
+
+            # Test 7: Re-upload replaces the previous track and file
+            print("\n7. Testing track replacement...")
+            previous_path = trip.gps_file_path
+            response = client.post(f'/api/trips/{trip.id}/track',
+                                   data={'file': (io.BytesIO(NMEA_SAMPLE), 'log.nmea')},
+                                   headers=headers, content_type='multipart/form-data')
+            assert response.status_code == 202, response.data
+            assert not os.path.exists(previous_path)
+            job = run_job(json.loads(response.data)['job']['id'])
+            assert job.status == 'Completed', job.error
+            assert GPSRoutePoint.query.filter_by(trip_id=trip.id).count() == 2
+            print("   ✓ Previous points replaced by NMEA upload")
+
+            # Test 8: Bad uploads are rejected without touching existing points
+            print("\n8. Testing invalid uploads...")
+            response = client.post(f'/api/trips/{trip.id}/track',
+                                   data={'file': (io.BytesIO(b'<gpx><trkpt'), 'broken.gpx')},
+                                   headers=headers, content_type='multipart/form-data')
+            assert response.status_code == 202
+            job = run_job(json.loads(response.data)['job']['id'])
+            assert job.status == 'Failed' and 'Malformed XML' in job.error
+            response = client.post(f'/api/trips/{trip.id}/track',
+                                   data={'file': (io.BytesIO(b'a,b,c'), 'track.csv')},
+                                   headers=headers, content_type='multipart/form-data')
+            assert response.status_code == 400
+            assert GPSRoutePoint.query.filter_by(trip_id=trip.id).count() == 2
+            print("   ✓ Malformed and unsupported files rejected")
+
+            # Clean up
+            response = client.delete(f'/api/trips/{trip.id}', headers=headers)
+            assert response.status_code == 200
+            db.session.delete(boat)
+            db.session.commit()
+
+    print("\n=== All GPS Import Tests Passed! ===")
+
+if __name__ == "__main__":
+    test_gps_import()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Test script for ETags and conditional GETs on read endpoints
+"""
+
+from datetime import date, timedelta
+import http_cache
+from app import app
+from models import db, User, Boat, Equipment
+from flask import json
+from test_query_counts import count_statements
+
+def test_http_cache():
+    """Test weak ETags, 304 responses and invalidation on change"""
+
+    print("=== HTTP Caching Tests ===\n")
+
+    with app.test_client() as client:
+        with app.app_context():
+            db.create_all()
+
+            def get_user(username):
+                user = User.query.filter_by(username=username).first()
+                if not user:
+                    user = User(username=username, email=f'{username}@test.com')
+                    user.set_password('etag123')
+                    db.session.add(user)
+                    db.session.commit()
+                return user.id
+
+            def login(username):
+                response = client.post('/api/auth/login',
+                                       data=json.dumps({'username': username, 'password': 'etag123'}),
+                                       content_type='application/json')
+                return {'Authorization': f"Bearer {json.loads(response.data)['access_token']}"}
+
+            user_id = get_user('etag_tester')
+            get_user('etag_other')
+            boats = [Boat(name=f'ETag Boat {i}', owner_id=user_id) for i in range(3)]
+            db.session.add_all(boats)
+            db.session.commit()
+            boat_ids = [boat.id for boat in boats]
+            equipment_ids = []
+
+            headers = login('etag_tester')
+
+            def conditional_get(url, etag, request_headers=headers):
+                db.session.expunge_all()
+                with count_statements() as statements:
+                    response = client.get(url, headers={**request_headers, 'If-None-Match': etag})
+                return response, statements
+
+            try:
+                # Test 1: Lists and objects carry validators
+                print("1. Testing validators on responses...")
+                urls = ['/api/boats', '/api/trips', '/api/equipment', '/api/maintenance', '/api/events',
+                        '/api/user/modules', f'/api/boats/{boat_ids[0]}']
+                etags = {}
+                for url in urls:
+                    response = client.get(url, headers=headers)
+                    assert response.status_code == 200, url
+                    assert response.headers['ETag'].startswith('W/"'), url
+                    assert 'no-cache' in response.headers['Cache-Control']
+                    etags[url] = response.headers['ETag']
+                assert 'Last-Modified' in client.get('/api/boats', headers=headers).headers
+                print(f"   ✓ {len(urls)} endpoints send weak ETags")
+
+                # Test 2: Matching If-None-Match returns an empty 304 without loading rows
+                print("\n2. Testing 304 Not Modified...")
+                for url in urls:
+                    response, statements = conditional_get(url, etags[url])
+                    assert response.status_code == 304 and response.data == b'', url
+                    assert response.headers['ETag'] == etags[url]
+                response, statements = conditional_get('/api/boats', etags['/api/boats'])
+                # User lookup plus the count/max(updated_at) aggregate
+                assert len(statements) == 2, statements
+                print("   ✓ 304 with 2 statements for /api/boats")
+
+                # Test 3: Changes produce a new tag
+                print("\n3. Testing invalidation...")
+                client.put(f'/api/boats/{boat_ids[0]}', headers=headers,
+                           data=json.dumps({'name': 'Renamed ETag Boat'}), content_type='application/json')
+                for url in ('/api/boats', f'/api/boats/{boat_ids[0]}'):
+                    response, _ = conditional_get(url, etags[url])
+                    assert response.status_code == 200, url
+                    assert response.headers['ETag'] != etags[url]
+
+                response = client.post('/api/equipment', headers=headers,
+                                       data=json.dumps({'name': 'ETag Winch', 'category': 'Deck'}),
+                                       content_type='application/json')
+                equipment_ids.append(json.loads(response.data)['equipment']['id'])
+                assert conditional_get('/api/equipment', etags['/api/equipment'])[0].status_code == 200
+
+                # Different page or filter, or different user: different tag
+                assert conditional_get('/api/boats?limit=1', etags['/api/boats'])[0].status_code == 200
+                other = login('etag_other')
+                response, _ = conditional_get('/api/events', etags['/api/events'], other)
+                assert response.status_code == 200
+                print("   ✓ Updates, inserts, query strings and users change the tag")
+
+                # Test 4: Date-derived fields (is_overdue, days_until_event, ...) go stale at midnight
+                print("\n4. Testing the date in the tag...")
+                etags = {url: client.get(url, headers=headers).headers['ETag'] for url in urls}
+                tomorrow = tuple((date.fromisoformat(day) + timedelta(days=1)).isoformat()
+                                 for day in http_cache.today())
+                today = http_cache.today
+                http_cache.today = lambda: tomorrow
+                try:
+                    for url in urls:
+                        response, _ = conditional_get(url, etags[url])
+                        assert response.status_code == 200 and response.headers['ETag'] != etags[url], url
+                finally:
+                    http_cache.today = today
+                assert conditional_get('/api/boats', etags['/api/boats'])[0].status_code == 304
+                print(f"   ✓ {len(urls)} tags change the next day")
+            finally:
+                # Clean up
+                db.session.expunge_all()
+                Equipment.query.filter(Equipment.id.in_(equipment_ids)).delete()
+                Boat.query.filter(Boat.id.in_(boat_ids)).delete()
+                db.session.commit()
+
+    print("\n=== All HTTP Caching Tests Passed! ===")
+
+if __name__ == "__main__":
+    test_http_cache()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Test script for the hot-path indexes
+
+The ix_* indexes declared in models.py must match the migrations that add
+them to existing databases, and the list queries must actually use them.
+"""
+
+import glob
+import importlib.util
+import os
+from sqlalchemy import inspect, text
+from app import app
+from models import db
+
+VERSIONS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'migrations', 'versions')
+FIRST_INDEX_REVISION = 'b7c3e1f04a92'
+
+def load_index_migrations():
+    """The index migrations from FIRST_INDEX_REVISION on, in upgrade order"""
+    revisions = {}
+    for path in glob.glob(os.path.join(VERSIONS, '*.py')):
+        spec = importlib.util.spec_from_file_location(f'migration_{os.path.basename(path)[:-3]}', path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        revisions[module.down_revision] = module
+    chain = []
+    module = next(module for module in revisions.values() if module.revision == FIRST_INDEX_REVISION)
+    while module:
+        chain.append(module)
+        module = revisions.get(module.revision)
+    # One linear history, so `flask db upgrade` reaches every index
+    assert len(chain) == len(revisions) - 1, [module.revision for module in revisions.values()]
+    return chain
+
+def migrated_indexes():
+    """(name, table, columns) of the indexes left after every index migration has run"""
+    indexes = set()
+    for module in load_index_migrations():
+        indexes -= {(name, table, tuple(columns)) for name, table, columns in getattr(module, 'DROPPED_INDEXES', [])}
+        indexes |= {(name, table, tuple(columns)) for name, table, columns in module.INDEXES}
+    return indexes
+
+def test_indexes():
+    """Test model indexes, the migration list and query plans agree"""
+
+    print("=== Index Tests ===\n")
+
+    with app.app_context():
+        db.create_all()
+
+        # Test 1: Models and migration declare the same indexes
+        print("1. Testing models match the migrations...")
+        declared = {
+            (index.name, table.name, tuple(column.name for column in index.columns))
+            for table in db.metadata.sorted_tables for index in table.indexes if index.name.startswith('ix_')
+        }
+        migrated = migrated_indexes()
+        assert declared == migrated, declared ^ migrated
+        print(f"   ✓ {len(declared)} indexes")
+
+        # Test 2: create_all builds them
+        print("\n2. Testing indexes exist after create_all...")
+        inspector = inspect(db.engine)
+        for name, table, _ in declared:
+            assert name in {index['name'] for index in inspector.get_indexes(table)}, name
+        print("   ✓ All indexes present")
+
+        # Test 3: SQLite plans use them for the hot lookups
+        if db.engine.dialect.name == 'sqlite':
+            print("\n3. Testing query plans...")
+            checks = [
+                ("SELECT * FROM boats WHERE owner_id = 1 AND is_active = 1", 'ix_boats_owner_id_is_active'),
+                ("SELECT * FROM trips WHERE captain_id = 1", 'ix_trips_captain_id'),
+                ("SELECT * FROM gps_route_points WHERE trip_id = 1 ORDER BY timestamp",
+                 'ix_gps_route_points_trip_id_timestamp'),
+            ]
+            for sql, index_name in checks:
+                plan = ' '.join(row[-1] for row in db.session.execute(text(f'EXPLAIN QUERY PLAN {sql}')))
+                assert index_name in plan and 'TEMP B-TREE' not in plan, plan
+                print(f"   ✓ {index_name}")
+
+    print("\n=== All Index Tests Passed! ===")
+
+if __name__ == "__main__":
+    test_indexes()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Test script for the background GPS track job queue
+"""
+
+import os
+import signal
+import threading
+import time
+from datetime import datetime, timedelta
+from app import app
+from models import db, User, Boat, Trip, GPSRoutePoint, TripRouteLevel, ProcessingJob
+from jobs import _heartbeat, claim_next_job, enqueue_job, enqueue_unprocessed_trips, requeue_stale_jobs, run_job
+import track_worker
+from track_worker import run_worker
+
+def test_job_queue():
+    """Test queueing, claiming, recovery and the worker pool"""
+
+    print("=== Background Job Queue Tests ===\n")
+
+    with app.app_context():
+        db.create_all()
+
+        # Start from an empty queue so claims are predictable
+        ProcessingJob.query.delete()
+        db.session.commit()
+
+        user = User.query.filter_by(username='job_queue_tester').first()
+        if not user:
+            user = User(username='job_queue_tester', email='job_queue@test.com')
+            user.set_password('jobs123')
+            db.session.add(user)
+            db.session.commit()
+
+        boat = Boat(name='Queue Tester', owner_id=user.id)
+        db.session.add(boat)
+        db.session.commit()
+
+        start = datetime(2025, 6, 21, 8, 0, 0)
+        trip = Trip(name='Unprocessed Passage', boat_id=boat.id, captain_id=user.id,
+                    start_date=start, total_route_points=3, route_processed=False)
+        db.session.add(trip)
+        db.session.commit()
+        for i in range(3):
+            db.session.add(GPSRoutePoint(trip_id=trip.id, latitude=37.8 + i * 0.01, longitude=-122.4,
+                                         timestamp=start + timedelta(minutes=i)))
+        db.session.commit()
+
+        # Test 1: Scanner picks up unprocessed trips once
+        print("1. Testing scan for unprocessed trips...")
+        assert enqueue_unprocessed_trips() >= 1
+        job = ProcessingJob.query.filter_by(trip_id=trip.id).one()
+        assert job.job_type == 'process_track' and job.status == 'Queued'
+        assert enqueue_unprocessed_trips() == 0
+        print(f"   ✓ Job {job.id} queued for trip {trip.id}")
+
+        # Test 2: Claiming marks the job Running exactly once
+        print("\n2. Testing job claim...")
+        claimed_id = claim_next_job('test-worker')
+        assert claimed_id == job.id
+        db.session.refresh(job)
+        assert job.status == 'Running' and job.attempts == 1 and job.worker == 'test-worker'
+        assert claim_next_job('other-worker') is None
+        print("   ✓ Job claimed atomically")
+
+        # Test 3: Long jobs keep beating; jobs abandoned by a dead worker are requeued
+        print("\n3. Testing heartbeat and stale job recovery...")
+        job.started_at = job.updated_at = datetime.utcnow() - timedelta(hours=1)
+        db.session.commit()
+        with _heartbeat(job.id, 0.1):
+            time.sleep(0.35)
+        db.session.refresh(job)
+        assert job.updated_at > datetime.utcnow() - timedelta(minutes=1)
+        assert requeue_stale_jobs(900) == 0
+        print("   ✓ Heartbeat keeps a long running job from going stale")
+
+        job.updated_at = datetime.utcnow() - timedelta(hours=1)
+        db.session.commit()
+        assert requeue_stale_jobs(900) == 1
+        db.session.refresh(job)
+        assert job.status == 'Queued' and job.worker is None
+        print("   ✓ Stale job returned to the queue")
+
+        # Test 4: Worker pool drains the queue
+        print("\n4. Testing worker pool...")
+        previous_handlers = signal.getsignal(signal.SIGINT), signal.getsignal(signal.SIGTERM)
+        try:
+            run_worker(processes=1, once=True)
+        finally:
+            signal.signal(signal.SIGINT, previous_handlers[0])
+            signal.signal(signal.SIGTERM, previous_handlers[1])
+        db.session.expire_all()
+        job = db.session.get(ProcessingJob, job.id)
+        trip = db.session.get(Trip, trip.id)
+        assert job.status == 'Completed', job.error
+        assert trip.route_processed and trip.distance_calculated > 0
+        assert TripRouteLevel.query.filter_by(trip_id=trip.id).count() == len(app.config['ROUTE_SIMPLIFY_TOLERANCES'])
+        assert enqueue_unprocessed_trips() == 0
+        print(f"   ✓ Job completed, trip distance {trip.distance_calculated} nm")
+
+        # Test 5: An idle worker sleeps between polls instead of spinning on the queue
+        print("\n5. Testing idle polling...")
+        claims = []
+
+        def counted_claim(worker=None):
+            claims.append(worker)
+            return claim_next_job(worker)
+
+        previous_handlers = signal.getsignal(signal.SIGINT), signal.getsignal(signal.SIGTERM)
+        stopper = threading.Timer(1.0, os.kill, (os.getpid(), signal.SIGTERM))
+        track_worker.claim_next_job = counted_claim
+        try:
+            stopper.start()
+            run_worker(processes=1, poll_interval=0.25)
+        finally:
+            stopper.cancel()
+            track_worker.claim_next_job = claim_next_job
+            signal.signal(signal.SIGINT, previous_handlers[0])
+            signal.signal(signal.SIGTERM, previous_handlers[1])
+        # One claim per 0.25s poll over about a second
+        assert 1 <= len(claims) <= 6, len(claims)
+        print(f"   ✓ {len(claims)} claim queries in 1s of idling")
+
+        # Test 6: Trips without loadable points and deleted trips fail permanently
+        print("\n6. Testing permanent failures...")
+        GPSRoutePoint.query.filter_by(trip_id=trip.id).delete()
+        TripRouteLevel.query.filter_by(trip_id=trip.id).delete()
+        empty = enqueue_job(trip, 'process_track')
+        db.session.commit()
+        empty = run_job(empty.id)
+        assert empty.status == 'Failed' and 'No GPS points' in empty.error, empty.error
+        # Still listed with points but no levels, yet not queued again on every poll
+        jobs_before = ProcessingJob.query.filter_by(trip_id=trip.id).count()
+        enqueue_unprocessed_trips()
+        assert ProcessingJob.query.filter_by(trip_id=trip.id).count() == jobs_before
+        print("   ✓ Trip without points failed once, not requeued by the scan")
+
+        orphan = enqueue_job(trip, 'process_track')
+        db.session.commit()
+        orphan_id = orphan.id
+        ProcessingJob.query.filter(ProcessingJob.trip_id == trip.id, ProcessingJob.id != orphan_id).delete()
+        # Bulk delete, as if the trip vanished while the job sat in the queue
+        Trip.query.filter_by(id=trip.id).delete()
+        db.session.commit()
+        orphan = run_job(orphan_id)
+        assert orphan.status == 'Failed' and 'Trip not found' in orphan.error
+        print("   ✓ Orphaned job marked Failed without retry")
+
+        # Clean up
+        db.session.delete(orphan)
+        db.session.delete(boat)
+        db.session.commit()
+
+    print("\n=== All Job Queue Tests Passed! ===")
+
+if __name__ == "__main__":
+    test_job_queue()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Test script for paginated, filterable list endpoints
+"""
+
+from datetime import date, timedelta
+from app import app
+from models import db, User, Boat, MaintenanceRecord
+from flask import json
+from test_query_counts import count_statements
+
+def test_list_endpoints():
+    """Test keyset pagination, filters and sparse fields"""
+
+    print("=== List Endpoint Tests ===\n")
+
+    with app.test_client() as client:
+        with app.app_context():
+            db.create_all()
+
+            user = User.query.filter_by(username='list_query_tester').first()
+            if not user:
+                user = User(username='list_query_tester', email='list_query@test.com')
+                user.set_password('list123')
+                db.session.add(user)
+                db.session.commit()
+
+            boats = [Boat(name=f'List Boat {i}', owner_id=user.id, boat_type='Sailboat' if i % 2 else 'Motorboat')
+                     for i in range(5)]
+            db.session.add_all(boats)
+            db.session.commit()
+
+            first_day = date(2025, 1, 1)
+            records = [
+                MaintenanceRecord(
+                    boat_id=boats[i % 5].id, maintenance_type='Routine', title=f'Service {i}',
+                    description='Scheduled work', date_performed=first_day + timedelta(days=i),
+                    status='Planned' if i % 3 == 0 else 'Completed', cost=10 + i, created_by=user.id,
+                    parts_used=json.dumps(['filter'])
+                )
+                for i in range(25)
+            ]
+            db.session.add_all(records)
+            db.session.commit()
+
+            login = client.post('/api/auth/login',
+                                data=json.dumps({'username': 'list_query_tester', 'password': 'list123'}),
+                                content_type='application/json')
+            headers = {'Authorization': f"Bearer {json.loads(login.data)['access_token']}"}
+
+            # Test 1: Without paging parameters the whole list comes back as before
+            print("1. Testing unpaginated list...")
+            data = json.loads(client.get('/api/maintenance', headers=headers).data)
+            assert data['count'] == 25 and data['next_cursor'] is None
+            assert 'total_cost' in data['maintenance_records'][0]
+            print(f"   ✓ {data['count']} records")
+
+            # Test 2: Keyset pages cover every record exactly once
+            print("\n2. Testing keyset pagination...")
+            seen = []
+            cursor = None
+            pages = 0
+            while True:
+                url = '/api/maintenance?limit=10' + (f'&after={cursor}' if cursor else '')
+                data = json.loads(client.get(url, headers=headers).data)
+                seen.extend(record['id'] for record in data['maintenance_records'])
+                pages += 1
+                cursor = data['next_cursor']
+                if cursor is None:
+                    break
+            assert pages == 3 and seen == sorted(record.id for record in records)
+            print(f"   ✓ {len(seen)} records in {pages} pages")
+
+            # Test 3: Filters and date ranges
+            print("\n3. Testing filters...")
+            data = json.loads(client.get('/api/maintenance?status=Planned', headers=headers).data)
+            assert data['count'] == 9
+            data = json.loads(client.get(
+                f'/api/maintenance?boat_id={boats[0].id},{boats[1].id}&date_from=2025-01-03&date_to=2025-01-10',
+                headers=headers).data)
+            days = sorted(record['date_performed'] for record in data['maintenance_records'])
+            assert days == ['2025-01-06', '2025-01-07']
+            # An offset is converted to UTC: 01:00+02:00 is 23:00 the day before
+            data = json.loads(client.get('/api/maintenance?date_to=2025-01-07T01:00:00%2B02:00',
+                                         headers=headers).data)
+            assert max(record['date_performed'] for record in data['maintenance_records']) == '2025-01-06'
+            with count_statements() as statements:
+                data = json.loads(client.get('/api/boats?boat_type=Sailboat', headers=headers).data)
+            assert data['count'] == 2
+            # The summary for the ETag and the page each filter once
+            filtered = [sql for sql in statements if 'boat_type' in sql.split('WHERE', 1)[-1]]
+            assert len(filtered) == 2 and all(sql.count('boats.boat_type =') == 1 for sql in filtered), filtered
+            print("   ✓ Status, boat and date range filters applied")
+
+            # Test 4: Sparse fields
+            print("\n4. Testing fields parameter...")
+            data = json.loads(client.get('/api/maintenance?fields=title,cost,parts_used,date_performed&limit=1',
+                                         headers=headers).data)
+            record = data['maintenance_records'][0]
+            assert set(record) == {'id', 'title', 'cost', 'parts_used', 'date_performed'}
+            assert record['cost'] == 10.0 and record['parts_used'] == ['filter']
+            assert record['date_performed'] == '2025-01-01'
+            print(f"   ✓ Projected record: {record}")
+
+            # Test 5: Bad parameters are rejected
+            print("\n5. Testing invalid parameters...")
+            for query in ('limit=abc', 'limit=0', 'after=x', 'fields=password_hash', 'date_from=yesterday',
+                          'boat_id=abc'):
+                response = client.get(f'/api/maintenance?{query}', headers=headers)
+                assert response.status_code == 400, query
+            print("   ✓ Invalid parameters return 400")
+
+            # Clean up
+            for record in records:
+                db.session.delete(record)
+            for boat in boats:
+                db.session.delete(boat)
+            db.session.commit()
+
+    print("\n=== All List Endpoint Tests Passed! ===")
+
+if __name__ == "__main__":
+    test_list_endpoints()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Test script for the synthetic data generator and load-test mixes
+"""
+
+import os
+import tempfile
+import threading
+from werkzeug.serving import make_server
+from factory import create_app
+from models import db, User, Trip, TripRouteLevel
+from synthetic_data import generate
+from track_math import load_trip_track
+import loadtest
+
+SIZES = dict(users=2, boats_per_user=2, equipment_per_boat=2, records_per_equipment=2,
+             events_per_user=3, trips_per_boat=3, tracks=2, track_points=3000)
+
+def test_load_harness():
+    """Test deterministic generation and a short logbook mix against a live server"""
+
+    print("=== Load Harness Tests ===\n")
+
+    scratch = [tempfile.NamedTemporaryFile(suffix='.db', delete=False) for _ in range(2)]
+    for handle in scratch:
+        handle.close()
+    server = None
+    try:
+        apps = [create_app(API_MODULES='all', SQLALCHEMY_DATABASE_URI=f'sqlite:///{handle.name}') for handle in scratch]
+
+        # Test 1: Every table is filled and tracks have route levels
+        print("1. Testing generation...")
+        snapshots = []
+        for app, storage in zip(apps, ('rows', 'columnar')):
+            with app.app_context():
+                db.create_all()
+                counts = generate('small', seed=7, storage=storage, **SIZES)
+                tracked = Trip.query.filter_by(route_processed=True).order_by(Trip.id).all()
+                track = load_trip_track(tracked[0].id)
+                snapshots.append(([trip.start_date for trip in Trip.query.order_by(Trip.id)],
+                                  round(float(track['latitude'][-1]), 6)))
+                assert TripRouteLevel.query.count() == len(tracked) * len(app.config['ROUTE_SIMPLIFY_TOLERANCES'])
+                assert User.query.filter_by(username='loadtest_1').one().is_admin
+        assert counts == {'users': 2, 'boats': 4, 'equipment': 8, 'maintenance_records': 16, 'events': 6,
+                          'trips': 12, 'tracks': 2, 'gps_points': 6000}, counts
+        print(f"   ✓ {counts}")
+
+        # Test 2: Same seed, same data, whichever track storage
+        print("\n2. Testing determinism...")
+        assert snapshots[0] == snapshots[1]
+        print(f"   ✓ Identical trips and tracks (last latitude {snapshots[0][1]})")
+
+        # Test 3: A mix against a real HTTP server, every request succeeds
+        print("\n3. Testing the logbook mix...")
+        server = make_server('127.0.0.1', 0, apps[0], threaded=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f'http://127.0.0.1:{server.server_port}'
+        sessions = []
+        for n in (1, 2):
+            headers = loadtest.login(url, f'loadtest_{n}', 'loadtest123')
+            sessions.append({'headers': headers, 'ids': loadtest.discover_ids(url, headers)})
+        results, seconds = loadtest.run_load_test(url, loadtest.MIXES['logbook'], sessions, concurrency=2,
+                                                  duration=1.5, warmup=0)
+        summary = loadtest.summarize(results, seconds)
+        assert summary['total']['errors'] == 0 and summary['total']['requests'] > 0, summary
+        assert {'p50_ms', 'p95_ms', 'p99_ms', 'requests_per_second'} <= set(summary['total'])
+        assert set(summary) == {f'{method} {path}' for _, method, path in loadtest.MIXES['logbook']} | {'total'}
+        print(f"   ✓ {summary['total']['requests']} requests, p95 {summary['total']['p95_ms']} ms")
+    finally:
+        if server:
+            server.shutdown()
+        for handle in scratch:
+            for suffix in ('', '-wal', '-shm'):
+                if os.path.exists(handle.name + suffix):
+                    os.unlink(handle.name + suffix)
+
+    print("\n=== All Load Harness Tests Passed! ===")
+
+if __name__ == "__main__":
+    test_load_harness()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Test script for maintenance record access control
+
+Records are visible to the owner of their boat or equipment and to their
+creator, and the check runs in SQL: the statement count must not depend on
+how many boats or equipment the user owns.
+"""
+
+from datetime import date
+from app import app
+from models import db, User, Boat, Equipment, MaintenanceRecord
+from flask import json
+from test_query_counts import count_statements
+
+def get_user(username):
+    user = User.query.filter_by(username=username).first()
+    if not user:
+        user = User(username=username, email=f'{username}@test.com')
+        user.set_password('access123')
+        db.session.add(user)
+        db.session.commit()
+    return user
+
+def test_maintenance_access():
+    """Test ownership scoping for maintenance records"""
+
+    print("=== Maintenance Access Tests ===\n")
+
+    with app.test_client() as client:
+        with app.app_context():
+            db.create_all()
+
+            owner_id = get_user('maintenance_owner').id
+            other_id = get_user('maintenance_other').id
+
+            boat = Boat(name='Access Boat', owner_id=owner_id)
+            other_boat = Boat(name='Other Boat', owner_id=other_id)
+            db.session.add_all([boat, other_boat])
+            db.session.flush()
+            winch = Equipment(name='Access Winch', owner_id=owner_id)
+            db.session.add(winch)
+            db.session.flush()
+
+            def record(title, created_by, boat_id=None, equipment_id=None):
+                return MaintenanceRecord(boat_id=boat_id, equipment_id=equipment_id, maintenance_type='Routine',
+                                         title=title, description='Access test', date_performed=date(2025, 1, 1),
+                                         created_by=created_by)
+
+            on_boat = record('On owner boat', other_id, boat_id=boat.id)
+            on_equipment = record('On owner winch', other_id, equipment_id=winch.id)
+            created = record('Created by owner', owner_id, boat_id=other_boat.id)
+            foreign = record('Someone else', other_id, boat_id=other_boat.id)
+            records = [on_boat, on_equipment, created, foreign]
+            db.session.add_all(records)
+            db.session.commit()
+            record_ids = [item.id for item in records]
+            fleet_ids = [boat.id, other_boat.id]
+            winch_id = winch.id
+            created_id = created.id
+
+            def login(username):
+                response = client.post('/api/auth/login',
+                                       data=json.dumps({'username': username, 'password': 'access123'}),
+                                       content_type='application/json')
+                return {'Authorization': f"Bearer {json.loads(response.data)['access_token']}"}
+
+            owner = login('maintenance_owner')
+
+            try:
+                # Test 1: Each ownership route grants access; others are hidden
+                print("1. Testing list scoping...")
+                data = json.loads(client.get('/api/maintenance', headers=owner).data)
+                titles = {item['title'] for item in data['maintenance_records']}
+                assert {'On owner boat', 'On owner winch', 'Created by owner'} <= titles
+                assert 'Someone else' not in titles
+                print(f"   ✓ {len(titles)} visible records")
+
+                # Test 2: Detail, update and delete use the same scope
+                print("\n2. Testing detail, update and delete...")
+                assert client.get(f'/api/maintenance/{on_equipment.id}', headers=owner).status_code == 200
+                assert client.get(f'/api/maintenance/{foreign.id}', headers=owner).status_code == 404
+                response = client.put(f'/api/maintenance/{foreign.id}', headers=owner,
+                                      data=json.dumps({'title': 'Hijacked'}), content_type='application/json')
+                assert response.status_code == 404
+                assert client.delete(f'/api/maintenance/{foreign.id}', headers=owner).status_code == 404
+                response = client.put(f'/api/maintenance/{on_boat.id}', headers=owner,
+                                      data=json.dumps({'title': 'Updated by owner'}), content_type='application/json')
+                assert response.status_code == 200
+                print("   ✓ Foreign record returns 404, own record updates")
+
+                # Test 3: Statement count doesn't grow with the fleet
+                print("\n3. Testing statement count vs fleet size...")
+
+                def measure():
+                    db.session.expunge_all()
+                    with count_statements() as statements:
+                        response = client.get(f'/api/maintenance/{created_id}', headers=owner)
+                    assert response.status_code == 200
+                    return len(statements)
+
+                small = measure()
+                extra_boats = [Boat(name=f'Fleet Boat {i}', owner_id=owner_id) for i in range(25)]
+                db.session.add_all(extra_boats)
+                db.session.commit()
+                fleet_ids += [extra.id for extra in extra_boats]
+                large = measure()
+                assert large == small, f'{small} statements with 1 boat, {large} with 26'
+                print(f"   ✓ {large} statements with 1 or 26 boats")
+            finally:
+                # Clean up
+                db.session.expunge_all()
+                for model, ids in ((MaintenanceRecord, record_ids), (Equipment, [winch_id]), (Boat, fleet_ids)):
+                    model.query.filter(model.id.in_(ids)).delete()
+                db.session.commit()
+
+    print("\n=== All Maintenance Access Tests Passed! ===")
+
+if __name__ == "__main__":
+    test_maintenance_access()
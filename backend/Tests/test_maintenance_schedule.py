@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Test script for the maintenance scheduler
+
+Record, boat and equipment writes must keep the materialized next due
+occurrence of each recurring task equal to a rebuild, and
+/api/maintenance/due must answer from it in one statement.
+"""
+
+from datetime import date, timedelta
+import maintenance_schedule
+from app import app
+from models import db, User, Boat, Equipment, MaintenanceRecord, MaintenanceSchedule, BoatMonthlyStats
+from flask import json
+from test_query_counts import count_statements
+
+def test_maintenance_schedule():
+    """Test scheduling by days and engine hours, rescheduling, rebuild and the due endpoint"""
+
+    print("=== Maintenance Schedule Tests ===\n")
+
+    today = date.today()
+    rows = []
+    with app.test_client() as client:
+        with app.app_context():
+            db.create_all()
+
+            user = User.query.filter_by(username='schedule_owner').first()
+            if not user:
+                user = User(username='schedule_owner', email='schedule_owner@test.com')
+                user.set_password('schedule123')
+                db.session.add(user)
+                db.session.commit()
+            owner_id = user.id
+
+            def scheduled():
+                db.session.expire_all()
+                return {row.title: row for row in
+                        MaintenanceSchedule.query.filter_by(owner_id=owner_id).order_by(MaintenanceSchedule.due_on)}
+
+            def record(**values):
+                entry = MaintenanceRecord(maintenance_type='Routine', description=values['title'],
+                                          created_by=owner_id, **values)
+                db.session.add(entry)
+                db.session.commit()
+                rows.append((MaintenanceRecord, entry.id))
+                return entry
+
+            try:
+                boat = Boat(name='Schedule Boat', owner_id=owner_id, engine_hours=1000)
+                db.session.add(boat)
+                db.session.commit()
+                rows.append((Boat, boat.id))
+                engine = Equipment(name='Schedule Engine', category='Engine', owner_id=owner_id, boat_id=boat.id)
+                db.session.add(engine)
+                db.session.commit()
+                rows.append((Equipment, engine.id))
+                BoatMonthlyStats.query.filter_by(boat_id=boat.id).delete()
+                db.session.commit()
+
+                # Test 1: An interval in days schedules the next occurrence after the latest record
+                print("1. Testing interval_days tasks...")
+                record(boat_id=boat.id, title='Schedule hull check', date_performed=today - timedelta(days=400),
+                       maintenance_interval_days=365)
+                assert scheduled()['Schedule hull check'].due_on == today - timedelta(days=35)
+                latest = record(boat_id=boat.id, title='Schedule hull check', date_performed=today - timedelta(days=20),
+                                maintenance_interval_days=365)
+                task = scheduled()['Schedule hull check']
+                assert (task.record_id, task.due_on, task.due_by) == (latest.id, today + timedelta(days=345), 'date')
+                assert MaintenanceSchedule.query.filter_by(owner_id=owner_id).count() == 1
+                print(f"   ✓ Latest record schedules the task for {task.due_on}")
+
+                # Test 2: Cancelling or deleting the latest record falls back to the one before
+                print("\n2. Testing cancel and delete...")
+                latest.status = 'Cancelled'
+                db.session.commit()
+                assert scheduled()['Schedule hull check'].due_on == today - timedelta(days=35)
+                earlier = db.session.get(MaintenanceRecord, rows[-2][1])
+                db.session.delete(earlier)
+                db.session.commit()
+                rows.remove((MaintenanceRecord, earlier.id))
+                assert 'Schedule hull check' not in scheduled()
+                print("   ✓ Cancelled and deleted records no longer schedule the task")
+
+                # Test 3: Hour intervals are filled in from the meter and projected from the engine use rate
+                print("\n3. Testing engine hour tasks...")
+                oil = record(equipment_id=engine.id, title='Schedule oil change', date_performed=today,
+                             maintenance_interval_hours=100, next_maintenance_due=today + timedelta(days=180))
+                assert oil.next_maintenance_hours == 1100
+                task = scheduled()['Schedule oil change']
+                assert (task.due_on, task.due_by, task.due_engine_hours) == (today + timedelta(days=180), 'date', 1100)
+                boat.engine_hours = 1090
+                db.session.commit()
+                task = scheduled()['Schedule oil change']
+                # 90 hours this month over at least 30 days: 3 hours a day, 10 hours to go
+                assert (task.due_on, task.due_by) == (today + timedelta(days=4), 'engine_hours'), task.due_on
+                boat.engine_hours = 1105
+                db.session.commit()
+                assert scheduled()['Schedule oil change'].due_on == today
+                print("   ✓ Projected from 3 h/day, then due once the meter passed 1100")
+
+                # Test 4: Rebuild reproduces what the events maintained
+                print("\n4. Testing rebuild...")
+                record(boat_id=boat.id, title='Schedule rigging', date_performed=today - timedelta(days=10),
+                       next_maintenance_due=today + timedelta(days=60))
+                before = {title: (task.record_id, task.due_on, task.due_by) for title, task in scheduled().items()}
+                MaintenanceSchedule.query.filter_by(owner_id=owner_id).delete()
+                db.session.commit()
+                maintenance_schedule.rebuild()
+                db.session.commit()
+                after = {title: (task.record_id, task.due_on, task.due_by) for title, task in scheduled().items()}
+                assert before == after, (before, after)
+                print(f"   ✓ {len(after)} tasks rebuilt unchanged")
+
+                # Test 5: The due endpoint filters by window in one statement
+                print("\n5. Testing /api/maintenance/due...")
+                login = client.post('/api/auth/login',
+                                    data=json.dumps({'username': 'schedule_owner', 'password': 'schedule123'}),
+                                    content_type='application/json')
+                headers = {'Authorization': f"Bearer {json.loads(login.data)['access_token']}"}
+                response = client.get('/api/maintenance/due', headers=headers)
+                assert response.status_code == 200
+                data = json.loads(response.data)
+                assert [item['title'] for item in data['due']] == ['Schedule oil change']
+                item = data['due'][0]
+                assert (item['is_overdue'], item['days_until_due'], item['equipment_name']) == (False, 0,
+                                                                                                'Schedule Engine')
+                data = json.loads(client.get('/api/maintenance/due?within=9w', headers=headers).data)
+                assert [item['title'] for item in data['due']] == ['Schedule oil change', 'Schedule rigging']
+                assert data['until'] == (today + timedelta(weeks=9)).isoformat()
+                assert client.get('/api/maintenance/due?within=soon', headers=headers).status_code == 400
+                with count_statements() as statements:
+                    maintenance_schedule.due_items(maintenance_schedule.due_query(owner_id, today), today)
+                assert len(statements) == 1
+                print(f"   ✓ 30d: 1 task, 9w: {data['count']} tasks, one statement")
+            finally:
+                db.session.rollback()
+                db.session.expunge_all()
+                MaintenanceSchedule.query.filter_by(owner_id=owner_id).delete()
+                for model, row_id in reversed(rows):
+                    model.query.filter_by(id=row_id).delete()
+                BoatMonthlyStats.query.filter(BoatMonthlyStats.boat_id.in_(
+                    [row_id for model, row_id in rows if model is Boat])).delete()
+                db.session.commit()
+
+    print("\n=== All Maintenance Schedule Tests Passed! ===")
+
+if __name__ == "__main__":
+    test_maintenance_schedule()
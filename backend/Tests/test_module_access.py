@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Test script for cached module access resolution
+
+/api/user/modules must resolve in one joined query, be served from the
+cache on repeat calls, and reflect grants, revokes, toggles and module
+updates immediately.
+"""
+
+import module_access
+from app import app
+from models import db, User, SystemModule, UserModulePermission
+from flask import json
+from test_query_counts import count_statements
+
+def get_user(username, is_admin=False):
+    user = User.query.filter_by(username=username).first()
+    if not user:
+        user = User(username=username, email=f'{username}@test.com', is_admin=is_admin)
+        user.set_password('modules123')
+        db.session.add(user)
+        db.session.commit()
+    return user
+
+def test_module_access():
+    """Test module resolution, caching and invalidation"""
+
+    print("=== Module Access Tests ===\n")
+
+    with app.test_client() as client:
+        with app.app_context():
+            db.create_all()
+
+            get_user('module_access_admin', is_admin=True)
+            member_id = get_user('module_access_member').id
+            modules = [
+                SystemModule(name=f'access_module_{i}', display_name=f'Access Module {i}', sort_order=400 - i,
+                             requires_admin=(i == 2))
+                for i in range(3)
+            ]
+            db.session.add_all(modules)
+            db.session.commit()
+            module_ids = [module.id for module in modules]
+
+            def login(username):
+                response = client.post('/api/auth/login',
+                                       data=json.dumps({'username': username, 'password': 'modules123'}),
+                                       content_type='application/json')
+                return {'Authorization': f"Bearer {json.loads(response.data)['access_token']}"}
+
+            admin = login('module_access_admin')
+            member = login('module_access_member')
+
+            def navigation():
+                db.session.expunge_all()
+                with count_statements() as statements:
+                    response = client.get('/api/user/modules', headers=member)
+                names = [module['name'] for module in json.loads(response.data)['modules']
+                         if module['name'].startswith('access_module_')]
+                return names, len(statements)
+
+            try:
+                # Test 1: Grants through the API invalidate the cache
+                print("1. Testing grants...")
+                names, _ = navigation()
+                assert names == []
+                for module_id in module_ids:
+                    response = client.post(f'/api/admin/users/{member_id}/modules', headers=admin,
+                                           data=json.dumps({'module_id': module_id}), content_type='application/json')
+                    assert response.status_code == 201
+                names, statements = navigation()
+                # Admin-only module stays hidden; order follows sort_order
+                assert names == ['access_module_1', 'access_module_0'], names
+                print(f"   ✓ {names} in {statements} statements")
+
+                # Test 2: Repeat calls come from the cache
+                print("\n2. Testing cache hit...")
+                cached_names, cached_statements = navigation()
+                assert cached_names == names and cached_statements < statements
+                print(f"   ✓ {cached_statements} statements (user lookup only)")
+
+                # Test 3: Toggle, module update and revoke are visible immediately
+                print("\n3. Testing invalidation...")
+                client.put(f'/api/user/modules/{module_ids[0]}/toggle', headers=member)
+                data = json.loads(client.get('/api/user/modules', headers=member).data)
+                assert next(m for m in data['modules'] if m['id'] == module_ids[0])['is_enabled'] is False
+
+                client.put(f'/api/admin/modules/{module_ids[1]}', headers=admin,
+                           data=json.dumps({'is_active': False}), content_type='application/json')
+                assert navigation()[0] == ['access_module_0']
+
+                client.delete(f'/api/admin/users/{member_id}/modules/{module_ids[0]}', headers=admin)
+                assert navigation()[0] == []
+                print("   ✓ Toggle, module update and revoke reflected")
+
+                # Test 4: Admin view shows every module with grant status
+                print("\n4. Testing admin permission view...")
+                data = json.loads(client.get(f'/api/admin/users/{member_id}/modules', headers=admin).data)
+                status = {m['id']: m['has_permission'] for m in data['modules'] if m['id'] in module_ids}
+                assert status == {module_ids[0]: False, module_ids[1]: True, module_ids[2]: True}
+                print(f"   ✓ {len(data['modules'])} modules listed")
+            finally:
+                # Clean up
+                db.session.expunge_all()
+                UserModulePermission.query.filter(UserModulePermission.module_id.in_(module_ids)).delete()
+                SystemModule.query.filter(SystemModule.id.in_(module_ids)).delete()
+                db.session.commit()
+                module_access.invalidate()
+
+    print("\n=== All Module Access Tests Passed! ===")
+
+if __name__ == "__main__":
+    test_module_access()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Test script for batched user preference updates
+"""
+
+import threading
+import preferences
+from app import app
+from models import db, User, UserPreference
+from flask import json
+from test_query_counts import count_statements
+
+def test_preferences():
+    """Test preference upsert, change detection and If-Match versions"""
+
+    print("=== User Preferences Tests ===\n")
+
+    with app.test_client() as client:
+        with app.app_context():
+            db.create_all()
+
+            user = User.query.filter_by(username='preferences_tester').first()
+            if not user:
+                user = User(username='preferences_tester', email='preferences@test.com')
+                user.set_password('prefs123')
+                db.session.add(user)
+                db.session.commit()
+            user_id = user.id
+            UserPreference.query.filter_by(user_id=user_id).delete()
+            db.session.commit()
+
+            login = client.post('/api/auth/login',
+                                data=json.dumps({'username': 'preferences_tester', 'password': 'prefs123'}),
+                                content_type='application/json')
+            headers = {'Authorization': f"Bearer {json.loads(login.data)['access_token']}"}
+
+            def put(prefs, if_match=None):
+                request_headers = dict(headers)
+                if if_match:
+                    request_headers['If-Match'] = f'"{if_match}"'
+                db.session.expunge_all()
+                with count_statements() as statements:
+                    response = client.put('/api/user/preferences', headers=request_headers,
+                                          data=json.dumps(prefs), content_type='application/json')
+                writes = [sql for sql in statements
+                          if sql.startswith(('INSERT', 'UPDATE')) and 'user_preferences' in sql]
+                return response, json.loads(response.data), writes
+
+            try:
+                # Test 1: Many keys are written with one statement
+                print("1. Testing batched insert...")
+                prefs = {f'key_{i}': {'value': i} for i in range(20)}
+                prefs['theme'] = 'dark'
+                response, data, writes = put(prefs)
+                assert response.status_code == 200 and len(writes) == 1, writes
+                assert len(data['changed_keys']) == 21
+                print(f"   ✓ 21 keys in {len(writes)} write statement")
+
+                # Test 2: Mixed insert/update is one upsert; unchanged keys are skipped
+                print("\n2. Testing upsert and change detection...")
+                response, data, writes = put({'theme': 'light', 'key_0': {'value': 0}, 'language': 'en'})
+                assert len(writes) == 1 and sorted(data['changed_keys']) == ['language', 'theme']
+                response, data, writes = put({'theme': 'light'})
+                assert writes == [] and data['changed_keys'] == []
+                stored = json.loads(client.get('/api/user/preferences', headers=headers).data)
+                assert stored['preferences']['theme'] == 'light' and stored['preferences']['key_3'] == {'value': 3}
+                assert stored['count'] == 22
+                print("   ✓ Changed keys upserted, unchanged values not written")
+
+                # Test 3: If-Match versions
+                print("\n3. Testing If-Match...")
+                response = client.get('/api/user/preferences', headers=headers)
+                version = json.loads(response.data)['version']
+                assert response.headers['ETag'] == f'"{version}"'
+
+                response, data, _ = put({'theme': 'dark'}, if_match=version)
+                assert response.status_code == 200 and data['version'] != version
+                new_version = data['version']
+
+                # A second tab still holding the old version is rejected
+                response, data, writes = put({'theme': 'blue'}, if_match=version)
+                assert response.status_code == 412 and data['version'] == new_version and writes == []
+                response, data, _ = put({'theme': 'blue'}, if_match=new_version)
+                assert response.status_code == 200
+                print("   ✓ Stale version returns 412, current version succeeds")
+
+                # Test 4: A write landing between another PUT's version check and its upsert is not overwritten
+                print("\n4. Testing concurrent autosaves...")
+                version = json.loads(client.get('/api/user/preferences', headers=headers).data)['version']
+                preferences.lock_preferences(user_id)
+                preferences.save_preferences(user_id, {'theme': UserPreference.encode_value('green')})
+                result = {}
+
+                def other_tab():
+                    with app.test_client() as other_client:
+                        response = other_client.put('/api/user/preferences', data=json.dumps({'theme': 'red'}),
+                                                    headers={**headers, 'If-Match': f'"{version}"'},
+                                                    content_type='application/json')
+                        result['status'] = response.status_code
+
+                thread = threading.Thread(target=other_tab)
+                thread.start()
+                # Without the lock the other tab would match the old version now and overwrite 'green' later
+                thread.join(0.5)
+                assert thread.is_alive()
+                db.session.commit()
+                thread.join()
+                stored = json.loads(client.get('/api/user/preferences', headers=headers).data)['preferences']
+                assert result['status'] == 412 and stored['theme'] == 'green', (result, stored['theme'])
+                print("   ✓ Second autosave waited for the first and got 412")
+            finally:
+                # Clean up
+                db.session.expunge_all()
+                UserPreference.query.filter_by(user_id=user_id).delete()
+                db.session.commit()
+
+    print("\n=== All User Preferences Tests Passed! ===")
+
+if __name__ == "__main__":
+    test_preferences()
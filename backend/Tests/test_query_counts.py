@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Test script for SQL statement counts on list endpoints
+
+Each list endpoint must issue the same number of statements whether it
+returns a handful of rows or many, i.e. no lazy load per serialized row.
+"""
+
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from sqlalchemy import event
+from app import app
+from models import (
+    db, User, SystemModule, UserModulePermission, Boat, Equipment, MaintenanceRecord, Event, Trip
+)
+from flask import json
+
+@contextmanager
+def count_statements():
+    """Count SQL statements executed on the app's engine inside the block"""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+
+def add_rows(user_id, start, count):
+    """Add rows whose related objects are all distinct, so lazy loads can't hit the identity map"""
+    rows = []
+    for i in range(start, start + count):
+        boat = Boat(name=f'Count Boat {i}', owner_id=user_id)
+        module = SystemModule(name=f'count_module_{i}', display_name=f'Count Module {i}', sort_order=100 + i)
+        db.session.add_all([boat, module])
+        db.session.flush()
+
+        equipment = Equipment(name=f'Count Winch {i}', owner_id=user_id, boat_id=boat.id)
+        db.session.add(equipment)
+        db.session.flush()
+
+        rows.extend([
+            boat, module, equipment,
+            MaintenanceRecord(boat_id=boat.id, equipment_id=equipment.id, maintenance_type='Routine',
+                              title=f'Service {i}', description='Grease', date_performed=date(2025, 1, 1),
+                              created_by=user_id),
+            Trip(name=f'Count Trip {i}', boat_id=boat.id, captain_id=user_id,
+                 start_date=datetime(2025, 6, 1) + timedelta(days=i)),
+            Event(name=f'Count Event {i}', event_type='Race', start_date=datetime(2025, 7, 1),
+                  created_by=user_id, is_public=False),
+            UserModulePermission(user_id=user_id, module_id=module.id),
+        ])
+    db.session.add_all(rows)
+    db.session.commit()
+    return [(type(row), row.id) for row in rows]
+
+def test_list_statement_counts():
+    """Test statement counts stay constant as rows are added"""
+
+    print("=== SQL Statement Count Tests ===\n")
+
+    endpoints = ['/api/boats', '/api/trips', '/api/equipment', '/api/maintenance', '/api/events', '/api/user/modules']
+
+    with app.test_client() as client:
+        with app.app_context():
+            db.create_all()
+
+            user = User.query.filter_by(username='query_count_tester').first()
+            if not user:
+                user = User(username='query_count_tester', email='query_count@test.com')
+                user.set_password('count123')
+                db.session.add(user)
+                db.session.commit()
+            user_id = user.id
+
+            login = client.post('/api/auth/login',
+                                data=json.dumps({'username': 'query_count_tester', 'password': 'count123'}),
+                                content_type='application/json')
+            headers = {'Authorization': f"Bearer {json.loads(login.data)['access_token']}"}
+
+            def measure(url):
+                # Start each request with an empty identity map, as a real request would
+                db.session.expunge_all()
+                with count_statements() as statements:
+                    response = client.get(url, headers=headers)
+                assert response.status_code == 200, url
+                return len(statements)
+
+            rows = add_rows(user_id, 0, 3)
+            small = {url: measure(url) for url in endpoints}
+
+            # Test 1: Statement counts don't grow with the number of rows
+            print("1. Testing statement counts with 3 vs 12 rows...")
+            rows += add_rows(user_id, 3, 9)
+            for url in endpoints:
+                large = measure(url)
+                assert large == small[url], f'{url}: {small[url]} statements for 3 rows, {large} for 12'
+                print(f"   ✓ {url}: {large} statements")
+
+            # Test 2: The harness catches N+1 loads when eager loading is missing
+            print("\n2. Testing harness detects lazy loads...")
+            declared = MaintenanceRecord.serializer_relationships
+            try:
+                MaintenanceRecord.serializer_relationships = ()
+                lazy = measure('/api/maintenance')
+            finally:
+                MaintenanceRecord.serializer_relationships = declared
+            assert lazy > small['/api/maintenance'] + 12
+            print(f"   ✓ Without eager loading: {lazy} statements")
+
+            # Clean up (dependent rows first)
+            db.session.expunge_all()
+            for model, row_id in reversed(rows):
+                model.query.filter_by(id=row_id).delete()
+            db.session.commit()
+
+    print("\n=== All SQL Statement Count Tests Passed! ===")
+
+if __name__ == "__main__":
+    test_list_statement_counts()
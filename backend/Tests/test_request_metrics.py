@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Test script for request timing, Server-Timing headers and Prometheus metrics
+"""
+
+import os
+import re
+import shutil
+import tempfile
+import request_metrics
+from app import app
+from factory import create_app
+from models import db, User
+from flask import json
+
+def test_request_metrics():
+    """Test Server-Timing headers, the metrics endpoint and merging worker files"""
+
+    print("=== Request Metrics Tests ===\n")
+
+    with app.test_client() as client:
+        with app.app_context():
+            admin = User.query.filter_by(username='metrics_admin').first()
+            if not admin:
+                admin = User(username='metrics_admin', email='metrics_admin@test.com', is_admin=True)
+                admin.set_password('metrics123')
+                db.session.add(admin)
+                db.session.commit()
+            db.session.remove()
+
+        login = client.post('/api/auth/login', data=json.dumps({'username': 'metrics_admin', 'password': 'metrics123'}),
+                            content_type='application/json')
+        headers = {'Authorization': f"Bearer {json.loads(login.data)['access_token']}"}
+
+        # Test 1: Responses say where their time went only when asked to
+        print("1. Testing Server-Timing header...")
+        assert 'Server-Timing' not in client.get('/api/boats', headers=headers).headers
+        app.config['METRICS_SERVER_TIMING'] = True
+        try:
+            response = client.get('/api/boats', headers=headers)
+        finally:
+            app.config['METRICS_SERVER_TIMING'] = False
+        timing = response.headers['Server-Timing']
+        match = re.fullmatch(r'app;dur=([\d.]+), db;dur=([\d.]+);desc="(\d+) statements, (\d+) rows"', timing)
+        assert match, timing
+        total, db_time, statements, rows = float(match[1]), float(match[2]), int(match[3]), int(match[4])
+        assert statements >= 1 and rows >= 1 and db_time <= total
+        print(f"   ✓ {timing}")
+
+        # Test 2: Prometheus histograms per route template, admin only
+        print("\n2. Testing metrics endpoint...")
+        client.get('/api/boats/999999', headers=headers)
+        client.get('/api/no-such-route')
+        response = client.get('/api/admin/metrics', headers=headers)
+        assert response.status_code == 200 and response.mimetype == 'text/plain'
+        text = response.get_data(as_text=True)
+        assert '# TYPE http_request_duration_seconds histogram' in text
+        labels = 'method="GET",endpoint="/api/boats",status="200"'
+        assert f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}}' in text
+        assert 'endpoint="/api/boats/<int:boat_id>",status="404"' in text
+        assert 'endpoint="<unmatched>"' in text
+        count = int(re.search(rf'http_request_duration_seconds_count{{{re.escape(labels)}}} (\d+)', text)[1])
+        assert count >= 1
+        assert client.get('/api/admin/metrics').status_code == 401
+        print(f"   ✓ {len(text.splitlines())} lines, /api/boats counted {count} time(s)")
+
+    # Test 3: Switched off, no header and no listeners
+    print("\n3. Testing METRICS_ENABLED=False...")
+    quiet_app = create_app(modules=[], METRICS_ENABLED=False)
+    with quiet_app.test_client() as client:
+        assert 'Server-Timing' not in client.get('/api/health').headers
+    print("   ✓ No Server-Timing header")
+
+    # Test 4: Worker files are summed, exited workers are archived
+    print("\n4. Testing multi-worker aggregation...")
+    directory = tempfile.mkdtemp()
+    try:
+        dead_pid = 2 ** 22 + 1  # above the default pid_max, so never a live process
+        series = request_metrics._new_series()
+        series.update(requests=3, seconds=0.3)
+        series['buckets'][0] = 3
+        request_metrics.write_json(os.path.join(directory, f'{dead_pid}.json'),
+                                    [['GET', '/api/boats', '200', series]])
+        merged = request_metrics.collect(directory)
+        own = request_metrics.merge_snapshots([request_metrics.registry.snapshot()])
+        boats = ('GET', '/api/boats', '200')
+        assert merged[boats]['requests'] == own.get(boats, {'requests': 0})['requests'] + 3
+        assert not os.path.exists(os.path.join(directory, f'{dead_pid}.json'))
+        assert os.path.exists(os.path.join(directory, request_metrics.ARCHIVE_FILE))
+        assert request_metrics.collect(directory)[boats]['requests'] == merged[boats]['requests']
+    finally:
+        shutil.rmtree(directory)
+    print("   ✓ Exited worker's counts kept in archive.json")
+
+    print("\n=== All Request Metrics Tests Passed! ===")
+
+if __name__ == "__main__":
+    test_request_metrics()
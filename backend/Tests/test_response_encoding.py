@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Test script for the JSON provider and response compression
+"""
+
+import gzip
+from datetime import date, datetime
+from decimal import Decimal
+import compression
+from app import app
+from config import Config
+from models import db, User, Boat, MaintenanceRecord
+from flask import Flask, json, jsonify
+from json_provider import OrjsonProvider, StdlibJSONProvider, orjson
+
+def test_response_encoding():
+    """Test native type encoding, provider parity and gzip responses"""
+
+    print("=== Response Encoding Tests ===\n")
+
+    # Test 1: Both providers write dates as ISO 8601 and Decimals as floats
+    print("1. Testing JSON providers...")
+    payload = {'when': datetime(2025, 6, 1, 14, 30, 5, 120000), 'day': date(2025, 6, 1),
+               'cost': Decimal('12.50'), 'items': [1, 'two', None]}
+    providers = [StdlibJSONProvider(app)] + ([OrjsonProvider(app)] if orjson else [])
+    decoded = []
+    for provider in providers:
+        with app.app_context():
+            decoded.append(json.loads(provider.response(payload).get_data()))
+    for data in decoded:
+        assert data == {'when': '2025-06-01T14:30:05.120000', 'day': '2025-06-01', 'cost': 12.5,
+                        'items': [1, 'two', None]}, data
+    if orjson:
+        assert isinstance(app.json, OrjsonProvider)
+    print(f"   ✓ {len(providers)} provider(s) agree: {decoded[0]['when']}, {decoded[0]['cost']}")
+
+    with app.test_client() as client:
+        with app.app_context():
+            db.create_all()
+
+            user = User.query.filter_by(username='encoding_tester').first()
+            if not user:
+                user = User(username='encoding_tester', email='encoding@test.com')
+                user.set_password('encoding123')
+                db.session.add(user)
+                db.session.commit()
+            boat = Boat(name='Encoding Boat', owner_id=user.id)
+            db.session.add(boat)
+            db.session.flush()
+            records = [MaintenanceRecord(boat_id=boat.id, maintenance_type='Routine', title=f'Service {i}',
+                                         description='Compression test', date_performed=date(2025, 1, 1),
+                                         cost=Decimal('10.00'), created_by=user.id)
+                       for i in range(30)]
+            db.session.add_all(records)
+            db.session.commit()
+
+            login = client.post('/api/auth/login',
+                                data=json.dumps({'username': 'encoding_tester', 'password': 'encoding123'}),
+                                content_type='application/json')
+            headers = {'Authorization': f"Bearer {json.loads(login.data)['access_token']}"}
+
+            try:
+                # Test 2: Large JSON is gzipped for clients that accept it
+                print("\n2. Testing gzip compression...")
+                plain = client.get('/api/maintenance', headers=headers)
+                compressed = client.get('/api/maintenance', headers={**headers, 'Accept-Encoding': 'gzip, deflate'})
+                assert 'Content-Encoding' not in plain.headers
+                assert compressed.headers['Content-Encoding'] == 'gzip'
+                assert 'Accept-Encoding' in compressed.headers['Vary']
+                assert gzip.decompress(compressed.data) == plain.data
+                assert compressed.headers['ETag'] == plain.headers['ETag']
+                assert int(compressed.headers['Content-Length']) == len(compressed.data) < len(plain.data)
+                print(f"   ✓ {len(plain.data)} bytes -> {len(compressed.data)} bytes")
+
+                # Test 3: Small bodies and 304s are left alone
+                print("\n3. Testing threshold and 304...")
+                small = client.get('/api/health', headers={'Accept-Encoding': 'gzip'})
+                assert 'Content-Encoding' not in small.headers
+                not_modified = client.get('/api/maintenance', headers={
+                    **headers, 'Accept-Encoding': 'gzip', 'If-None-Match': plain.headers['ETag']})
+                assert not_modified.status_code == 304 and 'Content-Encoding' not in not_modified.headers
+                print("   ✓ Small and 304 responses sent uncompressed")
+            finally:
+                # Clean up
+                for record in records:
+                    db.session.delete(record)
+                db.session.delete(boat)
+                db.session.commit()
+
+    # Test 4: Strong ETags become weak once compressed
+    print("\n4. Testing strong ETag downgrade...")
+    strong_app = Flask(__name__)
+    strong_app.config.from_object(Config)
+    compression.init_app(strong_app)
+
+    @strong_app.route('/strong-etag')
+    def strong_etag():
+        response = jsonify({'padding': 'x' * 4096})
+        response.set_etag('abc')
+        return response
+
+    response = strong_app.test_client().get('/strong-etag', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip' and response.headers['ETag'] == 'W/"abc"'
+    print("   ✓ ETag downgraded to weak")
+
+    print("\n=== All Response Encoding Tests Passed! ===")
+
+if __name__ == "__main__":
+    test_response_encoding()
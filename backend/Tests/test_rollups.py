@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Test script for the monthly statistics rollups
+
+Trip, maintenance, GPS track and hour meter writes must keep the per-user
+and per-boat monthly rows equal to a recompute, rebuild() must repair
+drift, and /api/dashboard/stats must read the rollups.
+"""
+
+from datetime import date, datetime, timedelta
+import rollups
+from app import app
+from models import db, User, Boat, MaintenanceRecord, Trip, GPSRoutePoint, UserMonthlyStats, BoatMonthlyStats
+from flask import json
+from track_math import process_trip_track
+
+def stats(model, column, owner_id, month):
+    row = model.query.filter(column == owner_id, model.month == month).first()
+    return row.figures() if row else None
+
+def test_rollups():
+    """Test incremental maintenance, rebuild and the stats endpoint"""
+
+    print("=== Statistics Rollup Tests ===\n")
+
+    june, july = date(2025, 6, 1), date(2025, 7, 1)
+    this_month = rollups.month_of(date.today())
+    rows = []
+    with app.test_client() as client:
+        with app.app_context():
+            db.create_all()
+
+            users = []
+            for name in ('rollup_captain', 'rollup_crew'):
+                user = User.query.filter_by(username=name).first()
+                if not user:
+                    user = User(username=name, email=f'{name}@test.com')
+                    user.set_password('rollup123')
+                    db.session.add(user)
+                    db.session.commit()
+                users.append(user.id)
+            captain_id, crew_id = users
+
+            def user_stats(user_id, month):
+                db.session.expire_all()
+                return stats(UserMonthlyStats, UserMonthlyStats.user_id, user_id, month)
+
+            def boat_stats(boat_id, month):
+                db.session.expire_all()
+                return stats(BoatMonthlyStats, BoatMonthlyStats.boat_id, boat_id, month)
+
+            def own_drift():
+                return [entry for entry in rollups.check()
+                        if (entry[0][0] == 'user' and entry[0][1] in users)
+                        or (entry[0][0] == 'boat' and entry[0][1] in boat_ids)]
+
+            try:
+                boats = [Boat(name=f'Rollup Boat {i}', owner_id=captain_id) for i in range(2)]
+                db.session.add_all(boats)
+                db.session.commit()
+                boat_ids = [boat.id for boat in boats]
+                rows += [(Boat, boat_id) for boat_id in boat_ids]
+                for model in (UserMonthlyStats, BoatMonthlyStats):
+                    column = model.user_id if model is UserMonthlyStats else model.boat_id
+                    model.query.filter(column.in_(users if model is UserMonthlyStats else boat_ids)).delete()
+                db.session.commit()
+
+                # Test 1: Inserting trips adds them to the captain's and boat's month
+                print("1. Testing trip inserts...")
+                trips = [
+                    Trip(name='Rollup Trip 1', boat_id=boat_ids[0], captain_id=captain_id,
+                         start_date=datetime(2025, 6, 3, 9), end_date=datetime(2025, 6, 3, 13), distance_miles=20),
+                    Trip(name='Rollup Trip 2', boat_id=boat_ids[0], captain_id=captain_id,
+                         start_date=datetime(2025, 6, 20, 9), actual_duration_hours=2.5, distance_miles=8.4),
+                ]
+                db.session.add_all(trips)
+                db.session.commit()
+                trip_ids = [trip.id for trip in trips]
+                rows += [(Trip, trip_id) for trip_id in trip_ids]
+                figures = user_stats(captain_id, june)
+                assert (figures['trips'], figures['distance_miles'], figures['hours_under_way']) == (2, 28.4, 6.5)
+                assert boat_stats(boat_ids[0], june)['trips'] == 2
+                print(f"   ✓ June: {figures}")
+
+                # Test 2: Updates move figures between months, boats and captains, even on expired objects
+                print("\n2. Testing trip updates and deletes...")
+                trip = db.session.get(Trip, trip_ids[1])
+                trip.start_date = datetime(2025, 7, 2, 9)
+                trip.boat_id = boat_ids[1]
+                trip.captain_id = crew_id
+                db.session.commit()
+                trip.distance_miles = 10
+                db.session.commit()
+                assert user_stats(captain_id, june)['trips'] == 1
+                assert user_stats(crew_id, july)['distance_miles'] == 10
+                assert boat_stats(boat_ids[1], july)['hours_under_way'] == 2.5
+                trip.status = 'Cancelled'
+                db.session.commit()
+                assert user_stats(crew_id, july)['trips'] == 0
+                db.session.delete(db.session.get(Trip, trip_ids[0]))
+                db.session.commit()
+                rows.remove((Trip, trip_ids[0]))
+                assert user_stats(captain_id, june)['trips'] == 0
+                assert not own_drift()
+                print("   ✓ Month, boat, captain, status and delete changes match a recompute")
+
+                # Test 3: Maintenance spend follows cost changes and cancellations
+                print("\n3. Testing maintenance records...")
+                records = [
+                    MaintenanceRecord(boat_id=boat_ids[0], maintenance_type='Routine', title='Rollup oil',
+                                      description='Oil', date_performed=date(2025, 6, 10), cost=80.25,
+                                      created_by=captain_id),
+                    MaintenanceRecord(boat_id=boat_ids[0], maintenance_type='Repair', title='Rollup pump',
+                                      description='Pump', date_performed=date(2025, 6, 12), cost=19.75,
+                                      created_by=captain_id),
+                ]
+                db.session.add_all(records)
+                db.session.commit()
+                rows += [(MaintenanceRecord, record.id) for record in records]
+                assert boat_stats(boat_ids[0], june)['maintenance_cost'] == 100.0
+                records[0].cost = 100
+                records[1].status = 'Cancelled'
+                db.session.commit()
+                figures = user_stats(captain_id, june)
+                assert (figures['maintenance_count'], figures['maintenance_cost']) == (1, 100.0), figures
+                print(f"   ✓ June spend {figures['maintenance_cost']} over {figures['maintenance_count']} record")
+
+                # Test 4: Processing a GPS track fills in the mileage of a trip without a logged distance
+                print("\n4. Testing the GPS track path...")
+                tracked = Trip(name='Rollup Tracked', boat_id=boat_ids[1], captain_id=captain_id,
+                               start_date=datetime(2025, 7, 5, 10))
+                db.session.add(tracked)
+                db.session.commit()
+                rows.append((Trip, tracked.id))
+                db.session.add_all([GPSRoutePoint(trip_id=tracked.id, latitude=54.3 + i * 0.01, longitude=10.15,
+                                                  timestamp=datetime(2025, 7, 5, 10) + timedelta(minutes=i))
+                                    for i in range(4)])
+                db.session.commit()
+                process_trip_track(tracked)
+                db.session.commit()
+                assert round(tracked.distance_calculated, 1) == 1.8
+                assert user_stats(captain_id, july)['distance_miles'] == 1.8
+                print(f"   ✓ Track distance {tracked.distance_calculated} nm counted for July")
+
+                # Test 5: Hour meter increases count as engine hours this month
+                print("\n5. Testing engine hours...")
+                boat = db.session.get(Boat, boat_ids[0])
+                boat.engine_hours = 1200
+                db.session.commit()
+                assert boat_stats(boat_ids[0], this_month) is None
+                boat.engine_hours = 1212.5
+                db.session.commit()
+                assert boat_stats(boat_ids[0], this_month)['engine_hours'] == 12.5
+                assert user_stats(captain_id, this_month)['engine_hours'] == 12.5
+                print("   ✓ First reading ignored, then 12.5 hours recorded")
+
+                # Test 6: Rebuild repairs drift from writes that bypass the ORM, keeping engine hours
+                print("\n6. Testing check and rebuild...")
+                Trip.query.filter_by(id=tracked.id).update({'distance_miles': 30})
+                db.session.commit()
+                assert own_drift()
+                rollups.rebuild()
+                db.session.commit()
+                assert not own_drift()
+                assert user_stats(captain_id, july)['distance_miles'] == 30
+                assert boat_stats(boat_ids[0], this_month)['engine_hours'] == 12.5
+                print("   ✓ Drift found and repaired")
+
+                # Test 7: The stats endpoint reads the rollups
+                print("\n7. Testing /api/dashboard/stats...")
+                login = client.post('/api/auth/login',
+                                    data=json.dumps({'username': 'rollup_captain', 'password': 'rollup123'}),
+                                    content_type='application/json')
+                headers = {'Authorization': f"Bearer {json.loads(login.data)['access_token']}"}
+                response = client.get('/api/dashboard/stats?from=2025-06&to=2025-07', headers=headers)
+                assert response.status_code == 200
+                data = json.loads(response.data)
+                assert [month['month'] for month in data['months']] == ['2025-06', '2025-07']
+                assert data['totals']['distance_miles'] == 30 and data['totals']['maintenance_cost'] == 100.0
+                assert [boat['boat_name'] for boat in data['boats']] == ['Rollup Boat 1', 'Rollup Boat 0']
+                assert data['boats'][0]['distance_miles'] == 30
+                assert client.get('/api/dashboard/stats?from=June', headers=headers).status_code == 400
+                assert client.get('/api/dashboard/stats?from=2025-08&to=2025-07', headers=headers).status_code == 400
+                print(f"   ✓ Totals {data['totals']}")
+
+                # Test 8: Numbers sent as JSON strings are counted as numbers
+                print("\n8. Testing numeric strings from the update routes...")
+                response = client.put(f'/api/boats/{boat_ids[0]}', headers=headers, content_type='application/json',
+                                      data=json.dumps({'engine_hours': '1225'}))
+                assert response.status_code == 200, response.data
+                response = client.put(f'/api/trips/{tracked.id}', headers=headers, content_type='application/json',
+                                      data=json.dumps({'distance_miles': '12.5', 'actual_duration_hours': '3'}))
+                assert response.status_code == 200, response.data
+                assert boat_stats(boat_ids[0], this_month)['engine_hours'] == 25
+                figures = user_stats(captain_id, july)
+                assert (figures['distance_miles'], figures['hours_under_way']) == (12.5, 3), figures
+                assert not own_drift()
+                print("   ✓ \"1225\" engine hours and \"12.5\" miles recorded")
+            finally:
+                db.session.rollback()
+                db.session.expunge_all()
+                GPSRoutePoint.query.filter(GPSRoutePoint.trip_id.in_(
+                    [row_id for model, row_id in rows if model is Trip])).delete()
+                for model, row_id in reversed(rows):
+                    model.query.filter_by(id=row_id).delete()
+                UserMonthlyStats.query.filter(UserMonthlyStats.user_id.in_(users)).delete()
+                BoatMonthlyStats.query.filter(BoatMonthlyStats.boat_id.in_(
+                    [row_id for model, row_id in rows if model is Boat])).delete()
+                db.session.commit()
+
+    print("\n=== All Statistics Rollup Tests Passed! ===")
+
+if __name__ == "__main__":
+    test_rollups()
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Test script for the production server settings
+"""
+
+import argparse
+from app import app
+from models import db
+from serve import ProductionServer, default_web_workers, gunicorn_options, post_fork
+
+def test_serve():
+    """Test gunicorn option defaults, overrides and the post-fork hook"""
+
+    print("=== Production Server Tests ===\n")
+
+    defaults = argparse.Namespace(bind=None, workers=None, threads=None, no_preload=False,
+                                  pidfile=None, access_log=False)
+
+    # Test 1: Defaults come from config.py
+    print("1. Testing default options...")
+    options = gunicorn_options(defaults)
+    assert options['worker_class'] == 'gthread'
+    assert options['workers'] == default_web_workers() and 2 <= options['workers'] <= 4
+    assert options['preload_app'] is True and options['keepalive'] > 0
+    assert options['max_requests_jitter'] == options['max_requests'] // 10
+    print(f"   ✓ {options['workers']} gthread workers x {options['threads']} threads, preloaded")
+
+    # Test 2: Command-line arguments win and gunicorn accepts every setting
+    print("\n2. Testing overrides...")
+    overrides = argparse.Namespace(bind='127.0.0.1:8001', workers=3, threads=8, no_preload=True,
+                                   pidfile='/tmp/test-serve.pid', access_log=True)
+    options = gunicorn_options(overrides)
+    server = ProductionServer(options)
+    assert server.cfg.bind == ['127.0.0.1:8001'] and server.cfg.workers == 3 and server.cfg.threads == 8
+    assert server.cfg.preload_app is False and server.cfg.accesslog == '-'
+    assert server.load() is app
+    print("   ✓ Overrides applied to gunicorn config")
+
+    # Test 3: Forked workers don't reuse the master's connections
+    print("\n3. Testing post-fork engine reset...")
+    with app.app_context():
+        db.session.execute(db.text('SELECT 1'))
+        db.session.remove()
+        pool = db.engine.pool
+        assert pool.checkedin() >= 1
+        post_fork(None, None)
+        assert db.engine.pool is not pool
+    print("   ✓ Connection pool replaced after fork")
+
+    print("\n=== All Production Server Tests Passed! ===")
+
+if __name__ == "__main__":
+    test_serve()
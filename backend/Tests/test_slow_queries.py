@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Test script for the slow query log
+"""
+
+import os
+import shutil
+import tempfile
+from datetime import date
+from app import app
+from factory import create_app
+from models import db, User
+from slow_queries import explain_statement, redact_parameters
+from flask import json
+
+def test_slow_queries():
+    """Test parameter redaction, EXPLAIN selection, capture and the admin endpoint"""
+
+    print("=== Slow Query Log Tests ===\n")
+
+    # Test 1: Values that shape plans are kept, user data is not
+    print("1. Testing parameter redaction...")
+    shown, count = redact_parameters(('alice@example.com', 42, None, date(2025, 1, 1), b'\x00\x01'))
+    assert shown == ['<str:17>', 42, None, '<date>', '<bytes:2>'] and count == 5
+    shown, count = redact_parameters(list(range(500)))
+    assert count == 500 and len(shown) == 21 and shown[-1] == '... 480 more'
+    assert redact_parameters({'username_1': 'bob', 'param_1': 3}) == ({'username_1': '<str:3>', 'param_1': 3}, 2)
+    print(f"   ✓ {shown[:3]} ... {shown[-1]}")
+
+    # Test 2: ANALYZE only where re-running the statement is harmless
+    print("\n2. Testing EXPLAIN variants...")
+    assert explain_statement('postgresql', 'SELECT 1', True) == 'EXPLAIN (ANALYZE, BUFFERS) SELECT 1'
+    assert explain_statement('postgresql', 'SELECT 1', False) == 'EXPLAIN SELECT 1'
+    assert explain_statement('postgresql', 'UPDATE boats SET name = %(name)s', True).startswith('EXPLAIN UPDATE')
+    assert explain_statement('sqlite', '\n  select 1', True) == 'EXPLAIN QUERY PLAN \n  select 1'
+    assert explain_statement('sqlite', 'PRAGMA journal_mode', True) is None
+    print("   ✓ ANALYZE for PostgreSQL SELECTs only, no plans for PRAGMA")
+
+    with app.app_context():
+        admin = User.query.filter_by(username='slow_admin').first()
+        if not admin:
+            admin = User(username='slow_admin', email='slow_admin@test.com', is_admin=True)
+            admin.set_password('slow123')
+            db.session.add(admin)
+            db.session.commit()
+        db.session.remove()
+
+    def login(client):
+        response = client.post('/api/auth/login', data=json.dumps({'username': 'slow_admin', 'password': 'slow123'}),
+                               content_type='application/json')
+        return {'Authorization': f"Bearer {json.loads(response.data)['access_token']}"}
+
+    # Test 3: Off by default
+    print("\n3. Testing disabled log...")
+    with app.test_client() as client:
+        data = json.loads(client.get('/api/admin/slow-queries', headers=login(client)).data)
+        assert data == {'enabled': False, 'threshold_ms': 0, 'queries': []}
+        assert client.get('/api/admin/slow-queries').status_code == 401
+    print("   ✓ SLOW_QUERY_MS=0 records nothing")
+
+    # Test 4: With a tiny threshold every statement is logged with route and plan
+    print("\n4. Testing capture...")
+    directory = tempfile.mkdtemp()
+    try:
+        logging_app = create_app(modules=['maintenance'], SLOW_QUERY_MS=0.001, METRICS_DIR=directory)
+        with logging_app.test_client() as client:
+            headers = login(client)
+            assert client.get('/api/maintenance', headers=headers).status_code == 200
+            response = client.get('/api/admin/slow-queries?route=/api/maintenance&limit=5', headers=headers)
+            data = json.loads(response.data)
+        assert data['enabled'] and 1 <= len(data['queries']) <= 5
+        query = data['queries'][0]
+        assert query['route'] == 'GET /api/maintenance' and query['pid'] == os.getpid()
+        assert query['plan'] and all(isinstance(line, str) for line in query['plan']), query
+        login_query = next(entry for entry in logging_app.extensions['slow_queries'].snapshot()
+                           if entry['route'] == 'POST /api/auth/login')
+        assert 'slow_admin' not in json.dumps(login_query['parameters'])
+        assert os.path.exists(os.path.join(directory, f'slow-{os.getpid()}.json'))
+    finally:
+        shutil.rmtree(directory)
+    print(f"   ✓ {query['duration_ms']} ms: {query['plan'][0].strip()}")
+
+    print("\n=== All Slow Query Log Tests Passed! ===")
+
+if __name__ == "__main__":
+    test_slow_queries()
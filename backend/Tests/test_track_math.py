@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Test script for vectorized track math
+"""
+
+import time
+import numpy as np
+from datetime import datetime, timedelta
+from app import app
+from models import db, User, Boat, Trip, GPSRoutePoint
+from track_math import compute_track_metrics, process_trip_track
+
+def test_track_math():
+    """Test vectorized metrics against the per-point model methods"""
+
+    print("=== Track Math Tests ===\n")
+
+    # Test 1: Vectorized results match GPSRoutePoint helpers
+    print("1. Testing vectorized distance and bearing...")
+    start = datetime(2025, 6, 21, 8, 0, 0)
+    coords = [(37.80, -122.40), (37.81, -122.39), (37.81, -122.39), (37.83, -122.42)]
+    points = [
+        GPSRoutePoint(latitude=lat, longitude=lon, timestamp=start + timedelta(minutes=i))
+        for i, (lat, lon) in enumerate(coords)
+    ]
+    metrics = compute_track_metrics(
+        [lat for lat, _ in coords],
+        [lon for _, lon in coords],
+        np.array([p.timestamp for p in points], dtype='datetime64[us]')
+    )
+    for i in range(1, len(points)):
+        expected_distance = points[i - 1].distance_to_point(points[i])
+        assert abs(metrics['distance_from_previous'][i] - expected_distance) < 1e-9
+        if expected_distance:
+            expected_bearing = points[i - 1].bearing_to_point(points[i])
+            assert abs(metrics['course_over_ground'][i] - expected_bearing) < 1e-9
+            assert abs(metrics['speed_over_ground'][i] - expected_distance * 60) < 1e-9
+    assert metrics['distance_from_previous'][0] == 0
+    assert np.isnan(metrics['course_over_ground'][2])
+    assert abs(metrics['cumulative_distance'][-1] - sum(metrics['distance_from_previous'])) < 1e-9
+    print(f"   ✓ Track length: {metrics['cumulative_distance'][-1]:.3f} nm")
+
+    # Test 2: 100k point track computes in one pass
+    print("\n2. Testing 100k point track...")
+    count = 100000
+    latitudes = 37.8 + np.cumsum(np.full(count, 0.00001))
+    longitudes = -122.4 + np.cumsum(np.full(count, 0.00001))
+    timestamps = np.datetime64('2025-06-21T08:00:00') + np.arange(count).astype('timedelta64[s]')
+    started = time.perf_counter()
+    metrics = compute_track_metrics(latitudes, longitudes, timestamps)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    assert metrics['speed_over_ground'].shape == (count,)
+    print(f"   ✓ Computed {count} points in {elapsed_ms:.1f} ms")
+
+    # Test 3: Processing a stored trip fills per-point and trip columns
+    print("\n3. Testing process_trip_track...")
+    with app.app_context():
+        db.create_all()
+
+        user = User.query.filter_by(username='track_math_tester').first()
+        if not user:
+            user = User(username='track_math_tester', email='track_math@test.com')
+            user.set_password('track123')
+            db.session.add(user)
+            db.session.commit()
+
+        boat = Boat(name='Math Tester', owner_id=user.id)
+        db.session.add(boat)
+        db.session.commit()
+
+        trip = Trip(name='Bay Loop', boat_id=boat.id, captain_id=user.id, start_date=start)
+        db.session.add(trip)
+        db.session.commit()
+
+        # Insert out of order to check points are processed by timestamp
+        for i, (lat, lon) in reversed(list(enumerate(coords))):
+            db.session.add(GPSRoutePoint(trip_id=trip.id, latitude=lat, longitude=lon,
+                                         timestamp=start + timedelta(minutes=i)))
+        db.session.commit()
+
+        processed = process_trip_track(trip)
+        db.session.commit()
+
+        stored = GPSRoutePoint.query.filter_by(trip_id=trip.id).order_by(GPSRoutePoint.timestamp).all()
+        assert processed == len(coords)
+        assert trip.route_processed and trip.total_route_points == len(coords)
+        assert stored[0].distance_from_previous == 0 and stored[0].speed_over_ground is None
+        assert abs(stored[-1].cumulative_distance - trip.distance_calculated) < 1e-3
+        assert abs(stored[1].course_over_ground - stored[0].bearing_to_point(stored[1])) < 1e-6
+        print(f"   ✓ Trip distance calculated: {trip.distance_calculated} nm")
+
+        # Clean up
+        GPSRoutePoint.query.filter_by(trip_id=trip.id).delete()
+        db.session.delete(trip)
+        db.session.delete(boat)
+        db.session.commit()
+
+    print("\n=== All Track Math Tests Passed! ===")
+
+if __name__ == "__main__":
+    test_track_math()
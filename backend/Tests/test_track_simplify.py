@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Test script for multi-resolution track simplification
+"""
+
+import json
+import time
+import numpy as np
+from datetime import datetime, timedelta
+from sqlalchemy import insert
+from app import app
+from models import db, User, Boat, Trip, GPSRoutePoint, TripRouteLevel
+from track_simplify import build_route_levels, closest_route_level, project_to_meters, simplify_track
+
+def _race_track(count):
+    """A wandering 100 nm course with GPS jitter"""
+    t = np.linspace(0, 1, count)
+    latitudes = 37.8 + 0.8 * t + 0.05 * np.sin(t * 40) + np.random.default_rng(1).normal(0, 0.00001, count)
+    longitudes = -122.4 + 0.6 * np.sin(t * 3) + np.random.default_rng(2).normal(0, 0.00001, count)
+    return latitudes, longitudes
+
+def test_track_simplify():
+    """Test simplification algorithms, stored levels and the route endpoint"""
+
+    print("=== Track Simplification Tests ===\n")
+
+    # Test 1: Straight lines collapse to their end points, corners survive
+    print("1. Testing simple shapes...")
+    latitudes = np.array([0.0, 0.0, 0.0, 0.001, 0.002])
+    longitudes = np.array([0.0, 0.001, 0.002, 0.002, 0.002])
+    for algorithm in ('douglas_peucker', 'visvalingam'):
+        kept = simplify_track(latitudes, longitudes, 5, algorithm).tolist()
+        assert kept == [0, 2, 4], (algorithm, kept)
+        assert len(simplify_track(latitudes, longitudes, 0, algorithm)) == 5
+    print("   ✓ Both algorithms keep only the corner")
+
+    # Test 2: A 100k point race reduces to a few hundred vertices within tolerance
+    print("\n2. Testing 100k point race...")
+    latitudes, longitudes = _race_track(100000)
+    started = time.perf_counter()
+    kept = simplify_track(latitudes, longitudes, 50)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    assert kept[0] == 0 and kept[-1] == len(latitudes) - 1
+    assert 20 < len(kept) < 1000
+    # Every dropped point lies within the tolerance of its simplified segment
+    x, y = project_to_meters(latitudes, longitudes)
+    segment = np.clip(np.searchsorted(kept, np.arange(len(x)), side='right') - 1, 0, len(kept) - 2)
+    ax, ay = x[kept[segment]], y[kept[segment]]
+    dx, dy = x[kept[segment + 1]] - ax, y[kept[segment + 1]] - ay
+    t = np.clip(((x - ax) * dx + (y - ay) * dy) / (dx * dx + dy * dy), 0, 1)
+    assert np.max(np.hypot(x - ax - t * dx, y - ay - t * dy)) <= 50 + 1e-6
+    print(f"   ✓ {len(latitudes)} points -> {len(kept)} vertices in {elapsed_ms:.1f} ms")
+
+    # Test 3: Closest level selection
+    print("\n3. Testing level selection...")
+    levels = [TripRouteLevel(tolerance_meters=value) for value in (5, 20, 100, 500)]
+    assert closest_route_level(levels).tolerance_meters == 500
+    assert closest_route_level(levels, 25).tolerance_meters == 20
+    assert closest_route_level(levels, 1).tolerance_meters == 5
+    assert closest_route_level(levels, 10000).tolerance_meters == 500
+    assert closest_route_level([], 10) is None
+    print("   ✓ Requests map to the nearest stored tolerance")
+
+    # Test 4: Levels are stored per trip and served by the route endpoint
+    print("\n4. Testing stored levels and route endpoint...")
+    with app.test_client() as client:
+        with app.app_context():
+            db.create_all()
+
+            user = User.query.filter_by(username='route_level_tester').first()
+            if not user:
+                user = User(username='route_level_tester', email='route_level@test.com')
+                user.set_password('route123')
+                db.session.add(user)
+                db.session.commit()
+
+            boat = Boat(name='Route Tester', owner_id=user.id)
+            db.session.add(boat)
+            db.session.commit()
+
+            start = datetime(2025, 6, 21, 8, 0, 0)
+            trip = Trip(name='Long Race', boat_id=boat.id, captain_id=user.id, start_date=start)
+            db.session.add(trip)
+            db.session.commit()
+
+            count = 20000
+            latitudes, longitudes = _race_track(count)
+            db.session.execute(insert(GPSRoutePoint.__table__), [
+                {'trip_id': trip.id, 'latitude': lat, 'longitude': lon,
+                 'timestamp': start + timedelta(seconds=i), 'point_type': 'track'}
+                for i, (lat, lon) in enumerate(zip(latitudes.tolist(), longitudes.tolist()))
+            ])
+            db.session.commit()
+
+            levels = build_route_levels(trip, tolerances=[100, 5, 20])
+            db.session.commit()
+            counts = [level.point_count for level in levels]
+            assert [level.tolerance_meters for level in levels] == [5, 20, 100]
+            assert counts == sorted(counts, reverse=True) and counts[0] < count
+
+            login = client.post('/api/auth/login',
+                                data=json.dumps({'username': 'route_level_tester', 'password': 'route123'}),
+                                content_type='application/json')
+            headers = {'Authorization': f"Bearer {json.loads(login.data)['access_token']}"}
+
+            response = client.get(f'/api/trips/{trip.id}/route?tolerance=25', headers=headers)
+            assert response.status_code == 200
+            route = json.loads(response.data)['route']
+            assert route['tolerance_meters'] == 20
+            assert len(route['coordinates']) == route['point_count'] == counts[1]
+            assert route['coordinates'][0] == [round(latitudes[0], 6), round(longitudes[0], 6)]
+
+            response = client.get(f'/api/trips/{trip.id}/route', headers=headers)
+            assert json.loads(response.data)['available_tolerances'] == [5, 20, 100]
+            assert json.loads(response.data)['route']['tolerance_meters'] == 100
+
+            assert client.get(f'/api/trips/{trip.id}/route?tolerance=abc', headers=headers).status_code == 400
+            assert client.get(f'/api/trips/{trip.id}/route?tolerance=-1', headers=headers).status_code == 400
+            print(f"   ✓ Level point counts: {counts}")
+
+            # Clean up through the API so route levels go with the trip
+            assert client.delete(f'/api/trips/{trip.id}', headers=headers).status_code == 200
+            assert TripRouteLevel.query.filter_by(trip_id=trip.id).count() == 0
+            db.session.delete(boat)
+            db.session.commit()
+
+    print("\n=== All Track Simplification Tests Passed! ===")
+
+if __name__ == "__main__":
+    test_track_simplify()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Test script for compact columnar GPS track storage
+"""
+
+import io
+import time
+import numpy as np
+from datetime import datetime, timedelta
+from sqlalchemy import func, select
+from app import app
+from models import db, User, Boat, Trip, GPSRoutePoint, TripTrackChunk
+from gps_import import import_track
+from track_math import load_trip_track, process_trip_track
+from track_store import convert_trip_track, decode_chunk, encode_chunk, has_columnar_track, read_trip_track
+
+def build_gpx(point_count):
+    """Build a GPX track with one fix per second and a named waypoint"""
+    start = datetime(2025, 6, 21, 8, 0, 0)
+    lines = [
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        '<gpx version="1.1" creator="test" xmlns="http://www.topografix.com/GPX/1/1">',
+        '<wpt lat="37.800000" lon="-122.400000"><time>2025-06-21T08:00:00Z</time><name>Start</name></wpt>',
+        '<trk><name>Race</name><trkseg>'
+    ]
+    for i in range(point_count):
+        timestamp = (start + timedelta(seconds=i)).strftime('%Y-%m-%dT%H:%M:%SZ')
+        lines.append(
+            f'<trkpt lat="{37.8 + i * 0.00003:.7f}" lon="{-122.4 + np.sin(i / 500) * 0.01:.7f}">'
+            f'<ele>1.5</ele><time>{timestamp}</time><sat>9</sat><hdop>0.9</hdop></trkpt>'
+        )
+    lines.append('</trkseg></trk></gpx>')
+    return '\n'.join(lines).encode('utf-8')
+
+def test_track_store():
+    """Test chunk encoding, columnar import/processing and conversion"""
+
+    print("=== Columnar Track Storage Tests ===\n")
+
+    # Test 1: Chunks round-trip coordinates, time and sparse sensor channels
+    print("1. Testing chunk encode/decode...")
+    start = np.datetime64('2025-06-21T08:00:00', 'us')
+    timestamps = start + np.arange(1000).astype('timedelta64[s]')
+    latitudes = 37.8 + np.cumsum(np.full(1000, 0.0000123))
+    longitudes = -122.4 - np.cumsum(np.full(1000, 0.0000456))
+    depth = np.full(1000, np.nan)
+    depth[::10] = 12.5
+    blob = encode_chunk({
+        'timestamp': timestamps, 'latitude': latitudes, 'longitude': longitudes,
+        'water_depth': depth, 'hdop': np.full(1000, np.nan)
+    }, labels={5: ('waypoint', 'Mark 1')})
+    decoded = decode_chunk(blob)
+    assert np.array_equal(decoded['timestamp'], timestamps)
+    assert np.max(np.abs(decoded['latitude'] - latitudes)) < 1e-7
+    assert np.max(np.abs(decoded['longitude'] - longitudes)) < 1e-7
+    assert np.array_equal(np.isnan(decoded['water_depth']), np.isnan(depth))
+    assert 'hdop' not in decoded
+    assert decoded['labels'] == {5: ('waypoint', 'Mark 1')}
+    assert np.isnan(decode_chunk(blob, channels={'hdop'})['hdop']).all()
+    print(f"   ✓ 1000 points in {len(blob)} bytes ({len(blob) / 1000:.1f} bytes/point)")
+
+    with app.app_context():
+        db.create_all()
+
+        user = User.query.filter_by(username='track_store_tester').first()
+        if not user:
+            user = User(username='track_store_tester', email='track_store@test.com')
+            user.set_password('store123')
+            db.session.add(user)
+            db.session.commit()
+
+        boat = Boat(name='Store Tester', owner_id=user.id)
+        db.session.add(boat)
+        db.session.commit()
+
+        trip_start = datetime(2025, 6, 21, 8, 0, 0)
+        columnar_trip = Trip(name='Columnar Race', boat_id=boat.id, captain_id=user.id, start_date=trip_start)
+        row_trip = Trip(name='Row Race', boat_id=boat.id, captain_id=user.id, start_date=trip_start)
+        db.session.add_all([columnar_trip, row_trip])
+        db.session.commit()
+
+        # Test 2: The same file imported both ways gives the same processed track
+        print("\n2. Testing columnar import and processing...")
+        gpx = build_gpx(30000)
+        assert import_track(columnar_trip, io.BytesIO(gpx), 'gpx', batch_size=10000, storage='columnar') == 30001
+        assert import_track(row_trip, io.BytesIO(gpx), 'gpx', batch_size=5000) == 30001
+        db.session.commit()
+        assert has_columnar_track(columnar_trip.id) and not has_columnar_track(row_trip.id)
+        assert GPSRoutePoint.query.filter_by(trip_id=columnar_trip.id).count() == 0
+
+        process_trip_track(columnar_trip)
+        process_trip_track(row_trip)
+        db.session.commit()
+        assert abs(columnar_trip.distance_calculated - row_trip.distance_calculated) < 0.01
+
+        stored = read_trip_track(columnar_trip.id)
+        assert len(stored['timestamp']) == 30001
+        assert stored['labels'] == {0: ('waypoint', 'Start')}
+        assert np.nanmax(stored['altitude']) == 1.5 and np.nanmax(stored['satellites_used']) == 9
+        assert abs(stored['cumulative_distance'][-1] - columnar_trip.distance_calculated) < 1e-3
+        print(f"   ✓ Both stores report {columnar_trip.distance_calculated} nm")
+
+        # Test 3: Columnar storage is far smaller and faster to load
+        print("\n3. Testing storage size and load time...")
+        chunk_bytes = db.session.execute(
+            select(func.sum(func.length(TripTrackChunk.data))).where(TripTrackChunk.trip_id == columnar_trip.id)
+        ).scalar()
+        started = time.perf_counter()
+        load_trip_track(row_trip.id)
+        row_seconds = time.perf_counter() - started
+        started = time.perf_counter()
+        load_trip_track(columnar_trip.id)
+        columnar_seconds = time.perf_counter() - started
+        assert chunk_bytes / 30001 < 12
+        assert columnar_seconds < row_seconds
+        print(f"   ✓ {chunk_bytes / 30001:.1f} bytes/point, load {row_seconds * 1000:.0f} ms (rows) "
+              f"vs {columnar_seconds * 1000:.0f} ms (columnar)")
+
+        # Test 4: Tracks convert between storage modes without losing points
+        print("\n4. Testing storage conversion...")
+        assert convert_trip_track(row_trip, 'columnar', chunk_size=8000) == 30001
+        db.session.commit()
+        assert TripTrackChunk.query.filter_by(trip_id=row_trip.id).count() == 4
+        assert GPSRoutePoint.query.filter_by(trip_id=row_trip.id).count() == 0
+        assert convert_trip_track(row_trip, 'columnar') == 0
+
+        assert convert_trip_track(columnar_trip, 'rows') == 30001
+        db.session.commit()
+        waypoint = GPSRoutePoint.query.filter_by(trip_id=columnar_trip.id, point_type='waypoint').one()
+        assert waypoint.point_name == 'Start'
+        assert not has_columnar_track(columnar_trip.id)
+        print("   ✓ Converted rows -> columnar -> rows")
+
+        # Clean up
+        for trip in (columnar_trip, row_trip):
+            GPSRoutePoint.query.filter_by(trip_id=trip.id).delete()
+            TripTrackChunk.query.filter_by(trip_id=trip.id).delete()
+            db.session.delete(trip)
+        db.session.delete(boat)
+        db.session.commit()
+
+    print("\n=== All Columnar Track Storage Tests Passed! ===")
+
+if __name__ == "__main__":
+    test_track_store()
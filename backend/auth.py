@@ -0,0 +1,159 @@
+"""
+Current-user resolution and authorization claims
+
+The authenticated user is loaded at most once per request and kept on
+flask.g, so get_current_user() and admin_required share one lookup.
+
+Optionally (USER_CACHE_TTL_SECONDS > 0) users are also kept in an in-process
+cache for a few seconds. Entries are dropped as soon as this process updates
+or deletes the user; other worker processes see the change once the TTL
+expires.
+
+Access tokens carry is_admin as a claim. With AUTHZ_TRUST_TOKEN_CLAIMS
+enabled, admin checks read the claim instead of the database. Claims only
+change when a new token is issued, so only turn this on together with
+expiring tokens (JWT_ACCESS_TOKEN_EXPIRES).
+"""
+
+import threading
+import time
+from functools import wraps
+from flask import current_app, g, jsonify
+from flask_jwt_extended import get_jwt, get_jwt_identity, jwt_required
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import make_transient_to_detached
+from models import db, User
+
+
+class UserCache:
+    """Thread-safe TTL cache of detached User snapshots keyed by user id"""
+
+    def __init__(self, max_entries=1000):
+        self.max_entries = max_entries
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, user_id, ttl):
+        """Return the cached snapshot, or None if missing or older than ttl seconds"""
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            stored_at, snapshot = entry
+            if time.monotonic() - stored_at > ttl:
+                del self._entries[user_id]
+                return None
+            return snapshot
+
+    def put(self, user):
+        """Store a detached copy of a loaded user"""
+        snapshot = User(**{
+            column.key: getattr(user, column.key) for column in inspect(User).column_attrs
+        })
+        make_transient_to_detached(snapshot)
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                # Drop the oldest entry; the cache only smooths bursts of requests
+                oldest = min(self._entries, key=lambda key: self._entries[key][0])
+                del self._entries[oldest]
+            self._entries[user.id] = (time.monotonic(), snapshot)
+
+    def evict(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+user_cache = UserCache()
+
+
+@event.listens_for(User, 'after_update')
+@event.listens_for(User, 'after_delete')
+def _evict_changed_user(mapper, connection, target):
+    user_cache.evict(target.id)
+
+
+def init_app(app):
+    """Start every request without a resolved user.
+
+    g normally lives for one request, but an app context pushed around
+    several requests (tests, CLI scripts) keeps it alive between them.
+    """
+    @app.before_request
+    def reset_current_user():
+        g.pop('_current_user', None)
+
+
+def load_current_user():
+    """Return the User for the request's JWT identity (None if the user is gone)"""
+    user_id = int(get_jwt_identity())
+
+    cached = g.get('_current_user')
+    if cached is not None and cached[0] == user_id:
+        return cached[1]
+
+    ttl = current_app.config.get('USER_CACHE_TTL_SECONDS', 0)
+    user = None
+    if ttl > 0:
+        snapshot = user_cache.get(user_id, ttl)
+        if snapshot is not None:
+            # Attach a copy to this request's session without a SELECT
+            user = db.session.merge(snapshot, load=False)
+
+    if user is None:
+        user = db.session.get(User, user_id)
+        if user is not None and ttl > 0:
+            user_cache.put(user)
+
+    g._current_user = (user_id, user)
+    return user
+
+
+def authorization_claims(user):
+    """Extra JWT claims: the admin flag"""
+    return {'is_admin': bool(user.is_admin)}
+
+
+def token_claim(name):
+    """Return an authorization claim from the request's token when claims are trusted.
+
+    Returns None if trusting claims is disabled or the token predates them,
+    in which case the caller falls back to the database.
+    """
+    if not current_app.config.get('AUTHZ_TRUST_TOKEN_CLAIMS'):
+        return None
+    return get_jwt().get(name)
+
+
+def get_current_user():
+    """Current user for route handlers (loaded once per request)"""
+    return load_current_user()
+
+
+def admin_required(f):
+    """Route decorator: valid token and an admin user, else 403"""
+    @wraps(f)
+    @jwt_required()
+    def decorated_function(*args, **kwargs):
+        # Trusted token claims answer without touching the database
+        is_admin = token_claim('is_admin')
+        if is_admin is not None:
+            if not is_admin:
+                return jsonify({'error': 'Admin access required'}), 403
+            return f(*args, **kwargs)
+        
+        user = get_current_user()
+        if not user:
+            return jsonify({'error': 'User not found'}), 404
+        
+        if not user.is_admin:
+            return jsonify({'error': 'Admin access required'}), 403
+        
+        return f(*args, **kwargs)
+    return decorated_function
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Index Benchmark
+
+Seeds a scratch database with synthetic boats, trips, equipment,
+maintenance, events and GPS points, then runs the queries behind the hot
+list endpoints with and without the ix_* indexes declared in models.py.
+Prints each query plan and its median time before and after.
+
+Never point this at a real database: it creates and fills every table.
+
+Usage:
+  python benchmark_indexes.py                        # 1M GPS points in a temp SQLite file
+  python benchmark_indexes.py --points 200000        # Smaller run
+  DATABASE_URL=postgresql://... python benchmark_indexes.py --yes   # Scratch Postgres database
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from sqlalchemy import text
+from factory import create_app
+from models import db
+
+# Rows per seeded user
+BOATS_PER_USER = 5
+TRIPS_PER_BOAT = 20
+EQUIPMENT_PER_BOAT = 10
+RECORDS_PER_EQUIPMENT = 4
+EVENTS_PER_USER = 20
+BATCH_SIZE = 10000
+
+# (label, SQL) - mirrors what the list endpoints run for one user
+QUERIES = [
+    ('boats by owner', "SELECT * FROM boats WHERE owner_id = :user_id AND is_active = :active"),
+    ('trips by captain', "SELECT * FROM trips WHERE captain_id = :user_id ORDER BY id"),
+    ('equipment by owner', "SELECT * FROM equipment WHERE owner_id = :user_id ORDER BY id"),
+    ('maintenance scoped to user',
+     "SELECT * FROM maintenance_records WHERE boat_id IN (SELECT id FROM boats WHERE owner_id = :user_id)"
+     " OR equipment_id IN (SELECT id FROM equipment WHERE owner_id = :user_id)"
+     " OR created_by = :user_id ORDER BY id"),
+    ('maintenance due soon',
+     "SELECT * FROM maintenance_records WHERE next_maintenance_due >= :today"
+     " AND next_maintenance_due < :due_before"),
+    ('events in date range',
+     "SELECT * FROM events WHERE (is_public = :active OR created_by = :user_id)"
+     " AND start_date >= :range_start AND start_date < :range_end ORDER BY id"),
+    ('track points for trip', "SELECT * FROM gps_route_points WHERE trip_id = :trip_id ORDER BY timestamp"),
+]
+
+def benchmark_indexes():
+    """Return the Index objects from models.py that this benchmark toggles"""
+    return [index for table in db.metadata.sorted_tables for index in table.indexes
+            if index.name.startswith('ix_')]
+
+def insert_rows(table_name, rows):
+    """Bulk insert rows (list of dicts) in executemany batches"""
+    table = db.metadata.tables[table_name]
+    for start in range(0, len(rows), BATCH_SIZE):
+        db.session.execute(table.insert(), rows[start:start + BATCH_SIZE])
+    db.session.commit()
+
+def seed(points, rng):
+    """Fill every hot table, scaling the row counts from the number of GPS points"""
+    users = max(10, points // 5000)
+    now = datetime(2025, 1, 1)
+
+    insert_rows('user', [
+        {'username': f'bench_{i}', 'email': f'bench_{i}@example.com', 'password_hash': 'x',
+         'is_active': True, 'is_admin': False, 'created_at': now}
+        for i in range(1, users + 1)])
+
+    boats = []
+    for user_id in range(1, users + 1):
+        for i in range(BOATS_PER_USER):
+            boats.append({'id': len(boats) + 1, 'name': f'Boat {user_id}-{i}', 'owner_id': user_id,
+                          'is_active': i != 0, 'created_at': now, 'updated_at': now})
+    insert_rows('boats', boats)
+
+    insert_rows('trips', [
+        {'id': (boat['id'] - 1) * TRIPS_PER_BOAT + i + 1, 'name': f'Trip {boat["id"]}-{i}',
+         'boat_id': boat['id'], 'captain_id': boat['owner_id'],
+         'start_date': now + timedelta(days=i), 'status': 'completed', 'created_at': now, 'updated_at': now}
+        for boat in boats for i in range(TRIPS_PER_BOAT)])
+
+    equipment = [
+        {'id': (boat['id'] - 1) * EQUIPMENT_PER_BOAT + i + 1, 'name': f'Winch {boat["id"]}-{i}',
+         'owner_id': boat['owner_id'], 'boat_id': boat['id'], 'created_at': now, 'updated_at': now}
+        for boat in boats for i in range(EQUIPMENT_PER_BOAT)]
+    insert_rows('equipment', equipment)
+
+    insert_rows('maintenance_records', [
+        {'boat_id': item['boat_id'], 'equipment_id': item['id'], 'maintenance_type': 'Routine',
+         'title': 'Service', 'description': 'Synthetic', 'date_performed': date(2024, 1, 1),
+         'next_maintenance_due': date(2025, 1, 1) + timedelta(days=rng.randrange(730)),
+         'status': 'Completed', 'created_by': item['owner_id'], 'created_at': now, 'updated_at': now}
+        for item in equipment for _ in range(RECORDS_PER_EQUIPMENT)])
+
+    insert_rows('events', [
+        {'name': f'Event {user_id}-{i}', 'event_type': 'Race', 'created_by': user_id,
+         'start_date': now + timedelta(days=rng.randrange(730)), 'is_public': i % 10 == 0,
+         'created_at': now, 'updated_at': now}
+        for user_id in range(1, users + 1) for i in range(EVENTS_PER_USER)])
+
+    # GPS points: whole tracks of a few thousand points spread over the trips
+    track_length = 2000
+    table = db.metadata.tables['gps_route_points']
+    for start in range(0, points, BATCH_SIZE):
+        batch = []
+        for n in range(start, min(points, start + BATCH_SIZE)):
+            trip_id = (n // track_length) * 7 % (len(boats) * TRIPS_PER_BOAT) + 1
+            batch.append({'trip_id': trip_id, 'latitude': 59.0 + n * 1e-6, 'longitude': 10.0 + n * 1e-6,
+                          'timestamp': now + timedelta(seconds=n % track_length),
+                          'point_type': 'track', 'created_at': now})
+        db.session.execute(table.insert(), batch)
+    db.session.commit()
+
+    return users, (points // 2 // track_length) * 7 % (len(boats) * TRIPS_PER_BOAT) + 1
+
+def query_plan(conn, sql, params):
+    """Return the database's plan for a query as a list of lines"""
+    if conn.dialect.name == 'sqlite':
+        rows = conn.execute(text(f'EXPLAIN QUERY PLAN {sql}'), params).fetchall()
+        return [row[-1] for row in rows]
+    if conn.dialect.name == 'postgresql':
+        return [row[0] for row in conn.execute(text(f'EXPLAIN ANALYZE {sql}'), params).fetchall()]
+    return [row[0] for row in conn.execute(text(f'EXPLAIN {sql}'), params).fetchall()]
+
+def time_query(conn, sql, params, repeat):
+    """Median wall time in milliseconds to fetch every row"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        conn.execute(text(sql), params).fetchall()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+def run_queries(params, repeat):
+    """Plan and time every benchmark query"""
+    results = {}
+    with db.engine.connect() as conn:
+        if conn.dialect.name in ('sqlite', 'postgresql'):
+            # Refresh planner statistics so the plans reflect the current indexes
+            conn.execute(text('ANALYZE'))
+        for label, sql in QUERIES:
+            results[label] = (query_plan(conn, sql, params), time_query(conn, sql, params, repeat))
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the hot-path indexes')
+    parser.add_argument('--points', type=int, default=1000000, help='GPS points to seed (default 1M)')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed runs per query (median reported)')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed for synthetic data')
+    parser.add_argument('--yes', action='store_true', help='Allow using DATABASE_URL (it will be filled)')
+    args = parser.parse_args()
+
+    scratch = None
+    if 'DATABASE_URL' in os.environ:
+        if not args.yes:
+            parser.error('DATABASE_URL is set; pass --yes to confirm it is a scratch database')
+        database_url = os.environ['DATABASE_URL']
+    else:
+        scratch = tempfile.NamedTemporaryFile(suffix='.db', delete=False)
+        scratch.close()
+        database_url = f'sqlite:///{scratch.name}'
+
+    app = create_app(api=False, SQLALCHEMY_DATABASE_URI=database_url)
+    try:
+        with app.app_context():
+            db.create_all()
+            indexes = benchmark_indexes()
+
+            print(f"🌱 Seeding {args.points:,} GPS points into {db.engine.url.render_as_string()}")
+            started = time.perf_counter()
+            users, trip_id = seed(args.points, random.Random(args.seed))
+            print(f"   Done in {time.perf_counter() - started:.1f}s ({users} users)")
+
+            params = {'user_id': users // 2, 'active': True, 'trip_id': trip_id,
+                      'today': date(2025, 6, 1), 'due_before': date(2025, 7, 1),
+                      'range_start': datetime(2025, 6, 1), 'range_end': datetime(2025, 9, 1)}
+
+            for index in indexes:
+                index.drop(db.engine, checkfirst=True)
+            before = run_queries(params, args.repeat)
+
+            for index in indexes:
+                index.create(db.engine, checkfirst=True)
+            after = run_queries(params, args.repeat)
+
+        for label, _ in QUERIES:
+            print(f"\n📋 {label}")
+            for name, (plan, elapsed) in (('without indexes', before[label]), ('with indexes', after[label])):
+                print(f"   {name}: {elapsed:.2f} ms")
+                for line in plan:
+                    print(f"      {line}")
+
+        print(f"\n{'query':<28} {'before ms':>10} {'after ms':>10} {'speedup':>8}")
+        for label, _ in QUERIES:
+            slow, fast = before[label][1], after[label][1]
+            print(f"{label:<28} {slow:>10.2f} {fast:>10.2f} {slow / max(fast, 1e-6):>7.1f}x")
+    finally:
+        if scratch:
+            os.unlink(scratch.name)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+JSON Encoding Benchmark
+
+Compares the stdlib and orjson JSON providers (see json_provider.py) on
+list payloads shaped like /api/trips, /api/maintenance and a simplified
+route, and shows the bytes sent with no compression, gzip and brotli.
+Runs on synthetic in-memory objects, no database needed.
+
+Usage:
+  python benchmark_json.py                     # 500 trips, 2000 maintenance records, 20k route points
+  python benchmark_json.py --trips 50 --repeat 20
+"""
+
+import argparse
+import gzip
+import random
+import statistics
+import time
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from flask import Flask
+from config import Config
+from models import User, Boat, Equipment, MaintenanceRecord, Trip
+from json_provider import OrjsonProvider, StdlibJSONProvider, orjson
+from compression import brotli
+
+def build_payloads(trips, records, route_points, rng):
+    """to_dict() list payloads for transient model objects"""
+    captain = User(id=1, username='skipper', first_name='Sam', last_name='Skipper')
+    boat = Boat(id=1, name='Windward', owner=captain)
+    winch = Equipment(id=1, name='Primary winch', owner=captain, boat=boat)
+    start = datetime(2025, 5, 1, 9, 30)
+
+    trip_rows = [
+        Trip(id=i, name=f'Trip {i}', description='Harbour to the outer islands and back', trip_type='Day Sail',
+             boat=boat, boat_id=1, captain=captain, captain_id=1, crew_size=3,
+             start_date=start + timedelta(days=i), end_date=start + timedelta(days=i, hours=6),
+             start_latitude=Decimal('59.9139'), start_longitude=Decimal('10.7522'),
+             distance_miles=rng.uniform(5, 40), max_speed_knots=rng.uniform(5, 9), status='completed',
+             fuel_cost=Decimal('42.50'), total_cost=Decimal('120.00'), route_processed=True,
+             total_route_points=rng.randrange(2000, 20000), created_at=start, updated_at=start)
+        for i in range(trips)
+    ]
+    maintenance_rows = [
+        MaintenanceRecord(id=i, boat=boat, boat_id=1, equipment=winch, equipment_id=1, creator=captain,
+                          created_by=1, maintenance_type='Routine', title='Service winch',
+                          description='Strip, clean and grease', date_performed=date(2024, 1, 1) + timedelta(days=i % 365),
+                          next_maintenance_due=date(2025, 1, 1) + timedelta(days=i % 365), cost=Decimal('35.00'),
+                          labor_hours=1.5, status='Completed', priority='Medium', parts_used='["grease", "pawl springs"]',
+                          created_at=start, updated_at=start)
+        for i in range(records)
+    ]
+    route = [[round(59.9 + i * 1e-5, 6), round(10.7 + i * 1e-5, 6)] for i in range(route_points)]
+
+    return {
+        f'trips ({trips})': {'trips': [trip.to_dict() for trip in trip_rows], 'count': trips, 'next_cursor': None},
+        f'maintenance ({records})': {'maintenance_records': [record.to_dict() for record in maintenance_rows],
+                                     'count': records, 'next_cursor': None},
+        f'route ({route_points} pts)': {'route': {'trip_id': 1, 'tolerance_meters': 5.0, 'coordinates': route}},
+    }
+
+def median_ms(function, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark JSON encoding and response compression')
+    parser.add_argument('--trips', type=int, default=500)
+    parser.add_argument('--maintenance', type=int, default=2000)
+    parser.add_argument('--route-points', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=10, help='Timed runs per measurement (median reported)')
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    providers = {'stdlib': StdlibJSONProvider(app)}
+    if orjson is not None:
+        providers['orjson'] = OrjsonProvider(app)
+    else:
+        print("⚠️  orjson is not installed; only the stdlib provider is measured")
+
+    payloads = build_payloads(args.trips, args.maintenance, args.route_points, random.Random(7))
+
+    with app.app_context():
+        print(f"\n{'payload':<22} {'encoder':<8} {'encode ms':>10}")
+        encoded = {}
+        for label, payload in payloads.items():
+            for name, provider in providers.items():
+                elapsed = median_ms(lambda: provider.response(payload), args.repeat)
+                encoded[label] = provider.response(payload).get_data()
+                print(f"{label:<22} {name:<8} {elapsed:>10.2f}")
+
+    config = app.config
+    print(f"\n{'payload':<22} {'encoding':<14} {'bytes':>10} {'ratio':>7} {'ms':>8}")
+    for label, body in encoded.items():
+        print(f"{label:<22} {'identity':<14} {len(body):>10,} {1:>7.2f} {0:>8.2f}")
+        variants = [(f"gzip -{config['COMPRESS_GZIP_LEVEL']}",
+                     lambda: gzip.compress(body, compresslevel=config['COMPRESS_GZIP_LEVEL'], mtime=0))]
+        if brotli is not None:
+            variants.append((f"br q{config['COMPRESS_BROTLI_QUALITY']}",
+                             lambda: brotli.compress(body, quality=config['COMPRESS_BROTLI_QUALITY'])))
+        for name, function in variants:
+            size = len(function())
+            elapsed = median_ms(function, args.repeat)
+            print(f"{label:<22} {name:<14} {size:>10,} {size / len(body):>7.2f} {elapsed:>8.2f}")
+    if brotli is None:
+        print("\n(brotli is not installed; pip install Brotli to compare it)")
+
+if __name__ == '__main__':
+    main()
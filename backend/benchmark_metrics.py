@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Request Metrics Overhead Benchmark
+
+Times the same requests through two apps, one with request metrics (see
+request_metrics.py) and one with METRICS_ENABLED=False, and reports the
+per-request cost of the instrumentation. Uses the Flask test client on a
+scratch SQLite database seeded with one user, boats and trips, so only
+the app is measured, not the network.
+
+Usage:
+  python benchmark_metrics.py                  # 2000 requests per path and mode
+  python benchmark_metrics.py --requests 500 --boats 200
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from flask import json
+from factory import create_app
+from models import db, User, Boat, Trip
+
+PATHS = ('/api/health', '/api/boats', '/api/trips')
+
+
+def seed(app, boats, trips):
+    with app.app_context():
+        db.create_all()
+        user = User(username='bench', email='bench@example.com')
+        user.set_password('bench123')
+        db.session.add(user)
+        db.session.flush()
+        boat_rows = [Boat(name=f'Boat {i}', owner_id=user.id) for i in range(boats)]
+        db.session.add_all(boat_rows)
+        db.session.flush()
+        start = datetime(2025, 5, 1, 9, 30)
+        db.session.add_all(Trip(name=f'Trip {i}', boat_id=boat_rows[i % boats].id, captain_id=user.id,
+                                start_date=start + timedelta(days=i)) for i in range(trips))
+        db.session.commit()
+        db.session.remove()
+
+
+def time_requests(client, path, headers, count):
+    """Per-request wall times in microseconds"""
+    timings = []
+    for _ in range(count):
+        started = time.perf_counter()
+        response = client.get(path, headers=headers)
+        timings.append((time.perf_counter() - started) * 1e6)
+        assert response.status_code == 200, (path, response.status_code)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure the per-request cost of request metrics')
+    parser.add_argument('--requests', type=int, default=2000, help='Timed requests per path and mode')
+    parser.add_argument('--boats', type=int, default=20)
+    parser.add_argument('--trips', type=int, default=50)
+    args = parser.parse_args()
+
+    scratch = tempfile.NamedTemporaryFile(suffix='.db', delete=False)
+    scratch.close()
+    uri = f'sqlite:///{scratch.name}'
+    try:
+        settings = {'SQLALCHEMY_DATABASE_URI': uri, 'COMPRESS_ENABLED': False}
+        apps = {
+            'off': create_app(modules=['boats', 'trips'], METRICS_ENABLED=False, **settings),
+            'on': create_app(modules=['boats', 'trips'], METRICS_SERVER_TIMING=True, **settings),
+        }
+        seed(apps['off'], args.boats, args.trips)
+
+        clients = {mode: app.test_client() for mode, app in apps.items()}
+        login = clients['off'].post('/api/auth/login', data=json.dumps({'username': 'bench', 'password': 'bench123'}),
+                                    content_type='application/json')
+        headers = {'Authorization': f"Bearer {json.loads(login.data)['access_token']}"}
+
+        print(f"\n{'path':<14} {'off µs':>9} {'on µs':>9} {'overhead µs':>12} {'%':>6}")
+        for path in PATHS:
+            results = {mode: [] for mode in clients}
+            # Alternate short rounds so drift (CPU frequency, caches) hits both modes alike
+            for _ in range(10):
+                for mode, client in clients.items():
+                    time_requests(client, path, headers, max(1, args.requests // 100))  # Warm-up
+                    results[mode] += time_requests(client, path, headers, max(1, args.requests // 10))
+            off, on = statistics.median(results['off']), statistics.median(results['on'])
+            print(f"{path:<14} {off:>9.0f} {on:>9.0f} {on - off:>12.0f} {(on - off) / off * 100:>6.1f}")
+        print(f"\nServer-Timing: {clients['on'].get('/api/trips', headers=headers).headers['Server-Timing']}")
+    finally:
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(scratch.name + suffix):
+                os.unlink(scratch.name + suffix)
+
+
+if __name__ == '__main__':
+    main()
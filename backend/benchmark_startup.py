@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Startup Benchmark
+
+Times create_app() in fresh interpreters, which is what a gunicorn master,
+`flask db upgrade` or an admin script pays before doing any work:
+
+- cli: create_app(api=False), the database-only app the scripts use
+- core: core, users and admin blueprints only
+- active: blueprints for the active SystemModules (the default)
+- all: every module blueprint
+
+Reports the median import + create time, process wall time, number of
+imported modules and registered routes, and whether numpy got imported.
+
+Usage:
+  python benchmark_startup.py                 # 7 runs per scenario
+  python benchmark_startup.py --runs 15
+  python benchmark_startup.py --importtime    # Slowest imports for the "all" scenario
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from blueprints import MODULE_BLUEPRINTS
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+SCENARIOS = [
+    ('cli', {'api': False}),
+    ('core', {'modules': []}),
+    ('active', {}),
+    ('all', {'modules': list(MODULE_BLUEPRINTS)}),
+]
+
+# Runs inside the child interpreter
+PROBE = '''
+import json, sys, time
+started = time.perf_counter()
+from factory import create_app
+app = create_app(**json.loads(sys.argv[1]))
+elapsed = time.perf_counter() - started
+print(json.dumps({'seconds': elapsed, 'modules': len(sys.modules), 'numpy': 'numpy' in sys.modules,
+                  'routes': sum(1 for rule in app.url_map.iter_rules() if rule.endpoint != 'static')}))
+'''
+
+
+def run_probe(kwargs, extra_args=()):
+    started = time.perf_counter()
+    result = subprocess.run([sys.executable, *extra_args, '-c', PROBE, json.dumps(kwargs)],
+                            cwd=BACKEND_DIR, capture_output=True, text=True, check=True)
+    wall = time.perf_counter() - started
+    return json.loads(result.stdout.strip().splitlines()[-1]), wall, result.stderr
+
+
+def slowest_imports(kwargs, count=15):
+    """Largest cumulative import times (microseconds, module) from python -X importtime"""
+    _, _, stderr = run_probe(kwargs, ('-X', 'importtime'))
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if name.strip() != 'factory':
+            rows.append((int(cumulative), name.strip()))
+    return sorted(rows, reverse=True)[:count]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark application startup')
+    parser.add_argument('--runs', type=int, default=7, help='Fresh interpreters per scenario (median reported)')
+    parser.add_argument('--importtime', action='store_true', help='Show the slowest imports for the "all" scenario')
+    args = parser.parse_args()
+
+    run_probe({'api': False})  # Warm the OS file cache and bytecode
+
+    print(f"\n{'scenario':<8} {'create ms':>10} {'process ms':>11} {'modules':>8} {'routes':>7} {'numpy':>6}")
+    for name, kwargs in SCENARIOS:
+        samples = [run_probe(kwargs) for _ in range(args.runs)]
+        info = samples[-1][0]
+        create_ms = statistics.median(sample[0]['seconds'] for sample in samples) * 1000
+        wall_ms = statistics.median(sample[1] for sample in samples) * 1000
+        print(f"{name:<8} {create_ms:>10.1f} {wall_ms:>11.1f} {info['modules']:>8} {info['routes']:>7} "
+              f"{'yes' if info['numpy'] else 'no':>6}")
+
+    if args.importtime:
+        print("\nSlowest top-level imports (all modules):")
+        for microseconds, module in slowest_imports(dict(SCENARIOS)['all']):
+            print(f"   {microseconds / 1000:>8.1f} ms  {module}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,21 @@
+"""
+API blueprints, one per area of the app
+
+core (health, auth), users (module choices, preferences), dashboard and
+admin are always registered. The others belong to the SystemModule of the same name
+and are only imported when that module is loaded, so a server without the
+trips module never imports numpy and the GPS track code.
+"""
+
+import importlib
+
+CORE_BLUEPRINTS = ('core', 'users', 'dashboard', 'admin')
+MODULE_BLUEPRINTS = ('boats', 'trips', 'equipment', 'maintenance', 'events')
+
+
+def register_blueprints(app, modules):
+    """Register the core blueprints plus the module blueprints named in modules"""
+    names = list(CORE_BLUEPRINTS) + [name for name in MODULE_BLUEPRINTS if name in modules]
+    for name in names:
+        app.register_blueprint(importlib.import_module(f'blueprints.{name}').bp)
+    return names
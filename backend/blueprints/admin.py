@@ -0,0 +1,261 @@
+"""
+Module management endpoints for the admin panel (always loaded: admin is a
+core module and is how other modules get switched back on)
+"""
+
+from flask import Blueprint, Response, current_app, jsonify, request
+from models import db, User, SystemModule, UserModulePermission
+from auth import admin_required, get_current_user
+from blueprints import MODULE_BLUEPRINTS
+import db_engine
+import module_access
+import request_metrics
+import slow_queries
+
+bp = Blueprint('admin', __name__)
+
+@bp.route('/api/admin/modules', methods=['GET'])
+@admin_required
+def get_all_modules():
+    """Get all system modules (admin only)"""
+    modules = SystemModule.query.order_by(SystemModule.sort_order).all()
+    return jsonify({
+        'modules': [module.to_dict() for module in modules],
+        'count': len(modules)
+    })
+
+@bp.route('/api/admin/modules', methods=['POST'])
+@admin_required
+def create_module():
+    """Create a new system module (admin only)"""
+    data = request.get_json()
+    
+    # Validate required fields
+    required_fields = ['name', 'display_name']
+    for field in required_fields:
+        if not data or not data.get(field):
+            return jsonify({'error': f'{field} is required'}), 400
+    
+    # Check if module already exists
+    if SystemModule.query.filter_by(name=data['name']).first():
+        return jsonify({'error': 'Module name already exists'}), 409
+    
+    # Create new module
+    module = SystemModule(
+        name=data['name'],
+        display_name=data['display_name'],
+        description=data.get('description'),
+        icon=data.get('icon'),
+        is_active=data.get('is_active', True),
+        requires_admin=data.get('requires_admin', False),
+        sort_order=data.get('sort_order', 0)
+    )
+    
+    db.session.add(module)
+    db.session.commit()
+    
+    return jsonify({
+        'message': 'Module created successfully',
+        'module': module.to_dict()
+    }), 201
+
+@bp.route('/api/admin/modules/<int:module_id>', methods=['PUT'])
+@admin_required
+def update_module(module_id):
+    """Update a system module (admin only)"""
+    module = SystemModule.query.get(module_id)
+    if not module:
+        return jsonify({'error': 'Module not found'}), 404
+    
+    data = request.get_json()
+    if not data:
+        return jsonify({'error': 'No data provided'}), 400
+    
+    was_active = module.is_active
+    
+    # Update fields
+    updateable_fields = ['display_name', 'description', 'icon', 'is_active', 'requires_admin', 'sort_order']
+    for field in updateable_fields:
+        if field in data:
+            setattr(module, field, data[field])
+    
+    db.session.commit()
+    
+    return jsonify({
+        'message': 'Module updated successfully',
+        'module': module.to_dict(),
+        # Module endpoints are registered at startup (see factory.py)
+        'restart_required': module.name in MODULE_BLUEPRINTS and bool(module.is_active) != bool(was_active)
+    })
+
+@bp.route('/api/admin/modules/<int:module_id>', methods=['DELETE'])
+@admin_required
+def delete_module(module_id):
+    """Delete a system module (admin only)"""
+    module = SystemModule.query.get(module_id)
+    if not module:
+        return jsonify({'error': 'Module not found'}), 404
+    
+    # Don't allow deletion of core modules
+    core_modules = ['dashboard', 'admin']
+    if module.name in core_modules:
+        return jsonify({'error': f'Cannot delete core module: {module.name}'}), 400
+    
+    # Delete related permissions first
+    UserModulePermission.query.filter_by(module_id=module.id).delete()
+    
+    db.session.delete(module)
+    db.session.commit()
+    
+    return jsonify({'message': 'Module deleted successfully'})
+
+@bp.route('/api/admin/users/<int:user_id>/modules', methods=['GET'])
+@admin_required
+def get_user_modules(user_id):
+    """Get user's module permissions (admin only)"""
+    user = User.query.get(user_id)
+    if not user:
+        return jsonify({'error': 'User not found'}), 404
+    
+    # Every module with this user's permission status, in one query
+    return jsonify({
+        'user': user.to_dict(),
+        'modules': module_access.user_module_grants(user_id)
+    })
+
+@bp.route('/api/admin/users/<int:user_id>/modules', methods=['POST'])
+@admin_required
+def grant_user_module(user_id):
+    """Grant module access to user (admin only)"""
+    user = User.query.get(user_id)
+    if not user:
+        return jsonify({'error': 'User not found'}), 404
+    
+    data = request.get_json()
+    if not data or not data.get('module_id'):
+        return jsonify({'error': 'module_id is required'}), 400
+    
+    module = SystemModule.query.get(data['module_id'])
+    if not module:
+        return jsonify({'error': 'Module not found'}), 404
+    
+    # Check if permission already exists
+    existing = UserModulePermission.query.filter_by(
+        user_id=user_id, module_id=module.id
+    ).first()
+    
+    if existing:
+        return jsonify({'error': 'User already has permission for this module'}), 409
+    
+    # Create permission
+    current_admin = get_current_user()
+    permission = UserModulePermission(
+        user_id=user_id,
+        module_id=module.id,
+        is_enabled=True,
+        granted_by=current_admin.id
+    )
+    
+    db.session.add(permission)
+    db.session.commit()
+    
+    return jsonify({
+        'message': 'Module access granted successfully',
+        'permission': permission.to_dict()
+    }), 201
+
+@bp.route('/api/admin/users/<int:user_id>/modules/<int:module_id>', methods=['DELETE'])
+@admin_required
+def revoke_user_module(user_id, module_id):
+    """Revoke module access from user (admin only)"""
+    permission = UserModulePermission.query.filter_by(
+        user_id=user_id, module_id=module_id
+    ).first()
+    
+    if not permission:
+        return jsonify({'error': 'Permission not found'}), 404
+    
+    # Don't allow revoking core modules
+    module = SystemModule.query.get(module_id)
+    if module and module.name in ['dashboard']:
+        return jsonify({'error': f'Cannot revoke access to core module: {module.name}'}), 400
+    
+    db.session.delete(permission)
+    db.session.commit()
+    
+    return jsonify({'message': 'Module access revoked successfully'})
+
+@bp.route('/api/admin/modules/bulk', methods=['POST'])
+@admin_required
+def bulk_module_access():
+    """Grant or revoke a user x module matrix in one transaction (admin only)"""
+    data = request.get_json()
+    if not data:
+        return jsonify({'error': 'No data provided'}), 400
+    
+    action = data.get('action', 'grant')
+    if action not in module_access.BULK_ACTIONS:
+        return jsonify({'error': f"action must be one of: {', '.join(module_access.BULK_ACTIONS)}"}), 400
+    
+    user_ids = data.get('user_ids')
+    module_ids = data.get('module_ids')
+    for name, ids in (('user_ids', user_ids), ('module_ids', module_ids)):
+        if not isinstance(ids, list) or not ids or not all(isinstance(i, int) and not isinstance(i, bool) for i in ids):
+            return jsonify({'error': f'{name} must be a non-empty list of integers'}), 400
+    reenable = data.get('reenable', False)
+    if not isinstance(reenable, bool):
+        return jsonify({'error': 'reenable must be true or false'}), 400
+    
+    max_pairs = current_app.config['MODULE_BULK_MAX_PAIRS']
+    if len(user_ids) * len(module_ids) > max_pairs:
+        return jsonify({'error': f'At most {max_pairs} user/module pairs per request'}), 400
+    
+    try:
+        results = module_access.bulk_set_module_access(
+            user_ids, module_ids, action=action, granted_by=get_current_user().id, reenable=reenable
+        )
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': f'Failed to {action} module access: {str(e)}'}), 500
+    
+    summary = {}
+    for result in results:
+        summary[result['outcome']] = summary.get(result['outcome'], 0) + 1
+    
+    return jsonify({
+        'action': action,
+        'summary': summary,
+        'results': results
+    })
+
+@bp.route('/api/admin/db/pool', methods=['GET'])
+@admin_required
+def get_db_pool_stats():
+    """Connection pool state and counters for the worker process that answers (admin only)"""
+    return jsonify({'pool': db_engine.pool_stats()})
+
+@bp.route('/api/admin/metrics', methods=['GET'])
+@admin_required
+def get_metrics():
+    """Request latency, SQL and response size metrics in Prometheus text format (admin only)"""
+    merged = request_metrics.collect(current_app.config['METRICS_DIR'])
+    return Response(request_metrics.render_prometheus(merged), mimetype='text/plain; version=0.0.4')
+
+@bp.route('/api/admin/slow-queries', methods=['GET'])
+@admin_required
+def get_slow_queries():
+    """Recent statements slower than SLOW_QUERY_MS from all workers, newest first (admin only)"""
+    config = current_app.config
+    limit = request.args.get('limit', 50, type=int)
+    log = current_app.extensions.get('slow_queries')
+    if log is None:
+        return jsonify({'enabled': False, 'threshold_ms': 0, 'queries': []})
+
+    if config['METRICS_DIR']:
+        slow_queries.prune(config['METRICS_DIR'], config['SLOW_QUERY_LOG_SIZE'])
+    queries = slow_queries.collect(log, config['METRICS_DIR'])
+    route = request.args.get('route')
+    if route:
+        queries = [query for query in queries if route in query['route']]
+    return jsonify({'enabled': True, 'threshold_ms': config['SLOW_QUERY_MS'], 'queries': queries[:max(1, limit)]})
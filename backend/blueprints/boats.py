@@ -0,0 +1,205 @@
+"""
+Boat CRUD endpoints (boats module)
+"""
+
+from flask import Blueprint, jsonify, request
+from flask_jwt_extended import jwt_required
+from models import db, Boat
+from auth import get_current_user
+from list_query import ListQueryError, paginated_response
+from http_cache import object_response
+
+bp = Blueprint('boats', __name__)
+
+@bp.route('/api/boats', methods=['GET'])
+@jwt_required()
+def get_boats():
+    """Get all boats for current user"""
+    user = get_current_user()
+    if not user:
+        return jsonify({'error': 'User not found'}), 404
+    
+    # Get boats owned by user
+    try:
+        return paginated_response(
+            Boat.query.filter_by(owner_id=user.id, is_active=True),
+            Boat,
+            'boats',
+            filters={'boat_type': Boat.boat_type, 'condition': Boat.condition},
+            date_column=Boat.created_at
+        )
+    except ListQueryError as e:
+        return jsonify({'error': str(e)}), 400
+
+@bp.route('/api/boats', methods=['POST'])
+@jwt_required()
+def create_boat():
+    """Create a new boat"""
+    user = get_current_user()
+    if not user:
+        return jsonify({'error': 'User not found'}), 404
+    
+    data = request.get_json()
+    if not data or not data.get('name'):
+        return jsonify({'error': 'Boat name is required'}), 400
+    
+    # Check for duplicate registration number if provided
+    if data.get('registration_number'):
+        existing = Boat.query.filter_by(registration_number=data['registration_number']).first()
+        if existing:
+            return jsonify({'error': 'Registration number already exists'}), 409
+    
+    # Create new boat
+    boat = Boat(
+        name=data['name'],
+        boat_type=data.get('boat_type'),
+        length_feet=data.get('length_feet'),
+        beam_feet=data.get('beam_feet'),
+        draft_feet=data.get('draft_feet'),
+        displacement_lbs=data.get('displacement_lbs'),
+        year_built=data.get('year_built'),
+        hull_material=data.get('hull_material'),
+        registration_number=data.get('registration_number'),
+        hin=data.get('hin'),
+        documentation_number=data.get('documentation_number'),
+        owner_id=user.id,
+        home_port=data.get('home_port'),
+        current_location=data.get('current_location'),
+        marina_berth=data.get('marina_berth'),
+        insurance_company=data.get('insurance_company'),
+        insurance_policy_number=data.get('insurance_policy_number'),
+        engine_make=data.get('engine_make'),
+        engine_model=data.get('engine_model'),
+        engine_year=data.get('engine_year'),
+        engine_hours=data.get('engine_hours'),
+        fuel_capacity_gallons=data.get('fuel_capacity_gallons'),
+        water_capacity_gallons=data.get('water_capacity_gallons'),
+        sail_area_sqft=data.get('sail_area_sqft'),
+        mast_height_feet=data.get('mast_height_feet'),
+        keel_type=data.get('keel_type'),
+        condition=data.get('condition', 'Good'),
+        notes=data.get('notes')
+    )
+    
+    # Handle dates
+    from datetime import datetime
+    if data.get('insurance_expiry'):
+        try:
+            boat.insurance_expiry = datetime.strptime(data['insurance_expiry'], '%Y-%m-%d').date()
+        except ValueError:
+            pass
+    
+    if data.get('last_survey_date'):
+        try:
+            boat.last_survey_date = datetime.strptime(data['last_survey_date'], '%Y-%m-%d').date()
+        except ValueError:
+            pass
+    
+    if data.get('next_survey_due'):
+        try:
+            boat.next_survey_due = datetime.strptime(data['next_survey_due'], '%Y-%m-%d').date()
+        except ValueError:
+            pass
+    
+    # Handle photos
+    if data.get('photos'):
+        boat.set_photos(data['photos'])
+    
+    db.session.add(boat)
+    db.session.commit()
+    
+    return jsonify({
+        'message': 'Boat created successfully',
+        'boat': boat.to_dict()
+    }), 201
+
+@bp.route('/api/boats/<int:boat_id>', methods=['GET'])
+@jwt_required()
+def get_boat(boat_id):
+    """Get specific boat details"""
+    user = get_current_user()
+    if not user:
+        return jsonify({'error': 'User not found'}), 404
+    
+    boat = Boat.query.filter_by(id=boat_id, owner_id=user.id).first()
+    if not boat:
+        return jsonify({'error': 'Boat not found'}), 404
+    
+    return object_response(boat, lambda: {'boat': boat.to_dict()})
+
+@bp.route('/api/boats/<int:boat_id>', methods=['PUT'])
+@jwt_required()
+def update_boat(boat_id):
+    """Update boat details"""
+    user = get_current_user()
+    if not user:
+        return jsonify({'error': 'User not found'}), 404
+    
+    boat = Boat.query.filter_by(id=boat_id, owner_id=user.id).first()
+    if not boat:
+        return jsonify({'error': 'Boat not found'}), 404
+    
+    data = request.get_json()
+    if not data:
+        return jsonify({'error': 'No data provided'}), 400
+    
+    # Check for duplicate registration number if changed
+    if data.get('registration_number') and data['registration_number'] != boat.registration_number:
+        existing = Boat.query.filter_by(registration_number=data['registration_number']).first()
+        if existing:
+            return jsonify({'error': 'Registration number already exists'}), 409
+    
+    # Update fields
+    updateable_fields = [
+        'name', 'boat_type', 'length_feet', 'beam_feet', 'draft_feet', 'displacement_lbs',
+        'year_built', 'hull_material', 'registration_number', 'hin', 'documentation_number',
+        'home_port', 'current_location', 'marina_berth', 'insurance_company', 
+        'insurance_policy_number', 'engine_make', 'engine_model', 'engine_year', 
+        'engine_hours', 'fuel_capacity_gallons', 'water_capacity_gallons', 'sail_area_sqft',
+        'mast_height_feet', 'keel_type', 'condition', 'notes'
+    ]
+    
+    for field in updateable_fields:
+        if field in data:
+            setattr(boat, field, data[field])
+    
+    # Handle date fields
+    from datetime import datetime
+    date_fields = ['insurance_expiry', 'last_survey_date', 'next_survey_due']
+    for field in date_fields:
+        if field in data and data[field]:
+            try:
+                setattr(boat, field, datetime.strptime(data[field], '%Y-%m-%d').date())
+            except ValueError:
+                pass
+        elif field in data and data[field] is None:
+            setattr(boat, field, None)
+    
+    # Handle photos
+    if 'photos' in data:
+        boat.set_photos(data['photos'])
+    
+    db.session.commit()
+    
+    return jsonify({
+        'message': 'Boat updated successfully',
+        'boat': boat.to_dict()
+    })
+
+@bp.route('/api/boats/<int:boat_id>', methods=['DELETE'])
+@jwt_required()
+def delete_boat(boat_id):
+    """Delete boat (soft delete by setting is_active=False)"""
+    user = get_current_user()
+    if not user:
+        return jsonify({'error': 'User not found'}), 404
+    
+    boat = Boat.query.filter_by(id=boat_id, owner_id=user.id).first()
+    if not boat:
+        return jsonify({'error': 'Boat not found'}), 404
+    
+    # Soft delete
+    boat.is_active = False
+    db.session.commit()
+    
+    return jsonify({'message': 'Boat deleted successfully'})
@@ -0,0 +1,78 @@
+"""
+Health check and authentication endpoints (always loaded)
+"""
+
+from flask import Blueprint, jsonify, request
+from flask_jwt_extended import jwt_required, create_access_token
+from models import db, User
+import auth
+
+bp = Blueprint('core', __name__)
+
+@bp.route('/')
+def home():
+    return jsonify({'message': 'Pi Server Project API is running!'})
+
+@bp.route('/api/health')
+def health():
+    return jsonify({'status': 'healthy', 'service': 'pi-server-api'})
+
+@bp.route('/api/auth/register', methods=['POST'])
+def register():
+    data = request.get_json()
+    
+    if not data or not data.get('username') or not data.get('email') or not data.get('password'):
+        return jsonify({'error': 'Username, email, and password required'}), 400
+    
+    # Check if user already exists
+    if User.query.filter_by(username=data['username']).first():
+        return jsonify({'error': 'Username already exists'}), 409
+    
+    if User.query.filter_by(email=data['email']).first():
+        return jsonify({'error': 'Email already exists'}), 409
+    
+    # Create new user
+    user = User(username=data['username'], email=data['email'])
+    user.set_password(data['password'])
+    
+    db.session.add(user)
+    db.session.commit()
+    
+    # Create access token
+    access_token = create_access_token(identity=str(user.id), additional_claims=auth.authorization_claims(user))
+    
+    return jsonify({
+        'message': 'User registered successfully',
+        'user': user.to_dict(),
+        'access_token': access_token
+    }), 201
+
+@bp.route('/api/auth/login', methods=['POST'])
+def login():
+    data = request.get_json()
+    
+    if not data or not data.get('username') or not data.get('password'):
+        return jsonify({'error': 'Username and password required'}), 400
+    
+    user = User.query.filter_by(username=data['username']).first()
+    
+    if not user or not user.check_password(data['password']):
+        return jsonify({'error': 'Invalid credentials'}), 401
+    
+    access_token = create_access_token(identity=str(user.id), additional_claims=auth.authorization_claims(user))
+    
+    return jsonify({
+        'message': 'Login successful',
+        'user': user.to_dict(),
+        'access_token': access_token
+    })
+
+@bp.route('/api/auth/me', methods=['GET'])
+@jwt_required()
+def get_current_user():
+    user = auth.load_current_user()
+    
+    if not user:
+        return jsonify({'error': 'User not found'}), 404
+    
+    return jsonify({'user': user.to_dict()})
@@ -0,0 +1,56 @@
+"""
+Dashboard summary and statistics endpoints (always loaded: dashboard is a
+core module)
+"""
+
+from datetime import date, datetime
+from flask import Blueprint, current_app, jsonify, request
+from flask_jwt_extended import jwt_required
+from auth import get_current_user
+from dashboard import dashboard_summary, season_start
+from http_cache import payload_response
+import rollups
+
+bp = Blueprint('dashboard', __name__)
+
+def parse_month(value):
+    """First day of a YYYY-MM month, or None when not given"""
+    return datetime.strptime(value, '%Y-%m').date() if value else None
+
+@bp.route('/api/dashboard/summary', methods=['GET'])
+@jwt_required()
+def get_dashboard_summary():
+    """Get counts, maintenance, events, trips and season totals for the dashboard"""
+    user = get_current_user()
+    if not user:
+        return jsonify({'error': 'User not found'}), 404
+
+    # Aggregate queries, cached per user (see dashboard.py)
+    return payload_response(dashboard_summary(user))
+
+@bp.route('/api/dashboard/stats', methods=['GET'])
+@jwt_required()
+def get_dashboard_stats():
+    """Get monthly statistics for the current user and totals per boat"""
+    user = get_current_user()
+    if not user:
+        return jsonify({'error': 'User not found'}), 404
+
+    today = date.today()
+    try:
+        first = parse_month(request.args.get('from')) or season_start(
+            today, current_app.config['DASHBOARD_SEASON_START_MONTH'])
+        last = parse_month(request.args.get('to')) or rollups.month_of(today)
+    except ValueError:
+        return jsonify({'error': 'from and to must be months like 2025-06'}), 400
+    if first > last:
+        return jsonify({'error': 'from must not be after to'}), 400
+
+    # Read from the monthly rollups: one row per month, one group per boat
+    return payload_response({
+        'from': first.strftime('%Y-%m'),
+        'to': last.strftime('%Y-%m'),
+        'months': [row.to_dict() for row in rollups.user_months(user.id, first, last)],
+        'totals': rollups.user_totals(user.id, first, last),
+        'boats': rollups.boat_totals(user.id, first, last),
+    })
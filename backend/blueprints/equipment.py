@@ -0,0 +1,277 @@
+"""
+Equipment CRUD endpoints (equipment module)
+"""
+
+from flask import Blueprint, jsonify, request
+from flask_jwt_extended import jwt_required
+from models import db, Boat, Equipment
+from auth import get_current_user
+from list_query import ListQueryError, paginated_response
+from http_cache import object_response
+
+bp = Blueprint('equipment', __name__)
+
+@bp.route('/api/equipment', methods=['GET'])
+@jwt_required()
+def get_equipment():
+    """Get all equipment for current user"""
+    user = get_current_user()
+    if not user:
+        return jsonify({'error': 'User not found'}), 404
+    
+    # Get equipment owned by user
+    try:
+        return paginated_response(
+            Equipment.query.filter_by(owner_id=user.id),
+            Equipment,
+            'equipment',
+            filters={
+                'category': Equipment.category,
+                'boat_id': Equipment.boat_id,
+                'condition': Equipment.condition,
+                'is_operational': Equipment.is_operational
+            },
+            date_column=Equipment.purchase_date
+        )
+    except ListQueryError as e:
+        return jsonify({'error': str(e)}), 400
+
+@bp.route('/api/equipment', methods=['POST'])
+@jwt_required()
+def create_equipment():
+    """Create a new equipment item"""
+    user = get_current_user()
+    if not user:
+        return jsonify({'error': 'User not found'}), 404
+    
+    data = request.get_json()
+    if not data or not data.get('name'):
+        return jsonify({'error': 'Equipment name is required'}), 400
+    
+    try:
+        # Create new equipment
+        equipment = Equipment(
+            name=data['name'],
+            category=data.get('category'),
+            subcategory=data.get('subcategory'),
+            brand=data.get('brand'),
+            model=data.get('model'),
+            part_number=data.get('part_number'),
+            serial_number=data.get('serial_number'),
+            purchase_location=data.get('purchase_location'),
+            warranty_period_months=data.get('warranty_period_months'),
+            boat_id=data.get('boat_id') if data.get('boat_id') else None,
+            location_on_boat=data.get('location_on_boat'),
+            current_location=data.get('current_location'),
+            condition=data.get('condition', 'Good'),
+            is_operational=data.get('is_operational', True),
+            quantity=data.get('quantity', 1),
+            weight_lbs=data.get('weight_lbs'),
+            dimensions=data.get('dimensions'),
+            manual_url=data.get('manual_url'),
+            notes=data.get('notes'),
+            owner_id=user.id
+        )
+        
+        # Handle date fields
+        if data.get('purchase_date'):
+            from datetime import datetime
+            equipment.purchase_date = datetime.strptime(data['purchase_date'], '%Y-%m-%d').date()
+        
+        if data.get('warranty_expiry'):
+            from datetime import datetime
+            equipment.warranty_expiry = datetime.strptime(data['warranty_expiry'], '%Y-%m-%d').date()
+        
+        if data.get('last_inspection_date'):
+            from datetime import datetime
+            equipment.last_inspection_date = datetime.strptime(data['last_inspection_date'], '%Y-%m-%d').date()
+        
+        if data.get('next_inspection_due'):
+            from datetime import datetime
+            equipment.next_inspection_due = datetime.strptime(data['next_inspection_due'], '%Y-%m-%d').date()
+        
+        # Handle numeric fields
+        if data.get('purchase_price'):
+            equipment.purchase_price = float(data['purchase_price'])
+        
+        # Handle JSON fields
+        if data.get('specifications'):
+            equipment.set_specifications(data['specifications'])
+        
+        if data.get('photos'):
+            equipment.set_photos(data['photos'])
+        
+        if data.get('documents'):
+            equipment.set_documents(data['documents'])
+        
+        # Validate boat ownership if boat_id provided
+        if equipment.boat_id:
+            boat = Boat.query.filter_by(id=equipment.boat_id, owner_id=user.id).first()
+            if not boat:
+                return jsonify({'error': 'Boat not found or not owned by user'}), 404
+        
+        db.session.add(equipment)
+        db.session.commit()
+        
+        return jsonify({
+            'message': 'Equipment created successfully',
+            'equipment': equipment.to_dict()
+        }), 201
+        
+    except ValueError as e:
+        return jsonify({'error': f'Invalid data format: {str(e)}'}), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': f'Failed to create equipment: {str(e)}'}), 500
+
+@bp.route('/api/equipment/<int:equipment_id>', methods=['GET'])
+@jwt_required()
+def get_equipment_by_id(equipment_id):
+    """Get specific equipment by ID"""
+    user = get_current_user()
+    if not user:
+        return jsonify({'error': 'User not found'}), 404
+    
+    equipment = Equipment.query.filter_by(id=equipment_id, owner_id=user.id).first()
+    if not equipment:
+        return jsonify({'error': 'Equipment not found'}), 404
+    
+    return object_response(equipment, equipment.to_dict)
+
+@bp.route('/api/equipment/<int:equipment_id>', methods=['PUT'])
+@jwt_required()
+def update_equipment(equipment_id):
+    """Update equipment"""
+    user = get_current_user()
+    if not user:
+        return jsonify({'error': 'User not found'}), 404
+    
+    equipment = Equipment.query.filter_by(id=equipment_id, owner_id=user.id).first()
+    if not equipment:
+        return jsonify({'error': 'Equipment not found'}), 404
+    
+    data = request.get_json()
+    if not data:
+        return jsonify({'error': 'No data provided'}), 400
+    
+    try:
+        # Update basic fields
+        if 'name' in data:
+            equipment.name = data['name']
+        if 'category' in data:
+            equipment.category = data['category']
+        if 'subcategory' in data:
+            equipment.subcategory = data['subcategory']
+        if 'brand' in data:
+            equipment.brand = data['brand']
+        if 'model' in data:
+            equipment.model = data['model']
+        if 'part_number' in data:
+            equipment.part_number = data['part_number']
+        if 'serial_number' in data:
+            equipment.serial_number = data['serial_number']
+        if 'purchase_location' in data:
+            equipment.purchase_location = data['purchase_location']
+        if 'warranty_period_months' in data:
+            equipment.warranty_period_months = data['warranty_period_months']
+        if 'location_on_boat' in data:
+            equipment.location_on_boat = data['location_on_boat']
+        if 'current_location' in data:
+            equipment.current_location = data['current_location']
+        if 'condition' in data:
+            equipment.condition = data['condition']
+        if 'is_operational' in data:
+            equipment.is_operational = data['is_operational']
+        if 'quantity' in data:
+            equipment.quantity = data['quantity']
+        if 'weight_lbs' in data:
+            equipment.weight_lbs = data['weight_lbs']
+        if 'dimensions' in data:
+            equipment.dimensions = data['dimensions']
+        if 'manual_url' in data:
+            equipment.manual_url = data['manual_url']
+        if 'notes' in data:
+            equipment.notes = data['notes']
+        
+        # Handle boat_id change with validation
+        if 'boat_id' in data:
+            if data['boat_id']:
+                boat = Boat.query.filter_by(id=data['boat_id'], owner_id=user.id).first()
+                if not boat:
+                    return jsonify({'error': 'Boat not found or not owned by user'}), 404
+                equipment.boat_id = data['boat_id']
+            else:
+                equipment.boat_id = None
+        
+        # Handle date fields
+        if 'purchase_date' in data:
+            if data['purchase_date']:
+                from datetime import datetime
+                equipment.purchase_date = datetime.strptime(data['purchase_date'], '%Y-%m-%d').date()
+            else:
+                equipment.purchase_date = None
+        
+        if 'warranty_expiry' in data:
+            if data['warranty_expiry']:
+                from datetime import datetime
+                equipment.warranty_expiry = datetime.strptime(data['warranty_expiry'], '%Y-%m-%d').date()
+            else:
+                equipment.warranty_expiry = None
+        
+        if 'last_inspection_date' in data:
+            if data['last_inspection_date']:
+                from datetime import datetime
+                equipment.last_inspection_date = datetime.strptime(data['last_inspection_date'], '%Y-%m-%d').date()
+            else:
+                equipment.last_inspection_date = None
+        
+        if 'next_inspection_due' in data:
+            if data['next_inspection_due']:
+                from datetime import datetime
+                equipment.next_inspection_due = datetime.strptime(data['next_inspection_due'], '%Y-%m-%d').date()
+            else:
+                equipment.next_inspection_due = None
+        
+        # Handle numeric fields
+        if 'purchase_price' in data:
+            equipment.purchase_price = float(data['purchase_price']) if data['purchase_price'] else None
+        
+        # Handle JSON fields
+        if 'specifications' in data:
+            equipment.set_specifications(data['specifications'])
+        
+        if 'photos' in data:
+            equipment.set_photos(data['photos'])
+        
+        if 'documents' in data:
+            equipment.set_documents(data['documents'])
+        
+        db.session.commit()
+        
+        return jsonify({
+            'message': 'Equipment updated successfully',
+            'equipment': equipment.to_dict()
+        })
+        
+    except ValueError as e:
+        return jsonify({'error': f'Invalid data format: {str(e)}'}), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': f'Failed to update equipment: {str(e)}'}), 500
+
+@bp.route('/api/equipment/<int:equipment_id>', methods=['DELETE'])
+@jwt_required()
+def delete_equipment(equipment_id):
+    """Delete equipment"""
+    user = get_current_user()
+    if not user:
+        return jsonify({'error': 'User not found'}), 404
+    
+    equipment = Equipment.query.filter_by(id=equipment_id, owner_id=user.id).first()
+    if not equipment:
+        return jsonify({'error': 'Equipment not found'}), 404
+    
+    db.session.delete(equipment)
+    db.session.commit()
+    
+    return jsonify({'message': 'Equipment deleted successfully'})
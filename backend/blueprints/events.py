@@ -0,0 +1,313 @@
+"""
+Event CRUD endpoints (events module)
+"""
+
+from datetime import datetime, timedelta
+from flask import Blueprint, Response, current_app, jsonify, request
+from flask_jwt_extended import jwt_required
+from models import db, Event
+from auth import get_current_user
+from list_query import ListQueryError, paginated_response
+from http_cache import object_response, payload_response
+import event_calendar
+
+bp = Blueprint('events', __name__)
+
+@bp.route('/api/events', methods=['GET'])
+@jwt_required()
+def get_events():
+    """Get all events (public events + events created by user), or with from/to the occurrences in a window"""
+    user = get_current_user()
+    if not user:
+        return jsonify({'error': 'User not found'}), 404
+
+    if 'from' in request.args or 'to' in request.args:
+        return get_calendar(user)
+    
+    # Get public events and events created by user
+    events = Event.query.filter(
+        db.or_(
+            Event.is_public == True,
+            Event.created_by == user.id
+        )
+    )
+    
+    try:
+        return paginated_response(
+            events,
+            Event,
+            'events',
+            filters={'status': Event.status, 'event_type': Event.event_type},
+            date_column=Event.start_date
+        )
+    except ListQueryError as e:
+        return jsonify({'error': str(e)}), 400
+
+def get_calendar(user):
+    """Occurrences of the events the user can see in [from, to), recurring events expanded"""
+    try:
+        window_start, window_end = event_calendar.parse_window(
+            request.args.get('from'), request.args.get('to'), current_app.config['EVENTS_MAX_WINDOW_DAYS'])
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    events = event_calendar.calendar(user.id, window_start, window_end)
+    return payload_response({
+        'events': events,
+        'count': len(events),
+        'from': window_start.isoformat(),
+        'to': window_end.isoformat()
+    })
+
+@bp.route('/api/events/calendar.ics', methods=['GET'])
+@jwt_required()
+def get_events_feed():
+    """Export the events the user can see as an iCalendar file"""
+    user = get_current_user()
+    if not user:
+        return jsonify({'error': 'User not found'}), 404
+
+    # Without from, leave out events that ended more than EVENTS_FEED_PAST_DAYS ago
+    default_start = datetime.utcnow() - timedelta(days=current_app.config['EVENTS_FEED_PAST_DAYS'])
+    try:
+        window_start, window_end = event_calendar.parse_window(
+            request.args.get('from'), request.args.get('to'), None, default_start)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    feed = event_calendar.ical_feed(event_calendar.feed_events(user.id, window_start, window_end), request.host)
+    return Response(feed, mimetype='text/calendar', headers={
+        'Content-Disposition': 'attachment; filename=events.ics',
+        'Cache-Control': 'private, no-cache'
+    })
+
+@bp.route('/api/events', methods=['POST'])
+@jwt_required()
+def create_event():
+    """Create a new event"""
+    user = get_current_user()
+    if not user:
+        return jsonify({'error': 'User not found'}), 404
+    
+    data = request.get_json()
+    if not data or not data.get('name') or not data.get('start_date'):
+        return jsonify({'error': 'Event name and start date are required'}), 400
+    
+    try:
+        # Create new event
+        event = Event(
+            name=data['name'],
+            event_type=data.get('event_type'),
+            description=data.get('description'),
+            location=data.get('location'),
+            venue=data.get('venue'),
+            all_day=data.get('all_day', False),
+            timezone=data.get('timezone', 'UTC'),
+            organizer=data.get('organizer'),
+            organizer_contact=data.get('organizer_contact'),
+            website=data.get('website'),
+            registration_required=data.get('registration_required', False),
+            max_participants=data.get('max_participants'),
+            current_participants=data.get('current_participants', 0),
+            skill_level_required=data.get('skill_level_required'),
+            age_restrictions=data.get('age_restrictions'),
+            weather_dependent=data.get('weather_dependent', True),
+            notes=data.get('notes'),
+            status=data.get('status', 'Scheduled'),
+            is_public=data.get('is_public', True),
+            created_by=user.id
+        )
+        
+        # Handle datetime fields
+        from datetime import datetime
+        event.start_date = datetime.fromisoformat(data['start_date'].replace('Z', '+00:00'))
+        
+        if data.get('end_date'):
+            event.end_date = datetime.fromisoformat(data['end_date'].replace('Z', '+00:00'))
+        
+        if data.get('registration_deadline'):
+            event.registration_deadline = datetime.fromisoformat(data['registration_deadline'].replace('Z', '+00:00'))
+        
+        if data.get('backup_date'):
+            event.backup_date = datetime.fromisoformat(data['backup_date'].replace('Z', '+00:00'))
+        
+        # Handle recurrence (see event_calendar.py)
+        if data.get('recurrence'):
+            event_calendar.set_recurrence(event, data['recurrence'])
+        
+        # Handle numeric fields
+        if data.get('registration_fee'):
+            event.registration_fee = float(data['registration_fee'])
+        
+        # Handle JSON fields
+        if data.get('boat_requirements'):
+            event.set_boat_requirements(data['boat_requirements'])
+        
+        if data.get('prizes'):
+            event.set_prizes(data['prizes'])
+        
+        db.session.add(event)
+        db.session.commit()
+        
+        return jsonify({
+            'message': 'Event created successfully',
+            'event': event.to_dict()
+        }), 201
+        
+    except ValueError as e:
+        return jsonify({'error': f'Invalid data format: {str(e)}'}), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': f'Failed to create event: {str(e)}'}), 500
+
+@bp.route('/api/events/<int:event_id>', methods=['GET'])
+@jwt_required()
+def get_event_by_id(event_id):
+    """Get specific event by ID"""
+    user = get_current_user()
+    if not user:
+        return jsonify({'error': 'User not found'}), 404
+    
+    # Get public events or events created by user
+    event = Event.query.filter(
+        Event.id == event_id,
+        db.or_(
+            Event.is_public == True,
+            Event.created_by == user.id
+        )
+    ).first()
+    
+    if not event:
+        return jsonify({'error': 'Event not found'}), 404
+    
+    return object_response(event, event.to_dict)
+
+@bp.route('/api/events/<int:event_id>', methods=['PUT'])
+@jwt_required()
+def update_event(event_id):
+    """Update event (only creator can edit)"""
+    user = get_current_user()
+    if not user:
+        return jsonify({'error': 'User not found'}), 404
+    
+    event = Event.query.filter_by(id=event_id, created_by=user.id).first()
+    if not event:
+        return jsonify({'error': 'Event not found or not owned by user'}), 404
+    
+    data = request.get_json()
+    if not data:
+        return jsonify({'error': 'No data provided'}), 400
+    
+    try:
+        # Update basic fields
+        if 'name' in data:
+            event.name = data['name']
+        if 'event_type' in data:
+            event.event_type = data['event_type']
+        if 'description' in data:
+            event.description = data['description']
+        if 'location' in data:
+            event.location = data['location']
+        if 'venue' in data:
+            event.venue = data['venue']
+        if 'all_day' in data:
+            event.all_day = data['all_day']
+        if 'timezone' in data:
+            event.timezone = data['timezone']
+        if 'organizer' in data:
+            event.organizer = data['organizer']
+        if 'organizer_contact' in data:
+            event.organizer_contact = data['organizer_contact']
+        if 'website' in data:
+            event.website = data['website']
+        if 'registration_required' in data:
+            event.registration_required = data['registration_required']
+        if 'max_participants' in data:
+            event.max_participants = data['max_participants']
+        if 'current_participants' in data:
+            event.current_participants = data['current_participants']
+        if 'skill_level_required' in data:
+            event.skill_level_required = data['skill_level_required']
+        if 'age_restrictions' in data:
+            event.age_restrictions = data['age_restrictions']
+        if 'weather_dependent' in data:
+            event.weather_dependent = data['weather_dependent']
+        if 'notes' in data:
+            event.notes = data['notes']
+        if 'status' in data:
+            event.status = data['status']
+        if 'is_public' in data:
+            event.is_public = data['is_public']
+        
+        # Handle datetime fields
+        if 'start_date' in data:
+            from datetime import datetime
+            event.start_date = datetime.fromisoformat(data['start_date'].replace('Z', '+00:00'))
+        
+        if 'end_date' in data:
+            if data['end_date']:
+                from datetime import datetime
+                event.end_date = datetime.fromisoformat(data['end_date'].replace('Z', '+00:00'))
+            else:
+                event.end_date = None
+        
+        if 'registration_deadline' in data:
+            if data['registration_deadline']:
+                from datetime import datetime
+                event.registration_deadline = datetime.fromisoformat(data['registration_deadline'].replace('Z', '+00:00'))
+            else:
+                event.registration_deadline = None
+        
+        if 'backup_date' in data:
+            if data['backup_date']:
+                from datetime import datetime
+                event.backup_date = datetime.fromisoformat(data['backup_date'].replace('Z', '+00:00'))
+            else:
+                event.backup_date = None
+        
+        # Handle recurrence; its end moves with the event's dates
+        if 'recurrence' in data:
+            event_calendar.set_recurrence(event, data['recurrence'])
+        elif 'start_date' in data or 'end_date' in data:
+            event_calendar.refresh_series_end(event)
+        
+        # Handle numeric fields
+        if 'registration_fee' in data:
+            event.registration_fee = float(data['registration_fee']) if data['registration_fee'] else None
+        
+        # Handle JSON fields
+        if 'boat_requirements' in data:
+            event.set_boat_requirements(data['boat_requirements'])
+        
+        if 'prizes' in data:
+            event.set_prizes(data['prizes'])
+        
+        db.session.commit()
+        
+        return jsonify({
+            'message': 'Event updated successfully',
+            'event': event.to_dict()
+        })
+        
+    except ValueError as e:
+        return jsonify({'error': f'Invalid data format: {str(e)}'}), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': f'Failed to update event: {str(e)}'}), 500
+
+@bp.route('/api/events/<int:event_id>', methods=['DELETE'])
+@jwt_required()
+def delete_event(event_id):
+    """Delete event (only creator can delete)"""
+    user = get_current_user()
+    if not user:
+        return jsonify({'error': 'User not found'}), 404
+    
+    event = Event.query.filter_by(id=event_id, created_by=user.id).first()
+    if not event:
+        return jsonify({'error': 'Event not found or not owned by user'}), 404
+    
+    db.session.delete(event)
+    db.session.commit()
+    
+    return jsonify({'message': 'Event deleted successfully'})
@@ -0,0 +1,319 @@
+"""
+Maintenance record CRUD endpoints (maintenance module)
+"""
+
+from datetime import date, timedelta
+from flask import Blueprint, jsonify, request
+from flask_jwt_extended import jwt_required
+from models import db, Boat, Equipment, MaintenanceRecord
+from auth import get_current_user
+from list_query import ListQueryError, paginated_response
+from http_cache import object_response, payload_response
+import maintenance_schedule
+
+bp = Blueprint('maintenance', __name__)
+
+@bp.route('/api/maintenance', methods=['GET'])
+@jwt_required()
+def get_maintenance_records():
+    """Get all maintenance records for current user's boats and equipment"""
+    user = get_current_user()
+    if not user:
+        return jsonify({'error': 'User not found'}), 404
+    
+    # Maintenance records for user's boats or equipment, scoped in SQL
+    maintenance_records = MaintenanceRecord.query_for_user(user.id)
+    
+    try:
+        return paginated_response(
+            maintenance_records,
+            MaintenanceRecord,
+            'maintenance_records',
+            filters={
+                'status': MaintenanceRecord.status,
+                'boat_id': MaintenanceRecord.boat_id,
+                'equipment_id': MaintenanceRecord.equipment_id,
+                'maintenance_type': MaintenanceRecord.maintenance_type,
+                'priority': MaintenanceRecord.priority
+            },
+            date_column=MaintenanceRecord.date_performed
+        )
+    except ListQueryError as e:
+        return jsonify({'error': str(e)}), 400
+
+@bp.route('/api/maintenance/due', methods=['GET'])
+@jwt_required()
+def get_due_maintenance():
+    """Get recurring maintenance due across the user's fleet, overdue first"""
+    user = get_current_user()
+    if not user:
+        return jsonify({'error': 'User not found'}), 404
+
+    try:
+        within = maintenance_schedule.parse_within(request.args.get('within', '30d'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    # One range scan over the materialized schedule (see maintenance_schedule.py)
+    today = date.today()
+    until = today + timedelta(days=within)
+    due = maintenance_schedule.due_items(maintenance_schedule.due_query(user.id, until), today)
+    return payload_response({
+        'due': due,
+        'count': len(due),
+        'as_of': today.isoformat(),
+        'until': until.isoformat()
+    })
+
+@bp.route('/api/maintenance', methods=['POST'])
+@jwt_required()
+def create_maintenance_record():
+    """Create a new maintenance record"""
+    user = get_current_user()
+    if not user:
+        return jsonify({'error': 'User not found'}), 404
+    
+    data = request.get_json()
+    if not data or not data.get('title') or not data.get('description'):
+        return jsonify({'error': 'Title and description are required'}), 400
+    
+    try:
+        # Create new maintenance record
+        maintenance = MaintenanceRecord(
+            title=data['title'],
+            description=data['description'],
+            maintenance_type=data.get('maintenance_type', 'Routine'),
+            performed_by=data.get('performed_by'),
+            performed_by_type=data.get('performed_by_type', 'Self'),
+            location=data.get('location'),
+            currency=data.get('currency', 'USD'),
+            status=data.get('status', 'Completed'),
+            priority=data.get('priority', 'Medium'),
+            warranty_work=data.get('warranty_work', False),
+            notes=data.get('notes'),
+            created_by=user.id
+        )
+        
+        # Handle optional boat_id and equipment_id
+        if data.get('boat_id'):
+            boat = Boat.query.filter_by(id=data['boat_id'], owner_id=user.id).first()
+            if not boat:
+                return jsonify({'error': 'Boat not found or not owned by user'}), 404
+            maintenance.boat_id = data['boat_id']
+        
+        if data.get('equipment_id'):
+            equipment = Equipment.query.filter_by(id=data['equipment_id'], owner_id=user.id).first()
+            if not equipment:
+                return jsonify({'error': 'Equipment not found or not owned by user'}), 404
+            maintenance.equipment_id = data['equipment_id']
+        
+        # Require at least boat_id or equipment_id
+        if not maintenance.boat_id and not maintenance.equipment_id:
+            return jsonify({'error': 'Either boat_id or equipment_id is required'}), 400
+        
+        # Handle date fields
+        if data.get('date_performed'):
+            from datetime import datetime
+            maintenance.date_performed = datetime.strptime(data['date_performed'], '%Y-%m-%d').date()
+        else:
+            from datetime import date
+            maintenance.date_performed = date.today()
+        
+        if data.get('next_maintenance_due'):
+            from datetime import datetime
+            maintenance.next_maintenance_due = datetime.strptime(data['next_maintenance_due'], '%Y-%m-%d').date()
+        
+        # Handle numeric fields
+        if data.get('cost'):
+            maintenance.cost = float(data['cost'])
+        if data.get('labor_hours'):
+            maintenance.labor_hours = float(data['labor_hours'])
+        if data.get('parts_cost'):
+            maintenance.parts_cost = float(data['parts_cost'])
+        if data.get('labor_cost'):
+            maintenance.labor_cost = float(data['labor_cost'])
+        if data.get('next_maintenance_hours'):
+            maintenance.next_maintenance_hours = float(data['next_maintenance_hours'])
+        if data.get('maintenance_interval_days'):
+            maintenance.maintenance_interval_days = int(data['maintenance_interval_days'])
+        if data.get('maintenance_interval_hours'):
+            maintenance.maintenance_interval_hours = float(data['maintenance_interval_hours'])
+        
+        # Handle JSON fields
+        if data.get('parts_used'):
+            maintenance.set_parts_used(data['parts_used'])
+        
+        if data.get('photos'):
+            maintenance.set_photos(data['photos'])
+        
+        if data.get('documents'):
+            maintenance.set_documents(data['documents'])
+        
+        db.session.add(maintenance)
+        db.session.commit()
+        
+        return jsonify({
+            'message': 'Maintenance record created successfully',
+            'maintenance_record': maintenance.to_dict()
+        }), 201
+        
+    except ValueError as e:
+        return jsonify({'error': f'Invalid data format: {str(e)}'}), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': f'Failed to create maintenance record: {str(e)}'}), 500
+
+@bp.route('/api/maintenance/<int:maintenance_id>', methods=['GET'])
+@jwt_required()
+def get_maintenance_record_by_id(maintenance_id):
+    """Get specific maintenance record by ID"""
+    user = get_current_user()
+    if not user:
+        return jsonify({'error': 'User not found'}), 404
+    
+    # Access control: the record must be on the user's boats or equipment, or created by them
+    maintenance = MaintenanceRecord.query_for_user(user.id).filter(
+        MaintenanceRecord.id == maintenance_id
+    ).first()
+    
+    if not maintenance:
+        return jsonify({'error': 'Maintenance record not found'}), 404
+    
+    return object_response(maintenance, maintenance.to_dict)
+
+@bp.route('/api/maintenance/<int:maintenance_id>', methods=['PUT'])
+@jwt_required()
+def update_maintenance_record(maintenance_id):
+    """Update maintenance record"""
+    user = get_current_user()
+    if not user:
+        return jsonify({'error': 'User not found'}), 404
+    
+    # Access control: the record must be on the user's boats or equipment, or created by them
+    maintenance = MaintenanceRecord.query_for_user(user.id).filter(
+        MaintenanceRecord.id == maintenance_id
+    ).first()
+    
+    if not maintenance:
+        return jsonify({'error': 'Maintenance record not found'}), 404
+    
+    data = request.get_json()
+    if not data:
+        return jsonify({'error': 'No data provided'}), 400
+    
+    try:
+        # Update basic fields
+        if 'title' in data:
+            maintenance.title = data['title']
+        if 'description' in data:
+            maintenance.description = data['description']
+        if 'maintenance_type' in data:
+            maintenance.maintenance_type = data['maintenance_type']
+        if 'performed_by' in data:
+            maintenance.performed_by = data['performed_by']
+        if 'performed_by_type' in data:
+            maintenance.performed_by_type = data['performed_by_type']
+        if 'location' in data:
+            maintenance.location = data['location']
+        if 'currency' in data:
+            maintenance.currency = data['currency']
+        if 'status' in data:
+            maintenance.status = data['status']
+        if 'priority' in data:
+            maintenance.priority = data['priority']
+        if 'warranty_work' in data:
+            maintenance.warranty_work = data['warranty_work']
+        if 'notes' in data:
+            maintenance.notes = data['notes']
+        
+        # Handle boat_id and equipment_id changes with validation
+        if 'boat_id' in data:
+            if data['boat_id']:
+                boat = Boat.query.filter_by(id=data['boat_id'], owner_id=user.id).first()
+                if not boat:
+                    return jsonify({'error': 'Boat not found or not owned by user'}), 404
+                maintenance.boat_id = data['boat_id']
+            else:
+                maintenance.boat_id = None
+        
+        if 'equipment_id' in data:
+            if data['equipment_id']:
+                equipment = Equipment.query.filter_by(id=data['equipment_id'], owner_id=user.id).first()
+                if not equipment:
+                    return jsonify({'error': 'Equipment not found or not owned by user'}), 404
+                maintenance.equipment_id = data['equipment_id']
+            else:
+                maintenance.equipment_id = None
+        
+        # Handle date fields
+        if 'date_performed' in data:
+            if data['date_performed']:
+                from datetime import datetime
+                maintenance.date_performed = datetime.strptime(data['date_performed'], '%Y-%m-%d').date()
+        
+        if 'next_maintenance_due' in data:
+            if data['next_maintenance_due']:
+                from datetime import datetime
+                maintenance.next_maintenance_due = datetime.strptime(data['next_maintenance_due'], '%Y-%m-%d').date()
+            else:
+                maintenance.next_maintenance_due = None
+        
+        # Handle numeric fields
+        if 'cost' in data:
+            maintenance.cost = float(data['cost']) if data['cost'] else None
+        if 'labor_hours' in data:
+            maintenance.labor_hours = float(data['labor_hours']) if data['labor_hours'] else None
+        if 'parts_cost' in data:
+            maintenance.parts_cost = float(data['parts_cost']) if data['parts_cost'] else None
+        if 'labor_cost' in data:
+            maintenance.labor_cost = float(data['labor_cost']) if data['labor_cost'] else None
+        if 'next_maintenance_hours' in data:
+            maintenance.next_maintenance_hours = float(data['next_maintenance_hours']) if data['next_maintenance_hours'] else None
+        if 'maintenance_interval_days' in data:
+            maintenance.maintenance_interval_days = int(data['maintenance_interval_days']) if data['maintenance_interval_days'] else None
+        if 'maintenance_interval_hours' in data:
+            maintenance.maintenance_interval_hours = float(data['maintenance_interval_hours']) if data['maintenance_interval_hours'] else None
+        
+        # Handle JSON fields
+        if 'parts_used' in data:
+            maintenance.set_parts_used(data['parts_used'])
+        
+        if 'photos' in data:
+            maintenance.set_photos(data['photos'])
+        
+        if 'documents' in data:
+            maintenance.set_documents(data['documents'])
+        
+        db.session.commit()
+        
+        return jsonify({
+            'message': 'Maintenance record updated successfully',
+            'maintenance_record': maintenance.to_dict()
+        })
+        
+    except ValueError as e:
+        return jsonify({'error': f'Invalid data format: {str(e)}'}), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': f'Failed to update maintenance record: {str(e)}'}), 500
+
+@bp.route('/api/maintenance/<int:maintenance_id>', methods=['DELETE'])
+@jwt_required()
+def delete_maintenance_record(maintenance_id):
+    """Delete maintenance record"""
+    user = get_current_user()
+    if not user:
+        return jsonify({'error': 'User not found'}), 404
+    
+    # Access control: the record must be on the user's boats or equipment, or created by them
+    maintenance = MaintenanceRecord.query_for_user(user.id).filter(
+        MaintenanceRecord.id == maintenance_id
+    ).first()
+    
+    if not maintenance:
+        return jsonify({'error': 'Maintenance record not found'}), 404
+    
+    db.session.delete(maintenance)
+    db.session.commit()
+    
+    return jsonify({'message': 'Maintenance record deleted successfully'})
@@ -0,0 +1,351 @@
+"""
+Trip CRUD, GPS track upload, route and track job endpoints (trips module)
+"""
+
+import os
+import uuid
+from flask import Blueprint, current_app, jsonify, request
+from flask_jwt_extended import jwt_required
+from sqlalchemy.orm import defer
+from models import db, Boat, Trip, TripRouteLevel, ProcessingJob
+from auth import get_current_user
+from gps_import import detect_track_format
+from jobs import enqueue_job
+from track_simplify import closest_route_level
+from list_query import ListQueryError, paginated_response
+from http_cache import object_response
+
+bp = Blueprint('trips', __name__)
+
+# ============================================================
+# TRIPS CRUD API ENDPOINTS
+# ============================================================
+
+@bp.route('/api/trips', methods=['GET'])
+@jwt_required()
+def get_trips():
+    """Get all trips for current user"""
+    user = get_current_user()
+    if not user:
+        return jsonify({'error': 'User not found'}), 404
+    
+    # Get trips where user is captain or participant
+    try:
+        return paginated_response(
+            Trip.query.filter_by(captain_id=user.id),
+            Trip,
+            'trips',
+            filters={'status': Trip.status, 'boat_id': Trip.boat_id, 'trip_type': Trip.trip_type},
+            date_column=Trip.start_date
+        )
+    except ListQueryError as e:
+        return jsonify({'error': str(e)}), 400
+
+@bp.route('/api/trips', methods=['POST'])
+@jwt_required()
+def create_trip():
+    """Create a new trip"""
+    user = get_current_user()
+    if not user:
+        return jsonify({'error': 'User not found'}), 404
+    
+    data = request.get_json()
+    if not data or not data.get('name') or not data.get('boat_id') or not data.get('start_date'):
+        return jsonify({'error': 'Trip name, boat ID, and start date are required'}), 400
+    
+    # Verify boat ownership
+    boat = Boat.query.filter_by(id=data['boat_id'], owner_id=user.id).first()
+    if not boat:
+        return jsonify({'error': 'Boat not found or not owned by user'}), 404
+    
+    # Create new trip
+    from datetime import datetime
+    try:
+        start_date = datetime.fromisoformat(data['start_date'].replace('Z', '+00:00'))
+    except ValueError:
+        return jsonify({'error': 'Invalid start date format'}), 400
+    
+    trip = Trip(
+        name=data['name'],
+        description=data.get('description'),
+        trip_type=data.get('trip_type', 'Leisure'),
+        boat_id=data['boat_id'],
+        captain_id=user.id,
+        crew_size=data.get('crew_size', 1),
+        start_date=start_date,
+        planned_duration_hours=data.get('planned_duration_hours'),
+        start_location=data.get('start_location'),
+        end_location=data.get('end_location'),
+        start_latitude=data.get('start_latitude'),
+        start_longitude=data.get('start_longitude'),
+        end_latitude=data.get('end_latitude'),
+        end_longitude=data.get('end_longitude'),
+        status=data.get('status', 'Planned'),
+        purpose=data.get('purpose'),
+        difficulty_level=data.get('difficulty_level', 'Moderate'),
+        emergency_contact=data.get('emergency_contact'),
+        float_plan_filed=data.get('float_plan_filed', False),
+        float_plan_with=data.get('float_plan_with'),
+        safety_equipment_check=data.get('safety_equipment_check', False),
+        notes=data.get('notes')
+    )
+    
+    # Handle end date
+    if data.get('end_date'):
+        try:
+            trip.end_date = datetime.fromisoformat(data['end_date'].replace('Z', '+00:00'))
+        except ValueError:
+            pass
+    
+    # Handle complex fields
+    if data.get('weather_conditions'):
+        trip.set_weather_conditions(data['weather_conditions'])
+    
+    if data.get('cost_breakdown'):
+        trip.set_cost_breakdown(data['cost_breakdown'])
+    
+    if data.get('photos'):
+        trip.set_photos(data['photos'])
+    
+    if data.get('documents'):
+        trip.set_documents(data['documents'])
+    
+    if data.get('logbook_entries'):
+        trip.set_logbook_entries(data['logbook_entries'])
+    
+    if data.get('tags'):
+        trip.set_tags(data['tags'])
+    
+    db.session.add(trip)
+    db.session.commit()
+    
+    return jsonify({
+        'message': 'Trip created successfully',
+        'trip': trip.to_dict()
+    }), 201
+
+@bp.route('/api/trips/<int:trip_id>', methods=['GET'])
+@jwt_required()
+def get_trip(trip_id):
+    """Get specific trip details"""
+    user = get_current_user()
+    if not user:
+        return jsonify({'error': 'User not found'}), 404
+    
+    trip = Trip.query.filter_by(id=trip_id, captain_id=user.id).first()
+    if not trip:
+        return jsonify({'error': 'Trip not found'}), 404
+    
+    return object_response(trip, lambda: {'trip': trip.to_dict()})
+
+@bp.route('/api/trips/<int:trip_id>', methods=['PUT'])
+@jwt_required()
+def update_trip(trip_id):
+    """Update trip details"""
+    user = get_current_user()
+    if not user:
+        return jsonify({'error': 'User not found'}), 404
+    
+    trip = Trip.query.filter_by(id=trip_id, captain_id=user.id).first()
+    if not trip:
+        return jsonify({'error': 'Trip not found'}), 404
+    
+    data = request.get_json()
+    if not data:
+        return jsonify({'error': 'No data provided'}), 400
+    
+    # Update basic fields
+    basic_fields = [
+        'name', 'description', 'trip_type', 'crew_size', 'planned_duration_hours',
+        'actual_duration_hours', 'start_location', 'end_location', 'start_latitude',
+        'start_longitude', 'end_latitude', 'end_longitude', 'distance_miles',
+        'max_speed_knots', 'avg_speed_knots', 'max_wind_speed_knots', 'avg_wind_speed_knots',
+        'wind_direction', 'sea_conditions', 'visibility', 'tide_conditions',
+        'fuel_used_gallons', 'fuel_cost', 'status', 'purpose', 'difficulty_level',
+        'emergency_contact', 'float_plan_filed', 'float_plan_with', 'safety_equipment_check',
+        'total_cost', 'lessons_learned', 'highlights', 'challenges_faced',
+        'overall_rating', 'would_repeat', 'is_public', 'is_favorite', 'notes'
+    ]
+    
+    for field in basic_fields:
+        if field in data:
+            setattr(trip, field, data[field])
+    
+    # Handle date fields
+    from datetime import datetime
+    if 'start_date' in data and data['start_date']:
+        try:
+            trip.start_date = datetime.fromisoformat(data['start_date'].replace('Z', '+00:00'))
+        except ValueError:
+            pass
+    
+    if 'end_date' in data:
+        if data['end_date']:
+            try:
+                trip.end_date = datetime.fromisoformat(data['end_date'].replace('Z', '+00:00'))
+            except ValueError:
+                pass
+        else:
+            trip.end_date = None
+    
+    # Handle complex fields
+    if 'weather_conditions' in data:
+        trip.set_weather_conditions(data['weather_conditions'])
+    
+    if 'cost_breakdown' in data:
+        trip.set_cost_breakdown(data['cost_breakdown'])
+    
+    if 'photos' in data:
+        trip.set_photos(data['photos'])
+    
+    if 'documents' in data:
+        trip.set_documents(data['documents'])
+    
+    if 'logbook_entries' in data:
+        trip.set_logbook_entries(data['logbook_entries'])
+    
+    if 'tags' in data:
+        trip.set_tags(data['tags'])
+    
+    db.session.commit()
+    
+    return jsonify({
+        'message': 'Trip updated successfully',
+        'trip': trip.to_dict()
+    })
+
+@bp.route('/api/trips/<int:trip_id>', methods=['DELETE'])
+@jwt_required()
+def delete_trip(trip_id):
+    """Delete trip"""
+    user = get_current_user()
+    if not user:
+        return jsonify({'error': 'User not found'}), 404
+    
+    trip = Trip.query.filter_by(id=trip_id, captain_id=user.id).first()
+    if not trip:
+        return jsonify({'error': 'Trip not found'}), 404
+    
+    # Hard delete trip and related GPS points, track chunks, route levels and jobs
+    from models import GPSRoutePoint, TripTrackChunk
+    GPSRoutePoint.query.filter_by(trip_id=trip.id).delete()
+    TripTrackChunk.query.filter_by(trip_id=trip.id).delete()
+    TripRouteLevel.query.filter_by(trip_id=trip.id).delete()
+    ProcessingJob.query.filter_by(trip_id=trip.id).delete()
+    gps_file_path = trip.gps_file_path
+    
+    db.session.delete(trip)
+    db.session.commit()
+    
+    if gps_file_path and os.path.exists(gps_file_path):
+        os.remove(gps_file_path)
+    
+    return jsonify({'message': 'Trip deleted successfully'})
+
+@bp.route('/api/trips/<int:trip_id>/track', methods=['POST'])
+@jwt_required()
+def upload_trip_track(trip_id):
+    """Upload a GPX, KML or NMEA track file for a trip (processed in the background)"""
+    user = get_current_user()
+    if not user:
+        return jsonify({'error': 'User not found'}), 404
+
+    trip = Trip.query.filter_by(id=trip_id, captain_id=user.id).first()
+    if not trip:
+        return jsonify({'error': 'Trip not found'}), 404
+
+    upload = request.files.get('file')
+    if not upload or not upload.filename:
+        return jsonify({'error': 'Track file is required'}), 400
+
+    file_format = detect_track_format(upload.filename, request.form.get('format'))
+    if not file_format:
+        return jsonify({'error': 'Unsupported track format. Use gpx, kml or nmea'}), 400
+
+    try:
+        # Stream the upload to disk; parsing happens in track_worker.py
+        upload_folder = current_app.config['GPS_UPLOAD_FOLDER']
+        os.makedirs(upload_folder, exist_ok=True)
+        file_path = os.path.join(upload_folder, f'trip_{trip.id}_{uuid.uuid4().hex}.{file_format}')
+        upload.save(file_path)
+
+        previous_path = trip.gps_file_path
+        trip.gps_file_path = file_path
+        trip.gps_file_name = upload.filename[:255]
+        trip.gps_file_size = os.path.getsize(file_path)
+        trip.gps_file_type = file_format
+        trip.route_processed = False
+
+        job = enqueue_job(trip, 'import_track', created_by=user.id)
+        db.session.commit()
+
+        # Replace the previous upload for this trip
+        if previous_path and previous_path != file_path and os.path.exists(previous_path):
+            os.remove(previous_path)
+
+        return jsonify({
+            'message': 'Track uploaded, processing queued',
+            'job': job.to_dict(),
+            'trip': trip.to_dict()
+        }), 202
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': f'Failed to upload track: {str(e)}'}), 500
+
+@bp.route('/api/trips/<int:trip_id>/route', methods=['GET'])
+@jwt_required()
+def get_trip_route(trip_id):
+    """Get the precomputed simplified route closest to the requested tolerance (meters)"""
+    user = get_current_user()
+    if not user:
+        return jsonify({'error': 'User not found'}), 404
+
+    trip = Trip.query.filter_by(id=trip_id, captain_id=user.id).first()
+    if not trip:
+        return jsonify({'error': 'Trip not found'}), 404
+
+    tolerance = request.args.get('tolerance')
+    if tolerance is not None:
+        try:
+            tolerance = float(tolerance)
+        except ValueError:
+            return jsonify({'error': 'Tolerance must be a number of meters'}), 400
+        if tolerance <= 0:
+            return jsonify({'error': 'Tolerance must be greater than zero'}), 400
+
+    # Load level metadata first so only the chosen polyline is read
+    levels = TripRouteLevel.query.filter_by(trip_id=trip.id).options(
+        defer(TripRouteLevel.coordinates)
+    ).order_by(TripRouteLevel.tolerance_meters).all()
+    level = closest_route_level(levels, tolerance)
+    if not level:
+        return jsonify({'error': 'Route has not been processed yet'}), 404
+
+    return jsonify({
+        'route': level.to_dict(),
+        'available_tolerances': [item.tolerance_meters for item in levels]
+    })
+
+# ============================================================
+# BACKGROUND JOB API ENDPOINTS
+# ============================================================
+
+@bp.route('/api/jobs/<int:job_id>', methods=['GET'])
+@jwt_required()
+def get_job(job_id):
+    """Get status of a background job (owner or admin)"""
+    user = get_current_user()
+    if not user:
+        return jsonify({'error': 'User not found'}), 404
+    
+    job = ProcessingJob.query.get(job_id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    
+    # Users can see jobs for their own trips; admins can see everything
+    owns_trip = job.trip is not None and job.trip.captain_id == user.id
+    if not (user.is_admin or owns_trip or job.created_by == user.id):
+        return jsonify({'error': 'Job not found'}), 404
+    
+    return jsonify({'job': job.to_dict()})
@@ -0,0 +1,136 @@
+"""
+Per-user module and preference endpoints (always loaded)
+"""
+
+from flask import Blueprint, jsonify, request
+from flask_jwt_extended import jwt_required
+from models import db, SystemModule, UserModulePermission, UserPreference
+from auth import get_current_user
+import module_access
+import preferences
+from http_cache import payload_response
+
+bp = Blueprint('users', __name__)
+
+# ============================================================
+# USER MODULE PREFERENCE API ENDPOINTS
+# ============================================================
+
+@bp.route('/api/user/modules', methods=['GET'])
+@jwt_required()
+def get_user_available_modules():
+    """Get current user's available modules"""
+    user = get_current_user()
+    if not user:
+        return jsonify({'error': 'User not found'}), 404
+    
+    # Active, granted modules in navigation order (cached per user, see module_access.py)
+    available_modules = module_access.available_modules(user)
+    
+    return payload_response({
+        'modules': available_modules,
+        'count': len(available_modules)
+    })
+
+@bp.route('/api/user/modules/<int:module_id>/toggle', methods=['PUT'])
+@jwt_required()
+def toggle_user_module(module_id):
+    """Enable/disable module for current user"""
+    user = get_current_user()
+    if not user:
+        return jsonify({'error': 'User not found'}), 404
+    
+    permission = UserModulePermission.query.filter_by(
+        user_id=user.id, module_id=module_id
+    ).first()
+    
+    if not permission:
+        return jsonify({'error': 'You do not have permission for this module'}), 403
+    
+    # Don't allow disabling core modules
+    module = SystemModule.query.get(module_id)
+    if module and module.name in ['dashboard']:
+        return jsonify({'error': f'Cannot disable core module: {module.name}'}), 400
+    
+    # Toggle the enabled state
+    permission.is_enabled = not permission.is_enabled
+    db.session.commit()
+    
+    return jsonify({
+        'message': f'Module {"enabled" if permission.is_enabled else "disabled"} successfully',
+        'module': {
+            **module.to_dict(),
+            'is_enabled': permission.is_enabled
+        }
+    })
+
+# ============================================================
+# USER PREFERENCES API ENDPOINTS
+# ============================================================
+
+@bp.route('/api/user/preferences', methods=['GET'])
+@jwt_required()
+def get_user_preferences():
+    """Get current user's preferences"""
+    user = get_current_user()
+    if not user:
+        return jsonify({'error': 'User not found'}), 404
+    
+    stored = preferences.load_preferences(user.id)
+    version = preferences.preferences_version(stored)
+    
+    # Convert to dictionary format
+    prefs_dict = {key: UserPreference.decode_value(value) for key, value in stored.items()}
+    
+    response = jsonify({
+        'preferences': prefs_dict,
+        'count': len(stored),
+        'version': version
+    })
+    response.set_etag(version)
+    return response
+
+@bp.route('/api/user/preferences', methods=['PUT'])
+@jwt_required()
+def update_user_preferences():
+    """Update current user's preferences (optional If-Match version check)"""
+    user = get_current_user()
+    if not user:
+        return jsonify({'error': 'User not found'}), 404
+    
+    data = request.get_json()
+    if not data or not isinstance(data, dict):
+        return jsonify({'error': 'No preferences provided'}), 400
+    
+    # No other request can write the user's preferences between this read and the upsert
+    preferences.lock_preferences(user.id)
+
+    # All stored preferences in one query, then one upsert for the changed keys
+    stored = preferences.load_preferences(user.id)
+    version = preferences.preferences_version(stored)
+    # If-Match carries the version from the last GET/PUT; reject stale autosaves
+    if request.if_match and not request.if_match.contains_weak(version):
+        db.session.rollback()
+        return jsonify({'error': 'Preferences were changed by another request', 'version': version}), 412
+    
+    changes = preferences.changed_preferences(stored, data)
+    if changes:
+        try:
+            preferences.save_preferences(user.id, changes)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            return jsonify({'error': f'Failed to update preferences: {str(e)}'}), 500
+        stored.update(changes)
+        version = preferences.preferences_version(stored)
+    else:
+        db.session.rollback()
+    
+    response = jsonify({
+        'message': 'Preferences updated successfully',
+        'updated_keys': list(data),
+        'changed_keys': list(changes),
+        'version': version
+    })
+    response.set_etag(version)
+    return response
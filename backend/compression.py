@@ -0,0 +1,74 @@
+"""
+Response compression (brotli or gzip)
+
+Compresses text-like responses (JSON, HTML, CSS, JS, SVG, GPX/KML) at or
+above COMPRESS_MIN_SIZE bytes for clients that advertise support in
+Accept-Encoding. Brotli is preferred when the optional brotli package is
+installed; gzip is always available.
+
+Compressing with a strong ETag would claim byte-identity across encodings,
+so strong tags are downgraded to weak ones; weak tags are left as they are.
+"""
+
+import gzip
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # Optional dependency
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = {
+    'application/json',
+    'application/javascript',
+    'application/xml',
+    'application/gpx+xml',
+    'application/vnd.google-earth.kml+xml',
+    'image/svg+xml',
+}
+
+
+def _is_compressible(mimetype):
+    return bool(mimetype) and (mimetype.startswith('text/') or mimetype in COMPRESSIBLE_MIMETYPES)
+
+
+def choose_encoding(accept_encodings):
+    """Best supported encoding from a parsed Accept-Encoding header, or None"""
+    candidates = ['br', 'gzip'] if brotli is not None else ['gzip']
+    best = accept_encodings.best_match(candidates)
+    return best if best and accept_encodings[best] > 0 else None
+
+
+def compress(data, encoding, config):
+    if encoding == 'br':
+        return brotli.compress(data, quality=config['COMPRESS_BROTLI_QUALITY'])
+    return gzip.compress(data, compresslevel=config['COMPRESS_GZIP_LEVEL'], mtime=0)
+
+
+def init_app(app):
+    """Compress eligible responses after each request"""
+
+    @app.after_request
+    def compress_response(response):
+        if (not app.config['COMPRESS_ENABLED']
+                or response.status_code < 200 or response.status_code in (204, 206, 304)
+                or response.direct_passthrough or response.is_streamed
+                or 'Content-Encoding' in response.headers
+                or not _is_compressible(response.mimetype)):
+            return response
+
+        response.vary.add('Accept-Encoding')
+        if response.content_length is None or response.content_length < app.config['COMPRESS_MIN_SIZE']:
+            return response
+
+        encoding = choose_encoding(request.accept_encodings)
+        if encoding is None:
+            return response
+
+        response.set_data(compress(response.get_data(), encoding, app.config))
+        response.headers['Content-Encoding'] = encoding
+
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
@@ -8,4 +8,91 @@ class Config:
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY') or 'jwt-dev-secret-key'
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///app.db'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
-    JWT_ACCESS_TOKEN_EXPIRES = False  # Tokens don't expire for development
\ No newline at end of file
+    JWT_ACCESS_TOKEN_EXPIRES = False  # Tokens don't expire for development
+
+    # Database engine and connection pool (see db_engine.py)
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE') or 0)  # Per process; 0 = one per SERVE_THREADS
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW') or 2)  # Burst connections, closed when returned
+    DB_POOL_TIMEOUT_SECONDS = float(os.environ.get('DB_POOL_TIMEOUT_SECONDS') or 10)  # Then 503
+    DB_POOL_RECYCLE_SECONDS = int(os.environ.get('DB_POOL_RECYCLE_SECONDS') or 1800)
+    DB_STATEMENT_TIMEOUT_MS = int(os.environ.get('DB_STATEMENT_TIMEOUT_MS') or 30000)  # PostgreSQL; 0 = no limit
+    DB_IDLE_IN_TRANSACTION_TIMEOUT_MS = int(os.environ.get('DB_IDLE_IN_TRANSACTION_TIMEOUT_MS') or 60000)
+    DB_QUERY_CACHE_SIZE = int(os.environ.get('DB_QUERY_CACHE_SIZE') or 500)  # Compiled statements per engine
+    DB_PREPARE_THRESHOLD = int(os.environ.get('DB_PREPARE_THRESHOLD') or 5)  # psycopg 3 driver only
+    SQLITE_WAL = (os.environ.get('SQLITE_WAL') or 'true').lower() in ('1', 'true', 'yes')
+    SQLITE_BUSY_TIMEOUT_MS = int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS') or 5000)
+    SQLITE_CACHE_SIZE_KB = int(os.environ.get('SQLITE_CACHE_SIZE_KB') or 8192)
+
+    # Route blueprints (see factory.py)
+    API_MODULES = os.environ.get('API_MODULES') or 'active'  # active SystemModules, all, or a list like boats,trips
+
+    # Current-user lookups and token claims (see auth.py)
+    # Keyed by user id only: other worker processes keep a demoted or deleted user for up to the TTL
+    USER_CACHE_TTL_SECONDS = float(os.environ.get('USER_CACHE_TTL_SECONDS') or 0)  # 0 = load once per request
+    AUTHZ_TRUST_TOKEN_CLAIMS = (os.environ.get('AUTHZ_TRUST_TOKEN_CLAIMS') or 'false').lower() in ('1', 'true', 'yes')
+    MODULE_ACCESS_CACHE_TTL_SECONDS = float(os.environ.get('MODULE_ACCESS_CACHE_TTL_SECONDS') or 30)  # see module_access.py
+    MODULE_BULK_MAX_PAIRS = int(os.environ.get('MODULE_BULK_MAX_PAIRS') or 50000)  # POST /api/admin/modules/bulk
+
+    # Response encoding (see json_provider.py and compression.py)
+    JSON_PROVIDER = os.environ.get('JSON_PROVIDER') or 'auto'  # auto, orjson or stdlib
+    COMPRESS_ENABLED = (os.environ.get('COMPRESS_ENABLED') or 'true').lower() in ('1', 'true', 'yes')
+    COMPRESS_MIN_SIZE = int(os.environ.get('COMPRESS_MIN_SIZE') or 1024)  # Bytes; smaller bodies aren't worth it
+    COMPRESS_GZIP_LEVEL = int(os.environ.get('COMPRESS_GZIP_LEVEL') or 6)
+    COMPRESS_BROTLI_QUALITY = int(os.environ.get('COMPRESS_BROTLI_QUALITY') or 5)
+
+    # Request metrics and slow query log (see request_metrics.py and slow_queries.py)
+    METRICS_ENABLED = (os.environ.get('METRICS_ENABLED') or 'true').lower() in ('1', 'true', 'yes')
+    # Server-Timing reveals query counts and timings to every client, so it is opt-in
+    METRICS_SERVER_TIMING = (os.environ.get('METRICS_SERVER_TIMING') or 'false').lower() in ('1', 'true', 'yes')
+    METRICS_DIR = os.environ.get('METRICS_DIR') or ''  # Shared by serve.py workers; '' = this process only
+    METRICS_FLUSH_SECONDS = float(os.environ.get('METRICS_FLUSH_SECONDS') or 5)
+    SLOW_QUERY_MS = float(os.environ.get('SLOW_QUERY_MS') or 0)  # Log statements slower than this; 0 = off
+    SLOW_QUERY_LOG_SIZE = int(os.environ.get('SLOW_QUERY_LOG_SIZE') or 200)  # Entries kept per process
+    SLOW_QUERY_EXPLAIN = (os.environ.get('SLOW_QUERY_EXPLAIN') or 'true').lower() in ('1', 'true', 'yes')
+    SLOW_QUERY_EXPLAIN_ANALYZE = (os.environ.get('SLOW_QUERY_EXPLAIN_ANALYZE') or 'true').lower() in ('1', 'true', 'yes')  # PostgreSQL SELECTs
+    SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS = float(os.environ.get('SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS') or 60)  # Per statement
+
+    # List endpoints (see list_query.py)
+    LIST_DEFAULT_LIMIT = int(os.environ.get('LIST_DEFAULT_LIMIT') or 0)  # 0 = whole list unless ?limit= is given
+    LIST_MAX_LIMIT = int(os.environ.get('LIST_MAX_LIMIT') or 500)
+
+    # Dashboard summary (see dashboard.py)
+    DASHBOARD_CACHE_TTL_SECONDS = float(os.environ.get('DASHBOARD_CACHE_TTL_SECONDS') or 30)  # 0 = no cache
+    DASHBOARD_DUE_SOON_DAYS = int(os.environ.get('DASHBOARD_DUE_SOON_DAYS') or 30)  # Maintenance due within
+    DASHBOARD_SEASON_START_MONTH = int(os.environ.get('DASHBOARD_SEASON_START_MONTH') or 1)  # 4 = April to March
+    DASHBOARD_LIST_LIMIT = int(os.environ.get('DASHBOARD_LIST_LIMIT') or 5)  # Items per list
+
+    # Event calendar (see event_calendar.py)
+    EVENTS_MAX_WINDOW_DAYS = int(os.environ.get('EVENTS_MAX_WINDOW_DAYS') or 400)  # Longest ?from=&to= window
+    EVENTS_FEED_PAST_DAYS = int(os.environ.get('EVENTS_FEED_PAST_DAYS') or 90)  # calendar.ics history without ?from=
+
+    # GPS track import
+    GPS_IMPORT_BATCH_SIZE = int(os.environ.get('GPS_IMPORT_BATCH_SIZE') or 5000)
+    GPS_UPLOAD_FOLDER = os.environ.get('GPS_UPLOAD_FOLDER') or os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), 'uploads', 'tracks'
+    )
+    TRACK_STORAGE_MODE = os.environ.get('TRACK_STORAGE_MODE') or 'rows'  # rows or columnar (see track_store.py)
+
+    # Production server (see serve.py)
+    SERVE_BIND = os.environ.get('SERVE_BIND') or '0.0.0.0:5001'
+    SERVE_WORKERS = int(os.environ.get('SERVE_WORKERS') or 0)  # 0 = one per core, 2-4
+    SERVE_THREADS = int(os.environ.get('SERVE_THREADS') or 4)  # Concurrent requests per worker
+    SERVE_KEEPALIVE_SECONDS = int(os.environ.get('SERVE_KEEPALIVE_SECONDS') or 5)
+    SERVE_TIMEOUT_SECONDS = int(os.environ.get('SERVE_TIMEOUT_SECONDS') or 60)  # Slow track uploads on the Pi
+    SERVE_GRACEFUL_TIMEOUT_SECONDS = int(os.environ.get('SERVE_GRACEFUL_TIMEOUT_SECONDS') or 30)
+    SERVE_MAX_REQUESTS = int(os.environ.get('SERVE_MAX_REQUESTS') or 2000)  # Recycle workers; 0 = never
+    SERVE_PRELOAD = (os.environ.get('SERVE_PRELOAD') or 'true').lower() in ('1', 'true', 'yes')
+
+    # Background track jobs (see track_worker.py)
+    JOB_WORKER_PROCESSES = int(os.environ.get('JOB_WORKER_PROCESSES') or 0)  # 0 = leave a core free, max 2
+    JOB_WORKER_NICE = int(os.environ.get('JOB_WORKER_NICE') or 10)
+    JOB_POLL_INTERVAL_SECONDS = float(os.environ.get('JOB_POLL_INTERVAL_SECONDS') or 2)
+    JOB_HEARTBEAT_SECONDS = float(os.environ.get('JOB_HEARTBEAT_SECONDS') or 60)  # Running jobs refresh updated_at
+    JOB_STALE_AFTER_SECONDS = int(os.environ.get('JOB_STALE_AFTER_SECONDS') or 900)  # No heartbeat for this long = worker died
+    JOB_MAX_ATTEMPTS = int(os.environ.get('JOB_MAX_ATTEMPTS') or 3)
+
+    # Simplified route levels for map views (see track_simplify.py)
+    ROUTE_SIMPLIFY_TOLERANCES = [
+        float(value) for value in (os.environ.get('ROUTE_SIMPLIFY_TOLERANCES') or '5,20,100,500').split(',')
+    ]  # Meters, finest to coarsest
+    ROUTE_SIMPLIFY_ALGORITHM = os.environ.get('ROUTE_SIMPLIFY_ALGORITHM') or 'douglas_peucker'  # or visvalingam
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+GPS Track Storage Converter
+
+Moves stored trip tracks between GPSRoutePoint rows and compact columnar
+chunks (see track_store.py). New uploads use TRACK_STORAGE_MODE; this script
+converts tracks that are already in the database.
+
+Usage:
+  python convert_tracks.py --to columnar              # Convert every trip
+  python convert_tracks.py --to columnar --trip 12    # Convert one trip
+  python convert_tracks.py --to rows --trip 12        # Convert back to rows
+"""
+
+import argparse
+import time
+from factory import create_app
+from models import db, Trip
+from track_store import DEFAULT_CHUNK_SIZE, STORAGE_MODES, convert_trip_track
+
+def convert_tracks(storage, trip_id=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Convert one or all trips, committing after each trip"""
+    app = create_app(api=False)
+
+    with app.app_context():
+        db.create_all()
+
+        query = Trip.query.filter(Trip.total_route_points > 0)
+        if trip_id:
+            query = query.filter(Trip.id == trip_id)
+        trip_ids = [trip.id for trip in query.order_by(Trip.id).all()]
+
+        print(f"🔄 Converting {len(trip_ids)} trip(s) to {storage} storage")
+        total = 0
+        for current_id in trip_ids:
+            trip = db.session.get(Trip, current_id)
+            started = time.perf_counter()
+            try:
+                converted = convert_trip_track(trip, storage, chunk_size=chunk_size)
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                print(f"   ❌ Trip {current_id}: {e}")
+                continue
+
+            if converted:
+                total += converted
+                print(f"   ✓ Trip {current_id}: {converted} points in {time.perf_counter() - started:.2f}s")
+            else:
+                print(f"   - Trip {current_id}: already {storage}")
+
+        print(f"✅ Converted {total} points")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Convert stored GPS tracks between row and columnar storage')
+    parser.add_argument('--to', dest='storage', choices=STORAGE_MODES, required=True, help='Target storage mode')
+    parser.add_argument('--trip', type=int, help='Only convert this trip id')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='Points per chunk')
+    args = parser.parse_args()
+
+    convert_tracks(args.storage, trip_id=args.trip, chunk_size=args.chunk_size)
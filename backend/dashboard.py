@@ -0,0 +1,247 @@
+"""
+Dashboard summary
+
+dashboard_summary() builds everything the landing page shows, so it needs
+one request instead of downloading the boat, trip, equipment, maintenance
+and event lists and counting them in the browser:
+
+- counts: active boats, trips, equipment, maintenance records and
+  upcoming events
+- maintenance: overdue and due-soon totals plus the first few of each,
+  from the recurring maintenance schedule (maintenance_schedule.py)
+- next events (public or the user's own) and the most recent trips
+- the season so far: trips, miles, hours, engine hours and maintenance
+  spend, and miles per boat, read from the monthly rollups (rollups.py);
+  the season starts on DASHBOARD_SEASON_START_MONTH
+
+It runs eight statements whatever the size of the logbook: scalar-subquery
+counts, CASE aggregates, sums over at most twelve rollup rows per boat,
+and LIMITed lists that load only the columns shown.
+
+Summaries are cached per user for DASHBOARD_CACHE_TTL_SECONDS. ORM events
+(registered by init_app) drop a user's entry when their boats, trips,
+equipment, maintenance records or events are flushed, and again when the
+transaction commits, so a summary another request cached from the
+pre-commit rows doesn't outlive the write. Public events drop every
+entry. As with module_access.py, other worker processes catch up after
+the TTL.
+"""
+
+import threading
+import time
+from datetime import date, datetime
+from flask import current_app
+from sqlalchemy import event, func, inspect, select
+from sqlalchemy.orm import Session, object_session
+from models import db, Boat, Equipment, MaintenanceRecord, MaintenanceSchedule, Event, Trip
+import maintenance_schedule
+import rollups
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+# session.info key for the users whose entries are dropped again on commit (None = everyone)
+_PENDING = 'dashboard_invalidate'
+
+
+def invalidate(user_id=None):
+    """Forget the cached summary for one user, or for everyone"""
+    with _cache_lock:
+        if user_id is None:
+            _cache.clear()
+        else:
+            _cache.pop(user_id, None)
+
+
+def _values(target, name):
+    """The attribute's value and, when this flush changed it, the value it replaced"""
+    return {getattr(target, name), *inspect(target).attrs[name].history.deleted} - {None}
+
+
+def _changed(target, user_id=None):
+    """Drop the entry now and again once the flushing transaction commits"""
+    invalidate(user_id)
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_PENDING, set()).add(user_id)
+
+
+def _invalidate_all(target, name):
+    # A row moved to another user also leaves the previous user's summary
+    for user_id in _values(target, name):
+        _changed(target, user_id)
+
+
+def _owned_row_changed(mapper, connection, target):
+    _invalidate_all(target, 'owner_id')
+
+
+def _trip_changed(mapper, connection, target):
+    _invalidate_all(target, 'captain_id')
+
+
+def _maintenance_changed(mapper, connection, target):
+    # Shown to the creator and to the owners of the boat and equipment
+    _invalidate_all(target, 'created_by')
+    owners = []
+    boat_ids, equipment_ids = _values(target, 'boat_id'), _values(target, 'equipment_id')
+    if boat_ids:
+        owners.append(select(Boat.owner_id).where(Boat.id.in_(boat_ids)))
+    if equipment_ids:
+        owners.append(select(Equipment.owner_id).where(Equipment.id.in_(equipment_ids)))
+    for query in owners:
+        for owner_id in connection.execute(query).scalars():
+            if owner_id is not None:
+                _changed(target, owner_id)
+
+
+def _event_changed(mapper, connection, target):
+    if target.is_public or inspect(target).attrs.is_public.history.has_changes():
+        _changed(target)
+    else:
+        _invalidate_all(target, 'created_by')
+
+
+def _after_commit(session):
+    pending = session.info.pop(_PENDING, None)
+    if not pending:
+        return
+    if None in pending:
+        invalidate()
+    else:
+        for user_id in pending:
+            invalidate(user_id)
+
+
+def _after_rollback(session):
+    session.info.pop(_PENDING, None)
+
+
+def init_app(app):
+    """Register the ORM listeners that drop cached summaries (once per process)"""
+    if event.contains(Boat, 'after_insert', _owned_row_changed):
+        return
+    for model, listener in ((Boat, _owned_row_changed), (Equipment, _owned_row_changed),
+                            (Trip, _trip_changed), (MaintenanceRecord, _maintenance_changed),
+                            (Event, _event_changed)):
+        for name in ('after_insert', 'after_update', 'after_delete'):
+            event.listen(model, name, listener)
+    event.listen(Session, 'after_commit', _after_commit)
+    event.listen(Session, 'after_rollback', _after_rollback)
+
+
+def season_start(today, start_month):
+    """First day of the current season"""
+    year = today.year if today.month >= start_month else today.year - 1
+    return date(year, start_month, 1)
+
+
+def _isoformat(value):
+    return value.isoformat() if value else None
+
+
+def _counts(user_id, now):
+    subqueries = {
+        'boats': select(func.count(Boat.id)).where(Boat.owner_id == user_id, Boat.is_active.is_(True)),
+        'trips': select(func.count(Trip.id)).where(Trip.captain_id == user_id),
+        'equipment': select(func.count(Equipment.id)).where(Equipment.owner_id == user_id),
+        'maintenance_records': select(func.count(MaintenanceRecord.id)).where(MaintenanceRecord.owned_by(user_id)),
+        'upcoming_events': select(func.count(Event.id)).where(
+            db.or_(Event.is_public.is_(True), Event.created_by == user_id), Event.start_date >= now),
+    }
+    row = db.session.execute(select(*(query.scalar_subquery().label(name)
+                                      for name, query in subqueries.items()))).one()
+    return dict(row._mapping)
+
+
+def _maintenance(user_id, today, due_before, limit):
+    overdue, due_soon = maintenance_schedule.due_counts(user_id, today, due_before)
+    due_on = MaintenanceSchedule.due_on
+    query = maintenance_schedule.due_query(user_id)
+    return {
+        'overdue_count': overdue,
+        'due_soon_count': due_soon,
+        'overdue': maintenance_schedule.due_items(query.where(due_on < today).limit(limit), today),
+        'due_soon': maintenance_schedule.due_items(query.where(due_on.between(today, due_before)).limit(limit), today),
+    }
+
+
+def _next_events(user_id, now, limit):
+    rows = db.session.execute(
+        select(Event.id, Event.name, Event.event_type, Event.start_date, Event.end_date, Event.location,
+               Event.is_public)
+        .where(db.or_(Event.is_public.is_(True), Event.created_by == user_id), Event.start_date >= now)
+        .order_by(Event.start_date, Event.id).limit(limit)
+    ).all()
+    return [{'id': event_id, 'name': name, 'event_type': event_type, 'start_date': _isoformat(start),
+             'end_date': _isoformat(end), 'location': location, 'is_public': is_public}
+            for event_id, name, event_type, start, end, location, is_public in rows]
+
+
+def _recent_trips(user_id, limit):
+    rows = db.session.execute(
+        select(Trip.id, Trip.name, Trip.start_date, Trip.status, Trip.distance_miles, Trip.boat_id, Boat.name)
+        .join(Boat, Boat.id == Trip.boat_id)
+        .where(Trip.captain_id == user_id)
+        .order_by(Trip.start_date.desc(), Trip.id.desc()).limit(limit)
+    ).all()
+    return [{'id': trip_id, 'name': name, 'start_date': _isoformat(start), 'status': status,
+             'distance_miles': distance, 'boat_id': boat_id, 'boat_name': boat_name}
+            for trip_id, name, start, status, distance, boat_id, boat_name in rows]
+
+
+def _season(user_id, season_begins):
+    totals = rollups.user_totals(user_id, season_begins)
+    return {
+        'start': season_begins.isoformat(),
+        'trips': totals['trips'],
+        'distance_miles': totals['distance_miles'],
+        'hours': totals['hours_under_way'],
+        'engine_hours': totals['engine_hours'],
+        'maintenance_cost': totals['maintenance_cost'],
+        'by_boat': [{'boat_id': boat['boat_id'], 'boat_name': boat['boat_name'], 'trips': boat['trips'],
+                     'distance_miles': boat['distance_miles'], 'hours': boat['hours_under_way']}
+                    for boat in rollups.boat_totals(user_id, season_begins)],
+    }
+
+
+def build_summary(user_id, today=None, now=None):
+    """Compute the summary from the database (no cache)"""
+    config = current_app.config
+    today = today or date.today()
+    # Event dates are compared with UTC, as in Event.days_until_event
+    now = now or datetime.utcnow()
+    limit = config['DASHBOARD_LIST_LIMIT']
+    season_begins = season_start(today, config['DASHBOARD_SEASON_START_MONTH'])
+    due_before = date.fromordinal(today.toordinal() + config['DASHBOARD_DUE_SOON_DAYS'])
+
+    return {
+        'counts': _counts(user_id, now),
+        'maintenance': _maintenance(user_id, today, due_before, limit),
+        'next_events': _next_events(user_id, now, limit),
+        'recent_trips': _recent_trips(user_id, limit),
+        'season': _season(user_id, season_begins),
+        'generated_at': now.isoformat(timespec='seconds'),
+    }
+
+
+def dashboard_summary(user):
+    """The user's summary, from the cache when it is fresh.
+
+    The returned dict is shared with the cache; callers must not mutate it.
+    """
+    ttl = current_app.config['DASHBOARD_CACHE_TTL_SECONDS']
+    today = date.today()
+
+    if ttl > 0:
+        with _cache_lock:
+            entry = _cache.get(user.id)
+        # Overdue and due-soon lists change at midnight
+        if entry and entry[1] == today and time.monotonic() - entry[0] <= ttl:
+            return entry[2]
+
+    summary = build_summary(user.id, today)
+    if ttl > 0:
+        with _cache_lock:
+            _cache[user.id] = (time.monotonic(), today, summary)
+    return summary
@@ -0,0 +1,190 @@
+"""
+Database engine profiles and connection pool metrics
+
+engine_options() turns the DB_* and SQLITE_* settings into
+SQLALCHEMY_ENGINE_OPTIONS for the configured backend:
+
+- PostgreSQL: a pool of DB_POOL_SIZE connections per process (by default
+  one per gunicorn thread, since each request holds one connection) plus
+  a small overflow, pre-ping and recycling for connections dropped by the
+  server, and a server-side statement_timeout so a runaway query can't pin
+  a connection. Every serve.py worker has its own pool, so the server sees
+  workers x (pool size + overflow) connections at most; serve.py
+  --print-config shows that number. psycopg2 has no server-side prepared
+  statements; SQLAlchemy's compiled statement cache (DB_QUERY_CACHE_SIZE)
+  is used instead, and with the psycopg 3 driver statements are also
+  prepared server-side after DB_PREPARE_THRESHOLD executions.
+- SQLite files: WAL journal (readers don't block the writer), synchronous
+  NORMAL (safe with WAL), a busy timeout instead of immediate "database is
+  locked" errors, a larger page cache and in-memory temp tables. The pool
+  is bounded the same way.
+
+Explicit SQLALCHEMY_ENGINE_OPTIONS in the config win over the profile.
+
+init_app() also counts pool activity (new connections, checkouts, peak
+use, checkouts that left the pool full, invalidations and timeouts) for
+pool_stats(), and turns pool timeouts into 503 responses instead of 500s.
+"""
+
+import os
+import threading
+from flask import current_app, jsonify
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from models import db
+
+
+def is_memory_sqlite(url):
+    return url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:')
+
+
+def pool_size(config):
+    """Connections per process: DB_POOL_SIZE, or one per server thread"""
+    return config['DB_POOL_SIZE'] or config['SERVE_THREADS']
+
+
+def max_connections_per_process(config):
+    return pool_size(config) + config['DB_MAX_OVERFLOW']
+
+
+def engine_options(config):
+    """SQLALCHEMY_ENGINE_OPTIONS profile for the configured database"""
+    url = make_url(config['SQLALCHEMY_DATABASE_URI'])
+    options = {'query_cache_size': config['DB_QUERY_CACHE_SIZE']}
+
+    if not is_memory_sqlite(url):
+        options.update(
+            pool_size=pool_size(config),
+            max_overflow=config['DB_MAX_OVERFLOW'],
+            pool_timeout=config['DB_POOL_TIMEOUT_SECONDS'],
+        )
+
+    backend = url.get_backend_name()
+    if backend == 'postgresql':
+        options.update(pool_pre_ping=True, pool_recycle=config['DB_POOL_RECYCLE_SECONDS'], pool_use_lifo=True)
+        server_options = [f"-c statement_timeout={config['DB_STATEMENT_TIMEOUT_MS']}"]
+        if config['DB_IDLE_IN_TRANSACTION_TIMEOUT_MS']:
+            server_options.append(f"-c idle_in_transaction_session_timeout={config['DB_IDLE_IN_TRANSACTION_TIMEOUT_MS']}")
+        connect_args = {
+            'application_name': 'pi-server-api',
+            'connect_timeout': 10,
+            'options': ' '.join(server_options),
+        }
+        if url.get_driver_name() == 'psycopg':
+            connect_args['prepare_threshold'] = config['DB_PREPARE_THRESHOLD']
+        options['connect_args'] = connect_args
+    elif backend == 'sqlite':
+        # sqlite3's timeout is the busy timeout, in seconds
+        options['connect_args'] = {'timeout': config['SQLITE_BUSY_TIMEOUT_MS'] / 1000}
+
+    return options
+
+
+def _sqlite_pragmas(config, memory):
+    pragmas = [
+        ('synchronous', 'NORMAL' if config['SQLITE_WAL'] else 'FULL'),
+        ('cache_size', -config['SQLITE_CACHE_SIZE_KB']),
+        ('temp_store', 'MEMORY'),
+    ]
+    if config['SQLITE_WAL'] and not memory:
+        pragmas.insert(0, ('journal_mode', 'WAL'))
+    return pragmas
+
+
+class PoolMetrics:
+    """Counters for one engine's pool, updated from pool events"""
+
+    COUNTERS = ('connects', 'checkouts', 'full_checkouts', 'invalidations', 'timeouts')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.peak_checked_out = 0
+        for name in self.COUNTERS:
+            setattr(self, name, 0)
+
+    def increment(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def record_checkout(self, checked_out, capacity):
+        with self._lock:
+            self.checkouts += 1
+            self.peak_checked_out = max(self.peak_checked_out, checked_out)
+            if capacity is not None and checked_out >= capacity:
+                self.full_checkouts += 1
+
+    def as_dict(self):
+        with self._lock:
+            return {'peak_checked_out': self.peak_checked_out,
+                    **{name: getattr(self, name) for name in self.COUNTERS}}
+
+
+def pool_capacity(pool):
+    """Most connections the pool hands out at once, or None if unbounded"""
+    size = getattr(pool, 'size', None)
+    overflow = getattr(pool, '_max_overflow', None)
+    if size is None or overflow is None or overflow < 0:
+        return None
+    return size() + overflow
+
+
+def pool_stats(app=None):
+    """Live pool state and counters for this process"""
+    app = app or current_app
+    pool = db.engine.pool
+    stats = {
+        'pid': os.getpid(),
+        'pool_class': type(pool).__name__,
+        'capacity': pool_capacity(pool),
+    }
+    for name in ('size', 'checkedin', 'checkedout', 'overflow'):
+        method = getattr(pool, name, None)
+        stats[name] = method() if method else None
+    stats.update(app.extensions['db_engine'].as_dict())
+    return stats
+
+
+def init_app(app):
+    """Set up Flask-SQLAlchemy with the engine profile, SQLite pragmas and pool metrics"""
+    profile = engine_options(app.config)
+    profile.update(app.config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = profile
+    db.init_app(app)
+
+    metrics = PoolMetrics()
+    app.extensions['db_engine'] = metrics
+
+    with app.app_context():
+        engine = db.engine
+
+    if engine.dialect.name == 'sqlite':
+        pragmas = _sqlite_pragmas(app.config, is_memory_sqlite(engine.url))
+
+        @event.listens_for(engine, 'connect')
+        def set_sqlite_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            for name, value in pragmas:
+                cursor.execute(f'PRAGMA {name}={value}')
+            cursor.close()
+
+    capacity = pool_capacity(engine.pool)
+
+    @event.listens_for(engine, 'connect')
+    def count_connect(dbapi_connection, connection_record):
+        metrics.increment('connects')
+
+    @event.listens_for(engine, 'checkout')
+    def count_checkout(dbapi_connection, connection_record, connection_proxy):
+        metrics.record_checkout(engine.pool.checkedout() if capacity is not None else 0, capacity)
+
+    @event.listens_for(engine, 'invalidate')
+    def count_invalidate(dbapi_connection, connection_record, exception):
+        metrics.increment('invalidations')
+
+    @app.errorhandler(PoolTimeoutError)
+    def pool_exhausted(error):
+        metrics.increment('timeouts')
+        response = jsonify({'error': 'Server busy, please retry'})
+        response.headers['Retry-After'] = '1'
+        return response, 503
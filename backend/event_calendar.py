@@ -0,0 +1,348 @@
+"""
+Event calendar
+
+Calendar views ask for the events in a window (GET /api/events?from=&to=)
+rather than for every event ever created. An event overlaps the window
+when it starts inside it, or started before it and is still running at
+its start; those are two range scans, over ix_events_start_date_end_date
+and ix_events_end_date, however long the history is.
+
+Recurring events (weekly club races, say) are stored once, with the first
+occurrence's dates on the event and an RRULE in EventRecurrence. The
+supported subset is FREQ=DAILY|WEEKLY|MONTHLY|YEARLY with INTERVAL,
+COUNT or UNTIL, and BYDAY=MO,WE,... for weekly rules; EXDATE-style
+skipped occurrences are kept as a list. EventRecurrence.ends_at is the
+end of the last occurrence, so series that finished before the window
+are skipped by the query, and expand() starts at the period containing
+the window instead of walking from the first occurrence.
+
+ical_feed() writes the same events as an iCalendar (RFC 5545) file, with
+recurring events as one VEVENT carrying RRULE and EXDATE.
+"""
+
+import re
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import and_, exists, func, or_, select
+from sqlalchemy.orm import contains_eager
+from models import db, Event, EventRecurrence
+
+FREQUENCIES = ('DAILY', 'WEEKLY', 'MONTHLY', 'YEARLY')
+WEEKDAYS = ('MO', 'TU', 'WE', 'TH', 'FR', 'SA', 'SU')
+MAX_COUNT = 1000
+
+# Columns a calendar view shows for each occurrence
+CALENDAR_COLUMNS = ('id', 'name', 'event_type', 'location', 'venue', 'start_date', 'end_date', 'all_day',
+                    'timezone', 'status', 'is_public', 'created_by')
+
+ICAL_STATUS = {'cancelled': 'CANCELLED', 'postponed': 'TENTATIVE'}
+
+_UNTIL = re.compile(r'^(\d{8})(?:T(\d{6})Z?)?$')
+
+
+def parse_rule(text):
+    """The parts of an RRULE string as a dict; raises ValueError for what isn't supported"""
+    if not text or not isinstance(text, str):
+        raise ValueError('recurrence rule is required')
+    parts = {}
+    for part in text.strip().upper().removeprefix('RRULE:').split(';'):
+        name, _, value = part.partition('=')
+        if not value:
+            raise ValueError(f'recurrence rule part {part!r} must look like NAME=value')
+        parts[name] = value
+
+    unknown = set(parts) - {'FREQ', 'INTERVAL', 'COUNT', 'UNTIL', 'BYDAY', 'WKST'}
+    if unknown:
+        raise ValueError(f"Unsupported recurrence rule parts: {', '.join(sorted(unknown))}")
+    if parts.get('FREQ') not in FREQUENCIES:
+        raise ValueError(f"FREQ must be one of {', '.join(FREQUENCIES)}")
+    if parts.get('WKST', 'MO') != 'MO':
+        raise ValueError('Weeks start on Monday (WKST=MO)')
+    if 'COUNT' in parts and 'UNTIL' in parts:
+        raise ValueError('COUNT and UNTIL cannot both be given')
+
+    rule = {'freq': parts['FREQ'], 'interval': 1, 'count': None, 'until': None, 'byday': None}
+    for name in ('INTERVAL', 'COUNT'):
+        if name in parts:
+            if not parts[name].isdigit() or not 1 <= int(parts[name]) <= MAX_COUNT:
+                raise ValueError(f'{name} must be a number from 1 to {MAX_COUNT}')
+            rule[name.lower()] = int(parts[name])
+    if 'UNTIL' in parts:
+        match = _UNTIL.match(parts['UNTIL'])
+        if not match:
+            raise ValueError('UNTIL must look like 20250930 or 20250930T180000Z')
+        # A bare date includes the whole day
+        rule['until'] = datetime.strptime(match.group(1) + (match.group(2) or '235959'), '%Y%m%d%H%M%S')
+    if 'BYDAY' in parts:
+        if rule['freq'] != 'WEEKLY':
+            raise ValueError('BYDAY is only supported with FREQ=WEEKLY')
+        days = parts['BYDAY'].split(',')
+        if not all(day in WEEKDAYS for day in days):
+            raise ValueError(f"BYDAY must list days from {','.join(WEEKDAYS)}")
+        rule['byday'] = sorted({WEEKDAYS.index(day) for day in days})
+    return rule
+
+
+def _period_starts(start, rule, period):
+    """Occurrence starts in the period-th interval after the first occurrence"""
+    step = period * rule['interval']
+    if rule['freq'] == 'DAILY':
+        return [start + timedelta(days=step)]
+    if rule['freq'] == 'WEEKLY':
+        week = start + timedelta(weeks=step, days=-start.weekday())
+        days = rule['byday'] or [start.weekday()]
+        return [week + timedelta(days=day) for day in days if week + timedelta(days=day) >= start]
+
+    months = start.month - 1 + step * (12 if rule['freq'] == 'YEARLY' else 1)
+    try:
+        return [start.replace(year=start.year + months // 12, month=months % 12 + 1)]
+    except ValueError:
+        # The 31st in a shorter month, or 29 February, has no occurrence (as in RFC 5545)
+        return []
+
+
+def _first_period(start, rule, earliest):
+    """(period, occurrences before it) to begin expanding at so nothing at or after earliest is missed"""
+    if earliest <= start:
+        return 0, 0
+    freq, interval = rule['freq'], rule['interval']
+    if freq == 'DAILY':
+        period = (earliest - start).days // interval
+        return period, period
+    if freq == 'WEEKLY':
+        period = (earliest.date() - start.date() + timedelta(days=start.weekday())).days // 7 // interval
+        if not period:
+            return 0, 0
+        first_week = len(_period_starts(start, rule, 0))
+        return period, first_week + (period - 1) * len(rule['byday'] or [start.weekday()])
+
+    months = (earliest.year - start.year) * 12 + earliest.month - start.month
+    period = max(months // (12 if freq == 'YEARLY' else 1) // interval, 0)
+    # Months without the day are skipped, so count what came before (only needed for COUNT)
+    before = sum(len(_period_starts(start, rule, p)) for p in range(period)) if rule['count'] else 0
+    return period, before
+
+
+def expand(start, end, rule, window_start, window_end=None, exdates=()):
+    """(start, end) of each occurrence of a series overlapping [window_start, window_end), in order.
+
+    Only the periods from the one containing the window onwards are
+    generated. Without window_end the rule's COUNT or UNTIL must end it.
+    """
+    duration = end - start if end else timedelta(0)
+    skipped = set(exdates)
+    period, index = _first_period(start, rule, window_start - duration)
+    while True:
+        for occurrence in _period_starts(start, rule, period):
+            if rule['count'] and index >= rule['count']:
+                return
+            if rule['until'] and occurrence > rule['until']:
+                return
+            if window_end and occurrence >= window_end:
+                return
+            # COUNT includes skipped occurrences, as EXDATE does
+            index += 1
+            if occurrence in skipped:
+                continue
+            if occurrence + duration > window_start or occurrence >= window_start:
+                yield occurrence, occurrence + duration if end else None
+        period += 1
+
+
+def series_end(start, end, rule):
+    """End of a series' last occurrence, or None when it repeats forever"""
+    duration = end - start if end else timedelta(0)
+    if rule['until']:
+        return rule['until'] + duration
+    if rule['count']:
+        last = start
+        for last, _ in expand(start, None, rule, start):
+            pass
+        return last + duration
+    return None
+
+
+def set_recurrence(event, value):
+    """Apply a {"rule", "exdates"} payload (or None to stop repeating) to an event whose dates are set.
+
+    Raises ValueError for an unsupported rule or a bad date.
+    """
+    # Touch the event so list ETags change with its recurrence
+    event.updated_at = datetime.utcnow()
+    if not value:
+        event.recurrence = None
+        return
+    if not isinstance(value, dict):
+        raise ValueError('recurrence must be an object with a rule')
+    rule = parse_rule(value.get('rule'))
+    exdates = value.get('exdates') or []
+    if not isinstance(exdates, list) or not all(isinstance(text, str) for text in exdates):
+        raise ValueError('exdates must be a list of ISO datetimes')
+
+    recurrence = event.recurrence or EventRecurrence()
+    recurrence.rule = value['rule'].strip().upper().removeprefix('RRULE:')
+    if 'exdates' in value:
+        recurrence.set_exdates([datetime.fromisoformat(text.replace('Z', '+00:00')).replace(tzinfo=None)
+                                for text in exdates])
+    recurrence.ends_at = series_end(event.start_date, event.end_date, rule)
+    event.recurrence = recurrence
+
+
+def refresh_series_end(event):
+    """Recompute ends_at after an event's dates changed"""
+    if event.recurrence:
+        event.recurrence.ends_at = series_end(event.start_date, event.end_date, parse_rule(event.recurrence.rule))
+
+
+def _visible(user_id):
+    # Wrapped so the planner can't OR the visibility indexes, which would read every public event
+    return or_(func.coalesce(Event.is_public, False).is_(True), Event.created_by == user_id)
+
+
+def _recurring():
+    return exists().where(EventRecurrence.event_id == Event.id)
+
+
+def single_events(user_id, window_start, window_end=None):
+    """Non-recurring events a user can see that overlap the window"""
+    starts_inside = Event.start_date >= window_start
+    if window_end:
+        starts_inside = and_(starts_inside, Event.start_date < window_end)
+    # start_date is wrapped so this branch is a range over ix_events_end_date rather than over every
+    # event that started before the window
+    still_running = and_(Event.end_date > window_start, func.coalesce(Event.start_date, window_start) < window_start)
+    return select(Event).where(_visible(user_id), or_(starts_inside, still_running), ~_recurring())
+
+
+def recurring_events(user_id, window_start):
+    """Recurring events a user can see whose series hasn't ended by the window's start.
+
+    Driven by ix_event_recurrences_ends_at; series that begin after the
+    window just expand to nothing.
+    """
+    return (
+        select(Event)
+        .join(EventRecurrence, EventRecurrence.event_id == Event.id)
+        .where(_visible(user_id), or_(EventRecurrence.ends_at.is_(None), EventRecurrence.ends_at > window_start))
+    )
+
+
+def calendar(user_id, window_start, window_end):
+    """Occurrences of the events a user can see in [window_start, window_end), by start"""
+    columns = [getattr(Event, name) for name in CALENDAR_COLUMNS]
+    singles = db.session.execute(single_events(user_id, window_start, window_end).with_only_columns(*columns))
+    series = db.session.execute(recurring_events(user_id, window_start).with_only_columns(*columns, EventRecurrence))
+
+    occurrences = []
+    for row in singles.mappings():
+        item = dict(row)
+        item['start_date'] = row['start_date'].isoformat()
+        item['end_date'] = row['end_date'].isoformat() if row['end_date'] else None
+        item['recurring'] = False
+        occurrences.append(item)
+    for row in series.mappings():
+        recurrence = row['EventRecurrence']
+        values = {name: row[name] for name in CALENDAR_COLUMNS}
+        for start, end in expand(row['start_date'], row['end_date'], parse_rule(recurrence.rule), window_start,
+                                 window_end, recurrence.get_exdates()):
+            occurrences.append({**values, 'start_date': start.isoformat(), 'end_date': end.isoformat() if end else None,
+                                'recurring': True})
+    occurrences.sort(key=lambda item: (item['start_date'], item['id']))
+    return occurrences
+
+
+def feed_events(user_id, window_start, window_end=None):
+    """Events and series a user can see overlapping the window, for ical_feed()"""
+    singles = db.session.scalars(single_events(user_id, window_start, window_end).order_by(Event.start_date))
+    series = db.session.scalars(recurring_events(user_id, window_start)
+                                .options(contains_eager(Event.recurrence)).order_by(Event.start_date))
+    return list(singles) + [event for event in series if window_end is None or event.start_date < window_end]
+
+
+def _escape(text):
+    return (str(text).replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+            .replace('\r\n', '\\n').replace('\n', '\\n'))
+
+
+def _fold(line):
+    """Split a content line into 75-octet pieces, never inside a UTF-8 character"""
+    encoded = line.encode()
+    pieces = []
+    while len(encoded) > 75:
+        cut = 75 if not pieces else 74
+        while encoded[cut] & 0xC0 == 0x80:
+            cut -= 1
+        pieces.append(encoded[:cut].decode())
+        encoded = encoded[cut:]
+    pieces.append(encoded.decode())
+    return '\r\n '.join(pieces)
+
+
+def _ical_time(name, value, event):
+    if event.all_day:
+        return f'{name};VALUE=DATE:{value:%Y%m%d}'
+    if not event.timezone or event.timezone.upper() == 'UTC':
+        return f'{name}:{value:%Y%m%dT%H%M%S}Z'
+    return f'{name};TZID={event.timezone}:{value:%Y%m%dT%H%M%S}'
+
+
+def ical_feed(events, uid_domain, now=None):
+    """An iCalendar file with one VEVENT per event; recurring events carry their RRULE"""
+    stamp = f'{(now or datetime.utcnow()):%Y%m%dT%H%M%SZ}'
+    lines = ['BEGIN:VCALENDAR', 'VERSION:2.0', 'PRODID:-//Sailor Utility//Events//EN', 'CALSCALE:GREGORIAN',
+             'METHOD:PUBLISH', 'X-WR-CALNAME:Sailing events']
+    for event in events:
+        end = event.end_date
+        if event.all_day:
+            # DTEND of an all-day event is the day after it ends
+            end = (end or event.start_date) + timedelta(days=1)
+        lines += ['BEGIN:VEVENT', f'UID:event-{event.id}@{uid_domain}', f'DTSTAMP:{stamp}',
+                  _ical_time('DTSTART', event.start_date, event)]
+        if end:
+            lines.append(_ical_time('DTEND', end, event))
+        lines.append(f'SUMMARY:{_escape(event.name)}')
+        location = ', '.join(part for part in (event.venue, event.location) if part)
+        for name, value in (('LOCATION', location), ('DESCRIPTION', event.description),
+                            ('CATEGORIES', event.event_type)):
+            if value:
+                lines.append(f'{name}:{_escape(value)}')
+        if event.website:
+            lines.append(f'URL:{event.website}')
+        lines.append(f"STATUS:{ICAL_STATUS.get((event.status or '').lower(), 'CONFIRMED')}")
+        if event.recurrence:
+            lines.append(f'RRULE:{event.recurrence.rule}')
+            lines += [_ical_time('EXDATE', value, event) for value in event.recurrence.get_exdates()]
+        if event.updated_at:
+            lines.append(f'LAST-MODIFIED:{event.updated_at:%Y%m%dT%H%M%SZ}')
+        lines.append('END:VEVENT')
+    lines.append('END:VCALENDAR')
+    return ''.join(_fold(line) + '\r\n' for line in lines)
+
+
+def _parse_bound(name, text, upper):
+    try:
+        if len(text) == 10:
+            parsed = datetime.strptime(text, '%Y-%m-%d')
+            # A bare end date includes the whole day
+            return parsed + timedelta(days=1) if upper else parsed
+        parsed = datetime.fromisoformat(text.replace('Z', '+00:00'))
+    except ValueError:
+        raise ValueError(f'{name} must be a date (YYYY-MM-DD) or ISO datetime')
+    # Event dates are naive UTC
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def parse_window(start_text, end_text, max_days, default_start=None):
+    """[start, end) from from/to query values; end may be omitted when max_days is None"""
+    if not start_text and default_start is None:
+        raise ValueError('from is required')
+    window_start = _parse_bound('from', start_text, False) if start_text else default_start
+    window_end = _parse_bound('to', end_text, True) if end_text else None
+    if window_end is None and max_days is not None:
+        raise ValueError('to is required')
+    if window_end is not None and window_end <= window_start:
+        raise ValueError('to must be after from')
+    if max_days is not None and window_end - window_start > timedelta(days=max_days):
+        raise ValueError(f'The window can be at most {max_days} days')
+    return window_start, window_end
@@ -0,0 +1,106 @@
+"""
+Application factory
+
+create_app() builds the API: config, JSON provider, extensions and the
+blueprints for the modules selected by API_MODULES (by default the active
+SystemModules, see blueprints/__init__.py). Command-line scripts that only
+need the database use create_app(api=False), which skips routes, JWT,
+CORS, response compression and request metrics but keeps the ORM
+listeners that maintain the statistics rollups and maintenance schedule.
+
+Flask-Migrate pulls in alembic, about half of the import time, so it is
+only set up for `flask db ...` commands and the migrate_* scripts.
+
+Flask doesn't allow registering blueprints once the app has served a
+request, so switching a module on or off takes effect at the next start.
+"""
+
+import click
+from flask import Flask
+from flask_cors import CORS
+from flask_jwt_extended import JWTManager
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+from config import Config
+from models import db, SystemModule
+import auth
+import blueprints
+import compression
+import dashboard
+import db_engine
+import json_provider
+import maintenance_schedule
+import request_metrics
+import rollups
+import slow_queries
+
+cors = CORS()
+jwt = JWTManager()
+
+
+def active_modules(app):
+    """Names of active SystemModules, or None if the table can't be read (e.g. before migrations)"""
+    with app.app_context():
+        try:
+            return set(db.session.scalars(select(SystemModule.name).where(SystemModule.is_active.is_(True))))
+        except SQLAlchemyError:
+            return None
+        finally:
+            db.session.remove()
+
+
+def api_modules(app):
+    """Module blueprints to load for the API_MODULES setting"""
+    setting = app.config['API_MODULES']
+    if setting == 'all':
+        return set(blueprints.MODULE_BLUEPRINTS)
+    if setting == 'active':
+        active = active_modules(app)
+        if active:
+            return active
+        # No modules table, or it hasn't been seeded yet: serve everything rather than an empty API
+        app.logger.warning('No active system modules found; loading every module blueprint')
+        return set(blueprints.MODULE_BLUEPRINTS)
+    return {name.strip() for name in setting.split(',') if name.strip()}
+
+
+def init_migrations(app):
+    """Register Flask-Migrate (imported here because alembic is slow to import)"""
+    from flask_migrate import Migrate
+    Migrate(app, db)
+
+
+def create_app(config=Config, api=True, modules=None, migrations=None, **settings):
+    """Create the Flask app.
+
+    settings override single config values (e.g. SQLALCHEMY_DATABASE_URI),
+    api=False returns a database-only app for scripts, and modules replaces
+    API_MODULES with an explicit collection of module names. migrations
+    defaults to True only when the app is loaded by the flask command.
+    """
+    app = Flask(__name__)
+    app.config.from_object(config)
+    app.config.update(settings)
+
+    db_engine.init_app(app)
+    rollups.init_app(app)
+    maintenance_schedule.init_app(app)
+    dashboard.init_app(app)
+    slow_queries.init_app(app)
+    if migrations is None:
+        migrations = click.get_current_context(silent=True) is not None
+    if migrations:
+        init_migrations(app)
+    if not api:
+        return app
+
+    # First, so its timing covers the other hooks and it sees the compressed body
+    request_metrics.init_app(app)
+    json_provider.init_app(app)
+    cors.init_app(app)
+    jwt.init_app(app)
+    auth.init_app(app)
+    compression.init_app(app)
+
+    blueprints.register_blueprints(app, api_modules(app) if modules is None else modules)
+    return app
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Synthetic Data Generator
+
+Creates a database filled by synthetic_data.generate() for load tests and
+benchmarks: users loadtest_1..N (loadtest_1 is an admin, all share one
+password), their boats, equipment, maintenance records, events, trips and
+GPS tracks. The same --profile and --seed give the same data every time.
+
+Profiles (per user: boats, equipment per boat, trips per boat; GPS points):
+  small    5 users     2 / 5 / 10     4 tracks x 5k points
+  medium   50 users    3 / 10 / 30    20 tracks x 50k points (1M)
+  large    200 users   3 / 15 / 60    10 tracks x 500k points (5M)
+
+Never point --database-url at a database you care about.
+
+Usage:
+  python generate_data.py                                  # small profile into instance/loadtest.db
+  python generate_data.py --profile large --storage columnar --replace
+  python generate_data.py --tracks 2 --track-points 2000000 # Two 2M-point tracks
+  python generate_data.py --database-url postgresql://localhost/loadtest --yes
+"""
+
+import argparse
+import os
+import time
+from config import Config
+from factory import create_app
+from models import db
+from synthetic_data import PROFILES, generate
+
+DEFAULT_DATABASE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'instance', 'loadtest.db')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate a synthetic database for load tests')
+    parser.add_argument('--profile', choices=sorted(PROFILES), default='small')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--database', default=DEFAULT_DATABASE, help='SQLite file to create')
+    parser.add_argument('--database-url', help='Scratch database URL instead of a SQLite file (needs --yes)')
+    parser.add_argument('--yes', action='store_true', help='Confirm --database-url may be filled')
+    parser.add_argument('--replace', action='store_true', help='Delete an existing --database file first')
+    parser.add_argument('--prefix', default='loadtest_', help='Username prefix')
+    parser.add_argument('--password', default='loadtest123')
+    parser.add_argument('--storage', choices=('rows', 'columnar'), default=Config.TRACK_STORAGE_MODE,
+                        help='How GPS tracks are stored (see track_store.py)')
+    parser.add_argument('--no-route-levels', action='store_true', help='Skip simplified routes for the tracks')
+    for name in PROFILES['small']:
+        parser.add_argument(f"--{name.replace('_', '-')}", type=int, help='Override the profile count')
+    args = parser.parse_args()
+
+    if args.database_url:
+        if not args.yes:
+            parser.error('--database-url will be filled with synthetic rows; pass --yes to confirm')
+        database_url = args.database_url
+    else:
+        if os.path.exists(args.database):
+            if not args.replace:
+                parser.error(f'{args.database} exists; pass --replace to recreate it')
+            for suffix in ('', '-wal', '-shm'):
+                if os.path.exists(args.database + suffix):
+                    os.unlink(args.database + suffix)
+        os.makedirs(os.path.dirname(os.path.abspath(args.database)), exist_ok=True)
+        database_url = f'sqlite:///{os.path.abspath(args.database)}'
+
+    overrides = {name: getattr(args, name) for name in PROFILES['small'] if getattr(args, name) is not None}
+    app = create_app(api=False, SQLALCHEMY_DATABASE_URI=database_url)
+    with app.app_context():
+        db.create_all()
+        print(f"🌱 Generating the {args.profile} profile (seed {args.seed}) into {db.engine.url.render_as_string()}")
+        started = time.perf_counter()
+        try:
+            counts = generate(args.profile, seed=args.seed, prefix=args.prefix, password=args.password,
+                              storage=args.storage, route_levels=not args.no_route_levels,
+                              progress=lambda message: print(f"   {message}"), **overrides)
+        except ValueError as e:
+            db.session.rollback()
+            raise SystemExit(f"❌ {e}")
+
+    print(f"✅ Done in {time.perf_counter() - started:.1f}s")
+    for table, count in counts.items():
+        print(f"   {table:<20} {count:>10,}")
+    print("\nServe it and run a workload mix against it:")
+    print(f"   DATABASE_URL={database_url} python serve.py")
+    print(f"   python loadtest.py --mix dashboard --username '{args.prefix}{{n}}' --users {counts['users']} "
+          f"--password {args.password} --output results.json")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,449 @@
+"""
+Streaming GPS track import
+
+Parses GPX, KML and NMEA 0183 track files incrementally (iterparse for the XML
+formats, line by line for NMEA) and bulk-inserts GPSRoutePoint rows in
+fixed-size batches, so memory stays flat no matter how long the log is. In
+columnar storage mode the points are written as compressed track chunks
+instead (see track_store.py).
+"""
+
+import io
+import os
+import re
+import xml.etree.ElementTree as ET
+from collections import deque
+from datetime import datetime, timezone
+from functools import lru_cache
+from sqlalchemy import insert
+from models import db, GPSRoutePoint
+from track_store import STORAGE_MODES, ChunkWriter, delete_trip_chunks
+
+DEFAULT_BATCH_SIZE = 5000
+SUPPORTED_FORMATS = ('gpx', 'kml', 'nmea')
+
+# File extensions accepted for each format
+FORMAT_EXTENSIONS = {
+    '.gpx': 'gpx',
+    '.kml': 'kml',
+    '.nmea': 'nmea',
+    '.nme': 'nmea',
+    '.log': 'nmea',
+    '.txt': 'nmea',
+}
+
+# Every imported row carries the same keys so the batches go out as a single executemany
+POINT_FIELDS = (
+    'latitude', 'longitude', 'altitude', 'timestamp', 'speed_knots',
+    'course_over_ground', 'hdop', 'satellites_used', 'water_depth',
+    'water_temperature', 'point_type', 'point_name'
+)
+
+MPS_TO_KNOTS = 1.9438444924
+
+# Elements dropped from the parse tree once they have been consumed
+_DETACHABLE_TAGS = {'trkpt', 'rtept', 'wpt', 'Placemark', 'when', 'coord', 'coordinates'}
+
+
+class TrackParseError(ValueError):
+    """Raised when a track file cannot be parsed"""
+
+
+def detect_track_format(filename, requested_format=None):
+    """Work out the track format from an explicit request or the file extension"""
+    if requested_format:
+        requested_format = requested_format.lower()
+        return requested_format if requested_format in SUPPORTED_FORMATS else None
+
+    extension = os.path.splitext(filename or '')[1].lower()
+    return FORMAT_EXTENSIONS.get(extension)
+
+
+@lru_cache(maxsize=256)
+def _local_name(tag):
+    """Strip the XML namespace from a tag"""
+    return tag.rsplit('}', 1)[-1]
+
+
+def _parse_time(text):
+    """Parse an ISO 8601 timestamp into a naive UTC datetime"""
+    if not text:
+        return None
+    try:
+        value = datetime.fromisoformat(text.strip().replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _to_float(text):
+    """Convert text to float, returning None for blanks and garbage"""
+    if text is None or text == '':
+        return None
+    try:
+        return float(text)
+    except ValueError:
+        return None
+
+
+def _new_point(point_type='track'):
+    """Create an empty point dict with every importable field"""
+    point = dict.fromkeys(POINT_FIELDS)
+    point['point_type'] = point_type
+    return point
+
+
+class _CountingReader(io.RawIOBase):
+    """Wrap a binary stream and count the bytes read through it"""
+
+    def __init__(self, stream):
+        self._stream = stream
+        self.bytes_read = 0
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self._stream.read(len(buffer))
+        if not data:
+            return 0
+        buffer[:len(data)] = data
+        self.bytes_read += len(data)
+        return len(data)
+
+
+def _iterparse(stream, wanted):
+    """Yield (element, parent) as each wanted XML element closes, detaching consumed points"""
+    stack = []
+    try:
+        for event, elem in ET.iterparse(stream, events=('start', 'end')):
+            if event == 'start':
+                stack.append(elem)
+                continue
+            stack.pop()
+
+            name = _local_name(elem.tag)
+            if name not in wanted:
+                continue
+
+            parent = stack[-1] if stack else None
+            yield elem, parent
+            # Drop the finished element so the tree never grows with the file
+            if parent is not None and name in _DETACHABLE_TAGS:
+                parent.remove(elem)
+    except ET.ParseError as e:
+        raise TrackParseError(f'Malformed XML: {e}') from e
+
+
+def iter_gpx_points(stream):
+    """Yield point dicts from a GPX 1.0/1.1 stream (track, route and waypoints)"""
+    point_types = {'trkpt': 'track', 'rtept': 'waypoint', 'wpt': 'waypoint'}
+
+    for elem, parent in _iterparse(stream, point_types):
+        tag = _local_name(elem.tag)
+
+        latitude = _to_float(elem.get('lat'))
+        longitude = _to_float(elem.get('lon'))
+        if latitude is None or longitude is None:
+            continue
+
+        point = _new_point(point_types[tag])
+        point['latitude'] = latitude
+        point['longitude'] = longitude
+
+        # Children may sit inside <extensions>, so walk the whole subtree
+        for child in elem.iter():
+            name = _local_name(child.tag)
+            text = child.text.strip() if child.text else ''
+            if not text:
+                continue
+            if name == 'ele':
+                point['altitude'] = _to_float(text)
+            elif name == 'time':
+                point['timestamp'] = _parse_time(text)
+            elif name == 'name':
+                point['point_name'] = text[:100] or None
+            elif name == 'hdop':
+                point['hdop'] = _to_float(text)
+            elif name == 'sat':
+                satellites = _to_float(text)
+                point['satellites_used'] = int(satellites) if satellites is not None else None
+            elif name == 'speed':
+                speed = _to_float(text)
+                point['speed_knots'] = speed * MPS_TO_KNOTS if speed is not None else None
+            elif name in ('course', 'cog'):
+                point['course_over_ground'] = _to_float(text)
+            elif name in ('depth', 'Depth'):
+                point['water_depth'] = _to_float(text)
+            elif name in ('wtemp', 'Temperature'):
+                point['water_temperature'] = _to_float(text)
+
+        yield point
+
+
+_COORD_TUPLE = re.compile(r'[^\s]+')
+
+
+def iter_kml_points(stream):
+    """Yield point dicts from a KML stream (gx:Track, LineString and Point placemarks)"""
+    track_times = deque()
+    placemark_name = None
+    placemark_time = None
+
+    wanted = {'name', 'when', 'coord', 'coordinates', 'Placemark'}
+
+    for elem, parent in _iterparse(stream, wanted):
+        tag = _local_name(elem.tag)
+        parent_tag = _local_name(parent.tag) if parent is not None else None
+        text = elem.text.strip() if elem.text else ''
+
+        if tag == 'name' and parent_tag == 'Placemark':
+            placemark_name = text[:100] or None
+        elif tag == 'when':
+            if parent_tag == 'Track':
+                # gx:Track lists every <when> before its <gx:coord> siblings
+                track_times.append(_parse_time(text))
+            elif parent_tag == 'TimeStamp':
+                placemark_time = _parse_time(text)
+        elif tag == 'coord' and parent_tag == 'Track':
+            parts = text.split()
+            if len(parts) < 2:
+                continue
+            point = _new_point('track')
+            point['longitude'] = _to_float(parts[0])
+            point['latitude'] = _to_float(parts[1])
+            point['altitude'] = _to_float(parts[2]) if len(parts) > 2 else None
+            point['timestamp'] = track_times.popleft() if track_times else None
+            if point['latitude'] is not None and point['longitude'] is not None:
+                yield point
+        elif tag == 'coordinates' and parent_tag in ('LineString', 'Point'):
+            point_type = 'track' if parent_tag == 'LineString' else 'waypoint'
+            for match in _COORD_TUPLE.finditer(text):
+                parts = match.group(0).split(',')
+                if len(parts) < 2:
+                    continue
+                point = _new_point(point_type)
+                point['longitude'] = _to_float(parts[0])
+                point['latitude'] = _to_float(parts[1])
+                point['altitude'] = _to_float(parts[2]) if len(parts) > 2 else None
+                point['timestamp'] = placemark_time
+                if point_type == 'waypoint':
+                    point['point_name'] = placemark_name
+                if point['latitude'] is not None and point['longitude'] is not None:
+                    yield point
+        elif tag == 'Placemark':
+            placemark_name = None
+            placemark_time = None
+            track_times.clear()
+
+
+def _nmea_checksum_ok(sentence):
+    """Validate the optional *hh checksum of an NMEA sentence"""
+    if '*' not in sentence:
+        return True
+    body, checksum = sentence[1:].split('*', 1)
+    calculated = 0
+    for char in body:
+        calculated ^= ord(char)
+    try:
+        return calculated == int(checksum[:2], 16)
+    except ValueError:
+        return False
+
+
+def _nmea_coordinate(value, hemisphere):
+    """Convert NMEA ddmm.mmmm / dddmm.mmmm plus hemisphere to decimal degrees"""
+    if not value or not hemisphere:
+        return None
+    try:
+        raw = float(value)
+    except ValueError:
+        return None
+    degrees = int(raw // 100)
+    decimal = degrees + (raw - degrees * 100) / 60
+    return -decimal if hemisphere in ('S', 'W') else decimal
+
+
+def _nmea_time(date_value, time_value):
+    """Combine a date and an NMEA hhmmss(.ss) time into a datetime"""
+    if date_value is None or not time_value or len(time_value) < 6:
+        return None
+    try:
+        seconds = float(time_value[4:])
+        whole = int(seconds)
+        return datetime(
+            date_value.year, date_value.month, date_value.day,
+            int(time_value[0:2]), int(time_value[2:4]), whole,
+            int(round((seconds - whole) * 1000000)) % 1000000
+        )
+    except ValueError:
+        return None
+
+
+def iter_nmea_points(stream, default_date=None):
+    """Yield point dicts from an NMEA 0183 log, one fix per time epoch"""
+    text_stream = io.TextIOWrapper(stream, encoding='ascii', errors='replace', newline='')
+    current_date = default_date
+    pending = None
+    pending_time = None
+
+    def flush():
+        if pending and pending['latitude'] is not None and pending['longitude'] is not None:
+            pending['timestamp'] = _nmea_time(current_date, pending_time)
+            return pending
+        return None
+
+    for raw_line in text_stream:
+        line = raw_line.strip()
+        # Some loggers prefix each sentence with a local timestamp
+        start = line.find('$')
+        if start < 0:
+            continue
+        line = line[start:]
+        if not _nmea_checksum_ok(line):
+            continue
+
+        fields = line.split('*', 1)[0].split(',')
+        sentence = fields[0][3:] if len(fields[0]) >= 6 else ''
+
+        if sentence in ('RMC', 'GGA', 'GLL'):
+            if sentence == 'RMC':
+                time_value = fields[1] if len(fields) > 1 else ''
+            elif sentence == 'GGA':
+                time_value = fields[1] if len(fields) > 1 else ''
+            else:
+                time_value = fields[5] if len(fields) > 5 else ''
+
+            # A new epoch starts whenever the fix time changes
+            if pending is not None and time_value != pending_time:
+                point = flush()
+                if point:
+                    yield point
+                pending = None
+            if pending is None:
+                pending = _new_point('track')
+                pending_time = time_value
+
+            if sentence == 'RMC' and len(fields) >= 10:
+                if fields[2] != 'A':
+                    pending = None
+                    continue
+                try:
+                    current_date = datetime.strptime(fields[9], '%d%m%y').date()
+                except ValueError:
+                    pass
+                pending['latitude'] = _nmea_coordinate(fields[3], fields[4])
+                pending['longitude'] = _nmea_coordinate(fields[5], fields[6])
+                pending['speed_knots'] = _to_float(fields[7])
+                pending['course_over_ground'] = _to_float(fields[8])
+            elif sentence == 'GGA' and len(fields) >= 10:
+                if fields[6] in ('', '0'):
+                    continue
+                pending['latitude'] = _nmea_coordinate(fields[2], fields[3])
+                pending['longitude'] = _nmea_coordinate(fields[4], fields[5])
+                satellites = _to_float(fields[7])
+                pending['satellites_used'] = int(satellites) if satellites is not None else None
+                pending['hdop'] = _to_float(fields[8])
+                pending['altitude'] = _to_float(fields[9])
+            elif sentence == 'GLL' and len(fields) >= 7 and fields[6] == 'A':
+                if pending['latitude'] is None:
+                    pending['latitude'] = _nmea_coordinate(fields[1], fields[2])
+                    pending['longitude'] = _nmea_coordinate(fields[3], fields[4])
+        elif pending is not None:
+            # Untimed sentences belong to the epoch currently being assembled
+            if sentence == 'VTG' and len(fields) >= 6:
+                if pending['course_over_ground'] is None:
+                    pending['course_over_ground'] = _to_float(fields[1])
+                if pending['speed_knots'] is None:
+                    pending['speed_knots'] = _to_float(fields[5])
+            elif sentence == 'DPT' and len(fields) >= 2:
+                depth = _to_float(fields[1])
+                offset = _to_float(fields[2]) if len(fields) > 2 else None
+                if depth is not None:
+                    pending['water_depth'] = depth + (offset or 0)
+            elif sentence == 'DBT' and len(fields) >= 4 and pending['water_depth'] is None:
+                pending['water_depth'] = _to_float(fields[3])
+            elif sentence == 'MTW' and len(fields) >= 2:
+                pending['water_temperature'] = _to_float(fields[1])
+
+    point = flush()
+    if point:
+        yield point
+
+
+def iter_track_points(stream, file_format, default_date=None):
+    """Yield point dicts from a track stream in the given format"""
+    if file_format == 'gpx':
+        return iter_gpx_points(stream)
+    if file_format == 'kml':
+        return iter_kml_points(stream)
+    if file_format == 'nmea':
+        return iter_nmea_points(stream, default_date=default_date)
+    raise TrackParseError(f'Unsupported track format: {file_format}')
+
+
+def import_track(trip, stream, file_format, filename=None, batch_size=DEFAULT_BATCH_SIZE, storage='rows'):
+    """Replace a trip's route points with those parsed from a track stream.
+
+    With storage='rows' rows are inserted in batches of batch_size; with
+    storage='columnar' every batch_size points become one compressed chunk.
+    Either way the work happens within the caller's transaction; the caller
+    commits or rolls back. Returns the number of points imported.
+    """
+    if storage not in STORAGE_MODES:
+        raise ValueError(f'Unknown track storage mode: {storage}')
+
+    reader = _CountingReader(stream)
+    buffered = io.BufferedReader(reader, buffer_size=64 * 1024)
+    fallback_time = trip.start_date
+    default_date = trip.start_date.date() if trip.start_date else None
+
+    # Replace any previously uploaded track, whichever way it was stored
+    GPSRoutePoint.query.filter_by(trip_id=trip.id).delete(synchronize_session=False)
+    delete_trip_chunks(trip.id)
+
+    # Core insert keeps each batch a plain executemany without ORM bookkeeping
+    statement = insert(GPSRoutePoint.__table__)
+    writer = ChunkWriter(trip.id, chunk_size=batch_size) if storage == 'columnar' else None
+    batch = []
+    total_points = 0
+    first_timestamp = None
+
+    for point in iter_track_points(buffered, file_format, default_date=default_date):
+        if point['timestamp'] is None:
+            point['timestamp'] = fallback_time
+        if first_timestamp is None:
+            first_timestamp = point['timestamp']
+
+        if writer:
+            writer.add(point)
+            continue
+
+        point['trip_id'] = trip.id
+        point['elapsed_time_seconds'] = int((point['timestamp'] - first_timestamp).total_seconds())
+        batch.append(point)
+
+        if len(batch) >= batch_size:
+            db.session.execute(statement, batch)
+            total_points += len(batch)
+            batch = []
+
+    if writer:
+        writer.flush()
+        total_points = writer.total_points
+    elif batch:
+        db.session.execute(statement, batch)
+        total_points += len(batch)
+
+    if not total_points:
+        raise TrackParseError('No track points found in file')
+
+    trip.gps_file_name = filename
+    trip.gps_file_size = reader.bytes_read
+    trip.gps_file_type = file_format
+    trip.total_route_points = total_points
+    trip.route_processed = False
+
+    return total_points
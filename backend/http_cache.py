@@ -0,0 +1,75 @@
+"""
+Conditional GET support (weak ETags and 304 Not Modified)
+
+ETags are computed from cheap summaries instead of the response body:
+max(updated_at) and row count for collections, updated_at for single
+objects, a hash of the payload for small cached responses. Every tag also
+covers the requesting user and the full request path (query string
+included), so one user's tag never validates another user's or another
+page's response.
+
+Responses are marked "private, no-cache": browsers keep them but
+revalidate with If-None-Match on every use, which turns the frontend's
+refetch-on-navigation into bodyless 304s when nothing changed.
+
+Several to_dict() fields are computed from the current date (is_overdue,
+days_until_event, age_days, ...), so every tag also covers today's date:
+a 304 never keeps yesterday's day counts on screen.
+
+These are weak ETags: a change to a related row shown inside to_dict()
+(e.g. a boat renamed while its equipment is unchanged) does not change
+the tag of the equipment list.
+"""
+
+import hashlib
+import json
+from datetime import date, datetime
+from flask import Response, jsonify, request
+from flask_jwt_extended import get_jwt_identity
+from sqlalchemy import func
+
+CACHE_CONTROL = 'private, no-cache'
+
+
+def today():
+    """The local and UTC dates the models' date-derived fields are computed from"""
+    return date.today().isoformat(), datetime.utcnow().date().isoformat()
+
+
+def make_etag(*parts):
+    """Hash the given summary values together with the user, request path and date"""
+    digest = hashlib.sha1(repr((get_jwt_identity(), request.full_path, today()) + parts).encode())
+    return digest.hexdigest()[:20]
+
+
+def _with_validators(response, etag, last_modified=None):
+    response.set_etag(etag, weak=True)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    response.headers['Cache-Control'] = CACHE_CONTROL
+    return response
+
+
+def conditional_response(etag, build_payload, last_modified=None):
+    """304 if the client's If-None-Match matches etag, else jsonify(build_payload())"""
+    if request.if_none_match.contains_weak(etag):
+        return _with_validators(Response(status=304), etag, last_modified)
+    return _with_validators(jsonify(build_payload()), etag, last_modified)
+
+
+def collection_summary(query, model):
+    """(row count, max updated_at) of a filtered query in one aggregate statement"""
+    return query.order_by(None).with_entities(func.count(model.id), func.max(model.updated_at)).one()
+
+
+def object_response(obj, build_payload):
+    """Conditional response for one model instance, tagged by its id and updated_at"""
+    return conditional_response(
+        make_etag(obj.__tablename__, obj.id, obj.updated_at), build_payload, obj.updated_at
+    )
+
+
+def payload_response(payload):
+    """Conditional response for an already-built payload, tagged by its content"""
+    etag = make_etag(json.dumps(payload, sort_keys=True, default=str))
+    return conditional_response(etag, lambda: payload)
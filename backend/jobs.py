@@ -0,0 +1,248 @@
+"""
+Background job queue for GPS track post-processing
+
+Jobs live in the processing_jobs table so they survive restarts. Web requests
+only enqueue work; track_worker.py claims queued jobs and runs them in a
+bounded pool of worker processes.
+"""
+
+import os
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import exists, func, or_, select, update
+from sqlalchemy.exc import SQLAlchemyError
+from models import db, ProcessingJob, Trip, TripRouteLevel
+from gps_import import TrackParseError, import_track
+from track_math import process_trip_track
+from track_simplify import build_route_levels
+
+JOB_TYPES = ('import_track', 'process_track')
+
+
+class PermanentJobError(Exception):
+    """Raised when a job can never succeed and should not be retried"""
+
+
+def worker_name():
+    """Identify this process in the jobs table"""
+    return f'{socket.gethostname()}:{os.getpid()}'[:100]
+
+
+def default_worker_processes():
+    """Leave a core for the web server; never use more than two by default"""
+    return max(1, min(2, (os.cpu_count() or 1) - 1))
+
+
+def enqueue_job(trip, job_type, created_by=None):
+    """Add a job for a trip to the session; the caller commits"""
+    if job_type not in JOB_TYPES:
+        raise ValueError(f'Unknown job type: {job_type}')
+
+    job = ProcessingJob(
+        job_type=job_type,
+        trip_id=trip.id,
+        created_by=created_by,
+        status='Queued',
+        attempts=0,
+        max_attempts=current_app.config['JOB_MAX_ATTEMPTS']
+    )
+    db.session.add(job)
+    return job
+
+
+def enqueue_unprocessed_trips():
+    """Queue jobs for trips with unprocessed GPS data or missing route levels that never had a job.
+
+    Trips with a job are left to it: queued and running jobs will finish,
+    failed ones wait for a new upload, and a completed one already stored
+    whatever the trip's points allow, so scanning again would only repeat it.
+    """
+    has_levels = exists().where(TripRouteLevel.trip_id == Trip.id)
+    has_job = exists().where(ProcessingJob.trip_id == Trip.id)
+    trips = Trip.query.filter(
+        or_(Trip.route_processed.isnot(True), ~has_levels),
+        or_(Trip.gps_file_path.isnot(None), Trip.total_route_points > 0),
+        ~has_job
+    ).all()
+
+    for trip in trips:
+        # Re-import an upload that never finished, otherwise just recompute from stored points
+        needs_import = trip.gps_file_path and not trip.route_processed
+        enqueue_job(trip, 'import_track' if needs_import else 'process_track')
+
+    db.session.commit()
+    return len(trips)
+
+
+def requeue_stale_jobs(stale_after_seconds):
+    """Return jobs left Running by a worker that died or was restarted.
+
+    A running job refreshes updated_at every JOB_HEARTBEAT_SECONDS, so only
+    jobs whose worker stopped beating go stale, however long the job takes.
+    """
+    cutoff = datetime.utcnow() - timedelta(seconds=stale_after_seconds)
+    last_seen = func.coalesce(ProcessingJob.updated_at, ProcessingJob.started_at)
+    stale = (ProcessingJob.status == 'Running', last_seen < cutoff)
+    message = 'Worker stopped before the job finished'
+
+    retried = db.session.execute(
+        update(ProcessingJob)
+        .where(*stale, ProcessingJob.attempts < ProcessingJob.max_attempts)
+        .values(status='Queued', worker=None, error=message)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    failed = db.session.execute(
+        update(ProcessingJob)
+        .where(*stale)
+        .values(status='Failed', finished_at=datetime.utcnow(), error=message)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    db.session.commit()
+    return retried + failed
+
+
+def claim_next_job(worker=None):
+    """Atomically mark the oldest queued job Running and return its id"""
+    worker = worker or worker_name()
+
+    # Another worker may win the race for a row, so retry a few candidates
+    for _ in range(5):
+        job_id = db.session.execute(
+            select(ProcessingJob.id)
+            .where(ProcessingJob.status == 'Queued')
+            .order_by(ProcessingJob.id)
+            .limit(1)
+        ).scalar()
+        if job_id is None:
+            db.session.commit()
+            return None
+
+        claimed = db.session.execute(
+            update(ProcessingJob)
+            .where(ProcessingJob.id == job_id, ProcessingJob.status == 'Queued')
+            .values(
+                status='Running',
+                worker=worker,
+                attempts=ProcessingJob.attempts + 1,
+                started_at=datetime.utcnow(),
+                updated_at=datetime.utcnow(),
+                finished_at=None
+            )
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        db.session.commit()
+        if claimed:
+            return job_id
+
+    return None
+
+
+@contextmanager
+def _heartbeat(job_id, interval):
+    """Refresh the job's updated_at from a background thread while the block runs"""
+    if not interval or interval <= 0:
+        yield
+        return
+
+    # The thread gets its own connections; the session belongs to the job
+    engine = db.engine
+    table = ProcessingJob.__table__
+    stop = threading.Event()
+
+    def beat():
+        while not stop.wait(interval):
+            try:
+                with engine.begin() as connection:
+                    connection.execute(
+                        update(table)
+                        .where(table.c.id == job_id, table.c.status == 'Running')
+                        .values(updated_at=datetime.utcnow())
+                    )
+            except SQLAlchemyError:
+                # A locked database just skips a beat; staleness allows for several
+                pass
+
+    thread = threading.Thread(target=beat, name=f'job-{job_id}-heartbeat', daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+
+def _import_trip_file(trip):
+    """Import the stored upload for a trip"""
+    if not trip.gps_file_path or not os.path.exists(trip.gps_file_path):
+        raise TrackParseError('Uploaded track file is missing')
+
+    with open(trip.gps_file_path, 'rb') as track_file:
+        return import_track(
+            trip,
+            track_file,
+            trip.gps_file_type,
+            filename=trip.gps_file_name,
+            batch_size=current_app.config['GPS_IMPORT_BATCH_SIZE'],
+            storage=current_app.config['TRACK_STORAGE_MODE']
+        )
+
+
+def run_job(job_id):
+    """Run a single job to completion, recording the outcome on the job row"""
+    job = db.session.get(ProcessingJob, job_id)
+    if not job:
+        return None
+
+    # Jobs run directly (not claimed through the queue) still count as an attempt
+    if job.status != 'Running':
+        job.status = 'Running'
+        job.worker = worker_name()
+        job.attempts = (job.attempts or 0) + 1
+        job.started_at = datetime.utcnow()
+        job.finished_at = None
+        db.session.commit()
+
+    started = time.perf_counter()
+    try:
+        with _heartbeat(job_id, current_app.config['JOB_HEARTBEAT_SECONDS']):
+            trip = db.session.get(Trip, job.trip_id)
+            if not trip:
+                raise PermanentJobError('Trip not found')
+
+            result = {}
+            if job.job_type == 'import_track':
+                result['points_imported'] = _import_trip_file(trip)
+            result['points_processed'] = process_trip_track(trip)
+            if not result['points_processed']:
+                raise PermanentJobError('No GPS points could be loaded for the trip')
+            result['distance_calculated'] = trip.distance_calculated
+            result['route_levels'] = {
+                level.tolerance_meters: level.point_count for level in build_route_levels(trip)
+            }
+            result['elapsed_ms'] = round((time.perf_counter() - started) * 1000, 1)
+
+        job.status = 'Completed'
+        job.error = None
+        job.set_result(result)
+        job.finished_at = datetime.utcnow()
+        db.session.commit()
+
+    except Exception as e:
+        db.session.rollback()
+        job = db.session.get(ProcessingJob, job_id)
+        job.error = f'{type(e).__name__}: {e}'
+        job.finished_at = datetime.utcnow()
+
+        # Bad files and deleted trips will never succeed, so don't retry them
+        permanent = isinstance(e, (TrackParseError, PermanentJobError))
+        if permanent or job.attempts >= job.max_attempts:
+            job.status = 'Failed'
+        else:
+            job.status = 'Queued'
+        db.session.commit()
+
+    return job
@@ -0,0 +1,86 @@
+"""
+JSON provider for API responses
+
+Uses orjson when it is installed (several times faster than the stdlib
+encoder on large trip and maintenance lists) and falls back to the
+standard library otherwise. Both providers serialize datetime and date as
+ISO 8601 and Decimal as float, so values can be returned as-is instead of
+being converted in each to_dict().
+
+JSON_PROVIDER selects the encoder: auto (orjson if importable), orjson or
+stdlib.
+"""
+
+import dataclasses
+import uuid
+from datetime import date
+from decimal import Decimal
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # Optional dependency
+    orjson = None
+
+
+def _default(value):
+    """Serialize types neither encoder handles natively"""
+    if isinstance(value, Decimal):
+        return float(value)
+    # Stdlib path only from here: orjson encodes these itself
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.asdict(value)
+    if hasattr(value, '__html__'):
+        return str(value.__html__())
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+
+class StdlibJSONProvider(DefaultJSONProvider):
+    """Flask's default provider, with ISO dates instead of HTTP dates"""
+
+    default = staticmethod(_default)
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """orjson-backed provider; output matches StdlibJSONProvider"""
+
+    def _options(self):
+        options = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        if self._app.debug and self.compact is not True:
+            options |= orjson.OPT_INDENT_2
+        return options
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=_default, option=self._options()).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        # Skip the bytes -> str -> bytes round trip of the base implementation
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=_default, option=self._options() | orjson.OPT_APPEND_NEWLINE)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+def select_provider(name='auto'):
+    """Return the provider class for a JSON_PROVIDER setting"""
+    if name not in ('auto', 'orjson', 'stdlib'):
+        raise ValueError(f'Unknown JSON_PROVIDER: {name}')
+    if name == 'orjson' and orjson is None:
+        raise RuntimeError('JSON_PROVIDER=orjson but orjson is not installed')
+    if name == 'stdlib' or orjson is None:
+        return StdlibJSONProvider
+    return OrjsonProvider
+
+
+def init_app(app):
+    """Install the configured JSON provider on the app"""
+    app.json_provider_class = select_provider(app.config.get('JSON_PROVIDER', 'auto'))
+    app.json = app.json_provider_class(app)
@@ -0,0 +1,209 @@
+"""
+Shared helpers for list endpoints
+
+Every collection endpoint (boats, trips, equipment, maintenance, events)
+accepts the same query string:
+
+  limit=50              page size (capped at LIST_MAX_LIMIT)
+  after=123             keyset cursor: return rows with id greater than this
+  fields=id,name        only load and return these columns
+  date_from/date_to     inclusive range on the endpoint's date column
+  <filter>=a,b          equality filters declared per endpoint (comma = any of)
+
+Pages are ordered by id so the cursor is a plain indexed range scan instead
+of an OFFSET that gets slower the deeper a client pages.
+"""
+
+from datetime import date, datetime, timedelta, timezone
+from flask import current_app, request
+from sqlalchemy import inspect
+from sqlalchemy.orm import joinedload, load_only, selectinload
+import http_cache
+
+
+class ListQueryError(ValueError):
+    """Raised for invalid list query parameters (returned as 400)"""
+
+
+def _parse_int(name, value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ListQueryError(f'{name} must be an integer')
+
+
+def _naive_utc(value):
+    """A parsed datetime as naive UTC, the way the models store them"""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _parse_date_bound(name, value, upper):
+    """Parse YYYY-MM-DD or an ISO datetime; a bare upper date includes the whole day"""
+    try:
+        if len(value) == 10:
+            parsed = datetime.strptime(value, '%Y-%m-%d')
+            return parsed + timedelta(days=1) if upper else parsed, True
+        return _naive_utc(datetime.fromisoformat(value.replace('Z', '+00:00'))), False
+    except ValueError:
+        raise ListQueryError(f'{name} must be a date (YYYY-MM-DD) or ISO datetime')
+
+
+def _filter_values(column, name, raw):
+    """Split a comma-separated filter value and convert it to the column's type"""
+    values = [value.strip() for value in raw.split(',') if value.strip()]
+    if not values:
+        raise ListQueryError(f'{name} filter is empty')
+
+    python_type = column.type.python_type
+    if python_type is bool:
+        return [value.lower() in ('1', 'true', 'yes') for value in values]
+    if python_type is int:
+        return [_parse_int(name, value) for value in values]
+    return values
+
+
+def apply_list_filters(query, model, filters=None, date_column=None, args=None):
+    """Apply declared equality filters and a date range from the query string"""
+    args = request.args if args is None else args
+
+    for name, column in (filters or {}).items():
+        raw = args.get(name)
+        if raw is None:
+            continue
+        values = _filter_values(column, name, raw)
+        query = query.filter(column == values[0] if len(values) == 1 else column.in_(values))
+
+    if date_column is not None:
+        is_date = date_column.type.python_type is date
+        for name, upper in (('date_from', False), ('date_to', True)):
+            raw = args.get(name)
+            if not raw:
+                continue
+            bound, whole_day = _parse_date_bound(name, raw, upper)
+            if is_date:
+                # Date columns compare by calendar day
+                bound = bound.date()
+            if not upper:
+                query = query.filter(date_column >= bound)
+            elif whole_day:
+                query = query.filter(date_column < bound)
+            else:
+                query = query.filter(date_column <= bound)
+
+    return query
+
+
+def eager_load_options(model):
+    """Loader options for the relationships a model's to_dict() reads.
+
+    Many-to-one relationships are joined into the main query; collections
+    get one extra SELECT ... IN query. Either way the statement count stays
+    constant no matter how many rows are serialized.
+    """
+    options = []
+    for name in getattr(model, 'serializer_relationships', ()):
+        attribute = getattr(model, name)
+        loader = selectinload if attribute.property.uselist else joinedload
+        options.append(loader(attribute))
+    return options
+
+
+def parse_fields(model, args=None):
+    """Return the requested column names (always including id), or None for full objects"""
+    args = request.args if args is None else args
+    raw = args.get('fields')
+    if not raw:
+        return None
+
+    columns = inspect(model).columns.keys()
+    fields = [field.strip() for field in raw.split(',') if field.strip()]
+    unknown = [field for field in fields if field not in columns]
+    if unknown:
+        raise ListQueryError(f"Unknown fields: {', '.join(unknown)}")
+    if 'id' not in fields:
+        fields.insert(0, 'id')
+    return fields
+
+
+def serialize_fields(obj, fields):
+    """Serialize only the given columns, matching to_dict() formatting.
+
+    Dates and Decimals are left to the app's JSON provider (json_provider.py),
+    which writes them the same way to_dict() does.
+    """
+    data = {}
+    for field in fields:
+        # JSON text columns follow the get_<column>() convention used by to_dict()
+        getter = getattr(obj, f'get_{field}', None)
+        data[field] = getter() if callable(getter) else getattr(obj, field)
+    return data
+
+
+def paginated_list(query, model, collection, filters=None, date_column=None):
+    """Filter, page and serialize a list query into the standard list response.
+
+    Returns a dict with the collection, its count and next_cursor (the
+    `after` value for the next page, or None on the last page). Without a
+    limit the whole filtered list is returned, as before pagination existed.
+    Raises ListQueryError for invalid parameters.
+    """
+    return list_page(apply_list_filters(query, model, filters, date_column), model, collection)
+
+
+def list_page(query, model, collection):
+    """Page and serialize a query apply_list_filters() has already filtered"""
+    args = request.args
+    fields = parse_fields(model, args)
+    if fields:
+        query = query.options(load_only(*(getattr(model, field) for field in fields)))
+    else:
+        query = query.options(*eager_load_options(model))
+
+    if args.get('after'):
+        query = query.filter(model.id > _parse_int('after', args['after']))
+
+    limit = args.get('limit') or current_app.config['LIST_DEFAULT_LIMIT']
+    limit = _parse_int('limit', limit) if limit else None
+    if limit is not None:
+        if limit < 1:
+            raise ListQueryError('limit must be at least 1')
+        limit = min(limit, current_app.config['LIST_MAX_LIMIT'])
+
+    query = query.order_by(model.id)
+    if limit:
+        # One extra row tells us whether another page exists
+        items = query.limit(limit + 1).all()
+        has_more = len(items) > limit
+        items = items[:limit]
+    else:
+        items = query.all()
+        has_more = False
+
+    if fields:
+        results = [serialize_fields(item, fields) for item in items]
+    else:
+        results = [item.to_dict() for item in items]
+
+    return {
+        collection: results,
+        'count': len(results),
+        'next_cursor': items[-1].id if has_more else None
+    }
+
+
+def paginated_response(query, model, collection, filters=None, date_column=None):
+    """paginated_list() as a JSON response with a weak ETag and Last-Modified.
+
+    The tag comes from the filtered query's row count and max(updated_at),
+    so a matching If-None-Match is answered with 304 after one aggregate
+    query, without loading or serializing any rows.
+    """
+    query = apply_list_filters(query, model, filters, date_column)
+    count, last_modified = http_cache.collection_summary(query, model)
+    return http_cache.conditional_response(
+        http_cache.make_etag(model.__tablename__, count, last_modified),
+        lambda: list_page(query, model, collection),
+        last_modified
+    )
@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+API Load Test
+
+Drives a running server with N concurrent clients. Each client is a thread
+with its own keep-alive HTTP connection. It either requests the given
+endpoints in turn, like the frontend polling lists, or follows a scripted
+workload mix (MIXES) that picks weighted requests the way a user session
+would. It reports requests/sec and latency percentiles per endpoint, and
+--output writes them as JSON so a later run can be compared with
+--baseline.
+
+Mixes use ids of the logged-in users' own boats and trips, so run them
+against data from generate_data.py (loadtest_1..N share one password):
+
+  dashboard   landing page: profile, modules, the dashboard summary, boats and trips
+  logbook     paging through trips, opening trips and their routes
+  upload      uploading GPX tracks (queues track_worker.py jobs) while browsing
+
+Only stdlib modules are used, so the script can be copied to another
+machine. The client threads share one GIL, so run it from another machine
+than the Pi (or at least watch that the load generator isn't the
+bottleneck).
+
+Usage:
+  python loadtest.py --username captain --password secret
+  python loadtest.py --url http://raspberrypi.local:5001 --concurrency 50 --duration 30 \\
+                     --username captain --password secret /api/boats /api/trips
+  python loadtest.py --mix logbook --username 'loadtest_{n}' --users 5 --password loadtest123 \\
+                     --output after.json --baseline before.json
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import statistics
+import subprocess
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from urllib.parse import urlsplit
+
+# (weight, method, path) - {boat_id}, {trip_id} and {tracked_trip_id} are filled per request
+MIXES = {
+    'dashboard': [
+        (1, 'GET', '/api/auth/me'),
+        (1, 'GET', '/api/user/modules'),
+        (4, 'GET', '/api/dashboard/summary'),
+        (1, 'GET', '/api/boats'),
+        (1, 'GET', '/api/trips?limit=10'),
+        (1, 'GET', '/api/events?from=2025-06-01&to=2025-06-30'),
+    ],
+    'logbook': [
+        (3, 'GET', '/api/trips?limit=20'),
+        (3, 'GET', '/api/trips/{trip_id}'),
+        (2, 'GET', '/api/trips/{tracked_trip_id}/route?tolerance=20'),
+        (1, 'GET', '/api/trips/{tracked_trip_id}/route?tolerance=5'),
+        (1, 'GET', '/api/boats/{boat_id}'),
+    ],
+    'upload': [
+        (1, 'POST', '/api/trips/{trip_id}/track'),
+        (2, 'GET', '/api/trips/{trip_id}'),
+        (2, 'GET', '/api/trips?limit=20'),
+    ],
+}
+
+UPLOAD_POINTS = 2000
+
+
+def login(url, username, password):
+    """Return an Authorization header for the user"""
+    parts = urlsplit(url)
+    connection = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=30)
+    connection.request('POST', '/api/auth/login', body=json.dumps({'username': username, 'password': password}),
+                       headers={'Content-Type': 'application/json'})
+    response = connection.getresponse()
+    body = response.read()
+    connection.close()
+    if response.status != 200:
+        raise SystemExit(f"❌ Login failed for {username} ({response.status}): {body[:200]!r}")
+    return {'Authorization': f"Bearer {json.loads(body)['access_token']}"}
+
+
+def get_json(url, path, headers):
+    parts = urlsplit(url)
+    connection = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=30)
+    connection.request('GET', path, headers=headers)
+    response = connection.getresponse()
+    body = response.read()
+    connection.close()
+    if response.status != 200:
+        raise SystemExit(f"❌ GET {path} failed ({response.status}): {body[:200]!r}")
+    return json.loads(body)
+
+
+def discover_ids(url, headers):
+    """Ids of the user's boats and trips to fill the mix templates with"""
+    trips = get_json(url, '/api/trips?limit=500&fields=id,route_processed', headers)['trips']
+    boats = get_json(url, '/api/boats?fields=id', headers)['boats']
+    return {
+        'boat_id': [boat['id'] for boat in boats],
+        'trip_id': [trip['id'] for trip in trips],
+        'tracked_trip_id': [trip['id'] for trip in trips if trip['route_processed']],
+    }
+
+
+def gpx_upload(rng, points=UPLOAD_POINTS):
+    """A multipart body with a synthetic GPX track, and its Content-Type"""
+    latitude, longitude = 59.9, 10.7
+    moment = datetime(2025, 6, 1, 10, 0)
+    fixes = []
+    for _ in range(points):
+        latitude += rng.uniform(-2e-5, 4e-5)
+        longitude += rng.uniform(-2e-5, 4e-5)
+        moment += timedelta(seconds=1)
+        fixes.append(f'<trkpt lat="{latitude:.7f}" lon="{longitude:.7f}"><time>{moment.isoformat()}Z</time></trkpt>')
+    gpx = ('<?xml version="1.0"?><gpx version="1.1" creator="loadtest"><trk><trkseg>'
+           + ''.join(fixes) + '</trkseg></trk></gpx>').encode()
+    boundary = uuid.uuid4().hex
+    body = (f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="loadtest.gpx"\r\n'
+            f'Content-Type: application/gpx+xml\r\n\r\n').encode() + gpx + f'\r\n--{boundary}--\r\n'.encode()
+    return body, f'multipart/form-data; boundary={boundary}'
+
+
+def percentile(timings, fraction):
+    ordered = sorted(timings)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def run_client(url, mix, session, deadline, results, seed):
+    """Send weighted requests from the mix over one connection until the deadline"""
+    parts = urlsplit(url)
+    connection = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=30)
+    rng = random.Random(seed)
+    weights = [weight for weight, _, _ in mix]
+    upload = None
+    reused = False
+    while time.perf_counter() < deadline:
+        _, method, template = rng.choices(mix, weights)[0]
+        path = template.format(**{name: rng.choice(ids) for name, ids in session['ids'].items() if ids})
+        headers, body = session['headers'], None
+        if method == 'POST':
+            if upload is None:
+                upload = gpx_upload(rng)
+            body, content_type = upload
+            headers = {**headers, 'Content-Type': content_type}
+        started = time.perf_counter()
+        for attempt in range(2):
+            try:
+                connection.request(method, path, body=body, headers=headers)
+                response = connection.getresponse()
+                response.read()
+                ok = 200 <= response.status < 300
+                reused = not response.will_close
+                if response.will_close:
+                    connection.close()
+                break
+            except (OSError, http.client.HTTPException):
+                ok = False
+                connection.close()
+                # Like browsers, retry once when the server closed an idle keep-alive connection
+                # (e.g. a worker restarting after kill -HUP or max_requests)
+                if not reused or attempt:
+                    break
+                reused = False
+        elapsed = time.perf_counter() - started
+        stats = results[f'{method} {template}']
+        (stats['timings'] if ok else stats['errors']).append(elapsed)
+    connection.close()
+
+
+def run_load_test(url, mix, sessions, concurrency, duration, warmup=2.0, seed=0):
+    """Run the clients and return {endpoint: {'timings': [...], 'errors': [...]}} plus the measured seconds.
+
+    Client i uses sessions[i % len(sessions)], a dict of its 'headers' and
+    the 'ids' to fill path templates with.
+    """
+    def new_results():
+        return {f'{method} {template}': {'timings': [], 'errors': []} for _, method, template in mix}
+
+    if warmup:
+        run_client(url, mix, sessions[0], time.perf_counter() + warmup, new_results(), seed - 1)
+
+    results = new_results()
+    started = time.perf_counter()
+    deadline = started + duration
+    # list.append is atomic, so the clients can share the result lists
+    clients = [threading.Thread(target=run_client,
+                                args=(url, mix, sessions[i % len(sessions)], deadline, results, seed + i))
+               for i in range(concurrency)]
+    for client in clients:
+        client.start()
+    for client in clients:
+        client.join()
+    return results, time.perf_counter() - started
+
+
+def _summary(timings, errors, seconds):
+    summary = {'requests': len(timings), 'errors': len(errors),
+               'requests_per_second': round(len(timings) / seconds, 2)}
+    if timings:
+        summary.update({
+            'mean_ms': round(statistics.fmean(timings) * 1000, 2),
+            'p50_ms': round(statistics.median(timings) * 1000, 2),
+            'p95_ms': round(percentile(timings, 0.95) * 1000, 2),
+            'p99_ms': round(percentile(timings, 0.99) * 1000, 2),
+        })
+    return summary
+
+
+def summarize(results, seconds):
+    """Per-endpoint and total counts, throughput and latency percentiles in milliseconds"""
+    endpoints = {endpoint: _summary(stats['timings'], stats['errors'], seconds) for endpoint, stats in results.items()}
+    endpoints['total'] = _summary([timing for stats in results.values() for timing in stats['timings']],
+                                  [error for stats in results.values() for error in stats['errors']], seconds)
+    return endpoints
+
+
+def print_report(summary, seconds, concurrency):
+    print(f"\n{concurrency} clients for {seconds:.1f}s")
+    print(f"{'endpoint':<52} {'requests':>9} {'req/s':>8} {'errors':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for endpoint, stats in summary.items():
+        line = f"{endpoint:<52} {stats['requests']:>9} {stats['requests_per_second']:>8.1f} {stats['errors']:>7}"
+        if stats['requests']:
+            line += f" {stats['p50_ms']:>8.1f} {stats['p95_ms']:>8.1f} {stats['p99_ms']:>8.1f}"
+        print(line)
+
+
+def print_comparison(summary, baseline):
+    """Show how throughput and tail latency moved against a previous --output file"""
+    print(f"\nCompared with {baseline['commit'] or 'baseline'} ({baseline['started_at']})")
+    print(f"{'endpoint':<52} {'req/s':>17} {'p95 ms':>17} {'p99 ms':>17}")
+    for endpoint, stats in summary.items():
+        before = baseline['endpoints'].get(endpoint)
+        if not before or not before.get('requests') or not stats['requests']:
+            continue
+        columns = []
+        for key in ('requests_per_second', 'p95_ms', 'p99_ms'):
+            change = (stats[key] - before[key]) / before[key] * 100 if before[key] else 0
+            columns.append(f"{before[key]:>7.1f}→{stats[key]:<7.1f}{change:+.0f}%")
+        print(f"{endpoint:<52} " + ' '.join(f'{column:>17}' for column in columns))
+
+
+def current_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=os.path.dirname(os.path.abspath(__file__)),
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Load test API endpoints with concurrent keep-alive clients')
+    parser.add_argument('paths', nargs='*', help='Endpoints to request in turn (default /api/boats /api/trips)')
+    parser.add_argument('--mix', choices=sorted(MIXES), help='Scripted workload instead of paths')
+    parser.add_argument('--url', default='http://127.0.0.1:5001', help='Server base URL')
+    parser.add_argument('--username', required=True, help="With --users, a pattern like 'loadtest_{n}'")
+    parser.add_argument('--password', required=True)
+    parser.add_argument('--users', type=int, default=1, help='Log in as users 1..N of the --username pattern')
+    parser.add_argument('--concurrency', type=int, default=50)
+    parser.add_argument('--duration', type=float, default=30, help='Seconds to run')
+    parser.add_argument('--seed', type=int, default=1, help='Seed for the request sequence')
+    parser.add_argument('--gzip', action='store_true', help='Send Accept-Encoding: gzip')
+    parser.add_argument('--output', help='Write the results as JSON to this file')
+    parser.add_argument('--baseline', help='Compare with the JSON of an earlier --output')
+    args = parser.parse_args()
+
+    if args.mix and args.paths:
+        parser.error('give either --mix or paths, not both')
+    if args.users > 1 and '{n}' not in args.username:
+        parser.error("--users needs a username pattern such as 'loadtest_{n}'")
+    mix = MIXES[args.mix] if args.mix else [(1, 'GET', path) for path in args.paths or ['/api/boats', '/api/trips']]
+
+    sessions = []
+    for n in range(1, args.users + 1):
+        headers = login(args.url, args.username.format(n=n), args.password)
+        if args.gzip:
+            headers['Accept-Encoding'] = 'gzip'
+        ids = discover_ids(args.url, headers) if any('{' in template for _, _, template in mix) else {}
+        sessions.append({'headers': headers, 'ids': ids})
+    # Users without the boats or trips the mix needs would only produce 404s
+    needed = {name for _, _, template in mix for name in ('boat_id', 'trip_id', 'tracked_trip_id')
+              if f'{{{name}}}' in template}
+    sessions = [session for session in sessions if all(session['ids'][name] for name in needed)]
+    if not sessions:
+        raise SystemExit(f"❌ The {args.mix} mix needs {', '.join(sorted(needed))} values; "
+                         f"load data with generate_data.py")
+
+    started_at = datetime.now(timezone.utc).isoformat(timespec='seconds')
+    print(f"🚀 {args.concurrency} clients as {len(sessions)} user(s) -> {args.url} "
+          f"{args.mix + ' mix' if args.mix else ' '.join(path for _, _, path in mix)}")
+    results, seconds = run_load_test(args.url, mix, sessions, args.concurrency, args.duration, seed=args.seed)
+    summary = summarize(results, seconds)
+    print_report(summary, seconds, args.concurrency)
+
+    report = {
+        'started_at': started_at,
+        'commit': current_commit(),
+        'url': args.url,
+        'mix': args.mix or 'paths',
+        'concurrency': args.concurrency,
+        'users': len(sessions),
+        'duration_seconds': round(seconds, 2),
+        'seed': args.seed,
+        'endpoints': summary,
+    }
+    if args.baseline:
+        with open(args.baseline) as f:
+            print_comparison(summary, json.load(f))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Results written to {args.output}")
@@ -0,0 +1,324 @@
+"""
+Maintenance scheduler
+
+MaintenanceSchedule holds the next due occurrence of every recurring
+maintenance task, so "what's due across my fleet" is one range scan over
+(owner_id, due_on) rather than a pass over every record in Python.
+
+A task is the records sharing a boat, equipment and title (each "Oil
+change" logged for the engine, say). Its latest record that isn't
+cancelled sets the next occurrence:
+
+- by the calendar: next_maintenance_due, else date_performed +
+  maintenance_interval_days
+- by the hour meter: next_maintenance_hours. Records with only
+  maintenance_interval_hours get it filled in from the boat's engine_hours
+  when they are saved. The day the meter gets there is projected from the
+  boat's engine hours over the last year (see rollups.py), and is the day
+  of scheduling once the meter has passed it.
+
+due_on is the earlier of the two. A task due by hours on a boat with no
+recorded engine use has no projection and is scheduled once the meter
+reaches it.
+
+ORM events reschedule a task when its records change, and a boat's or
+equipment item's tasks when its hour meter, owner or boat changes. Writes
+that bypass the ORM need rebuild() (schedule_maintenance.py).
+"""
+
+import math
+import re
+from datetime import date, datetime, timedelta
+from sqlalchemy import and_, case, delete, event, func, inspect, or_, select
+from sqlalchemy.orm import aliased
+from models import db, Boat, BoatMonthlyStats, Equipment, MaintenanceRecord, MaintenanceSchedule
+from rollups import month_of
+
+USAGE_WINDOW_DAYS = 365
+MIN_USAGE_DAYS = 30  # Don't project from a burst of use in the last few days
+MAX_WITHIN_DAYS = 3650
+BATCH_SIZE = 5000
+
+# Record columns that decide a task's next occurrence
+SCHEDULE_COLUMNS = ('boat_id', 'equipment_id', 'title', 'status', 'date_performed', 'next_maintenance_due',
+                    'next_maintenance_hours', 'maintenance_interval_days', 'maintenance_interval_hours')
+
+_WITHIN = re.compile(r'^(\d+)\s*([dw]?)$')
+
+_meter_boat = aliased(Boat)
+
+
+def parse_within(value):
+    """Days for a window like 30d, 6w or 30"""
+    match = _WITHIN.match((value or '').strip().lower())
+    if not match:
+        raise ValueError('within must look like 30d or 6w')
+    days = int(match.group(1)) * (7 if match.group(2) == 'w' else 1)
+    if days > MAX_WITHIN_DAYS:
+        raise ValueError(f'within can be at most {MAX_WITHIN_DAYS} days')
+    return days
+
+
+def _task(columns, boat_id, equipment_id, title):
+    return and_(columns.boat_id.is_not_distinct_from(boat_id),
+                columns.equipment_id.is_not_distinct_from(equipment_id),
+                columns.title == title)
+
+
+def _task_records():
+    """Records that can schedule a task, with owner and hour meter, latest first"""
+    return (
+        select(MaintenanceRecord.id, MaintenanceRecord.boat_id, MaintenanceRecord.equipment_id,
+               MaintenanceRecord.title, MaintenanceRecord.date_performed, MaintenanceRecord.next_maintenance_due,
+               MaintenanceRecord.next_maintenance_hours, MaintenanceRecord.maintenance_interval_days,
+               func.coalesce(Boat.owner_id, Equipment.owner_id, MaintenanceRecord.created_by).label('owner_id'),
+               _meter_boat.id.label('meter_boat_id'), _meter_boat.engine_hours)
+        .outerjoin(Boat, Boat.id == MaintenanceRecord.boat_id)
+        .outerjoin(Equipment, Equipment.id == MaintenanceRecord.equipment_id)
+        .outerjoin(_meter_boat, _meter_boat.id == func.coalesce(MaintenanceRecord.boat_id, Equipment.boat_id))
+        .where(func.lower(func.coalesce(MaintenanceRecord.status, '')) != 'cancelled')
+        .order_by(MaintenanceRecord.date_performed.desc(), MaintenanceRecord.id.desc())
+    )
+
+
+def usage_rates(executor, today, boat_ids=None):
+    """Engine hours per day for boats over the last year, from the monthly rollups"""
+    query = (
+        select(BoatMonthlyStats.boat_id, func.sum(BoatMonthlyStats.engine_hours), func.min(BoatMonthlyStats.month))
+        .where(BoatMonthlyStats.month >= month_of(today - timedelta(days=USAGE_WINDOW_DAYS)),
+               BoatMonthlyStats.engine_hours > 0)
+        .group_by(BoatMonthlyStats.boat_id)
+    )
+    if boat_ids is not None:
+        query = query.where(BoatMonthlyStats.boat_id.in_(boat_ids))
+    return {boat_id: hours / max((today - first).days + 1, MIN_USAGE_DAYS)
+            for boat_id, hours, first in executor.execute(query)}
+
+
+def next_occurrence(row, rate, today):
+    """Schedule values for a task's latest record, or None when it can't be placed on the calendar"""
+    due_date = row.next_maintenance_due
+    if due_date is None and row.maintenance_interval_days and row.date_performed:
+        due_date = row.date_performed + timedelta(days=row.maintenance_interval_days)
+
+    hours_date = None
+    if row.next_maintenance_hours is not None and row.engine_hours is not None:
+        remaining = row.next_maintenance_hours - row.engine_hours
+        if remaining <= 0:
+            hours_date = today
+        elif rate:
+            hours_date = today + timedelta(days=math.ceil(remaining / rate))
+
+    options = [(day, reason) for day, reason in ((due_date, 'date'), (hours_date, 'engine_hours')) if day]
+    if not options:
+        return None
+    due_on, due_by = min(options)
+    return {
+        'record_id': row.id,
+        'boat_id': row.boat_id,
+        'equipment_id': row.equipment_id,
+        'title': row.title,
+        'owner_id': row.owner_id,
+        'due_date': due_date,
+        'due_engine_hours': row.next_maintenance_hours,
+        'due_on': due_on,
+        'due_by': due_by,
+        'scheduled_at': datetime.utcnow(),
+    }
+
+
+def schedule_task(connection, boat_id, equipment_id, title, today=None, exclude_record_id=None):
+    """Recompute one task's schedule row"""
+    today = today or date.today()
+    schedule = MaintenanceSchedule.__table__
+    connection.execute(delete(schedule).where(_task(schedule.c, boat_id, equipment_id, title)))
+
+    query = _task_records().where(_task(MaintenanceRecord, boat_id, equipment_id, title)).limit(1)
+    if exclude_record_id:
+        query = query.where(MaintenanceRecord.id != exclude_record_id)
+    row = connection.execute(query).first()
+    if row is None:
+        return
+
+    rates = {}
+    if row.next_maintenance_hours is not None and row.meter_boat_id:
+        rates = usage_rates(connection, today, [row.meter_boat_id])
+    values = next_occurrence(row, rates.get(row.meter_boat_id), today)
+    if values:
+        connection.execute(schedule.insert().values(values))
+
+
+def _changed(target, columns):
+    state = inspect(target)
+    return any(state.attrs[name].history.has_changes() for name in columns)
+
+
+def _loaded(connection, target, name):
+    """An attribute's value without loading it through the session mid-flush"""
+    state = inspect(target)
+    if name in state.dict:
+        return state.dict[name]
+    table = MaintenanceRecord.__table__
+    return connection.execute(select(table.c[name]).where(table.c.id == target.id)).scalar()
+
+
+def _task_keys(connection, condition):
+    return connection.execute(
+        select(MaintenanceRecord.boat_id, MaintenanceRecord.equipment_id, MaintenanceRecord.title)
+        .where(condition).distinct()
+    ).all()
+
+
+def _scheduled_key(connection, record_id):
+    schedule = MaintenanceSchedule.__table__
+    return connection.execute(
+        select(schedule.c.boat_id, schedule.c.equipment_id, schedule.c.title).where(schedule.c.record_id == record_id)
+    ).first()
+
+
+def _fill_due_hours(connection, target, get):
+    interval = get('maintenance_interval_hours')
+    if not interval or get('next_maintenance_hours') is not None:
+        return
+    boat_id, equipment_id = get('boat_id'), get('equipment_id')
+    if not boat_id and equipment_id:
+        boat_id = connection.execute(select(Equipment.boat_id).where(Equipment.id == equipment_id)).scalar()
+    meter = connection.execute(select(Boat.engine_hours).where(Boat.id == boat_id)).scalar() if boat_id else None
+    if meter is not None:
+        target.next_maintenance_hours = meter + interval
+
+
+def _record_before_insert(mapper, connection, target):
+    _fill_due_hours(connection, target, lambda name: getattr(target, name))
+
+
+def _record_before_update(mapper, connection, target):
+    if _changed(target, ('maintenance_interval_hours', 'next_maintenance_hours', 'boat_id', 'equipment_id')):
+        _fill_due_hours(connection, target, lambda name: _loaded(connection, target, name))
+
+
+def _reschedule_record(connection, record_id, exclude=False):
+    """Reschedule the task the record belongs to now and the one it was scheduled for, if different"""
+    keys = set(_task_keys(connection, MaintenanceRecord.id == record_id))
+    previous = _scheduled_key(connection, record_id)
+    if previous:
+        keys.add(tuple(previous))
+    for key in keys:
+        schedule_task(connection, *key, exclude_record_id=record_id if exclude else None)
+
+
+def _record_after_insert(mapper, connection, target):
+    _reschedule_record(connection, target.id)
+
+
+def _record_after_update(mapper, connection, target):
+    if _changed(target, SCHEDULE_COLUMNS):
+        _reschedule_record(connection, target.id)
+
+
+def _record_before_delete(mapper, connection, target):
+    _reschedule_record(connection, target.id, exclude=True)
+
+
+def _boat_after_update(mapper, connection, target):
+    if _changed(target, ('owner_id',)):
+        condition = or_(MaintenanceRecord.boat_id == target.id,
+                        MaintenanceRecord.equipment_id.in_(select(Equipment.id).where(Equipment.boat_id == target.id)))
+    elif _changed(target, ('engine_hours',)):
+        condition = and_(
+            MaintenanceRecord.next_maintenance_hours.isnot(None),
+            or_(MaintenanceRecord.boat_id == target.id,
+                MaintenanceRecord.equipment_id.in_(select(Equipment.id).where(Equipment.boat_id == target.id))))
+    else:
+        return
+    for key in _task_keys(connection, condition):
+        schedule_task(connection, *key)
+
+
+def _equipment_after_update(mapper, connection, target):
+    if _changed(target, ('owner_id', 'boat_id')):
+        for key in _task_keys(connection, MaintenanceRecord.equipment_id == target.id):
+            schedule_task(connection, *key)
+
+
+def init_app(app):
+    """Register the ORM listeners that keep the schedule current (once per process)"""
+    if event.contains(MaintenanceRecord, 'after_insert', _record_after_insert):
+        return
+    event.listen(MaintenanceRecord, 'before_insert', _record_before_insert)
+    event.listen(MaintenanceRecord, 'before_update', _record_before_update)
+    event.listen(MaintenanceRecord, 'after_insert', _record_after_insert)
+    event.listen(MaintenanceRecord, 'after_update', _record_after_update)
+    event.listen(MaintenanceRecord, 'before_delete', _record_before_delete)
+    event.listen(Boat, 'after_update', _boat_after_update)
+    event.listen(Equipment, 'after_update', _equipment_after_update)
+
+
+def rebuild(today=None):
+    """Recompute the whole schedule; returns the number of scheduled tasks and the caller commits"""
+    today = today or date.today()
+    schedule = MaintenanceSchedule.__table__
+    db.session.execute(delete(schedule))
+
+    rates = usage_rates(db.session, today)
+    seen = set()
+    rows = []
+    for row in db.session.execute(_task_records().execution_options(yield_per=BATCH_SIZE)):
+        key = (row.boat_id, row.equipment_id, row.title)
+        if key in seen:
+            continue
+        seen.add(key)
+        values = next_occurrence(row, rates.get(row.meter_boat_id), today)
+        if values:
+            rows.append(values)
+
+    for start in range(0, len(rows), BATCH_SIZE):
+        db.session.execute(schedule.insert(), rows[start:start + BATCH_SIZE])
+    return len(rows)
+
+
+def due_query(owner_id, until=None):
+    """Scheduled tasks of an owner due by until, with the names and meter shown with them, soonest first"""
+    query = (
+        select(MaintenanceSchedule.record_id, MaintenanceSchedule.title, MaintenanceRecord.maintenance_type,
+               MaintenanceRecord.priority, MaintenanceSchedule.boat_id, Boat.name.label('boat_name'),
+               MaintenanceSchedule.equipment_id, Equipment.name.label('equipment_name'),
+               MaintenanceSchedule.due_on, MaintenanceSchedule.due_by, MaintenanceSchedule.due_date,
+               MaintenanceSchedule.due_engine_hours, Boat.engine_hours)
+        .join(MaintenanceRecord, MaintenanceRecord.id == MaintenanceSchedule.record_id)
+        .outerjoin(Boat, Boat.id == MaintenanceSchedule.boat_id)
+        .outerjoin(Equipment, Equipment.id == MaintenanceSchedule.equipment_id)
+        .where(MaintenanceSchedule.owner_id == owner_id)
+        .order_by(MaintenanceSchedule.due_on, MaintenanceSchedule.id)
+    )
+    return query.where(MaintenanceSchedule.due_on <= until) if until else query
+
+
+def due_counts(owner_id, today, until):
+    """(overdue, due from today until) counts for an owner"""
+    due_on = MaintenanceSchedule.due_on
+    return tuple(db.session.execute(
+        select(func.count(case((due_on < today, 1))), func.count(case((due_on >= today, 1))))
+        .where(MaintenanceSchedule.owner_id == owner_id, due_on <= until)
+    ).one())
+
+
+def due_items(query, today):
+    """Rows of due_query() as dictionaries"""
+    return [{
+        'record_id': row.record_id,
+        'title': row.title,
+        'maintenance_type': row.maintenance_type,
+        'priority': row.priority,
+        'boat_id': row.boat_id,
+        'boat_name': row.boat_name,
+        'equipment_id': row.equipment_id,
+        'equipment_name': row.equipment_name,
+        'due_on': row.due_on.isoformat(),
+        'due_by': row.due_by,
+        'due_date': row.due_date.isoformat() if row.due_date else None,
+        'due_engine_hours': row.due_engine_hours,
+        'engine_hours': row.engine_hours,
+        'days_until_due': (row.due_on - today).days,
+        'is_overdue': row.due_on < today,
+    } for row in db.session.execute(query)]
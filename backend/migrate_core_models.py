@@ -8,28 +8,11 @@ to the production PostgreSQL database.
 
 import os
 import sys
-from flask import Flask
-from flask_migrate import Migrate, upgrade, migrate as flask_migrate
-from config import Config
+from flask_migrate import upgrade, migrate as flask_migrate
+from factory import create_app
 from models import db, User, SystemModule, UserModulePermission, UserPreference, Boat, Equipment, MaintenanceRecord, Event
 import traceback
 
-def create_app_for_migration():
-    """Create Flask app configured for migration"""
-    app = Flask(__name__)
-    
-    # Use production config for PostgreSQL
-    app.config.from_object(Config)
-    
-    # Override database URL if provided via environment
-    if 'DATABASE_URL' in os.environ:
-        app.config['SQLALCHEMY_DATABASE_URI'] = os.environ['DATABASE_URL']
-    
-    db.init_app(app)
-    migrate = Migrate(app, db)
-    
-    return app, migrate
-
 def check_existing_tables(app):
     """Check what tables already exist"""
     print("🔄 Checking existing database structure...")
@@ -157,7 +140,7 @@ def run_core_models_migration():
     
     try:
         # Create app for migration
-        app, migrate = create_app_for_migration()
+        app = create_app(api=False, migrations=True)
         
         print(f"📊 Database URI: {app.config.get('SQLALCHEMY_DATABASE_URI', 'Not configured')}")
         
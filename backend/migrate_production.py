@@ -6,30 +6,12 @@ This script handles migrating the production PostgreSQL database
 to support the enhanced sailor utility features.
 """
 
-import os
 import sys
-from flask import Flask
-from flask_migrate import Migrate, upgrade, init, migrate as flask_migrate
-from config import Config
+from flask_migrate import upgrade, init, migrate as flask_migrate
+from factory import create_app
 from models import db, User, SystemModule, UserModulePermission, UserPreference
 import traceback
 
-def create_app_for_migration():
-    """Create Flask app configured for migration"""
-    app = Flask(__name__)
-    
-    # Use production config for PostgreSQL
-    app.config.from_object(Config)
-    
-    # Override database URL if provided via environment
-    if 'DATABASE_URL' in os.environ:
-        app.config['SQLALCHEMY_DATABASE_URI'] = os.environ['DATABASE_URL']
-    
-    db.init_app(app)
-    migrate = Migrate(app, db)
-    
-    return app, migrate
-
 def backup_existing_data(app):
     """Backup existing user data before migration"""
     print("🔄 Backing up existing user data...")
@@ -241,7 +223,7 @@ def run_migration():
     
     try:
         # Create app for migration
-        app, migrate = create_app_for_migration()
+        app = create_app(api=False, migrations=True)
         
         print(f"📊 Database URI: {app.config.get('SQLALCHEMY_DATABASE_URI', 'Not configured')}")
         
@@ -0,0 +1,60 @@
+"""Add indexes for event calendar windows
+
+Revision ID: 1c0af2d16498
+Revises: 3f57375c86bf
+Create Date: 2026-10-17 16:05:37.152960
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '1c0af2d16498'
+down_revision = '3f57375c86bf'
+branch_labels = None
+depends_on = None
+
+
+# (index name, table, columns) - must match the db.Index declarations in models.py
+INDEXES = [
+    ('ix_events_start_date_end_date', 'events', ['start_date', 'end_date']),
+    ('ix_events_end_date', 'events', ['end_date']),
+    ('ix_event_recurrences_ends_at', 'event_recurrences', ['ends_at']),
+]
+
+# Replaced by ix_events_start_date_end_date, which serves the same lookups
+DROPPED_INDEXES = [
+    ('ix_events_start_date', 'events', ['start_date']),
+]
+
+
+def _existing_indexes():
+    """Map each existing table to the names of its indexes"""
+    inspector = sa.inspect(op.get_bind())
+    return {
+        table: {index['name'] for index in inspector.get_indexes(table)}
+        for table in inspector.get_table_names()
+    }
+
+
+def upgrade():
+    # event_recurrences is created with db.create_all(), so only touch tables
+    # that exist and indexes that are missing
+    existing = _existing_indexes()
+    for name, table, columns in INDEXES:
+        if table in existing and name not in existing[table]:
+            op.create_index(name, table, columns, unique=False)
+    for name, table, columns in DROPPED_INDEXES:
+        if table in existing and name in existing[table]:
+            op.drop_index(name, table_name=table)
+
+
+def downgrade():
+    existing = _existing_indexes()
+    for name, table, columns in DROPPED_INDEXES:
+        if table in existing and name not in existing[table]:
+            op.create_index(name, table, columns, unique=False)
+    for name, table, columns in reversed(INDEXES):
+        if table in existing and name in existing[table]:
+            op.drop_index(name, table_name=table)
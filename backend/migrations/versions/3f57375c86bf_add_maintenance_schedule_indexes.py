@@ -0,0 +1,49 @@
+"""Add indexes for the maintenance schedule
+
+Revision ID: 3f57375c86bf
+Revises: b7c3e1f04a92
+Create Date: 2026-10-17 15:40:12.904518
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f57375c86bf'
+down_revision = 'b7c3e1f04a92'
+branch_labels = None
+depends_on = None
+
+
+# (index name, table, columns) - must match the db.Index declarations in models.py
+INDEXES = [
+    ('ix_maintenance_schedule_owner_id_due_on', 'maintenance_schedule', ['owner_id', 'due_on']),
+    ('ix_maintenance_schedule_boat_id', 'maintenance_schedule', ['boat_id']),
+    ('ix_maintenance_schedule_equipment_id', 'maintenance_schedule', ['equipment_id']),
+]
+
+
+def _existing_indexes():
+    """Map each existing table to the names of its indexes"""
+    inspector = sa.inspect(op.get_bind())
+    return {
+        table: {index['name'] for index in inspector.get_indexes(table)}
+        for table in inspector.get_table_names()
+    }
+
+
+def upgrade():
+    # maintenance_schedule is created with db.create_all(), so it may not exist yet
+    # (create_all then builds the indexes with it) or may already have them
+    existing = _existing_indexes()
+    for name, table, columns in INDEXES:
+        if table in existing and name not in existing[table]:
+            op.create_index(name, table, columns, unique=False)
+
+
+def downgrade():
+    existing = _existing_indexes()
+    for name, table, columns in reversed(INDEXES):
+        if table in existing and name in existing[table]:
+            op.drop_index(name, table_name=table)
@@ -0,0 +1,62 @@
+"""Add indexes for hot foreign keys and filter columns
+
+Revision ID: b7c3e1f04a92
+Revises: 94d5653a4280
+Create Date: 2026-10-17 09:12:44.318205
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7c3e1f04a92'
+down_revision = '94d5653a4280'
+branch_labels = None
+depends_on = None
+
+
+# (index name, table, columns) - must match the db.Index declarations in models.py
+INDEXES = [
+    ('ix_boats_owner_id_is_active', 'boats', ['owner_id', 'is_active']),
+    ('ix_trips_captain_id', 'trips', ['captain_id']),
+    ('ix_trips_boat_id', 'trips', ['boat_id']),
+    ('ix_equipment_owner_id', 'equipment', ['owner_id']),
+    ('ix_equipment_boat_id', 'equipment', ['boat_id']),
+    ('ix_maintenance_records_boat_id', 'maintenance_records', ['boat_id']),
+    ('ix_maintenance_records_equipment_id', 'maintenance_records', ['equipment_id']),
+    ('ix_maintenance_records_created_by', 'maintenance_records', ['created_by']),
+    ('ix_maintenance_records_next_maintenance_due', 'maintenance_records', ['next_maintenance_due']),
+    ('ix_events_is_public', 'events', ['is_public']),
+    ('ix_events_created_by', 'events', ['created_by']),
+    ('ix_events_start_date', 'events', ['start_date']),
+    ('ix_user_module_permissions_module_id', 'user_module_permissions', ['module_id']),
+    ('ix_gps_route_points_trip_id_timestamp', 'gps_route_points', ['trip_id', 'timestamp']),
+    ('ix_processing_jobs_status_id', 'processing_jobs', ['status', 'id']),
+    ('ix_processing_jobs_trip_id', 'processing_jobs', ['trip_id']),
+]
+
+
+def _existing_indexes():
+    """Map each existing table to the names of its indexes"""
+    inspector = sa.inspect(op.get_bind())
+    return {
+        table: {index['name'] for index in inspector.get_indexes(table)}
+        for table in inspector.get_table_names()
+    }
+
+
+def upgrade():
+    # Several of these tables were created with db.create_all() rather than a
+    # migration, so only touch tables that exist and indexes that are missing
+    existing = _existing_indexes()
+    for name, table, columns in INDEXES:
+        if table in existing and name not in existing[table]:
+            op.create_index(name, table, columns, unique=False)
+
+
+def downgrade():
+    existing = _existing_indexes()
+    for name, table, columns in reversed(INDEXES):
+        if table in existing and name in existing[table]:
+            op.drop_index(name, table_name=table)
@@ -128,9 +128,15 @@ class UserModulePermission(db.Model):
     user = db.relationship('User', foreign_keys=[user_id], backref='module_permissions')
     module = db.relationship('SystemModule', backref='user_permissions')
     granted_by_user = db.relationship('User', foreign_keys=[granted_by])
+
+    # Relationships read by to_dict(); list endpoints eager load these
+    serializer_relationships = ('module', 'granted_by_user')
     
-    # Unique constraint to prevent duplicate permissions
-    __table_args__ = (db.UniqueConstraint('user_id', 'module_id', name='_user_module_uc'),)
+    # Unique constraint to prevent duplicate permissions (also the user_id, module_id index)
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'module_id', name='_user_module_uc'),
+        db.Index('ix_user_module_permissions_module_id', 'module_id'),
+    )
     
     def to_dict(self):
         """Convert permission to dictionary for JSON response"""
@@ -160,24 +166,31 @@ class UserPreference(db.Model):
     # Relationships
     user = db.relationship('User', backref='preferences')
     
-    # Unique constraint to prevent duplicate preference keys per user
+    # Unique constraint to prevent duplicate preference keys per user (also the lookup index)
     __table_args__ = (db.UniqueConstraint('user_id', 'preference_key', name='_user_preference_uc'),)
     
-    def get_value(self):
-        """Get preference value, attempting to parse as JSON first"""
-        if self.preference_value:
+    @staticmethod
+    def encode_value(value):
+        """Stored text for a preference value: strings as-is, anything else as JSON"""
+        return value if isinstance(value, str) else json.dumps(value)
+    
+    @staticmethod
+    def decode_value(stored):
+        """Preference value from stored text, attempting to parse as JSON first"""
+        if stored:
             try:
-                return json.loads(self.preference_value)
+                return json.loads(stored)
             except json.JSONDecodeError:
-                return self.preference_value
+                return stored
         return None
     
+    def get_value(self):
+        """Get preference value, attempting to parse as JSON first"""
+        return self.decode_value(self.preference_value)
+    
     def set_value(self, value):
         """Set preference value, converting to JSON if not string"""
-        if isinstance(value, str):
-            self.preference_value = value
-        else:
-            self.preference_value = json.dumps(value)
+        self.preference_value = self.encode_value(value)
     
     def to_dict(self):
         """Convert preference to dictionary for JSON response"""
@@ -251,6 +264,12 @@ class Boat(db.Model):
     
     # Relationships
     owner = db.relationship('User', backref='owned_boats')
+
+    # Relationships read by to_dict(); list endpoints eager load these
+    serializer_relationships = ('owner',)
+
+    # Boat lists filter on the owner's active boats
+    __table_args__ = (db.Index('ix_boats_owner_id_is_active', 'owner_id', 'is_active'),)
     
     def get_photos(self):
         """Get photos as list"""
@@ -368,6 +387,14 @@ class Equipment(db.Model):
     # Relationships
     owner = db.relationship('User', backref='equipment')
     boat = db.relationship('Boat', backref='equipment')
+
+    # Relationships read by to_dict(); list endpoints eager load these
+    serializer_relationships = ('owner', 'boat')
+
+    __table_args__ = (
+        db.Index('ix_equipment_owner_id', 'owner_id'),
+        db.Index('ix_equipment_boat_id', 'boat_id'),
+    )
     
     def get_specifications(self):
         """Get specifications as dictionary"""
@@ -518,7 +545,37 @@ class MaintenanceRecord(db.Model):
     boat = db.relationship('Boat', backref='maintenance_records')
     equipment = db.relationship('Equipment', backref='maintenance_records')
     creator = db.relationship('User', backref='created_maintenance_records')
-    
+
+    # Relationships read by to_dict(); list endpoints eager load these
+    serializer_relationships = ('boat', 'equipment', 'creator')
+
+    # Ownership scoping and the due-maintenance lookups
+    __table_args__ = (
+        db.Index('ix_maintenance_records_boat_id', 'boat_id'),
+        db.Index('ix_maintenance_records_equipment_id', 'equipment_id'),
+        db.Index('ix_maintenance_records_created_by', 'created_by'),
+        db.Index('ix_maintenance_records_next_maintenance_due', 'next_maintenance_due'),
+    )
+
+    @classmethod
+    def owned_by(cls, user_id):
+        """SQL condition for records on the user's boats or equipment, or created by them.
+
+        The boat and equipment ids are uncorrelated subqueries, so the access
+        check stays inside one statement and each branch is an index lookup
+        (boats/equipment by owner, then records by boat/equipment/creator).
+        """
+        return db.or_(
+            cls.boat_id.in_(db.select(Boat.id).where(Boat.owner_id == user_id)),
+            cls.equipment_id.in_(db.select(Equipment.id).where(Equipment.owner_id == user_id)),
+            cls.created_by == user_id
+        )
+
+    @classmethod
+    def query_for_user(cls, user_id):
+        """Query of every maintenance record the user may see or change"""
+        return cls.query.filter(cls.owned_by(user_id))
+
     def get_parts_used(self):
         """Get parts used as list"""
         if self.parts_used:
@@ -625,6 +682,38 @@ class MaintenanceRecord(db.Model):
         }
 
 
+class MaintenanceSchedule(db.Model):
+    __tablename__ = 'maintenance_schedule'
+
+    id = db.Column(db.Integer, primary_key=True)
+
+    # Next due occurrence of a recurring task, kept current by maintenance_schedule.py. A task is the
+    # records with the same boat, equipment and title; the latest one sets the next due.
+    record_id = db.Column(db.Integer, db.ForeignKey('maintenance_records.id'), nullable=False)
+    boat_id = db.Column(db.Integer, db.ForeignKey('boats.id'))
+    equipment_id = db.Column(db.Integer, db.ForeignKey('equipment.id'))
+    title = db.Column(db.String(200), nullable=False)
+    owner_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)  # Boat owner, else equipment owner, else creator
+
+    # When it is due
+    due_date = db.Column(db.Date)  # By the calendar
+    due_engine_hours = db.Column(db.Float)  # By the hour meter
+    due_on = db.Column(db.Date, nullable=False)  # Earlier of due_date and the day the meter is projected to reach due_engine_hours
+    due_by = db.Column(db.String(20), nullable=False)  # date, engine_hours
+    scheduled_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    # Relationships
+    record = db.relationship('MaintenanceRecord')
+
+    # "What's due across my fleet" is one range scan; hour meter changes find a boat's tasks
+    __table_args__ = (
+        db.UniqueConstraint('record_id', name='uq_maintenance_schedule_record_id'),
+        db.Index('ix_maintenance_schedule_owner_id_due_on', 'owner_id', 'due_on'),
+        db.Index('ix_maintenance_schedule_boat_id', 'boat_id'),
+        db.Index('ix_maintenance_schedule_equipment_id', 'equipment_id'),
+    )
+
+
 class Event(db.Model):
     __tablename__ = 'events'
     
@@ -677,6 +766,17 @@ class Event(db.Model):
     
     # Relationships
     creator = db.relationship('User', backref='created_events')
+
+    # Relationships read by to_dict(); list endpoints eager load these
+    serializer_relationships = ('creator', 'recurrence')
+
+    __table_args__ = (
+        db.Index('ix_events_is_public', 'is_public'),
+        db.Index('ix_events_created_by', 'created_by'),
+        # Calendar windows (see event_calendar.py): events starting in the window, and ones still running
+        db.Index('ix_events_start_date_end_date', 'start_date', 'end_date'),
+        db.Index('ix_events_end_date', 'end_date'),
+    )
     
     def get_boat_requirements(self):
         """Get boat requirements as dictionary"""
@@ -774,11 +874,51 @@ class Event(db.Model):
             'duration_hours': self.duration_hours(),
             'created_by': self.created_by,
             'creator_name': self.creator.get_full_name() if self.creator else None,
+            'recurrence': self.recurrence.to_dict() if self.recurrence else None,
             'created_at': self.created_at.isoformat(),
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
 
 
+class EventRecurrence(db.Model):
+    """Repeat rule of a recurring event; the event's own dates are the first occurrence"""
+    __tablename__ = 'event_recurrences'
+
+    id = db.Column(db.Integer, primary_key=True)
+    event_id = db.Column(db.Integer, db.ForeignKey('events.id'), nullable=False)
+    rule = db.Column(db.String(255), nullable=False)  # RRULE, e.g. FREQ=WEEKLY;BYDAY=WE;UNTIL=20250930
+    exdates = db.Column(db.Text)  # JSON array of skipped occurrence starts
+    ends_at = db.Column(db.DateTime)  # End of the last occurrence, None while the series runs on
+
+    event = db.relationship('Event', backref=db.backref('recurrence', uselist=False, cascade='all, delete-orphan'))
+
+    __table_args__ = (
+        db.UniqueConstraint('event_id', name='uq_event_recurrences_event_id'),
+        db.Index('ix_event_recurrences_ends_at', 'ends_at'),
+    )
+
+    def get_exdates(self):
+        """Get skipped occurrence starts as datetimes"""
+        if self.exdates:
+            try:
+                return [datetime.fromisoformat(value) for value in json.loads(self.exdates)]
+            except (json.JSONDecodeError, TypeError, ValueError):
+                return []
+        return []
+
+    def set_exdates(self, exdates_list):
+        """Set skipped occurrence starts from a list of datetimes"""
+        self.exdates = json.dumps([value.isoformat() for value in exdates_list]) if exdates_list else None
+
+    def to_dict(self):
+        """Convert recurrence to dictionary for JSON response"""
+        return {
+            'rule': self.rule,
+            'exdates': [value.isoformat() for value in self.get_exdates()],
+            'ends_at': self.ends_at.isoformat() if self.ends_at else None
+        }
+
+
 class Trip(db.Model):
     __tablename__ = 'trips'
     
@@ -869,6 +1009,14 @@ class Trip(db.Model):
     # Relationships
     boat = db.relationship('Boat', backref='trips')
     captain = db.relationship('User', foreign_keys=[captain_id], backref='captained_trips')
+
+    # Relationships read by to_dict(); list endpoints eager load these
+    serializer_relationships = ('boat', 'captain')
+
+    __table_args__ = (
+        db.Index('ix_trips_captain_id', 'captain_id'),
+        db.Index('ix_trips_boat_id', 'boat_id'),
+    )
     
     # Timestamps
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -1105,6 +1253,9 @@ class GPSRoutePoint(db.Model):
     
     # Relationships
     trip = db.relationship('Trip', backref='route_points')
+
+    # Tracks are always read per trip in time order
+    __table_args__ = (db.Index('ix_gps_route_points_trip_id_timestamp', 'trip_id', 'timestamp'),)
     
     # Timestamps
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -1190,6 +1341,213 @@ class GPSRoutePoint(db.Model):
         }
 
 
+class TripTrackChunk(db.Model):
+    __tablename__ = 'trip_track_chunks'
+
+    id = db.Column(db.Integer, primary_key=True)
+    trip_id = db.Column(db.Integer, db.ForeignKey('trips.id'), nullable=False)
+    chunk_index = db.Column(db.Integer, nullable=False)  # Order of the chunk within the track
+
+    # Chunk summary
+    point_count = db.Column(db.Integer, nullable=False)
+    start_time = db.Column(db.DateTime)
+    end_time = db.Column(db.DateTime)
+
+    # Compressed column arrays (see track_store.py for the layout)
+    data = db.Column(db.LargeBinary, nullable=False)
+
+    # Timestamps
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    # Relationships
+    trip = db.relationship('Trip', backref='track_chunks')
+
+    __table_args__ = (db.UniqueConstraint('trip_id', 'chunk_index', name='uq_trip_track_chunk'),)
+
+    def to_dict(self):
+        """Convert chunk summary to dictionary for JSON response"""
+        return {
+            'trip_id': self.trip_id,
+            'chunk_index': self.chunk_index,
+            'point_count': self.point_count,
+            'start_time': self.start_time.isoformat() if self.start_time else None,
+            'end_time': self.end_time.isoformat() if self.end_time else None,
+            'size_bytes': len(self.data) if self.data else 0
+        }
+
+
+class TripRouteLevel(db.Model):
+    __tablename__ = 'trip_route_levels'
+
+    id = db.Column(db.Integer, primary_key=True)
+    trip_id = db.Column(db.Integer, db.ForeignKey('trips.id'), nullable=False)
+
+    # Simplification level
+    tolerance_meters = db.Column(db.Float, nullable=False)  # 0 = every route point
+    algorithm = db.Column(db.String(30), default='douglas_peucker')  # douglas_peucker, visvalingam
+    point_count = db.Column(db.Integer, default=0)
+    coordinates = db.Column(db.Text)  # JSON array of [latitude, longitude] pairs
+
+    # Timestamps
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    # Relationships
+    trip = db.relationship('Trip', backref='route_levels')
+
+    __table_args__ = (db.UniqueConstraint('trip_id', 'tolerance_meters', name='uq_trip_route_level'),)
+
+    def get_coordinates(self):
+        """Get coordinates as list"""
+        if self.coordinates:
+            try:
+                return json.loads(self.coordinates)
+            except json.JSONDecodeError:
+                return []
+        return []
+
+    def set_coordinates(self, coordinates_list):
+        """Set coordinates from list"""
+        self.coordinates = json.dumps(coordinates_list, separators=(',', ':')) if coordinates_list else None
+
+    def to_dict(self, include_coordinates=True):
+        """Convert route level to dictionary for JSON response"""
+        data = {
+            'trip_id': self.trip_id,
+            'tolerance_meters': self.tolerance_meters,
+            'algorithm': self.algorithm,
+            'point_count': self.point_count,
+            'created_at': self.created_at.isoformat()
+        }
+        if include_coordinates:
+            data['coordinates'] = self.get_coordinates()
+        return data
+
+
+class ProcessingJob(db.Model):
+    __tablename__ = 'processing_jobs'
+
+    id = db.Column(db.Integer, primary_key=True)
+    job_type = db.Column(db.String(50), nullable=False)  # import_track, process_track
+    trip_id = db.Column(db.Integer, db.ForeignKey('trips.id'), nullable=False)
+    created_by = db.Column(db.Integer, db.ForeignKey('user.id'))  # Empty for jobs queued by the worker scan
+
+    # Queue state
+    status = db.Column(db.String(20), default='Queued')  # Queued, Running, Completed, Failed
+    attempts = db.Column(db.Integer, default=0)
+    max_attempts = db.Column(db.Integer, default=3)
+    worker = db.Column(db.String(100))  # host:pid of the worker that claimed the job
+
+    # Outcome
+    error = db.Column(db.Text)
+    result = db.Column(db.Text)  # JSON summary written by the job handler
+
+    # Timestamps
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Relationships
+    trip = db.relationship('Trip', backref='processing_jobs')
+    creator = db.relationship('User', backref='processing_jobs')
+
+    # Workers poll for the oldest queued job; the scanner checks jobs per trip
+    __table_args__ = (
+        db.Index('ix_processing_jobs_status_id', 'status', 'id'),
+        db.Index('ix_processing_jobs_trip_id', 'trip_id'),
+    )
+
+    def get_result(self):
+        """Get result as dict"""
+        if self.result:
+            try:
+                return json.loads(self.result)
+            except json.JSONDecodeError:
+                return {}
+        return {}
+
+    def set_result(self, result_dict):
+        """Set result from dict"""
+        self.result = json.dumps(result_dict) if result_dict else None
+
+    def duration_seconds(self):
+        """Calculate how long the last attempt ran"""
+        if self.started_at and self.finished_at:
+            return (self.finished_at - self.started_at).total_seconds()
+        return None
+
+    def to_dict(self):
+        """Convert job to dictionary for JSON response"""
+        return {
+            'id': self.id,
+            'job_type': self.job_type,
+            'trip_id': self.trip_id,
+            'created_by': self.created_by,
+            'status': self.status,
+            'attempts': self.attempts,
+            'max_attempts': self.max_attempts,
+            'worker': self.worker,
+            'error': self.error,
+            'result': self.get_result(),
+            'duration_seconds': self.duration_seconds(),
+            'created_at': self.created_at.isoformat(),
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
+
+
+class MonthlyStatsColumns:
+    """Figures shared by the monthly statistics tables (kept current by rollups.py)"""
+
+    month = db.Column(db.Date, nullable=False)  # First day of the month
+
+    # Trips starting in the month (cancelled trips don't count)
+    trips = db.Column(db.Integer, nullable=False, default=0)
+    distance_miles = db.Column(db.Float, nullable=False, default=0)  # Logged distance, else the GPS track's
+    hours_under_way = db.Column(db.Float, nullable=False, default=0)
+
+    # Increases of Boat.engine_hours recorded in the month
+    engine_hours = db.Column(db.Float, nullable=False, default=0)
+
+    # Maintenance performed in the month (cancelled records don't count)
+    maintenance_count = db.Column(db.Integer, nullable=False, default=0)
+    maintenance_cost = db.Column(db.Numeric(12, 2), nullable=False, default=0)
+
+    def figures(self):
+        """The statistics as a dictionary of plain numbers"""
+        return {
+            'trips': self.trips,
+            'distance_miles': round(self.distance_miles, 1),
+            'hours_under_way': round(self.hours_under_way, 1),
+            'engine_hours': round(self.engine_hours, 1),
+            'maintenance_count': self.maintenance_count,
+            'maintenance_cost': round(float(self.maintenance_cost), 2)
+        }
+
+    def to_dict(self):
+        """Convert monthly statistics to dictionary for JSON response"""
+        return {'month': self.month.strftime('%Y-%m'), **self.figures()}
+
+
+class UserMonthlyStats(MonthlyStatsColumns, db.Model):
+    __tablename__ = 'user_monthly_stats'
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)  # Captain, maintenance creator, boat owner
+
+    __table_args__ = (db.UniqueConstraint('user_id', 'month', name='uq_user_monthly_stats'),)
+
+
+class BoatMonthlyStats(MonthlyStatsColumns, db.Model):
+    __tablename__ = 'boat_monthly_stats'
+
+    id = db.Column(db.Integer, primary_key=True)
+    boat_id = db.Column(db.Integer, db.ForeignKey('boats.id'), nullable=False)
+
+    __table_args__ = (db.UniqueConstraint('boat_id', 'month', name='uq_boat_monthly_stats'),)
+
+
 # Relationship tables for many-to-many relationships
 
 class TripParticipant(db.Model):
@@ -1225,6 +1583,9 @@ class TripParticipant(db.Model):
     # Relationships
     trip = db.relationship('Trip', backref='participants')
     user = db.relationship('User', backref='trip_participations')
+
+    # Relationships read by to_dict(); list endpoints eager load these
+    serializer_relationships = ('trip', 'user')
     
     # Unique constraint to prevent duplicate participant entries
     __table_args__ = (db.UniqueConstraint('trip_id', 'user_id', name='_trip_user_uc'),)
@@ -0,0 +1,214 @@
+"""
+Module access resolution for navigation and admin permission views
+
+available_modules() answers "which modules does this user see" with one
+joined query over permissions and modules and keeps the materialized list
+per user in an in-process cache, since the navigation call runs on every
+page load.
+
+The cache is invalidated by ORM events: any insert/update/delete of a
+UserModulePermission drops that user's entry and any change to a
+SystemModule drops every entry. Bulk query-level writes bypass those
+events and must call invalidate() themselves. Other worker processes pick
+changes up after MODULE_ACCESS_CACHE_TTL_SECONDS.
+"""
+
+import threading
+import time
+from flask import current_app
+from sqlalchemy import event
+from models import db, User, SystemModule, UserModulePermission
+from upsert import dialect_insert
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def invalidate(user_id=None):
+    """Forget the cached modules for one user, or for everyone"""
+    with _cache_lock:
+        if user_id is None:
+            _cache.clear()
+        else:
+            for key in [key for key in _cache if key[0] == user_id]:
+                del _cache[key]
+
+
+@event.listens_for(UserModulePermission, 'after_insert')
+@event.listens_for(UserModulePermission, 'after_update')
+@event.listens_for(UserModulePermission, 'after_delete')
+def _permission_changed(mapper, connection, target):
+    invalidate(target.user_id)
+
+
+@event.listens_for(SystemModule, 'after_insert')
+@event.listens_for(SystemModule, 'after_update')
+@event.listens_for(SystemModule, 'after_delete')
+def _module_changed(mapper, connection, target):
+    invalidate()
+
+
+def _load_available_modules(user_id, is_admin):
+    rows = db.session.query(SystemModule, UserModulePermission.is_enabled).join(
+        UserModulePermission, UserModulePermission.module_id == SystemModule.id
+    ).filter(
+        UserModulePermission.user_id == user_id,
+        SystemModule.is_active.is_(True)
+    ).order_by(SystemModule.sort_order, SystemModule.id).all()
+
+    return [
+        {**module.to_dict(), 'is_enabled': is_enabled}
+        for module, is_enabled in rows
+        # Admin-only modules need the user to be an admin as well as a grant
+        if is_admin or not module.requires_admin
+    ]
+
+
+def available_modules(user):
+    """Active modules the user has been granted, in navigation order.
+
+    Each entry is the module's to_dict() plus the user's is_enabled flag.
+    The returned list is shared with the cache; callers must not mutate it.
+    """
+    key = (user.id, bool(user.is_admin))
+    ttl = current_app.config.get('MODULE_ACCESS_CACHE_TTL_SECONDS', 0)
+
+    if ttl > 0:
+        with _cache_lock:
+            entry = _cache.get(key)
+        if entry and time.monotonic() - entry[0] <= ttl:
+            return entry[1]
+
+    modules = _load_available_modules(user.id, key[1])
+    if ttl > 0:
+        with _cache_lock:
+            _cache[key] = (time.monotonic(), modules)
+    return modules
+
+
+def user_module_grants(user_id):
+    """Every module with the user's grant (if any), for the admin permission view"""
+    rows = db.session.query(SystemModule, UserModulePermission).outerjoin(
+        UserModulePermission,
+        db.and_(UserModulePermission.module_id == SystemModule.id, UserModulePermission.user_id == user_id)
+    ).order_by(SystemModule.sort_order, SystemModule.id).all()
+
+    return [
+        {
+            **module.to_dict(),
+            'has_permission': permission is not None,
+            'is_enabled': permission.is_enabled if permission else False,
+            'granted_at': permission.granted_at.isoformat() if permission and permission.granted_at else None
+        }
+        for module, permission in rows
+    ]
+
+
+# Core modules that bulk revokes leave in place (same rule as the revoke endpoint)
+UNREVOKABLE_MODULES = ('dashboard',)
+
+BULK_ACTIONS = ('grant', 'revoke')
+
+# Stay under SQLite's bound-parameter limit when building IN lists
+_IN_CHUNK = 900
+
+
+def _chunks(values, size=_IN_CHUNK):
+    values = list(values)
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def _insert_ignoring_duplicates(rows):
+    """INSERT the permission rows, skipping pairs another request granted meanwhile"""
+    table = UserModulePermission.__table__
+    statement = dialect_insert(table)
+    if statement is None:
+        # Pairs were already filtered against existing rows; a race raises IntegrityError
+        db.session.execute(table.insert(), rows)
+        return
+    db.session.execute(statement.on_conflict_do_nothing(index_elements=['user_id', 'module_id']), rows)
+
+
+def bulk_set_module_access(user_ids, module_ids, action='grant', granted_by=None, reenable=False):
+    """Grant or revoke every module in module_ids for every user in user_ids.
+
+    Runs a handful of set-based statements in the caller's transaction (the
+    caller commits): one read of the existing grants, one executemany
+    INSERT ... ON CONFLICT DO NOTHING, and one UPDATE or DELETE by id.
+
+    Existing grants are left alone, as with the single-grant endpoint, so a
+    bulk grant doesn't undo modules users switched off themselves; with
+    reenable=True disabled grants are switched back on.
+
+    Returns a list of {'user_id', 'module_id', 'outcome'} in matrix order.
+    Grant outcomes: granted, exists, enabled (disabled grant switched on
+    with reenable). Revoke outcomes: revoked, not_granted, protected.
+    Either action can report user_not_found or module_not_found.
+    """
+    if action not in BULK_ACTIONS:
+        raise ValueError(f"action must be one of: {', '.join(BULK_ACTIONS)}")
+    user_ids = list(dict.fromkeys(user_ids))
+    module_ids = list(dict.fromkeys(module_ids))
+
+    known_users = set()
+    for chunk in _chunks(user_ids):
+        known_users.update(row[0] for row in db.session.execute(
+            db.select(User.id).where(User.id.in_(chunk))))
+    module_names = dict(db.session.execute(
+        db.select(SystemModule.id, SystemModule.name).where(SystemModule.id.in_(module_ids))).all())
+
+    existing = {}
+    permission = UserModulePermission.__table__.c
+    for chunk in _chunks(known_users):
+        rows = db.session.execute(
+            db.select(permission.id, permission.user_id, permission.module_id, permission.is_enabled).where(
+                permission.user_id.in_(chunk), permission.module_id.in_(list(module_names))))
+        existing.update({(row.user_id, row.module_id): (row.id, row.is_enabled) for row in rows})
+
+    results = []
+    inserts = []
+    changed_ids = []
+    for user_id in user_ids:
+        for module_id in module_ids:
+            if user_id not in known_users:
+                outcome = 'user_not_found'
+            elif module_id not in module_names:
+                outcome = 'module_not_found'
+            elif action == 'grant':
+                current = existing.get((user_id, module_id))
+                if current is None:
+                    inserts.append({'user_id': user_id, 'module_id': module_id,
+                                    'is_enabled': True, 'granted_by': granted_by})
+                    outcome = 'granted'
+                elif reenable and not current[1]:
+                    changed_ids.append(current[0])
+                    outcome = 'enabled'
+                else:
+                    outcome = 'exists'
+            else:
+                current = existing.get((user_id, module_id))
+                if current is None:
+                    outcome = 'not_granted'
+                elif module_names[module_id] in UNREVOKABLE_MODULES:
+                    outcome = 'protected'
+                else:
+                    changed_ids.append(current[0])
+                    outcome = 'revoked'
+            results.append({'user_id': user_id, 'module_id': module_id, 'outcome': outcome})
+
+    table = UserModulePermission.__table__
+    if inserts:
+        _insert_ignoring_duplicates(inserts)
+    for chunk in _chunks(changed_ids):
+        if action == 'grant':
+            db.session.execute(table.update().where(table.c.id.in_(chunk)).values(is_enabled=True))
+        else:
+            db.session.execute(table.delete().where(table.c.id.in_(chunk)))
+
+    # Set-based statements bypass the ORM events that normally invalidate
+    for user_id in {result['user_id'] for result in results
+                    if result['outcome'] in ('granted', 'enabled', 'revoked')}:
+        invalidate(user_id)
+
+    return results
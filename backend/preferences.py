@@ -0,0 +1,95 @@
+"""
+Batched reads and writes of user preferences
+
+A preferences PUT loads every stored preference of the user in one query,
+compares the submitted values against them and writes only the keys that
+changed, with a single multi-row INSERT ... ON CONFLICT DO UPDATE.
+
+preferences_version() is a hash of the stored keys and values. It is
+returned as the ETag of GET/PUT /api/user/preferences; a PUT with a
+stale If-Match header is rejected so concurrent autosaves from two tabs
+can't silently overwrite each other. Every PUT calls lock_preferences()
+before reading, so the version check and the upsert happen while no other
+request can write the user's preferences.
+"""
+
+import hashlib
+from datetime import datetime
+from sqlalchemy import select, update
+from models import db, User, UserPreference
+from upsert import dialect_insert
+
+
+def lock_preferences(user_id):
+    """Hold off other preference writers for the user until the transaction ends.
+
+    PostgreSQL locks the user's row. SQLite has no row locks and takes its
+    write lock only at a transaction's first write, so a no-op UPDATE of the
+    row takes it up front; reads after it see every committed write.
+    """
+    if db.session.get_bind().dialect.name == 'sqlite':
+        db.session.execute(update(User).where(User.id == user_id).values(id=User.id, updated_at=User.updated_at))
+    else:
+        db.session.execute(select(User.id).where(User.id == user_id).with_for_update())
+
+
+def load_preferences(user_id):
+    """Return {preference_key: stored text} for the user in one query"""
+    rows = db.session.execute(
+        db.select(UserPreference.preference_key, UserPreference.preference_value).where(
+            UserPreference.user_id == user_id)
+    )
+    return dict(rows.all())
+
+
+def preferences_version(stored):
+    """Opaque version string for a {key: stored text} mapping"""
+    digest = hashlib.sha1()
+    for key in sorted(stored):
+        digest.update(key.encode())
+        digest.update(b'\0')
+        digest.update((stored[key] or '').encode())
+        digest.update(b'\0')
+    return digest.hexdigest()[:16]
+
+
+def changed_preferences(stored, submitted):
+    """Return {key: stored text} for submitted values that differ from what is stored"""
+    changes = {}
+    for key, value in submitted.items():
+        encoded = UserPreference.encode_value(value)
+        if key not in stored or stored[key] != encoded:
+            changes[key] = encoded
+    return changes
+
+
+def save_preferences(user_id, changes):
+    """Insert or update the given {key: stored text} in one statement (caller commits)"""
+    if not changes:
+        return
+
+    now = datetime.utcnow()
+    rows = [
+        {'user_id': user_id, 'preference_key': key, 'preference_value': value, 'created_at': now, 'updated_at': now}
+        for key, value in changes.items()
+    ]
+
+    statement = dialect_insert(UserPreference.__table__)
+    if statement is None:
+        # No ON CONFLICT support: fall back to the ORM, one row per key
+        existing = {pref.preference_key: pref for pref in UserPreference.query.filter(
+            UserPreference.user_id == user_id, UserPreference.preference_key.in_(list(changes)))}
+        for key, value in changes.items():
+            pref = existing.get(key) or UserPreference(user_id=user_id, preference_key=key)
+            pref.preference_value = value
+            db.session.add(pref)
+        return
+
+    statement = statement.values(rows)
+    db.session.execute(statement.on_conflict_do_update(
+        index_elements=['user_id', 'preference_key'],
+        set_={
+            'preference_value': statement.excluded.preference_value,
+            'updated_at': statement.excluded.updated_at,
+        }
+    ))
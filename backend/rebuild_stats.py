@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Statistics Rollup Rebuild
+
+Recomputes the monthly per-user and per-boat statistics (see rollups.py)
+from trips and maintenance records. ORM events keep them current, so this
+is only needed after upgrading, after bulk imports that bypass the ORM, or
+when --check reports drift. Engine hours come from hour meter readings and
+are kept as they are.
+
+Usage:
+  python rebuild_stats.py            # Rebuild every rollup row
+  python rebuild_stats.py --check    # Report drift without writing; exits 1 if any
+"""
+
+import argparse
+import sys
+import time
+from factory import create_app
+from models import db
+import rollups
+
+def rebuild_stats(check_only=False):
+    """Rebuild the rollups, or with check_only list the rows that have drifted"""
+    app = create_app(api=False)
+
+    with app.app_context():
+        db.create_all()
+        started = time.perf_counter()
+
+        if check_only:
+            drift = rollups.check()
+            for (scope, owner_id, month), stored, expected in drift:
+                print(f"   ⚠ {scope} {owner_id} {month:%Y-%m}: stored {stored or 'nothing'}, expected {expected}")
+            print(f"{'❌' if drift else '✅'} {len(drift)} rollup row(s) differ from trips and maintenance records")
+            return not drift
+
+        counts = rollups.rebuild()
+        db.session.commit()
+        for table, count in counts.items():
+            print(f"   ✓ {table}: {count} rows")
+        print(f"✅ Rebuilt the statistics rollups in {time.perf_counter() - started:.2f}s")
+        return True
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Rebuild the monthly statistics rollups')
+    parser.add_argument('--check', action='store_true', help='Only compare the rollups with a recompute')
+    args = parser.parse_args()
+
+    sys.exit(0 if rebuild_stats(check_only=args.check) else 1)
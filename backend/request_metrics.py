@@ -0,0 +1,267 @@
+"""
+Per-endpoint request metrics
+
+Every request records wall time, time spent in SQL, statement count, rows
+and response bytes under (method, url rule, status). With
+METRICS_SERVER_TIMING set, the request numbers also go out as a
+Server-Timing header (visible in the browser's network tab):
+
+    Server-Timing: app;dur=12.4, db;dur=3.1;desc="4 statements, 57 rows"
+
+The header is off by default because any client, logged in or not, would
+see how much SQL each endpoint runs.
+
+Totals and latency histograms are rendered in the Prometheus text format
+for GET /api/admin/metrics.
+
+Rows are ORM objects loaded plus rows changed by INSERT/UPDATE/DELETE;
+drivers can't report rows fetched by a SELECT without consuming them.
+Response bytes are counted after compression.
+
+The bookkeeping is a few perf_counter() calls and dict updates per request
+and per statement, cheap enough to leave on (see benchmark_metrics.py).
+
+Each serve.py worker has its own registry. With METRICS_DIR set (serve.py
+does this), workers write their registry to METRICS_DIR/<pid>.json at most
+every METRICS_FLUSH_SECONDS, and the metrics endpoint sums every file, so
+a scrape sees all workers whichever one answers. Files of workers that
+have exited are folded into archive.json so counters never go backwards.
+"""
+
+import glob
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+from models import db
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNTERS = ('requests', 'seconds', 'db_seconds', 'statements', 'rows', 'bytes')
+ARCHIVE_FILE = 'archive.json'
+
+
+def _new_series():
+    series = dict.fromkeys(COUNTERS, 0)
+    series['buckets'] = [0] * (len(LATENCY_BUCKETS) + 1)
+    series['db_buckets'] = [0] * (len(LATENCY_BUCKETS) + 1)
+    return series
+
+
+def _merge_series(total, series):
+    for name in COUNTERS:
+        total[name] += series[name]
+    for name in ('buckets', 'db_buckets'):
+        total[name] = [a + b for a, b in zip(total[name], series[name])]
+
+
+class MetricsRegistry:
+    """Thread-safe per-endpoint totals and histograms for one process"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.series = {}
+
+    def observe(self, method, endpoint, status, seconds, db_seconds, statements, rows, size):
+        key = (method, endpoint, str(status))
+        with self._lock:
+            series = self.series.get(key)
+            if series is None:
+                series = self.series[key] = _new_series()
+            series['requests'] += 1
+            series['seconds'] += seconds
+            series['db_seconds'] += db_seconds
+            series['statements'] += statements
+            series['rows'] += rows
+            series['bytes'] += size
+            series['buckets'][bisect_left(LATENCY_BUCKETS, seconds)] += 1
+            series['db_buckets'][bisect_left(LATENCY_BUCKETS, db_seconds)] += 1
+
+    def snapshot(self):
+        """JSON-ready copy: a list of [method, endpoint, status, series]"""
+        with self._lock:
+            return [[*key, {**series, 'buckets': list(series['buckets']), 'db_buckets': list(series['db_buckets'])}]
+                    for key, series in self.series.items()]
+
+
+registry = MetricsRegistry()
+_last_flush = 0.0
+
+
+def merge_snapshots(snapshots):
+    """Sum snapshot lists into {(method, endpoint, status): series}"""
+    merged = {}
+    for snapshot in snapshots:
+        for method, endpoint, status, series in snapshot:
+            key = (method, endpoint, status)
+            if key not in merged:
+                merged[key] = _new_series()
+            _merge_series(merged[key], series)
+    return merged
+
+
+def write_json(path, data):
+    """Replace path atomically, so readers never see a half-written file"""
+    temporary = f'{path}.{os.getpid()}.tmp'
+    with open(temporary, 'w') as f:
+        json.dump(data, f)
+    os.replace(temporary, path)
+
+
+def read_json(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def pid_alive(pid):
+    """Whether a worker process still exists"""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def flush(directory):
+    """Write this process's registry to directory/<pid>.json"""
+    global _last_flush
+    _last_flush = time.monotonic()
+    os.makedirs(directory, exist_ok=True)
+    write_json(os.path.join(directory, f'{os.getpid()}.json'), registry.snapshot())
+
+
+def collect(directory=None):
+    """Merged series from every worker (or only this process without a directory)"""
+    if not directory:
+        return merge_snapshots([registry.snapshot()])
+
+    import fcntl
+
+    flush(directory)
+    with open(os.path.join(directory, '.lock'), 'a') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        archive_path = os.path.join(directory, ARCHIVE_FILE)
+        archive = read_json(archive_path) or []
+        live, archived = [], False
+        for path in glob.glob(os.path.join(directory, '[0-9]*.json')):
+            snapshot = read_json(path)
+            if snapshot is None:
+                continue
+            if pid_alive(int(os.path.basename(path).split('.')[0])):
+                live.append(snapshot)
+            else:
+                archive = [[*key, series] for key, series in merge_snapshots([archive, snapshot]).items()]
+                archived = True
+                os.unlink(path)
+        if archived:
+            write_json(archive_path, archive)
+    return merge_snapshots([archive] + live)
+
+
+def reset(directory):
+    """Remove metrics files left by a previous server run"""
+    for path in glob.glob(os.path.join(directory, '*.json')):
+        os.unlink(path)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def render_prometheus(merged):
+    """Prometheus text exposition (format 0.0.4) for merged series"""
+    lines = []
+
+    def histogram(name, help_text, field, total_field):
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} histogram')
+        for (method, endpoint, status), series in sorted(merged.items()):
+            labels = f'method="{_escape(method)}",endpoint="{_escape(endpoint)}",status="{status}"'
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS + ('+Inf',), series[field]):
+                cumulative += count
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'{name}_sum{{{labels}}} {series[total_field]:.6f}')
+            lines.append(f'{name}_count{{{labels}}} {series["requests"]}')
+
+    def counter(name, help_text, field):
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} counter')
+        for (method, endpoint, status), series in sorted(merged.items()):
+            labels = f'method="{_escape(method)}",endpoint="{_escape(endpoint)}",status="{status}"'
+            lines.append(f'{name}{{{labels}}} {series[field]}')
+
+    histogram('http_request_duration_seconds', 'Wall time per request.', 'buckets', 'seconds')
+    histogram('http_request_db_seconds', 'Time spent executing SQL per request.', 'db_buckets', 'db_seconds')
+    counter('http_request_sql_statements_total', 'SQL statements executed.', 'statements')
+    counter('http_request_rows_total', 'ORM rows loaded plus rows changed by DML.', 'rows')
+    counter('http_response_bytes_total', 'Response body bytes sent (after compression).', 'bytes')
+    return '\n'.join(lines) + '\n'
+
+
+def _current():
+    return g.get('_request_metrics') if has_request_context() else None
+
+
+@event.listens_for(db.Model, 'load', propagate=True)
+def _count_loaded_row(target, context):
+    metrics = _current()
+    if metrics is not None:
+        metrics['rows'] += 1
+
+
+def init_app(app):
+    """Time requests and their SQL; call before other extensions so the totals include them"""
+    if not app.config['METRICS_ENABLED']:
+        return
+
+    with app.app_context():
+        engine = db.engine
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def start_statement(conn, cursor, statement, parameters, context, executemany):
+        conn.info['_metrics_started'] = time.perf_counter()
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def end_statement(conn, cursor, statement, parameters, context, executemany):
+        metrics = _current()
+        if metrics is None:
+            return
+        metrics['db_seconds'] += time.perf_counter() - conn.info['_metrics_started']
+        metrics['statements'] += 1
+        if cursor.description is None and cursor.rowcount > 0:
+            metrics['rows'] += cursor.rowcount
+
+    @app.before_request
+    def start_request():
+        g._request_metrics = {'started': time.perf_counter(), 'db_seconds': 0.0, 'statements': 0, 'rows': 0}
+
+    # after_request handlers run in reverse order of registration, so this
+    # one (registered first) sees the final, compressed response
+    @app.after_request
+    def record_request(response):
+        metrics = g.pop('_request_metrics', None)
+        if metrics is None:
+            return response
+        seconds = time.perf_counter() - metrics['started']
+        endpoint = request.url_rule.rule if request.url_rule is not None else '<unmatched>'
+        registry.observe(request.method, endpoint, response.status_code, seconds, metrics['db_seconds'],
+                         metrics['statements'], metrics['rows'], response.content_length or 0)
+
+        if current_app.config['METRICS_SERVER_TIMING']:
+            response.headers['Server-Timing'] = (
+                f"app;dur={seconds * 1000:.1f}, db;dur={metrics['db_seconds'] * 1000:.1f};"
+                f"desc=\"{metrics['statements']} statements, {metrics['rows']} rows\""
+            )
+
+        directory = current_app.config['METRICS_DIR']
+        if directory and time.monotonic() - _last_flush >= current_app.config['METRICS_FLUSH_SECONDS']:
+            flush(directory)
+        return response
@@ -0,0 +1,292 @@
+"""
+Monthly statistics rollups
+
+UserMonthlyStats and BoatMonthlyStats hold trip counts, distance, hours
+under way, engine hours and maintenance spend for each user and boat per
+month, so statistics pages and the dashboard read a handful of rows
+however many years someone has logged.
+
+ORM events keep them current in the same transaction as the write:
+
+- trips count for their captain and boat in the month they start, with
+  distance_miles or, when none was logged, the GPS track's
+  distance_calculated, so processing a track updates the mileage
+- maintenance records count for their creator and boat in the month they
+  were performed
+- increases of Boat.engine_hours count for the boat and its owner in the
+  month they are recorded
+
+Updates and deletes read the stored row first, so the old figures are
+subtracted even when the object was expired, and each affected stats row
+is then changed with one upsert. Bulk Core and query-level writes (e.g.
+synthetic_data.py) bypass the events and must call rebuild(), which is
+also what rebuild_stats.py runs. Hour meter readings aren't kept anywhere
+else, so rebuild() leaves the engine hours as they are.
+"""
+
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+from sqlalchemy import event, func, inspect, select, update
+from models import db, Boat, MaintenanceRecord, Trip, UserMonthlyStats, BoatMonthlyStats
+from upsert import dialect_insert
+
+FIGURES = ('trips', 'distance_miles', 'hours_under_way', 'engine_hours', 'maintenance_count', 'maintenance_cost')
+
+# Columns each kind of row's figures are computed from
+TRIP_COLUMNS = ('captain_id', 'boat_id', 'start_date', 'end_date', 'status', 'distance_miles', 'distance_calculated',
+                'actual_duration_hours')
+MAINTENANCE_COLUMNS = ('created_by', 'boat_id', 'date_performed', 'status', 'cost')
+BOAT_COLUMNS = ('owner_id', 'engine_hours')
+
+BATCH_SIZE = 5000
+
+_TABLES = {
+    'user': (UserMonthlyStats.__table__, 'user_id'),
+    'boat': (BoatMonthlyStats.__table__, 'boat_id'),
+}
+
+
+def month_of(value):
+    """First day of the month of a date or datetime"""
+    return date(value.year, value.month, 1)
+
+
+def _cancelled(status):
+    return (status or '').lower() == 'cancelled'
+
+
+def _number(value):
+    """A figure as a float; pending values are whatever the route assigned, e.g. "12.5" from JSON"""
+    return None if value is None or value == '' else float(value)
+
+
+def trip_figures(row):
+    """{(scope, id, month): figures} a trip contributes; row maps TRIP_COLUMNS to values"""
+    if row['start_date'] is None or _cancelled(row['status']):
+        return {}
+    hours = _number(row['actual_duration_hours'])
+    if hours is None and row['end_date']:
+        hours = max((row['end_date'] - row['start_date']).total_seconds() / 3600, 0)
+    distance = _number(row['distance_miles'])
+    if distance is None:
+        distance = _number(row['distance_calculated'])
+    figures = {'trips': 1, 'distance_miles': distance or 0, 'hours_under_way': hours or 0}
+    month = month_of(row['start_date'])
+    return {('user', row['captain_id'], month): figures, ('boat', row['boat_id'], month): figures}
+
+
+def maintenance_figures(row):
+    """{(scope, id, month): figures} a maintenance record contributes"""
+    if row['date_performed'] is None or _cancelled(row['status']):
+        return {}
+    figures = {'maintenance_count': 1, 'maintenance_cost': Decimal(str(row['cost'] or 0))}
+    month = month_of(row['date_performed'])
+    return {('user', row['created_by'], month): figures, ('boat', row['boat_id'], month): figures}
+
+
+def _difference(old, new):
+    """Figures to add to each stats row to go from the old contributions to the new"""
+    changes = defaultdict(dict)
+    for sign, contributions in ((-1, old), (1, new)):
+        for key, figures in contributions.items():
+            for name, value in figures.items():
+                changes[key][name] = changes[key].get(name, 0) + sign * value
+    return {key: figures for key, figures in changes.items() if key[1] is not None and any(figures.values())}
+
+
+def _apply(connection, changes):
+    for (scope, owner_id, month), figures in changes.items():
+        table, column = _TABLES[scope]
+        values = {column: owner_id, 'month': month, **{name: figures.get(name, 0) for name in FIGURES}}
+        insert = dialect_insert(table)
+        if insert is not None:
+            connection.execute(insert.values(values).on_conflict_do_update(
+                index_elements=[column, 'month'],
+                set_={name: table.c[name] + insert.excluded[name] for name in figures}
+            ))
+            continue
+        result = connection.execute(
+            update(table)
+            .where(table.c[column] == owner_id, table.c.month == month)
+            .values({name: table.c[name] + value for name, value in figures.items()})
+        )
+        if not result.rowcount:
+            connection.execute(table.insert().values(values))
+
+
+def _stored(connection, mapper, target, columns):
+    """The row's column values as stored, before this flush changes them"""
+    table = mapper.local_table
+    row = connection.execute(select(*(table.c[name] for name in columns)).where(table.c.id == target.id)).one_or_none()
+    return row._asdict() if row else None
+
+
+def _pending(target, stored):
+    """The stored values with this flush's changes applied"""
+    state = inspect(target)
+    values = dict(stored)
+    for name in stored:
+        history = state.attrs[name].history
+        if history.has_changes():
+            values[name] = history.added[0] if history.added else None
+    return values
+
+
+def _changed(target, columns):
+    state = inspect(target)
+    return any(state.attrs[name].history.has_changes() for name in columns)
+
+
+def _listen(model, columns, figures):
+    def after_insert(mapper, connection, target):
+        _apply(connection, _difference({}, figures({name: getattr(target, name) for name in columns})))
+
+    def before_update(mapper, connection, target):
+        if _changed(target, columns):
+            stored = _stored(connection, mapper, target, columns)
+            if stored:
+                _apply(connection, _difference(figures(stored), figures(_pending(target, stored))))
+
+    def before_delete(mapper, connection, target):
+        stored = _stored(connection, mapper, target, columns)
+        if stored:
+            _apply(connection, _difference(figures(stored), {}))
+
+    for identifier, listener in (('after_insert', after_insert), ('before_update', before_update),
+                                 ('before_delete', before_delete)):
+        event.listen(model, identifier, listener)
+
+
+def _engine_hours_recorded(mapper, connection, target):
+    if not _changed(target, ('engine_hours',)):
+        return
+    stored = _stored(connection, mapper, target, BOAT_COLUMNS)
+    if not stored:
+        return
+    increase = (_number(_pending(target, stored)['engine_hours']) or 0) - (stored['engine_hours'] or 0)
+    # A first reading sets the meter rather than recording hours run
+    if stored['engine_hours'] is not None and increase:
+        month = month_of(date.today())
+        figures = {'engine_hours': increase}
+        _apply(connection, _difference({}, {('user', stored['owner_id'], month): figures,
+                                            ('boat', target.id, month): figures}))
+
+
+def init_app(app):
+    """Register the ORM listeners that keep the monthly statistics current (once per process)"""
+    if event.contains(Boat, 'before_update', _engine_hours_recorded):
+        return
+    _listen(Trip, TRIP_COLUMNS, trip_figures)
+    _listen(MaintenanceRecord, MAINTENANCE_COLUMNS, maintenance_figures)
+    event.listen(Boat, 'before_update', _engine_hours_recorded)
+
+
+def compute():
+    """Trip and maintenance figures for every stats row, recomputed from the source rows"""
+    totals = defaultdict(lambda: defaultdict(int))
+    for model, columns, figures in ((Trip, TRIP_COLUMNS, trip_figures),
+                                    (MaintenanceRecord, MAINTENANCE_COLUMNS, maintenance_figures)):
+        query = select(*(getattr(model, name) for name in columns)).execution_options(yield_per=BATCH_SIZE)
+        for row in db.session.execute(query):
+            for key, contribution in figures(row._asdict()).items():
+                if key[1] is not None:
+                    for name, value in contribution.items():
+                        totals[key][name] += value
+    return totals
+
+
+def _stored_rows(scope):
+    table, column = _TABLES[scope]
+    return {
+        (scope, row[column], row['month']): {name: row[name] for name in FIGURES}
+        for row in db.session.execute(select(table)).mappings()
+    }
+
+
+def check():
+    """Stats rows whose trip or maintenance figures differ from a recompute, as (key, stored, expected)"""
+    expected = compute()
+    stored = {**_stored_rows('user'), **_stored_rows('boat')}
+    drift = []
+    for key in sorted(set(expected) | set(stored), key=lambda key: (key[0], key[1], key[2])):
+        have = stored.get(key, {})
+        want = expected.get(key, {})
+        for name in FIGURES:
+            if name != 'engine_hours' and abs(float(have.get(name) or 0) - float(want.get(name) or 0)) > 0.005:
+                drift.append((key, have, dict(want)))
+                break
+    return drift
+
+
+def rebuild():
+    """Replace the trip and maintenance figures with a recompute, keeping engine hours.
+
+    Returns the number of stats rows per table; the caller commits.
+    """
+    expected = compute()
+    counts = {}
+    for scope, (table, column) in _TABLES.items():
+        rows = {}
+        for key, figures in _stored_rows(scope).items():
+            if figures['engine_hours']:
+                rows[key] = {'engine_hours': figures['engine_hours']}
+        for key, figures in expected.items():
+            if key[0] == scope:
+                rows.setdefault(key, {}).update(figures)
+
+        db.session.execute(table.delete())
+        values = [{column: owner_id, 'month': month, **{name: figures.get(name, 0) for name in FIGURES}}
+                  for (_, owner_id, month), figures in rows.items()]
+        for start in range(0, len(values), BATCH_SIZE):
+            db.session.execute(table.insert(), values[start:start + BATCH_SIZE])
+        counts[table.name] = len(values)
+    return counts
+
+
+def _sums(model):
+    return [func.coalesce(func.sum(getattr(model, name)), 0).label(name) for name in FIGURES]
+
+
+def _figures(row):
+    return {
+        'trips': int(row['trips']),
+        'distance_miles': round(float(row['distance_miles']), 1),
+        'hours_under_way': round(float(row['hours_under_way']), 1),
+        'engine_hours': round(float(row['engine_hours']), 1),
+        'maintenance_count': int(row['maintenance_count']),
+        'maintenance_cost': round(float(row['maintenance_cost']), 2),
+    }
+
+
+def user_months(user_id, first, last):
+    """A user's stats rows for the months first..last, oldest first"""
+    return db.session.scalars(
+        select(UserMonthlyStats)
+        .where(UserMonthlyStats.user_id == user_id, UserMonthlyStats.month.between(first, last))
+        .order_by(UserMonthlyStats.month)
+    ).all()
+
+
+def user_totals(user_id, first, last=None):
+    """A user's figures summed over the months first..last"""
+    query = select(*_sums(UserMonthlyStats)).where(UserMonthlyStats.user_id == user_id,
+                                                   UserMonthlyStats.month >= first)
+    if last:
+        query = query.where(UserMonthlyStats.month <= last)
+    return _figures(db.session.execute(query).mappings().one())
+
+
+def boat_totals(owner_id, first, last=None):
+    """Figures summed over the months first..last for each boat of an owner, most miles first"""
+    query = (
+        select(BoatMonthlyStats.boat_id, Boat.name.label('boat_name'), *_sums(BoatMonthlyStats))
+        .join(Boat, Boat.id == BoatMonthlyStats.boat_id)
+        .where(Boat.owner_id == owner_id, BoatMonthlyStats.month >= first)
+        .group_by(BoatMonthlyStats.boat_id, Boat.name)
+        .order_by(func.sum(BoatMonthlyStats.distance_miles).desc(), BoatMonthlyStats.boat_id)
+    )
+    if last:
+        query = query.where(BoatMonthlyStats.month <= last)
+    return [{'boat_id': row['boat_id'], 'boat_name': row['boat_name'], **_figures(row)}
+            for row in db.session.execute(query).mappings()]
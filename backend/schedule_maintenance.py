@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Maintenance Schedule Rebuild
+
+Recomputes the next due occurrence of every recurring maintenance task
+(see maintenance_schedule.py) from the maintenance records, boat hour
+meters and engine hours in the statistics rollups. ORM events keep the
+schedule current, so this is only needed after upgrading or after bulk
+imports that bypass the ORM. Projections by engine hours also drift as the
+usage rate changes, so running it nightly keeps them fresh.
+
+Usage:
+  python schedule_maintenance.py
+"""
+
+import sys
+import time
+from factory import create_app
+from models import db
+import maintenance_schedule
+
+def schedule_maintenance():
+    """Rebuild the maintenance schedule"""
+    app = create_app(api=False)
+
+    with app.app_context():
+        db.create_all()
+        started = time.perf_counter()
+
+        count = maintenance_schedule.rebuild()
+        db.session.commit()
+        print(f"✅ Scheduled {count} recurring maintenance task(s) in {time.perf_counter() - started:.2f}s")
+        return True
+
+if __name__ == "__main__":
+    sys.exit(0 if schedule_maintenance() else 1)
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Production Server
+
+Serves the API with gunicorn instead of the Flask development server that
+`python app.py` starts. The defaults are tuned for a Raspberry Pi:
+
+- gthread workers: each worker process handles SERVE_THREADS requests at once
+  and, unlike the sync worker, keeps idle HTTP/1.1 connections open for
+  SERVE_KEEPALIVE_SECONDS so clients don't reconnect for every call.
+- One worker per core (at least 2, at most 4). Two workers keep the API up
+  while the other one restarts; more than four only costs RAM on a Pi.
+- The app is preloaded in the master and forked, so workers share its code
+  pages and a broken import fails at startup instead of in every worker.
+  Database connections opened by the master are dropped after the fork.
+- Workers share request metrics through files in METRICS_DIR (by default
+  in /dev/shm), so GET /api/admin/metrics covers all of them.
+- Workers are recycled after SERVE_MAX_REQUESTS (with jitter) to bound memory
+  growth, and the worker heartbeat file lives in /dev/shm, not the SD card.
+
+Reloading a running server (see docs/DEPLOYMENT_GUIDE.md):
+  kill -HUP <master pid>     # Re-read config, replace workers gracefully
+  kill -USR2 <master pid>    # New code: start a new master, then QUIT the old one
+
+Usage:
+  python serve.py                              # Settings from config.py / .env
+  python serve.py --bind 127.0.0.1:8000 --workers 2 --threads 8
+  python serve.py --print-config               # Show effective settings and exit
+"""
+
+import argparse
+import os
+import tempfile
+from gunicorn.app.base import BaseApplication
+from config import Config
+from db_engine import max_connections_per_process
+import request_metrics
+
+
+def default_web_workers():
+    """One worker per core, at least two so a restart never drops the API, at most four"""
+    return max(2, min(4, os.cpu_count() or 1))
+
+
+def post_fork(server, worker):
+    """Drop database connections inherited from the preloading master"""
+    from app import app
+    from models import db
+
+    with app.app_context():
+        db.engine.dispose(close=False)
+
+
+def default_metrics_dir(bind):
+    """Per-address directory for worker metrics files, in RAM when possible"""
+    base = '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir()
+    return os.path.join(base, 'pi-server-metrics-' + bind.replace(':', '-').replace('/', '-'))
+
+
+def on_starting(server):
+    """Start counting from zero instead of where the previous server left off"""
+    os.makedirs(Config.METRICS_DIR, exist_ok=True)
+    request_metrics.reset(Config.METRICS_DIR)
+
+
+def gunicorn_options(args):
+    """gunicorn settings from config.py, overridden by command-line arguments"""
+    options = {
+        'bind': args.bind or Config.SERVE_BIND,
+        'workers': args.workers or Config.SERVE_WORKERS or default_web_workers(),
+        'worker_class': 'gthread',
+        'threads': args.threads or Config.SERVE_THREADS,
+        'keepalive': Config.SERVE_KEEPALIVE_SECONDS,
+        'timeout': Config.SERVE_TIMEOUT_SECONDS,
+        'graceful_timeout': Config.SERVE_GRACEFUL_TIMEOUT_SECONDS,
+        'max_requests': Config.SERVE_MAX_REQUESTS,
+        'max_requests_jitter': Config.SERVE_MAX_REQUESTS // 10,
+        'preload_app': Config.SERVE_PRELOAD and not args.no_preload,
+        'on_starting': on_starting,
+        'post_fork': post_fork,
+        'pidfile': args.pidfile,
+        'accesslog': '-' if args.access_log else None,
+        'errorlog': '-',
+        'proc_name': 'pi-server-api',
+    }
+    if os.path.isdir('/dev/shm'):
+        options['worker_tmp_dir'] = '/dev/shm'
+    return options
+
+
+class ProductionServer(BaseApplication):
+    """Embed gunicorn so the settings live in config.py instead of a separate conf file"""
+
+    def __init__(self, options):
+        self.options = options
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            if value is not None:
+                self.cfg.set(key, value)
+
+    def load(self):
+        from app import app
+        return app
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Serve the API with gunicorn')
+    parser.add_argument('--bind', help=f'Address to listen on (default {Config.SERVE_BIND})')
+    parser.add_argument('--workers', type=int, help='Worker processes (default: one per core, 2-4)')
+    parser.add_argument('--threads', type=int, help=f'Threads per worker (default {Config.SERVE_THREADS})')
+    parser.add_argument('--no-preload', action='store_true', help='Import the app in each worker instead')
+    parser.add_argument('--pidfile', help='Write the master PID here (for kill -HUP)')
+    parser.add_argument('--access-log', action='store_true', help='Log every request to stdout')
+    parser.add_argument('--print-config', action='store_true', help='Print the effective settings and exit')
+    args = parser.parse_args()
+
+    options = gunicorn_options(args)
+    # Size each worker's database pool for its threads (see db_engine.py)
+    Config.SERVE_THREADS = options['threads']
+    Config.METRICS_DIR = Config.METRICS_DIR or default_metrics_dir(options['bind'])
+    if args.print_config:
+        for key, value in options.items():
+            print(f"{key:<20} {getattr(value, '__name__', value)}")
+        per_worker = max_connections_per_process(vars(Config))
+        print(f"{'db connections':<20} {options['workers'] * per_worker} "
+              f"({options['workers']} workers x {per_worker}, plus track_worker.py processes)")
+        print(f"{'metrics dir':<20} {Config.METRICS_DIR}")
+    else:
+        print(f"🚀 Serving on {options['bind']} with {options['workers']} worker(s) x {options['threads']} thread(s)")
+        ProductionServer(options).run()
@@ -9,28 +9,12 @@ Usage:
   python show_users.py
 """
 
-import os
-from flask import Flask
-from config import Config
-from models import db, User, SystemModule, UserModulePermission
-
-def create_app_for_command():
-    """Create Flask app configured for database access"""
-    app = Flask(__name__)
-    
-    # Use development config for SQLite by default
-    app.config.from_object(Config)
-    
-    # Override with production database if specified
-    if 'DATABASE_URL' in os.environ:
-        app.config['SQLALCHEMY_DATABASE_URI'] = os.environ['DATABASE_URL']
-    
-    db.init_app(app)
-    return app
+from factory import create_app
+from models import User, SystemModule, UserModulePermission
 
 def show_users():
     """Display all users and their permissions"""
-    app = create_app_for_command()
+    app = create_app(api=False)
     
     with app.app_context():
         print("=" * 70)
@@ -0,0 +1,231 @@
+"""
+Slow query log
+
+Off by default. With SLOW_QUERY_MS set, every SQL statement that takes
+longer is recorded with:
+
+- the SQL (cut to MAX_STATEMENT_LENGTH characters) and its parameters,
+  redacted: numbers, booleans and NULLs are kept because they are what
+  explain a plan (ids, limits, IN-list sizes); strings, dates and bytes
+  become their type, e.g. '<str:12>'. Long IN-lists keep the first
+  MAX_PARAMETERS values plus a count.
+- the route that ran it (e.g. 'GET /api/maintenance') or the script name
+- the plan: EXPLAIN QUERY PLAN on SQLite; on PostgreSQL EXPLAIN, or
+  EXPLAIN (ANALYZE, BUFFERS) for SELECTs when SLOW_QUERY_EXPLAIN_ANALYZE
+  is on. ANALYZE runs the query again, so the plan of a statement is
+  captured at most once per SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS, and never
+  for INSERT/UPDATE/DELETE, which would be applied twice.
+
+Entries go into a ring buffer of SLOW_QUERY_LOG_SIZE per process. With
+METRICS_DIR set (serve.py does this), each worker also writes its buffer
+to METRICS_DIR/slow-<pid>.json, so GET /api/admin/slow-queries shows the
+slowest recent statements of all workers.
+"""
+
+import glob
+import os
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from flask import has_request_context, request
+from sqlalchemy import event
+from models import db
+from request_metrics import pid_alive, read_json, write_json
+
+MAX_STATEMENT_LENGTH = 5000
+MAX_PARAMETERS = 20
+EXPLAINABLE = ('SELECT', 'WITH', 'INSERT', 'UPDATE', 'DELETE')
+
+
+def redact(value):
+    """Keep values that shape a query plan, hide the ones that carry user data"""
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    if isinstance(value, (str, bytes)):
+        return f'<{type(value).__name__}:{len(value)}>'
+    return f'<{type(value).__name__}>'
+
+
+def redact_parameters(parameters):
+    """Redacted copy of DBAPI parameters (a sequence or a mapping) and their count"""
+    if parameters is None:
+        return None, 0
+    if isinstance(parameters, dict):
+        items = list(parameters.items())
+        shown = {key: redact(value) for key, value in items[:MAX_PARAMETERS]}
+        if len(items) > MAX_PARAMETERS:
+            shown['...'] = f'{len(items) - MAX_PARAMETERS} more'
+        return shown, len(items)
+    values = list(parameters)
+    shown = [redact(value) for value in values[:MAX_PARAMETERS]]
+    if len(values) > MAX_PARAMETERS:
+        shown.append(f'... {len(values) - MAX_PARAMETERS} more')
+    return shown, len(values)
+
+
+def current_route():
+    if has_request_context():
+        rule = request.url_rule.rule if request.url_rule is not None else request.path
+        return f'{request.method} {rule}'
+    return os.path.basename(sys.argv[0]) or 'python'
+
+
+def explain_statement(dialect, statement, analyze):
+    """EXPLAIN variant for a statement, or None if it has no plan worth showing"""
+    keyword = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ''
+    if keyword not in EXPLAINABLE:
+        return None
+    if dialect == 'sqlite':
+        return f'EXPLAIN QUERY PLAN {statement}'
+    if dialect == 'postgresql':
+        if analyze and keyword == 'SELECT':
+            return f'EXPLAIN (ANALYZE, BUFFERS) {statement}'
+        return f'EXPLAIN {statement}'
+    return f'EXPLAIN {statement}'
+
+
+def capture_plan(connection, dialect, statement, parameters, analyze):
+    """Plan lines for a statement, run on the connection that executed it"""
+    explain = explain_statement(dialect, statement, analyze)
+    if explain is None:
+        return None
+    cursor = connection.cursor()
+    try:
+        # A failed EXPLAIN would abort the request's PostgreSQL transaction
+        if dialect == 'postgresql':
+            cursor.execute('SAVEPOINT slow_query_explain')
+        try:
+            cursor.execute(explain, parameters or ())
+            rows = cursor.fetchall()
+        except Exception:
+            if dialect == 'postgresql':
+                cursor.execute('ROLLBACK TO SAVEPOINT slow_query_explain')
+            raise
+        if dialect == 'postgresql':
+            cursor.execute('RELEASE SAVEPOINT slow_query_explain')
+    finally:
+        cursor.close()
+    if dialect == 'sqlite':
+        # (id, parent, notused, detail): indent each step under its parent
+        depth = {0: -1}
+        lines = []
+        for node, parent, _, detail in rows:
+            depth[node] = depth.get(parent, -1) + 1
+            lines.append('  ' * depth[node] + detail)
+        return lines
+    return [' | '.join(str(column) for column in row) for row in rows]
+
+
+class SlowQueryLog:
+    """Ring buffer of slow statements for one process"""
+
+    def __init__(self, size):
+        self._lock = threading.Lock()
+        self.entries = deque(maxlen=size)
+        self.plans = {}  # statement -> (captured at, plan lines)
+
+    def cached_plan(self, statement, interval):
+        with self._lock:
+            cached = self.plans.get(statement)
+        if cached and time.monotonic() - cached[0] < interval:
+            return cached[1]
+        return None
+
+    def remember_plan(self, statement, plan):
+        with self._lock:
+            if len(self.plans) >= self.entries.maxlen:
+                self.plans.clear()
+            self.plans[statement] = (time.monotonic(), plan)
+
+    def add(self, entry):
+        with self._lock:
+            self.entries.append(entry)
+            return list(self.entries)
+
+    def snapshot(self):
+        with self._lock:
+            return list(self.entries)
+
+
+def _log_path(directory, pid):
+    return os.path.join(directory, f'slow-{pid}.json')
+
+
+def collect(log, directory=None, limit=None):
+    """Newest entries first, from every worker when a directory is given"""
+    entries = log.snapshot()
+    if directory:
+        for path in glob.glob(os.path.join(directory, 'slow-*.json')):
+            if path != _log_path(directory, os.getpid()):
+                entries += read_json(path) or []
+    entries.sort(key=lambda entry: entry['recorded_at'], reverse=True)
+    return entries[:limit] if limit else entries
+
+
+def prune(directory, keep):
+    """Delete logs of exited workers whose entries are all older than the newest keep entries"""
+    entries = []
+    for path in glob.glob(os.path.join(directory, 'slow-*.json')):
+        entries += read_json(path) or []
+    if len(entries) <= keep:
+        return
+    cutoff = sorted((entry['recorded_at'] for entry in entries), reverse=True)[keep - 1]
+    for path in glob.glob(os.path.join(directory, 'slow-*.json')):
+        pid = int(os.path.basename(path)[len('slow-'):].split('.')[0])
+        if not pid_alive(pid) and all(entry['recorded_at'] < cutoff for entry in read_json(path) or []):
+            os.unlink(path)
+
+
+def init_app(app):
+    """Record statements slower than SLOW_QUERY_MS (does nothing when it is 0)"""
+    threshold = app.config['SLOW_QUERY_MS'] / 1000
+    if threshold <= 0:
+        return
+
+    log = SlowQueryLog(app.config['SLOW_QUERY_LOG_SIZE'])
+    app.extensions['slow_queries'] = log
+    config = app.config
+
+    with app.app_context():
+        engine = db.engine
+    dialect = engine.dialect.name
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def start_statement(conn, cursor, statement, parameters, context, executemany):
+        conn.info['_slow_query_started'] = time.perf_counter()
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def check_statement(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info['_slow_query_started']
+        if elapsed < threshold:
+            return
+
+        plan, plan_error = None, None
+        if config['SLOW_QUERY_EXPLAIN'] and not executemany:
+            plan = log.cached_plan(statement, config['SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS'])
+            if plan is None:
+                try:
+                    plan = capture_plan(conn.connection, dialect, statement, parameters,
+                                        config['SLOW_QUERY_EXPLAIN_ANALYZE'])
+                    log.remember_plan(statement, plan)
+                except Exception as e:
+                    plan_error = str(e)
+
+        shown, count = redact_parameters(parameters[0] if executemany and parameters else parameters)
+        entries = log.add({
+            'recorded_at': datetime.now(timezone.utc).isoformat(),
+            'duration_ms': round(elapsed * 1000, 1),
+            'route': current_route(),
+            'statement': statement[:MAX_STATEMENT_LENGTH],
+            'parameters': shown,
+            'parameter_count': count,
+            'executemany': executemany,
+            'plan': plan,
+            'plan_error': plan_error,
+            'pid': os.getpid(),
+        })
+        if config['METRICS_DIR']:
+            os.makedirs(config['METRICS_DIR'], exist_ok=True)
+            write_json(_log_path(config['METRICS_DIR'], os.getpid()), entries)
@@ -0,0 +1,246 @@
+"""
+Synthetic data for benchmarks and load tests
+
+generate() fills a database with users, boats, equipment, maintenance
+records, events, trips and GPS tracks shaped like real use. The same
+profile and seed always produce the same rows, so load-test runs on
+different commits compare like with like (see generate_data.py and
+loadtest.py).
+
+Dates are laid out around a fixed start date rather than today, and every
+user gets the same password, hashed once. Tracks are numpy random walks at
+sailing speeds with one fix per second, written with the configured
+TRACK_STORAGE_MODE, and the tracked trips get their simplified route levels
+so /api/trips/<id>/route answers.
+
+Rows go in through Core executemany inserts; the ORM would spend minutes
+on bookkeeping at the larger profiles. The statistics rollups and the
+maintenance schedule are rebuilt at the end, since those inserts skip the
+ORM events.
+"""
+
+import math
+import random
+from datetime import datetime, timedelta
+import numpy as np
+from sqlalchemy import func, select
+from models import (db, User, SystemModule, UserModulePermission, Boat, Equipment, MaintenanceRecord, Event, Trip,
+                    GPSRoutePoint)
+from blueprints import MODULE_BLUEPRINTS
+import maintenance_schedule
+import rollups
+from track_simplify import build_route_levels
+from track_store import write_trip_track
+
+START_DATE = datetime(2025, 1, 1, 8, 0)
+BATCH_SIZE = 10000
+
+# Row counts per parent row; tracks x track_points GPS fixes in total
+PROFILES = {
+    'small': dict(users=5, boats_per_user=2, equipment_per_boat=5, records_per_equipment=3,
+                  events_per_user=10, trips_per_boat=10, tracks=4, track_points=5000),
+    'medium': dict(users=50, boats_per_user=3, equipment_per_boat=10, records_per_equipment=4,
+                   events_per_user=20, trips_per_boat=30, tracks=20, track_points=50000),
+    'large': dict(users=200, boats_per_user=3, equipment_per_boat=15, records_per_equipment=6,
+                  events_per_user=40, trips_per_boat=60, tracks=10, track_points=500000),
+}
+
+BOAT_TYPES = ('Sailboat', 'Catamaran', 'Motorboat', 'Dinghy')
+EQUIPMENT_CATEGORIES = ('Engine', 'Rigging', 'Sails', 'Electronics', 'Safety', 'Plumbing')
+MAINTENANCE_TYPES = ('Routine', 'Repair', 'Replacement', 'Inspection', 'Upgrade')
+EVENT_TYPES = ('Race', 'Regatta', 'Cruise', 'Social', 'Training')
+TRIP_TYPES = ('Day Sail', 'Overnight', 'Passage', 'Race')
+HOME_PORTS = (('Oslo', 59.90, 10.74), ('Gothenburg', 57.70, 11.95), ('Kiel', 54.33, 10.15),
+              ('Brighton', 50.81, -0.10), ('Annapolis', 38.97, -76.48))
+
+KNOT = 1852 / 3600  # metres per second
+
+
+def _insert(model, rows):
+    """Insert rows and return their new ids in order"""
+    table = model.__table__
+    ids = []
+    for start in range(0, len(rows), BATCH_SIZE):
+        result = db.session.execute(table.insert().returning(table.c.id, sort_by_parameter_order=True),
+                                    rows[start:start + BATCH_SIZE])
+        ids += result.scalars().all()
+    return ids
+
+
+def random_walk_track(rng, latitude, longitude, start, points):
+    """Column arrays for a track of one fix per second starting at a position"""
+    # Heading drifts slowly, speed wanders between 2 and 9 knots
+    heading = np.cumsum(rng.normal(0, 1.5, points)) + rng.uniform(0, 360)
+    speed = np.clip(5 + np.cumsum(rng.normal(0, 0.05, points)), 2, 9)
+    north = np.cumsum(speed * KNOT * np.cos(np.radians(heading)))
+    east = np.cumsum(speed * KNOT * np.sin(np.radians(heading)))
+    latitudes = latitude + north / 111320
+    longitudes = longitude + east / (111320 * math.cos(math.radians(latitude)))
+    timestamps = np.datetime64(start, 'us') + np.arange(points, dtype=np.int64) * np.timedelta64(1, 's')
+    return {
+        'timestamp': timestamps,
+        'latitude': latitudes,
+        'longitude': longitudes,
+        'speed_knots': np.round(speed, 2),
+        'course_over_ground': np.round(heading % 360, 1),
+    }
+
+
+def _write_track_rows(trip_id, columns):
+    table = GPSRoutePoint.__table__
+    count = len(columns['latitude'])
+    timestamps = columns['timestamp'].astype('datetime64[us]').tolist()
+    for start in range(0, count, BATCH_SIZE):
+        db.session.execute(table.insert(), [
+            {'trip_id': trip_id, 'latitude': float(columns['latitude'][i]), 'longitude': float(columns['longitude'][i]),
+             'timestamp': timestamps[i], 'elapsed_time_seconds': i, 'point_type': 'track',
+             'speed_knots': float(columns['speed_knots'][i]),
+             'course_over_ground': float(columns['course_over_ground'][i])}
+            for i in range(start, min(count, start + BATCH_SIZE))])
+
+
+def ensure_modules():
+    """Active SystemModules for every module blueprint, so create_app() loads all routes"""
+    existing = set(db.session.scalars(select(SystemModule.name)))
+    for order, name in enumerate(MODULE_BLUEPRINTS, start=1):
+        if name not in existing:
+            db.session.add(SystemModule(name=name, display_name=name.title(), sort_order=order, is_active=True))
+    db.session.flush()
+    return list(db.session.scalars(select(SystemModule.id)))
+
+
+def generate(profile='small', seed=42, prefix='loadtest_', password='loadtest123', storage='rows',
+             route_levels=True, progress=None, **overrides):
+    """Fill the database; overrides replace single PROFILES counts. Returns row counts per table."""
+    sizes = {**PROFILES[profile], **overrides}
+    rng = random.Random(seed)
+    np_rng = np.random.default_rng(seed)
+    progress = progress or (lambda message: None)
+    counts = {}
+
+    if db.session.scalar(select(func.count()).select_from(User).where(User.username.like(f'{prefix}%'))):
+        raise ValueError(f"Users named {prefix}* already exist; use another prefix or a fresh database")
+
+    hasher = User()
+    hasher.set_password(password)
+    module_ids = ensure_modules()
+
+    progress(f"{sizes['users']} users")
+    user_ids = _insert(User, [
+        {'username': f'{prefix}{n}', 'email': f'{prefix}{n}@example.com', 'password_hash': hasher.password_hash,
+         'first_name': 'Load', 'last_name': f'Tester {n}', 'is_active': True, 'is_admin': n == 1,
+         'created_at': START_DATE, 'updated_at': START_DATE}
+        for n in range(1, sizes['users'] + 1)])
+    _insert(UserModulePermission, [
+        {'user_id': user_id, 'module_id': module_id, 'is_enabled': True, 'granted_at': START_DATE}
+        for user_id in user_ids for module_id in module_ids])
+    counts['users'] = len(user_ids)
+
+    boats = []
+    for user_id in user_ids:
+        for i in range(sizes['boats_per_user']):
+            port = rng.choice(HOME_PORTS)[0]
+            name = f"{rng.choice(('Sea', 'Wind', 'Wave', 'Tide'))} {rng.choice(('Dancer', 'Runner', 'Song'))}"
+            boats.append({'name': name,
+                          'boat_type': rng.choice(BOAT_TYPES), 'length_feet': rng.randrange(14, 52),
+                          'year_built': rng.randrange(1975, 2024),
+                          'hull_material': rng.choice(('Fiberglass', 'Wood', 'Aluminum')),
+                          'owner_id': user_id, 'home_port': port, 'is_active': i == 0 or rng.random() < 0.8,
+                          'condition': rng.choice(('Excellent', 'Good', 'Fair')), 'engine_hours': rng.randrange(4000),
+                          'created_at': START_DATE, 'updated_at': START_DATE})
+    progress(f"{len(boats)} boats")
+    boat_ids = _insert(Boat, boats)
+    counts['boats'] = len(boat_ids)
+
+    equipment = []
+    for boat_id, boat in zip(boat_ids, boats):
+        for i in range(sizes['equipment_per_boat']):
+            category = rng.choice(EQUIPMENT_CATEGORIES)
+            equipment.append({'name': f'{category} item {i + 1}', 'category': category, 'owner_id': boat['owner_id'],
+                              'boat_id': boat_id, 'condition': rng.choice(('Excellent', 'Good', 'Fair', 'Poor')),
+                              'is_operational': rng.random() < 0.95, 'quantity': 1,
+                              'purchase_date': (START_DATE - timedelta(days=rng.randrange(3650))).date(),
+                              'created_at': START_DATE, 'updated_at': START_DATE})
+    progress(f"{len(equipment)} equipment items")
+    equipment_ids = _insert(Equipment, equipment)
+    counts['equipment'] = len(equipment_ids)
+
+    records = []
+    for equipment_id, item in zip(equipment_ids, equipment):
+        for _ in range(sizes['records_per_equipment']):
+            performed = START_DATE.date() + timedelta(days=rng.randrange(-365, 540))
+            interval = rng.choice((30, 90, 180, 365))
+            records.append({'boat_id': item['boat_id'], 'equipment_id': equipment_id,
+                            'maintenance_type': rng.choice(MAINTENANCE_TYPES),
+                            'title': f"Service {item['category'].lower()}",
+                            'description': 'Synthetic maintenance record', 'date_performed': performed,
+                            'next_maintenance_due': performed + timedelta(days=interval),
+                            'maintenance_interval_days': interval, 'cost': round(rng.uniform(10, 800), 2),
+                            'labor_hours': round(rng.uniform(0.5, 8), 1),
+                            'status': rng.choice(('Completed', 'Completed', 'Scheduled')),
+                            'priority': rng.choice(('Low', 'Medium', 'High')), 'created_by': item['owner_id'],
+                            'created_at': START_DATE, 'updated_at': START_DATE})
+    progress(f"{len(records)} maintenance records")
+    counts['maintenance_records'] = len(_insert(MaintenanceRecord, records))
+
+    events = []
+    for user_id in user_ids:
+        for i in range(sizes['events_per_user']):
+            start = START_DATE + timedelta(days=rng.randrange(730), hours=rng.randrange(10))
+            event_type = rng.choice(EVENT_TYPES)
+            events.append({'name': f'{event_type} {user_id}-{i + 1}', 'event_type': event_type,
+                           'start_date': start, 'end_date': start + timedelta(hours=rng.choice((2, 4, 8, 48))),
+                           'is_public': rng.random() < 0.1, 'status': 'scheduled', 'created_by': user_id,
+                           'created_at': START_DATE, 'updated_at': START_DATE})
+    progress(f"{len(events)} events")
+    counts['events'] = len(_insert(Event, events))
+
+    trips = []
+    for boat_id, boat in zip(boat_ids, boats):
+        for i in range(sizes['trips_per_boat']):
+            start = START_DATE + timedelta(days=rng.randrange(660), hours=rng.randrange(4))
+            hours = rng.choice((3, 5, 8, 26))
+            trips.append({'name': f'Trip {i + 1} on {boat["name"]}', 'trip_type': rng.choice(TRIP_TYPES),
+                          'boat_id': boat_id, 'captain_id': boat['owner_id'], 'crew_size': rng.randrange(1, 6),
+                          'start_date': start, 'end_date': start + timedelta(hours=hours),
+                          'start_location': boat['home_port'], 'end_location': boat['home_port'],
+                          'distance_miles': round(hours * rng.uniform(3, 7), 1), 'status': 'completed',
+                          'route_processed': False, 'total_route_points': 0,
+                          'created_at': START_DATE, 'updated_at': START_DATE})
+    progress(f"{len(trips)} trips")
+    trip_ids = _insert(Trip, trips)
+    counts['trips'] = len(trip_ids)
+    db.session.commit()
+
+    # Spread the tracks over users so every load-test user has some
+    tracked = sorted(set(trip_ids[int(i * len(trip_ids) / sizes['tracks'])] for i in range(sizes['tracks'])))
+    ports = {name: (latitude, longitude) for name, latitude, longitude in HOME_PORTS}
+    points = 0
+    for number, trip_id in enumerate(tracked, start=1):
+        trip = db.session.get(Trip, trip_id)
+        columns = random_walk_track(np_rng, *ports[trip.start_location], trip.start_date, sizes['track_points'])
+        if storage == 'columnar':
+            write_trip_track(trip_id, columns)
+        else:
+            _write_track_rows(trip_id, columns)
+        trip.total_route_points = sizes['track_points']
+        trip.route_processed = True
+        trip.end_date = trip.start_date + timedelta(seconds=sizes['track_points'])
+        db.session.commit()
+        if route_levels:
+            build_route_levels(trip)
+            db.session.commit()
+        points += sizes['track_points']
+        progress(f"track {number}/{len(tracked)}: {points:,} points")
+    counts['tracks'] = len(tracked)
+    counts['gps_points'] = points
+
+    # The Core inserts bypassed the ORM events that maintain the statistics and schedule
+    progress("statistics rollups")
+    rollups.rebuild()
+    progress("maintenance schedule")
+    maintenance_schedule.rebuild()
+    db.session.commit()
+
+    return counts
+
@@ -0,0 +1,184 @@
+"""
+Vectorized track math
+
+Computes per-point distance, cumulative distance, course and speed over ground
+for a whole trip at once using NumPy arrays instead of looping over
+GPSRoutePoint pairs in Python. Works the same for tracks kept as
+GPSRoutePoint rows or as compressed chunks (track_store.py).
+"""
+
+import numpy as np
+from sqlalchemy import Float, bindparam, cast, select, update
+from models import db, GPSRoutePoint
+from track_store import has_columnar_track, read_trip_track, update_trip_channels
+
+# Radius of earth in nautical miles (same value as GPSRoutePoint.distance_to_point)
+EARTH_RADIUS_NM = 3440.065
+
+# Rows written back per executemany
+UPDATE_BATCH_SIZE = 5000
+
+
+def haversine_nm(lat1, lon1, lat2, lon2):
+    """Great-circle distance in nautical miles between arrays of points (degrees)"""
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(v, dtype=np.float64)) for v in (lat1, lon1, lat2, lon2))
+    dlat = lat2 - lat1
+    dlon = lon2 - lon1
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_NM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def initial_bearing(lat1, lon1, lat2, lon2):
+    """Initial bearing in degrees (0-360) from the first to the second array of points"""
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(v, dtype=np.float64)) for v in (lat1, lon1, lat2, lon2))
+    dlon = lon2 - lon1
+    y = np.sin(dlon) * np.cos(lat2)
+    x = np.cos(lat1) * np.sin(lat2) - np.sin(lat1) * np.cos(lat2) * np.cos(dlon)
+    return (np.degrees(np.arctan2(y, x)) + 360) % 360
+
+
+def compute_track_metrics(latitudes, longitudes, timestamps):
+    """Compute per-point metrics for an ordered track.
+
+    timestamps is a datetime64 array. Each value describes the leg arriving at
+    that point, so the first point has zero distance and NaN course/speed.
+    Returns a dict of float64 arrays keyed by GPSRoutePoint column name.
+    """
+    latitudes = np.asarray(latitudes, dtype=np.float64)
+    longitudes = np.asarray(longitudes, dtype=np.float64)
+    count = latitudes.shape[0]
+
+    distance = np.zeros(count)
+    course = np.full(count, np.nan)
+    speed = np.full(count, np.nan)
+
+    if count > 1:
+        distance[1:] = haversine_nm(latitudes[:-1], longitudes[:-1], latitudes[1:], longitudes[1:])
+        course[1:] = initial_bearing(latitudes[:-1], longitudes[:-1], latitudes[1:], longitudes[1:])
+
+        # Knots = nautical miles per hour; skip legs with no elapsed time
+        elapsed_hours = np.diff(np.asarray(timestamps, dtype='datetime64[us]')).astype(np.float64) / 3.6e9
+        with np.errstate(divide='ignore', invalid='ignore'):
+            speed[1:] = np.where(elapsed_hours > 0, distance[1:] / elapsed_hours, np.nan)
+
+        # A leg with no movement has no meaningful course
+        course[1:][distance[1:] == 0] = np.nan
+
+    return {
+        'distance_from_previous': distance,
+        'cumulative_distance': np.cumsum(distance),
+        'course_over_ground': course,
+        'speed_over_ground': speed,
+    }
+
+
+def load_trip_track(trip_id):
+    """Load a trip's route points as NumPy arrays ordered by time.
+
+    Row-stored tracks also return each point's id; chunked tracks do not.
+    """
+    if has_columnar_track(trip_id):
+        track = read_trip_track(trip_id, channels=('latitude', 'longitude', 'course_over_ground'))
+        track.pop('labels')
+        return track
+
+    rows = db.session.execute(
+        select(
+            GPSRoutePoint.id,
+            cast(GPSRoutePoint.latitude, Float),
+            cast(GPSRoutePoint.longitude, Float),
+            GPSRoutePoint.timestamp,
+            GPSRoutePoint.course_over_ground
+        )
+        .where(GPSRoutePoint.trip_id == trip_id)
+        .order_by(GPSRoutePoint.timestamp, GPSRoutePoint.id)
+    ).all()
+
+    if not rows:
+        return {
+            'id': np.empty(0, dtype=np.int64),
+            'latitude': np.empty(0),
+            'longitude': np.empty(0),
+            'timestamp': np.empty(0, dtype='datetime64[us]'),
+            'course_over_ground': np.empty(0),
+        }
+
+    ids, latitudes, longitudes, timestamps, courses = zip(*rows)
+    return {
+        'id': np.fromiter(ids, dtype=np.int64, count=len(rows)),
+        'latitude': np.fromiter(latitudes, dtype=np.float64, count=len(rows)),
+        'longitude': np.fromiter(longitudes, dtype=np.float64, count=len(rows)),
+        'timestamp': np.array(timestamps, dtype='datetime64[us]'),
+        'course_over_ground': np.array(courses, dtype=np.float64),
+    }
+
+
+def _nullable(values):
+    """Convert a float array to a list with NaN replaced by None"""
+    return np.where(np.isnan(values), None, values).tolist()
+
+
+def process_trip_track(trip):
+    """Fill per-point distance/course/speed (row columns or chunk channels) and Trip.distance_calculated.
+
+    Changes are flushed through the current session; the caller commits.
+    Returns the number of points processed.
+    """
+    track = load_trip_track(trip.id)
+    count = track['latitude'].shape[0]
+
+    if count:
+        metrics = compute_track_metrics(track['latitude'], track['longitude'], track['timestamp'])
+
+        # Keep device-reported course where the log supplied one
+        device_course = track['course_over_ground']
+        course = np.where(np.isnan(device_course), metrics['course_over_ground'], device_course)
+        trip.distance_calculated = round(float(metrics['cumulative_distance'][-1]), 3)
+    else:
+        trip.distance_calculated = None
+
+    if count and 'id' not in track:
+        # Chunked tracks are rewritten with the metrics as extra channels
+        update_trip_channels(trip.id, {
+            'distance_from_previous': metrics['distance_from_previous'],
+            'cumulative_distance': metrics['cumulative_distance'],
+            'course_over_ground': course,
+            'speed_over_ground': metrics['speed_over_ground']
+        })
+    elif count:
+        point_ids = track['id'].tolist()
+        distances = metrics['distance_from_previous'].tolist()
+        cumulative = metrics['cumulative_distance'].tolist()
+        courses = _nullable(course)
+        speeds = _nullable(metrics['speed_over_ground'])
+
+        table = GPSRoutePoint.__table__
+        statement = (
+            update(table)
+            .where(table.c.id == bindparam('point_id'))
+            .values(
+                distance_from_previous=bindparam('new_distance'),
+                cumulative_distance=bindparam('new_cumulative'),
+                course_over_ground=bindparam('new_course'),
+                speed_over_ground=bindparam('new_speed')
+            )
+        )
+        for start in range(0, count, UPDATE_BATCH_SIZE):
+            end = start + UPDATE_BATCH_SIZE
+            db.session.execute(statement, [
+                {
+                    'point_id': point_id,
+                    'new_distance': distance,
+                    'new_cumulative': total,
+                    'new_course': point_course,
+                    'new_speed': speed
+                }
+                for point_id, distance, total, point_course, speed in zip(
+                    point_ids[start:end], distances[start:end], cumulative[start:end],
+                    courses[start:end], speeds[start:end]
+                )
+            ])
+
+    trip.total_route_points = count
+    trip.route_processed = True
+    return count
@@ -0,0 +1,187 @@
+"""
+Multi-resolution track simplification
+
+Reduces a trip's route to a handful of polylines at increasing tolerances so
+map views can draw a long race with a few hundred vertices instead of every
+GPSRoutePoint. Levels are built by the track worker after a track is
+processed and stored in the trip_route_levels table.
+"""
+
+import heapq
+import math
+import numpy as np
+from flask import current_app
+from models import db, TripRouteLevel
+from track_math import EARTH_RADIUS_NM, load_trip_track
+
+EARTH_RADIUS_M = EARTH_RADIUS_NM * 1852
+
+SIMPLIFY_ALGORITHMS = ('douglas_peucker', 'visvalingam')
+
+# Level tolerances at or below this are treated as full resolution
+MIN_TOLERANCE_METERS = 0.1
+
+# Decimal places kept in stored coordinates (~0.1 m)
+COORDINATE_PRECISION = 6
+
+
+def project_to_meters(latitudes, longitudes):
+    """Project degrees onto a local flat plane in meters (equirectangular around the mean latitude)"""
+    latitudes = np.asarray(latitudes, dtype=np.float64)
+    longitudes = np.asarray(longitudes, dtype=np.float64)
+    if latitudes.shape[0] == 0:
+        return latitudes, longitudes
+
+    scale = math.cos(math.radians(float(np.mean(latitudes))))
+    x = np.radians(longitudes) * scale * EARTH_RADIUS_M
+    y = np.radians(latitudes) * EARTH_RADIUS_M
+    return x, y
+
+
+def douglas_peucker(x, y, tolerance):
+    """Return a keep mask for points more than tolerance from the simplified line"""
+    count = x.shape[0]
+    keep = np.zeros(count, dtype=bool)
+    if count < 3 or tolerance <= 0:
+        keep[:] = True
+        return keep
+
+    keep[0] = keep[-1] = True
+    # Explicit stack instead of recursion so long tracks can't hit the recursion limit
+    stack = [(0, count - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+
+        dx = x[end] - x[start]
+        dy = y[end] - y[start]
+        px = x[start + 1:end] - x[start]
+        py = y[start + 1:end] - y[start]
+
+        # Distance to the segment (not the infinite line) so loops back to the start still split
+        length_squared = dx * dx + dy * dy
+        if length_squared > 0:
+            t = np.clip((px * dx + py * dy) / length_squared, 0.0, 1.0)
+            distances = np.hypot(px - t * dx, py - t * dy)
+        else:
+            distances = np.hypot(px, py)
+
+        index = int(np.argmax(distances))
+        if distances[index] > tolerance:
+            split = start + 1 + index
+            keep[split] = True
+            stack.append((start, split))
+            stack.append((split, end))
+
+    return keep
+
+
+def _triangle_area(x, y, a, b, c):
+    """Area of the triangle between three point indexes"""
+    return abs((x[b] - x[a]) * (y[c] - y[a]) - (x[c] - x[a]) * (y[b] - y[a])) / 2
+
+
+def visvalingam(x, y, tolerance):
+    """Return a keep mask removing points whose effective area is below tolerance squared"""
+    count = x.shape[0]
+    keep = np.ones(count, dtype=bool)
+    if count < 3 or tolerance <= 0:
+        return keep
+
+    min_area = tolerance * tolerance
+    x = x.tolist()
+    y = y.tolist()
+    previous = list(range(-1, count - 1))
+    following = list(range(1, count + 1))
+    removed = [False] * count
+
+    areas = [math.inf] * count
+    for i in range(1, count - 1):
+        areas[i] = _triangle_area(x, y, i - 1, i, i + 1)
+    heap = [(areas[i], i) for i in range(1, count - 1)]
+    heapq.heapify(heap)
+
+    while heap:
+        area, i = heapq.heappop(heap)
+        # Skip entries made stale by a neighbour's removal
+        if removed[i] or area != areas[i]:
+            continue
+        if area >= min_area:
+            break
+
+        removed[i] = True
+        before, after = previous[i], following[i]
+        following[before] = after
+        previous[after] = before
+
+        for neighbour in (before, after):
+            if 0 < neighbour < count - 1:
+                # Never let a neighbour's area drop below the point just removed
+                areas[neighbour] = max(
+                    _triangle_area(x, y, previous[neighbour], neighbour, following[neighbour]), area
+                )
+                heapq.heappush(heap, (areas[neighbour], neighbour))
+
+    keep[np.array(removed)] = False
+    return keep
+
+
+def simplify_track(latitudes, longitudes, tolerance_meters, algorithm='douglas_peucker'):
+    """Return the indexes of the points kept at the given tolerance"""
+    if algorithm not in SIMPLIFY_ALGORITHMS:
+        raise ValueError(f'Unknown simplification algorithm: {algorithm}')
+
+    x, y = project_to_meters(latitudes, longitudes)
+    if algorithm == 'visvalingam':
+        keep = visvalingam(x, y, tolerance_meters)
+    else:
+        keep = douglas_peucker(x, y, tolerance_meters)
+    return np.flatnonzero(keep)
+
+
+def build_route_levels(trip, tolerances=None, algorithm=None):
+    """Replace a trip's stored route levels; the caller commits.
+
+    Returns the list of TripRouteLevel rows added to the session.
+    """
+    tolerances = sorted(set(tolerances or current_app.config['ROUTE_SIMPLIFY_TOLERANCES']))
+    algorithm = algorithm or current_app.config['ROUTE_SIMPLIFY_ALGORITHM']
+    if algorithm not in SIMPLIFY_ALGORITHMS:
+        raise ValueError(f'Unknown simplification algorithm: {algorithm}')
+
+    TripRouteLevel.query.filter_by(trip_id=trip.id).delete()
+
+    track = load_trip_track(trip.id)
+    latitudes = track['latitude']
+    longitudes = track['longitude']
+    if latitudes.shape[0] == 0:
+        return []
+
+    levels = []
+    for tolerance in tolerances:
+        indexes = simplify_track(latitudes, longitudes, tolerance, algorithm)
+        coordinates = np.column_stack((latitudes[indexes], longitudes[indexes]))
+        level = TripRouteLevel(
+            trip_id=trip.id,
+            tolerance_meters=float(tolerance),
+            algorithm=algorithm,
+            point_count=int(indexes.shape[0])
+        )
+        level.set_coordinates(np.round(coordinates, COORDINATE_PRECISION).tolist())
+        db.session.add(level)
+        levels.append(level)
+
+    return levels
+
+
+def closest_route_level(levels, tolerance=None):
+    """Pick the stored level nearest a requested tolerance (coarsest when none is given)"""
+    if not levels:
+        return None
+    if tolerance is None:
+        return max(levels, key=lambda level: level.tolerance_meters)
+
+    # Tolerances step roughly geometrically with zoom, so compare on a log scale
+    tolerance = max(tolerance, MIN_TOLERANCE_METERS)
+    return min(levels, key=lambda level: abs(math.log(max(level.tolerance_meters, MIN_TOLERANCE_METERS) / tolerance)))
@@ -0,0 +1,382 @@
+"""
+Compact columnar storage for GPS tracks
+
+Instead of one wide gps_route_points row per fix, a trip's track can be kept
+as a few trip_track_chunks rows. Each chunk holds up to TRACK_CHUNK_SIZE
+points as column arrays: timestamps and coordinates are delta-encoded
+integers packed into the smallest integer type that fits, sensor channels are
+float32 with NaN for missing values, and the whole payload is zlib
+compressed. Reads decode straight into NumPy arrays without creating ORM
+objects.
+
+Blob layout: MAGIC, uint32 header length, JSON header, zlib payload.
+"""
+
+import json
+import struct
+import zlib
+from datetime import datetime
+import numpy as np
+from sqlalchemy import delete, select
+from models import db, GPSRoutePoint, TripTrackChunk
+
+MAGIC = b'GTC1'
+
+STORAGE_MODES = ('rows', 'columnar')
+
+DEFAULT_CHUNK_SIZE = 10000
+
+# Degrees are stored as integers in units of 1e-7 degree (about 1 cm)
+COORDINATE_SCALE = 10 ** 7
+
+# Per-point float channels kept when at least one point in a chunk has a value
+SENSOR_CHANNELS = (
+    'altitude', 'speed_knots', 'course_over_ground', 'hdop', 'satellites_used',
+    'water_depth', 'water_temperature',
+    'distance_from_previous', 'cumulative_distance', 'speed_over_ground'
+)
+
+_EPOCH = np.datetime64('1970-01-01T00:00:00', 'us')
+
+_HEADER_LENGTH = struct.Struct('<I')
+
+
+def _smallest_int(values):
+    """Downcast an int64 array to the narrowest integer type that holds it"""
+    if values.size == 0:
+        return values.astype(np.int8)
+    low, high = int(values.min()), int(values.max())
+    for dtype in (np.int8, np.int16, np.int32):
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return values.astype(dtype)
+    return values.astype(np.int64)
+
+
+def _to_microseconds(timestamps):
+    """Convert datetimes or datetime64 values to int64 microseconds since the epoch"""
+    return (np.asarray(timestamps, dtype='datetime64[us]') - _EPOCH).astype(np.int64)
+
+
+def encode_chunk(columns, labels=None):
+    """Encode one chunk of column arrays into a compressed blob.
+
+    columns must include latitude, longitude (degrees) and timestamp
+    (datetime64 or datetime); any SENSOR_CHANNELS present are stored too.
+    labels maps point offsets to (point_type, point_name) for non-track points.
+    """
+    count = len(columns['latitude'])
+    channels = []
+    buffers = []
+
+    def add(name, array, **meta):
+        data = np.ascontiguousarray(array).tobytes()
+        channels.append(dict(name=name, dtype=array.dtype.name, nbytes=len(data), **meta))
+        buffers.append(data)
+
+    # Integer channels are stored as a first value plus deltas
+    integer_channels = (
+        ('timestamp', _to_microseconds(columns['timestamp']), None),
+        ('latitude', np.rint(np.asarray(columns['latitude'], dtype=np.float64) * COORDINATE_SCALE).astype(np.int64),
+         COORDINATE_SCALE),
+        ('longitude', np.rint(np.asarray(columns['longitude'], dtype=np.float64) * COORDINATE_SCALE).astype(np.int64),
+         COORDINATE_SCALE),
+    )
+    for name, values, scale in integer_channels:
+        first = int(values[0]) if count else 0
+        add(name, _smallest_int(np.diff(values)), encoding='delta', first=first, scale=scale)
+
+    for name in SENSOR_CHANNELS:
+        if name not in columns or columns[name] is None:
+            continue
+        values = np.asarray(columns[name], dtype=np.float64)
+        if np.isnan(values).all():
+            continue
+        # float32 keeps distances to a few centimetres over a 1000 nm passage
+        add(name, values.astype(np.float32), encoding='raw')
+
+    header = json.dumps({
+        'count': count,
+        'channels': channels,
+        'labels': {str(offset): list(label) for offset, label in (labels or {}).items()}
+    }, separators=(',', ':')).encode('utf-8')
+
+    return MAGIC + _HEADER_LENGTH.pack(len(header)) + header + zlib.compress(b''.join(buffers), 6)
+
+
+def decode_chunk(blob, channels=None):
+    """Decode a chunk blob into a dict of NumPy arrays (optionally only some channels).
+
+    timestamp is datetime64[us], coordinates and sensor channels are float64
+    with NaN for missing values. Point labels are returned under 'labels'.
+    """
+    blob = bytes(blob)
+    if blob[:4] != MAGIC:
+        raise ValueError('Not a track chunk')
+
+    header_end = 8 + _HEADER_LENGTH.unpack_from(blob, 4)[0]
+    header = json.loads(blob[8:header_end])
+    payload = memoryview(zlib.decompress(blob[header_end:]))
+    count = header['count']
+
+    arrays = {}
+    offset = 0
+    for channel in header['channels']:
+        name = channel['name']
+        start, offset = offset, offset + channel['nbytes']
+        if channels is not None and name not in channels:
+            continue
+
+        values = np.frombuffer(payload[start:offset], dtype=channel['dtype'])
+        if channel['encoding'] == 'delta':
+            decoded = np.empty(count, dtype=np.int64)
+            if count:
+                decoded[0] = channel['first']
+                np.cumsum(values, dtype=np.int64, out=decoded[1:])
+                decoded[1:] += channel['first']
+            if name == 'timestamp':
+                arrays[name] = _EPOCH + decoded.astype('timedelta64[us]')
+            else:
+                arrays[name] = decoded / channel['scale']
+        else:
+            arrays[name] = values.astype(np.float64)
+
+    # Channels that were all empty in this chunk decode as NaN
+    for name in (channels or ()):
+        if name in SENSOR_CHANNELS and name not in arrays:
+            arrays[name] = np.full(count, np.nan)
+
+    arrays['labels'] = {int(offset): tuple(label) for offset, label in header['labels'].items()}
+    return arrays
+
+
+def _chunk_row(trip_id, chunk_index, columns, labels):
+    """Build the insert parameters for one chunk"""
+    timestamps = np.asarray(columns['timestamp'], dtype='datetime64[us]')
+    return {
+        'trip_id': trip_id,
+        'chunk_index': chunk_index,
+        'point_count': len(timestamps),
+        'start_time': timestamps.min().astype(datetime),
+        'end_time': timestamps.max().astype(datetime),
+        'data': encode_chunk(columns, labels),
+        'created_at': datetime.utcnow()
+    }
+
+
+def delete_trip_chunks(trip_id):
+    """Remove a trip's stored chunks"""
+    db.session.execute(delete(TripTrackChunk).where(TripTrackChunk.trip_id == trip_id))
+
+
+def has_columnar_track(trip_id):
+    """Whether a trip's track is stored as chunks"""
+    return db.session.execute(
+        select(TripTrackChunk.id).where(TripTrackChunk.trip_id == trip_id).limit(1)
+    ).first() is not None
+
+
+class ChunkWriter:
+    """Buffer parsed point dicts and write them out as chunks of chunk_size points"""
+
+    def __init__(self, trip_id, chunk_size=DEFAULT_CHUNK_SIZE):
+        self.trip_id = trip_id
+        self.chunk_size = chunk_size
+        self.chunk_index = 0
+        self.total_points = 0
+        self._points = []
+
+    def add(self, point):
+        self._points.append(point)
+        if len(self._points) >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        if not self._points:
+            return
+
+        points = self._points
+        columns = {
+            'latitude': [point['latitude'] for point in points],
+            'longitude': [point['longitude'] for point in points],
+            'timestamp': [point['timestamp'] for point in points],
+        }
+        for name in SENSOR_CHANNELS:
+            values = [point.get(name) for point in points]
+            if any(value is not None for value in values):
+                columns[name] = [np.nan if value is None else value for value in values]
+
+        labels = {
+            offset: (point.get('point_type') or 'track', point.get('point_name'))
+            for offset, point in enumerate(points)
+            if (point.get('point_type') or 'track') != 'track' or point.get('point_name')
+        }
+
+        db.session.execute(TripTrackChunk.__table__.insert(), [
+            _chunk_row(self.trip_id, self.chunk_index, columns, labels)
+        ])
+        self.chunk_index += 1
+        self.total_points += len(points)
+        self._points = []
+
+
+def write_trip_track(trip_id, columns, chunk_size=DEFAULT_CHUNK_SIZE, labels=None):
+    """Replace a trip's chunks with whole-track column arrays; the caller commits"""
+    delete_trip_chunks(trip_id)
+    count = len(columns['latitude'])
+    labels = labels or {}
+
+    rows = []
+    for chunk_index, start in enumerate(range(0, count, chunk_size)):
+        end = start + chunk_size
+        chunk_columns = {name: np.asarray(values)[start:end] for name, values in columns.items() if values is not None}
+        chunk_labels = {offset - start: label for offset, label in labels.items() if start <= offset < end}
+        rows.append(_chunk_row(trip_id, chunk_index, chunk_columns, chunk_labels))
+
+    if rows:
+        db.session.execute(TripTrackChunk.__table__.insert(), rows)
+    return count
+
+
+def read_trip_track(trip_id, channels=None):
+    """Decode all of a trip's chunks into whole-track NumPy arrays ordered by time.
+
+    Returns timestamp, latitude and longitude plus any stored sensor channels
+    (or only the requested channels), and 'labels' keyed by point index.
+    """
+    blobs = db.session.execute(
+        select(TripTrackChunk.data)
+        .where(TripTrackChunk.trip_id == trip_id)
+        .order_by(TripTrackChunk.chunk_index)
+    ).scalars().all()
+
+    if channels is not None:
+        channels = set(channels) | {'timestamp'}
+    decoded = [decode_chunk(blob, channels) for blob in blobs]
+
+    names = set()
+    for chunk in decoded:
+        names.update(name for name in chunk if name != 'labels')
+
+    track = {}
+    for name in names:
+        parts = []
+        for chunk in decoded:
+            if name in chunk:
+                parts.append(chunk[name])
+            else:
+                parts.append(np.full(len(chunk['timestamp']), np.nan))
+        track[name] = np.concatenate(parts)
+    if 'timestamp' not in track:
+        track['timestamp'] = np.empty(0, dtype='datetime64[us]')
+
+    labels = {}
+    offset = 0
+    for chunk in decoded:
+        labels.update({offset + index: label for index, label in chunk['labels'].items()})
+        offset += len(chunk['timestamp'])
+
+    # Points are stored in file order; sort by time like the row store does
+    timestamps = track['timestamp']
+    if timestamps.size > 1 and np.any(timestamps[1:] < timestamps[:-1]):
+        order = np.argsort(timestamps, kind='stable')
+        track = {name: values[order] for name, values in track.items()}
+        position = np.empty_like(order)
+        position[order] = np.arange(order.size)
+        labels = {int(position[index]): label for index, label in labels.items()}
+
+    track['labels'] = labels
+    return track
+
+
+def update_trip_channels(trip_id, channels):
+    """Add or replace per-point channels on a time-ordered trip track; the caller commits.
+
+    channels maps SENSOR_CHANNELS names to whole-track arrays in the same
+    (time) order returned by read_trip_track. The track is rewritten in time order.
+    """
+    track = read_trip_track(trip_id)
+    labels = track.pop('labels')
+    chunk_size = db.session.execute(
+        select(TripTrackChunk.point_count).where(TripTrackChunk.trip_id == trip_id).order_by(TripTrackChunk.chunk_index)
+    ).scalars().first() or DEFAULT_CHUNK_SIZE
+
+    for name, values in channels.items():
+        if name not in SENSOR_CHANNELS:
+            raise ValueError(f'Unknown track channel: {name}')
+        track[name] = np.asarray(values, dtype=np.float64)
+
+    return write_trip_track(trip_id, track, chunk_size=chunk_size, labels=labels)
+
+
+def convert_trip_track(trip, storage, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Move a trip's stored track between GPSRoutePoint rows and chunks; the caller commits.
+
+    Returns the number of points converted (0 if already stored that way).
+    """
+    if storage not in STORAGE_MODES:
+        raise ValueError(f'Unknown track storage mode: {storage}')
+
+    table = GPSRoutePoint.__table__
+    columnar = has_columnar_track(trip.id)
+
+    if storage == 'columnar' and not columnar:
+        names = ('latitude', 'longitude', 'timestamp') + SENSOR_CHANNELS
+        rows = db.session.execute(
+            select(*(table.c[name] for name in names), table.c.point_type, table.c.point_name)
+            .where(table.c.trip_id == trip.id)
+            .order_by(table.c.timestamp, table.c.id)
+        ).all()
+        if not rows:
+            return 0
+
+        columns = {}
+        for index, name in enumerate(names):
+            values = [row[index] for row in rows]
+            if name == 'timestamp':
+                columns[name] = values
+            elif any(value is not None for value in values):
+                columns[name] = [np.nan if value is None else float(value) for value in values]
+        labels = {
+            offset: (row.point_type or 'track', row.point_name)
+            for offset, row in enumerate(rows)
+            if (row.point_type or 'track') != 'track' or row.point_name
+        }
+
+        write_trip_track(trip.id, columns, chunk_size=chunk_size, labels=labels)
+        db.session.execute(delete(table).where(table.c.trip_id == trip.id))
+        return len(rows)
+
+    if storage == 'rows' and columnar:
+        track = read_trip_track(trip.id)
+        labels = track.pop('labels')
+        count = len(track['timestamp'])
+        timestamps = track['timestamp'].astype(datetime).tolist()
+        first_timestamp = min(timestamps) if timestamps else None
+        channels = {name: np.where(np.isnan(values), None, values).tolist()
+                    for name, values in track.items() if name in SENSOR_CHANNELS}
+
+        rows = []
+        for index in range(count):
+            point_type, point_name = labels.get(index, ('track', None))
+            row = {
+                'trip_id': trip.id,
+                'latitude': float(track['latitude'][index]),
+                'longitude': float(track['longitude'][index]),
+                'timestamp': timestamps[index],
+                'elapsed_time_seconds': int((timestamps[index] - first_timestamp).total_seconds()),
+                'point_type': point_type,
+                'point_name': point_name
+            }
+            for name in SENSOR_CHANNELS:
+                row[name] = channels[name][index] if name in channels else None
+            if row['satellites_used'] is not None:
+                row['satellites_used'] = int(row['satellites_used'])
+            rows.append(row)
+
+        for start in range(0, count, chunk_size):
+            db.session.execute(table.insert(), rows[start:start + chunk_size])
+        delete_trip_chunks(trip.id)
+        return count
+
+    return 0
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+GPS Track Worker
+
+Runs queued GPS track jobs (import, distance/speed processing) outside the
+web server. Jobs are claimed from the processing_jobs table and executed in a
+bounded pool of worker processes, so uploads never tie up a Flask request
+thread and the Pi keeps a core free for serving.
+
+Usage:
+  python track_worker.py                  # Run until stopped (Ctrl+C / SIGTERM)
+  python track_worker.py --processes 2    # Limit the number of worker processes
+  python track_worker.py --once           # Drain the queue and exit
+"""
+
+import argparse
+import multiprocessing
+import os
+import signal
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from factory import create_app
+from models import db
+from jobs import (
+    claim_next_job, default_worker_processes, enqueue_unprocessed_trips,
+    requeue_stale_jobs, run_job, worker_name
+)
+
+_worker_app = None
+
+def _init_worker_process(nice_increment):
+    """Set up a pool process with its own app context and database connections"""
+    global _worker_app
+
+    # Ctrl+C is handled by the parent, which lets running jobs finish
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    if nice_increment:
+        os.nice(nice_increment)
+
+    _worker_app = create_app(api=False)
+    _worker_app.app_context().push()
+
+def _execute_job(job_id):
+    """Run one job inside a pool process"""
+    try:
+        job = run_job(job_id)
+        return job_id, job.status if job else None
+    finally:
+        db.session.remove()
+
+def run_worker(processes=None, once=False, poll_interval=None):
+    """Claim and run jobs until stopped (or until the queue is empty with once=True)"""
+    app = create_app(api=False)
+    processes = processes or app.config['JOB_WORKER_PROCESSES'] or default_worker_processes()
+    poll_interval = poll_interval or app.config['JOB_POLL_INTERVAL_SECONDS']
+    name = worker_name()
+    stopping = False
+
+    def request_stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        print("🛑 Stop requested - finishing running jobs...")
+
+    signal.signal(signal.SIGINT, request_stop)
+    signal.signal(signal.SIGTERM, request_stop)
+
+    with app.app_context():
+        db.create_all()
+
+    print(f"🚀 Track worker {name} starting with {processes} process(es)")
+
+    # Spawned processes get fresh database connections instead of forked copies
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(
+        max_workers=processes,
+        mp_context=context,
+        initializer=_init_worker_process,
+        initargs=(app.config['JOB_WORKER_NICE'],)
+    ) as pool:
+        running = {}
+
+        while True:
+            if not stopping:
+                with app.app_context():
+                    requeue_stale_jobs(app.config['JOB_STALE_AFTER_SECONDS'])
+                    enqueue_unprocessed_trips()
+
+                    # Only claim as many jobs as there are free processes
+                    while len(running) < processes:
+                        job_id = claim_next_job(name)
+                        if job_id is None:
+                            break
+                        print(f"   ▶ Job {job_id} claimed")
+                        running[pool.submit(_execute_job, job_id)] = job_id
+
+                    db.session.remove()
+
+            if not running and (stopping or once):
+                break
+
+            if not running:
+                # wait() returns at once for no futures, so an idle worker would poll nonstop
+                time.sleep(poll_interval)
+                continue
+
+            done, _ = wait(list(running), timeout=poll_interval, return_when=FIRST_COMPLETED)
+            for future in done:
+                job_id = running.pop(future)
+                try:
+                    _, status = future.result()
+                    print(f"   ✓ Job {job_id} {status}")
+                except Exception as e:
+                    # The job row is requeued once it goes stale
+                    print(f"   ✗ Job {job_id} crashed: {e}")
+
+    print("👋 Track worker stopped")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Run queued GPS track jobs')
+    parser.add_argument('--processes', type=int, help='Number of worker processes')
+    parser.add_argument('--once', action='store_true', help='Exit when the queue is empty')
+    args = parser.parse_args()
+
+    run_worker(processes=args.processes, once=args.once)
@@ -0,0 +1,22 @@
+"""
+Dialect-aware INSERT constructs for ON CONFLICT statements
+
+PostgreSQL and SQLite both support INSERT ... ON CONFLICT, but through
+their own insert() constructs. dialect_insert() picks the right one for
+the current database, or returns None so callers can fall back to plain
+ORM writes elsewhere.
+"""
+
+from sqlalchemy.dialects import postgresql, sqlite
+from models import db
+
+_DIALECT_INSERTS = {
+    'postgresql': postgresql.insert,
+    'sqlite': sqlite.insert,
+}
+
+
+def dialect_insert(table):
+    """Return an insert() supporting on_conflict_*() for table, or None if unsupported"""
+    insert = _DIALECT_INSERTS.get(db.session.get_bind().dialect.name)
+    return insert(table) if insert else None
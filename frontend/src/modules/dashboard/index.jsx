@@ -1,43 +1,81 @@
 /**
  * Dashboard Module
  * 
- * Main dashboard with overview and statistics
+ * Main dashboard with overview and statistics, loaded in one request
+ * from /api/dashboard/summary
  */
-import React from 'react';
+import React, { useState, useEffect } from 'react';
 import './Dashboard.css';
 import '../shared.css';
+import apiService from '../../services/api';
+
+const formatDate = (value) => (value ? new Date(value).toLocaleDateString() : '');
 
 const Dashboard = ({ user }) => {
+  const [summary, setSummary] = useState(null);
+  const [error, setError] = useState('');
+
+  useEffect(() => {
+    loadSummary();
+  }, []);
+
+  const loadSummary = async () => {
+    try {
+      setError('');
+      setSummary(await apiService.getDashboardSummary());
+    } catch (err) {
+      setError(err.message || 'Failed to load dashboard');
+    }
+  };
+
+  const counts = summary?.counts || {};
+  const maintenance = summary?.maintenance;
+  const season = summary?.season;
+  const reminders = maintenance ? [...maintenance.overdue, ...maintenance.due_soon] : [];
+
   return (
     <div className="dashboard-module">
       <header className="module-header">
         <h1>Dashboard</h1>
         <p>Welcome back, {user?.first_name || user?.username}!</p>
       </header>
+
+      {error && <div className="error-message">{error}</div>}
       
       <div className="dashboard-grid">
         <div className="dashboard-card">
           <h3>Recent Activity</h3>
-          <p>No recent activity to display.</p>
+          {summary?.recent_trips.length ? (
+            <ul className="dashboard-list">
+              {summary.recent_trips.map((trip) => (
+                <li key={trip.id}>
+                  <span>{trip.name} ({trip.boat_name})</span>
+                  <span className="dashboard-list-meta">{formatDate(trip.start_date)}</span>
+                </li>
+              ))}
+            </ul>
+          ) : (
+            <p>No recent activity to display.</p>
+          )}
         </div>
         
         <div className="dashboard-card">
           <h3>Quick Stats</h3>
           <div className="stats-grid">
             <div className="stat-item">
-              <span className="stat-value">0</span>
+              <span className="stat-value">{counts.boats ?? 0}</span>
               <span className="stat-label">Boats</span>
             </div>
             <div className="stat-item">
-              <span className="stat-value">0</span>
+              <span className="stat-value">{counts.trips ?? 0}</span>
               <span className="stat-label">Trips</span>
             </div>
             <div className="stat-item">
-              <span className="stat-value">0</span>
+              <span className="stat-value">{counts.equipment ?? 0}</span>
               <span className="stat-label">Equipment</span>
             </div>
             <div className="stat-item">
-              <span className="stat-value">0</span>
+              <span className="stat-value">{counts.upcoming_events ?? 0}</span>
               <span className="stat-label">Events</span>
             </div>
           </div>
@@ -45,16 +83,66 @@ const Dashboard = ({ user }) => {
         
         <div className="dashboard-card">
           <h3>Upcoming Events</h3>
-          <p>No upcoming events scheduled.</p>
+          {summary?.next_events.length ? (
+            <ul className="dashboard-list">
+              {summary.next_events.map((event) => (
+                <li key={event.id}>
+                  <span>{event.name}</span>
+                  <span className="dashboard-list-meta">{formatDate(event.start_date)}</span>
+                </li>
+              ))}
+            </ul>
+          ) : (
+            <p>No upcoming events scheduled.</p>
+          )}
         </div>
         
         <div className="dashboard-card">
           <h3>Maintenance Reminders</h3>
-          <p>No maintenance items due.</p>
+          {reminders.length ? (
+            <ul className="dashboard-list">
+              {reminders.map((item) => (
+                <li key={item.record_id} className={item.days_until_due < 0 ? 'overdue' : ''}>
+                  <span>{item.title} ({item.equipment_name || item.boat_name})</span>
+                  <span className="dashboard-list-meta">
+                    {item.days_until_due < 0
+                      ? `${-item.days_until_due} days overdue`
+                      : `due in ${item.days_until_due} days`}
+                  </span>
+                </li>
+              ))}
+            </ul>
+          ) : (
+            <p>No maintenance items due.</p>
+          )}
         </div>
+
+        {season && (
+          <div className="dashboard-card">
+            <h3>This Season</h3>
+            <div className="stats-grid">
+              <div className="stat-item">
+                <span className="stat-value">{season.distance_miles}</span>
+                <span className="stat-label">Miles</span>
+              </div>
+              <div className="stat-item">
+                <span className="stat-value">{season.hours}</span>
+                <span className="stat-label">Hours</span>
+              </div>
+              <div className="stat-item">
+                <span className="stat-value">{season.trips}</span>
+                <span className="stat-label">Trips</span>
+              </div>
+              <div className="stat-item">
+                <span className="stat-value">{season.maintenance_cost}</span>
+                <span className="stat-label">Maintenance</span>
+              </div>
+            </div>
+          </div>
+        )}
       </div>
     </div>
   );
 };
 
-export default Dashboard;
\ No newline at end of file
+export default Dashboard;
@@ -123,6 +123,11 @@ class ApiService {
     });
   }
 
+  // Dashboard API
+  async getDashboardSummary() {
+    return await this.request('/dashboard/summary');
+  }
+
   // Boats API
   async getBoats() {
     return await this.request('/boats');
@@ -244,6 +249,12 @@ class ApiService {
     return await this.request('/events');
   }
 
+  // Occurrences between two dates (YYYY-MM-DD), recurring events expanded
+  async getEventCalendar(from, to) {
+    const params = new URLSearchParams({ from, to });
+    return await this.request(`/events?${params}`);
+  }
+
   async getEvent(id) {
     return await this.request(`/events/${id}`);
   }